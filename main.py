@@ -1,5 +1,20 @@
+import os
 import sys
-from src.ui import display_main_menu, prompt_input, clear_screen, UserQuitException
+from typing import Dict, Optional
+
+from src.progress import DEFAULT_PROGRESS_DIR, ProgressStore
+from src.result_cache import CachedEngine
+from src.scheduler import Scheduler
+from src.difficulty import DifficultyModel
+from src.engine import FLOAT32, FLOAT64, IEEEPresets
+from src.question_bank import QuestionBank, open_banks
+from src.transcript import TranscriptRecorder
+from src.base_mode import BaseMode
+from src.latency import LatencyRecorder
+from src.profiling import SessionProfiler
+from src.ui import (
+    display_main_menu, prompt_input, clear_screen, run_curses, set_input_source, set_latency_recorder, UserQuitException
+)
 
 from src.encode_mode import EncodeMode
 from src.decode_mode import DecodeMode
@@ -8,6 +23,7 @@ from src.special_cases_mode import SpecialCasesMode
 from src.denormals_mode import DenormalsMode
 from src.precision_impact import PrecisionImpactMode
 from src.rounding_mode import RoundingMode
+from src.drill_mode import DrillMode
 
 AVAILABLE_MODES = {
     1: "32-bit (Single) Encoding (Decimal -> Binary)",
@@ -19,13 +35,71 @@ AVAILABLE_MODES = {
     7: "Subnormals (Normalized vs Denormalized)",
     8: "Precision Impact",
     9: "Rounding Modes",
+    10: "Timed Drill (speed and throughput)",
 }
 
-def main():
+def create_mode(choice: int, cache: Optional[CachedEngine] = None,
+                banks: Optional[Dict[IEEEPresets, QuestionBank]] = None) -> Optional[BaseMode]:
+    """Instantiates the mode behind a menu number (None if it is not implemented)."""
+    banks = banks or {}
+    if choice == 1:
+        return EncodeMode(is_64_bit=False, cache=cache, bank=banks.get(FLOAT32))
+    elif choice == 2:
+        return DecodeMode(is_64_bit=False, cache=cache, bank=banks.get(FLOAT32))
+    elif choice == 3:
+        return EncodeMode(is_64_bit=True, cache=cache, bank=banks.get(FLOAT64))
+    elif choice == 4:
+        return DecodeMode(is_64_bit=True, cache=cache, bank=banks.get(FLOAT64))
+    elif choice == 5:
+        return MinMaxMode()
+    elif choice == 6:
+        return SpecialCasesMode()
+    elif choice == 7:
+        return DenormalsMode()
+    elif choice == 8:
+        return PrecisionImpactMode()
+    elif choice == 9:
+        return RoundingMode()
+    elif choice == 10:
+        return DrillMode()
+    return None
+
+def main(store: Optional[ProgressStore] = None, scheduler: Optional[Scheduler] = None,
+         profile_dir: Optional[str] = None, difficulty: Optional[DifficultyModel] = None):
+    if store is None:
+        # IEEE754_TUTOR_HOME relocates the progress files (e.g. one directory per learner)
+        store = ProgressStore(os.environ.get("IEEE754_TUTOR_HOME", DEFAULT_PROGRESS_DIR))
+    if scheduler is None:
+        scheduler = Scheduler()
+    if difficulty is None:
+        # Elo ratings that adapt the generated encoding/decoding rounds to the learner
+        difficulty = DifficultyModel()
+    # IEEE754_TUTOR_LATENCY=path.json|path.prom times every answer and exports the histograms on exit
+    latency_path = os.environ.get("IEEE754_TUTOR_LATENCY")
+    recorder = LatencyRecorder() if latency_path else None
+    set_latency_recorder(recorder)
+    # --profile DIR or IEEE754_TUTOR_PROFILE=DIR profiles every mode and dumps the reports on exit
+    profile_dir = profile_dir or os.environ.get("IEEE754_TUTOR_PROFILE")
+    profiler = SessionProfiler(profile_dir) if profile_dir else None
+    # IEEE754_TUTOR_CACHE=N shares an N-entry conversion cache between the encoding/decoding modes
+    cache_size = int(os.environ.get("IEEE754_TUTOR_CACHE") or 0)
+    cache = CachedEngine(cache_size) if cache_size > 0 else None
+    # IEEE754_TUTOR_BANK=DIR serves the encoding/decoding modes from compiled banks (tools/compile_bank.py)
+    bank_dir = os.environ.get("IEEE754_TUTOR_BANK")
+    banks = open_banks(bank_dir) if bank_dir else {}
+
+    def end_session():
+        store.close()
+        for bank in banks.values():
+            bank.close()
+        if recorder is not None:
+            recorder.export(latency_path)
+        if profiler is not None:
+            profiler.dump()
     
     while True:
         clear_screen()
-        display_main_menu(AVAILABLE_MODES)
+        display_main_menu(AVAILABLE_MODES, {mode_id: store.accuracy(mode_id) for mode_id in AVAILABLE_MODES})
         
         try:
             choice_str = prompt_input("Select a mode (number) [q to quit]: ")
@@ -38,33 +112,24 @@ def main():
                 prompt_input("\nPress Enter to continue.")
                 continue
             
-            if choice == 1:
-                mode = EncodeMode(is_64_bit=False)
-            elif choice == 2:
-                mode = DecodeMode(is_64_bit=False)
-            elif choice == 3:
-                mode = EncodeMode(is_64_bit=True)
-            elif choice == 4:
-                mode = DecodeMode(is_64_bit=True)
-            elif choice == 5:
-                mode = MinMaxMode()
-            elif choice == 6:
-                mode = SpecialCasesMode()
-            elif choice == 7:
-                mode = DenormalsMode()
-            elif choice == 8:
-                mode = PrecisionImpactMode()
-            elif choice == 9:
-                mode = RoundingMode()
-            else:
+            mode = create_mode(choice, cache, banks)
+            if mode is None:
                 print(f"\nMode {choice} is not yet implemented.")
                 prompt_input("\nPress Enter to return to the menu.")
                 continue
                 
-            while mode.run_round():
-                pass
+            mode.bind_progress(store, choice)
+            mode.bind_scheduler(scheduler, choice)
+            mode.bind_difficulty(difficulty, choice)
+            if profiler is None:
+                while mode.run_round():
+                    pass
+            else:
+                profiler.run_mode(choice, mode)
+            mode.finish_question()
             
         except UserQuitException:
+            end_session()
             print("\nExiting IEEE 754 Tutor. Goodbye!")
             sys.exit(0)
         except ValueError:
@@ -72,10 +137,28 @@ def main():
             try:
                 prompt_input("\nPress Enter to continue.")
             except UserQuitException:
+                end_session()
                 sys.exit(0)
         except KeyboardInterrupt:
+            end_session()
             print("\n\nExiting...")
             sys.exit(0)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="IEEE 754 Tutor")
+    parser.add_argument("--profile", metavar="DIR", help="Profile each mode (cProfile + tracemalloc) and write the reports to DIR on exit.")
+    parser.add_argument("--record", metavar="PATH", help="Record the session's prompts and answers to a transcript (replay with tools/replay_transcripts.py).")
+    parser.add_argument("--seed", type=int, help="RNG seed of a recorded session (default: random).")
+    parser.add_argument("--curses", action="store_true", help="Full-screen interface that redraws only the lines that change.")
+    args = parser.parse_args()
+    if args.curses and args.record:
+        parser.error("--record reads from the plain terminal and cannot be combined with --curses")
+    if args.record:
+        transcript = TranscriptRecorder(args.record, seed=args.seed)
+        set_input_source(transcript)
+        main(scheduler=Scheduler(clock=transcript.clock, seed=transcript.seed), profile_dir=args.profile)
+    elif args.curses:
+        run_curses(main, profile_dir=args.profile)
+    else:
+        main(profile_dir=args.profile)
@@ -2,6 +2,19 @@ import unittest
 import sys
 import os
 import importlib
+import argparse
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+TESTS_DIR = os.path.join(PROJECT_ROOT, 'tests')
+
+# fast: functional suites (no z3 needed), bmc: Z3 proofs, exhaustive: full-range sweeps (opt-in)
+TIERS = ("fast", "bmc", "exhaustive")
+DEFAULT_TIERS = ("fast", "bmc")
 
 def check_z3():
     try:
@@ -10,32 +23,227 @@ def check_z3():
         print("Error: The 'z3-solver' module is not installed.", file=sys.stderr)
         print("This project requires Z3 for formal verification tests to run.", file=sys.stderr)
         print("Please resolve this dependency by running: pip install z3-solver", file=sys.stderr)
+        print("The functional tier runs without it: python3 run_tests.py --tier fast", file=sys.stderr)
         sys.exit(1)
 
-def main():
-    check_z3()
-    
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
+@dataclass
+class CaseRecord:
+    """Outcome of one test case: passed, failed, error, skipped or timeout, plus its wall time."""
+    tier: str
+    classname: str
+    name: str
+    status: str
+    seconds: float
+    detail: str = ""
+    cached: bool = False
+
+    @property
+    def id(self) -> str:
+        return f"{self.classname}.{self.name}"
+
+class TimingResult(unittest.TestResult):
+    """TestResult that times every test and keeps one CaseRecord per test case."""
+    def __init__(self, tier: str):
+        super().__init__()
+        # Tests echo their prompts to stdout; capture it per test so parallel workers do not interleave
+        self.buffer = True
+        self.tier = tier
+        self.records: List[CaseRecord] = []
+        self._start = 0.0
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._start = time.perf_counter()
+
+    def _record(self, test, status: str, detail: str = "") -> None:
+        classname, _, name = test.id().rpartition(".")
+        self.records.append(CaseRecord(self.tier, classname, name, status, time.perf_counter() - self._start, detail))
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._record(test, "passed")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, "failed", self.failures[-1][1])
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._record(test, "error", self.errors[-1][1])
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._record(test, "skipped", reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._record(test, "passed")
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._record(test, "failed", "Unexpected success.")
+
+def tier_of(filename: str) -> str:
+    """Maps a test file name to its tier."""
+    if filename.endswith('_bmc.py'):
+        return "bmc"
+    if filename.endswith('_exhaustive.py'):
+        return "exhaustive"
+    return "fast"
+
+def discover_modules(tests_dir: str, tiers: Sequence[str]) -> List[str]:
+    """Lists the test modules (sorted) that belong to the given tiers."""
+    return [f[:-3] for f in sorted(os.listdir(tests_dir))
+            if f.startswith('test_') and f.endswith('.py') and tier_of(f) in tiers]
+
+def shard(items: Sequence, index: int, count: int) -> list:
+    """Deterministic round-robin slice: shard `index` (1-based) of `count`."""
+    return list(items[index - 1::count])
+
+def run_module(tests_dir: str, module: str) -> List[CaseRecord]:
+    """Runs one test module and returns its records; also the worker-process entry point."""
     # Manually load modules since we cannot use __init__.py packages
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    tests_dir = os.path.join(project_root, 'tests')
-    
-    sys.path.insert(0, project_root)
-    sys.path.insert(0, tests_dir)
-    
-    for f in os.listdir(tests_dir):
-        if f.startswith('test_') and f.endswith('.py'):
-            mod_name = f[:-3]
-            mod = importlib.import_module(mod_name)
-            suite.addTests(loader.loadTestsFromModule(mod))
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    for path in (PROJECT_ROOT, tests_dir):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    result = TimingResult(tier_of(module + '.py'))
+    try:
+        mod = importlib.import_module(module)
+    except Exception as e:
+        return [CaseRecord(result.tier, module, "<import>", "error", 0.0, f"{type(e).__name__}: {e}")]
+    # clear_screen() shells out to `clear`, which writes to fd 1 directly and bypasses the result buffer
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        unittest.defaultTestLoader.loadTestsFromModule(mod).run(result)
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+        os.close(devnull)
+    return result.records
+
+def run_modules(tests_dir: str, modules: Sequence[str], jobs: int) -> List[CaseRecord]:
+    """Runs test modules in parallel worker processes, returning records in module order."""
+    if jobs <= 1 or len(modules) <= 1:
+        return [r for m in modules for r in run_module(tests_dir, m)]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(modules))) as pool:
+        futures = [pool.submit(run_module, tests_dir, m) for m in modules]
+        return [r for f in futures for r in f.result()]
+
+def run_bmc(tests_dir: str, jobs: int, shard_index: int, shard_count: int,
+            use_cache: bool) -> List[CaseRecord]:
+    """Runs the Z3 proofs through the parallel, cached proof runner."""
+    from tools.proof_runner import ProofCache, discover_proofs, run_proofs, summarize, format_cache_report
+
+    cache = ProofCache() if use_cache else None
+    specs = shard(discover_proofs(tests_dir), shard_index, shard_count)
+    proofs = run_proofs(specs, jobs, cache=cache)
+    if cache is not None:
+        print(format_cache_report(summarize(proofs, 0.0)))
+    return [CaseRecord("bmc", f"{s.module}.{s.cls}", s.method, r.status, r.seconds, r.detail, r.cached)
+            for s, r in zip(specs, proofs)]
+
+def write_junit(records: Sequence[CaseRecord], path: str, wall_seconds: float) -> None:
+    """Writes JUnit XML with one <testsuite> per test module."""
+    suites = {}
+    for r in records:
+        suites.setdefault(r.classname.split(".")[0], []).append(r)
+
+    def counts(rs):
+        return {
+            "tests": str(len(rs)),
+            "failures": str(sum(r.status == "failed" for r in rs)),
+            "errors": str(sum(r.status in ("error", "timeout") for r in rs)),
+            "skipped": str(sum(r.status == "skipped" for r in rs)),
+        }
+
+    root = ET.Element("testsuites", name="ieee754", time=f"{wall_seconds:.3f}", **counts(records))
+    for module, rs in suites.items():
+        suite = ET.SubElement(root, "testsuite", name=module, time=f"{sum(r.seconds for r in rs):.3f}", **counts(rs))
+        ET.SubElement(ET.SubElement(suite, "properties"), "property", name="tier", value=rs[0].tier)
+        for r in rs:
+            case = ET.SubElement(suite, "testcase", classname=r.classname, name=r.name, time=f"{r.seconds:.3f}")
+            message = r.detail.strip().splitlines()[-1] if r.detail.strip() else r.status
+            if r.status == "failed":
+                ET.SubElement(case, "failure", message=message).text = r.detail
+            elif r.status in ("error", "timeout"):
+                ET.SubElement(case, "error", message=message, type=r.status).text = r.detail
+            elif r.status == "skipped":
+                ET.SubElement(case, "skipped", message=r.detail)
+            if r.cached:
+                ET.SubElement(case, "system-out").text = "Verdict reused from the proof cache."
+    ET.indent(root)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+def format_slowest(records: Sequence[CaseRecord], count: int) -> List[str]:
+    """Lines of the slowest-tests report (cached proofs are excluded, they cost nothing this run)."""
+    ran = sorted((r for r in records if not r.cached), key=lambda r: r.seconds, reverse=True)[:count]
+    lines = [f"Slowest {len(ran)} tests:"]
+    lines += [f"  {r.seconds:>8.3f}s  {r.tier:<10} {r.id}" for r in ran]
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the test tiers in parallel worker processes.")
+    parser.add_argument("--tier", action="append", choices=TIERS + ("all",),
+                        help="Tier to run; repeatable (default: fast and bmc)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--shard", default="1/1", metavar="I/N", help="Only run shard I of N (1-based)")
+    parser.add_argument("--junit", metavar="PATH", help="Write JUnit XML results to PATH")
+    parser.add_argument("--slowest", type=int, default=10, help="Length of the slowest-tests report (0 to hide)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-solve every proof instead of reusing cached verdicts")
+    parser.add_argument("--update-manifest", action="store_true",
+                        help="Let the coverage test rewrite doc/coverage_manifest.md (otherwise it only checks it)")
+    args = parser.parse_args()
+
+    tiers = TIERS if "all" in (args.tier or ()) else tuple(args.tier or DEFAULT_TIERS)
+    try:
+        shard_index, shard_count = (int(x) for x in args.shard.split("/"))
+        if not 1 <= shard_index <= shard_count:
+            raise ValueError
+    except ValueError:
+        parser.error(f"--shard expects I/N with 1 <= I <= N, got '{args.shard}'")
+
+    # Only the proofs need z3, so the functional inner loop works without it
+    if "bmc" in tiers:
+        check_z3()
     
+    sys.path.insert(0, PROJECT_ROOT)
+    sys.path.insert(0, TESTS_DIR)
+    if args.update_manifest:
+        # Read by tests/test_coverage_manifest.py; worker processes inherit it
+        os.environ["IEEE754_UPDATE_MANIFEST"] = "1"
+
+    start = time.perf_counter()
+    modules = shard(discover_modules(TESTS_DIR, [t for t in tiers if t != "bmc"]), shard_index, shard_count)
+    records = run_modules(TESTS_DIR, modules, args.jobs)
+    if "bmc" in tiers:
+        records += run_bmc(TESTS_DIR, args.jobs, shard_index, shard_count, not args.no_cache)
+    wall = time.perf_counter() - start
+
+    bad = [r for r in records if r.status in ("failed", "error", "timeout")]
+    for r in bad:
+        print("=" * 70)
+        print(f"{r.status.upper()}: {r.id} [{r.tier}]")
+        print("-" * 70)
+        print(r.detail)
+    if args.slowest:
+        print("\n".join(format_slowest(records, args.slowest)))
+    print("-" * 70)
+    print(f"Ran {len(records)} tests ({', '.join(tiers)}; shard {shard_index}/{shard_count}) in {wall:.3f}s")
+    counts = {}
+    for r in records:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    summary = ", ".join(f"{s}={n}" for s, n in sorted(counts.items()))
+    print(f"{'FAILED' if bad else 'OK'} ({summary})")
+
+    if args.junit:
+        write_junit(records, args.junit, wall)
+
     # Exit with 0 if successful, 1 if failures
-    sys.exit(not result.wasSuccessful())
+    sys.exit(1 if bad else 0)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,285 @@
+"""
+Stdlib-only HTTP JSON API over the engine: encode, decode, fields and classify for
+every preset, in batches of up to MAX_BATCH values per request. Served by a
+ThreadingHTTPServer speaking HTTP/1.1, so clients can keep connections alive.
+
+    POST /v1/encode    {"preset": "FLOAT32", "values": [0.1, "nan", "0x1.8p1"], "rounding": "RNE"}
+    POST /v1/decode    {"preset": "FLOAT16", "bits": ["0x3c00", 15360], "exact": false}
+    POST /v1/fields    {"preset": "FLOAT64", "bits": [...]}   (or "values": [...])
+    POST /v1/classify  {"preset": "BFLOAT16", "bits": [...]}  (or "values": [...])
+    POST /v1/derive    {"preset": "FLOAT32", "values": [0.1]}  (or "bits"; worked steps, up to MAX_DERIVATIONS)
+    GET  /v1/presets, GET /v1/cache (result-cache counters), GET /healthz
+
+Non-finite floats are exchanged as the strings "nan", "inf" and "-inf". Numeric strings
+are limited to MAX_NUMBER_CHARS characters and exponents of magnitude MAX_EXPONENT.
+"""
+import json
+import math
+import re
+from fractions import Fraction
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from src.engine import (
+    FLOAT64, PRESETS, ROUNDING_MODES, ROUND_NEAREST_EVEN, ROUND_TOWARD_NEGATIVE, ROUND_TOWARD_POSITIVE, IEEEPresets,
+    bits_to_float, bits_to_hex, classify_bits, exact_decimal, extract_bit_fields, float_to_bits, parse_hex_float,
+    round_exact
+)
+from src.derivation import as_dict, derive, derive_bits
+from src.result_cache import CachedEngine
+
+MAX_BATCH = 100_000
+MAX_BODY_BYTES = 16 * 1024 * 1024
+# A derivation is a few hundred bytes of text (more for the exact expansions of extreme doubles)
+MAX_DERIVATIONS = 1000
+# Numeric strings: long enough for the exact decimal expansion of any double, with an exponent
+# (decimal after 'e', binary after 'p') past every preset's range, but small enough to parse in microseconds
+MAX_NUMBER_CHARS = 1200
+MAX_EXPONENT = 1100
+_HEX_EXPONENT = re.compile(r"[pP]([+-]?\d+)")
+_DECIMAL_EXPONENT = re.compile(r"[eE]([+-]?\d+)")
+_DECIMAL = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+class ApiError(Exception):
+    """A client error, answered with `status` and a JSON {"error": message} body."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _preset(payload: dict) -> IEEEPresets:
+    name = payload.get("preset", "FLOAT32")
+    if not isinstance(name, str) or name not in PRESETS:
+        raise ApiError(400, f"Unknown preset {name!r}, expected one of {sorted(PRESETS)}")
+    return PRESETS[name]
+
+def _batch(payload: dict, key: str) -> list:
+    """The list under `key` (a scalar is a batch of one), limited to MAX_BATCH items."""
+    items = payload[key]
+    if not isinstance(items, list):
+        items = [items]
+    if len(items) > MAX_BATCH:
+        raise ApiError(413, f"A batch holds at most {MAX_BATCH} items, got {len(items)}.")
+    return items
+
+def _is_hex(item) -> bool:
+    """Whether a number item is a hex-float string, after checking its type, length and exponent."""
+    if isinstance(item, bool) or not isinstance(item, (int, float, str)):
+        raise ApiError(400, f"Expected a number or numeric string, got {item!r}")
+    if not isinstance(item, str):
+        return False
+    if len(item) > MAX_NUMBER_CHARS:
+        raise ApiError(400, f"Numeric strings are limited to {MAX_NUMBER_CHARS} characters, got {len(item)}.")
+    is_hex = "0x" in item.lower()
+    exponent = (_HEX_EXPONENT if is_hex else _DECIMAL_EXPONENT).search(item)
+    if exponent and abs(int(exponent.group(1))) > MAX_EXPONENT:
+        raise ApiError(400, f"Exponents are limited to {MAX_EXPONENT} in magnitude, got {exponent.group(1)}.")
+    return is_hex
+
+def _parse_hex(text: str, preset: IEEEPresets, mode: str) -> int:
+    try:
+        return parse_hex_float(text, preset, mode)
+    except ValueError:
+        raise ApiError(400, f"Invalid number {text!r}")
+
+def _parse_value(item) -> float:
+    """
+    A JSON number, or a string: decimal, 'nan'/'inf'/'-inf' or a C99 hex float ('0x1.8p1').
+    Derivations explain doubles, so a hex float must be exact in one.
+    """
+    if _is_hex(item):
+        bits = _parse_hex(item, FLOAT64, ROUND_TOWARD_POSITIVE)
+        if bits != _parse_hex(item, FLOAT64, ROUND_TOWARD_NEGATIVE):
+            raise ApiError(400, f"Hex float {item!r} is not exactly representable as a double.")
+        return bits_to_float(bits, FLOAT64)
+    try:
+        return float(item.strip() if isinstance(item, str) else item)
+    except ValueError:
+        raise ApiError(400, f"Invalid number {item!r}")
+    except OverflowError:
+        raise ApiError(400, f"Integer {item} is out of the range of a double.")
+
+def _round_ratio(sign: int, numerator: int, denominator: int, preset: IEEEPresets, mode: str) -> int:
+    """
+    Rounds (-1)^sign * numerator / denominator once: the quotient keeps f_bits + 3 bits
+    and a sticky bit for any remainder, which round_exact then rounds as exact binary.
+    """
+    k = max(0, preset.f_bits + 3 - (numerator.bit_length() - denominator.bit_length()))
+    quotient, remainder = divmod(numerator << k, denominator)
+    return round_exact(sign, (quotient << 1) | (remainder != 0), -k - 1, preset, mode)[0]
+
+def _encode_value(item, preset: IEEEPresets, mode: str = ROUND_NEAREST_EVEN) -> int:
+    """
+    The pattern of `item` (as accepted by _parse_value) in `preset`. Hex floats, integers and
+    decimal strings are rounded once, exactly from their digits, rather than first to a double
+    and then again.
+    """
+    if _is_hex(item):
+        return _parse_hex(item, preset, mode)
+    if isinstance(item, int):
+        return round_exact(int(item < 0), abs(item), 0, preset, mode)[0]
+    if isinstance(item, str) and _DECIMAL.fullmatch(item.strip()):
+        text = item.strip()
+        value = abs(Fraction(text))
+        return _round_ratio(int(text.startswith("-")), value.numerator, value.denominator, preset, mode)
+    return float_to_bits(_parse_value(item), preset, mode)
+
+def _parse_bits(item, preset: IEEEPresets) -> int:
+    """A non-negative integer or a hex word ('0x3f800000') that fits the preset."""
+    if isinstance(item, str):
+        try:
+            item = int(item, 16)
+        except ValueError:
+            raise ApiError(400, f"Invalid hex word {item!r}")
+    if isinstance(item, bool) or not isinstance(item, int) or item < 0 or item >> preset.total_bits:
+        raise ApiError(400, f"Expected a {preset.total_bits}-bit pattern, got {item!r}")
+    return item
+
+def _patterns(payload: dict, preset: IEEEPresets) -> List[int]:
+    """Bit patterns from "bits", or encoded (round to nearest even) from "values"."""
+    if "bits" in payload:
+        return [_parse_bits(b, preset) for b in _batch(payload, "bits")]
+    if "values" in payload:
+        return [_encode_value(v, preset) for v in _batch(payload, "values")]
+    raise ApiError(400, "Expected a 'bits' or 'values' list.")
+
+def _json_float(value: float):
+    """Finite floats as numbers, the rest as 'nan', 'inf' or '-inf' (JSON has no literal for them)."""
+    if math.isfinite(value):
+        return value
+    return "nan" if math.isnan(value) else ("inf" if value > 0 else "-inf")
+
+def handle_encode(payload: dict, cache: Optional[CachedEngine] = None) -> dict:
+    preset = _preset(payload)
+    mode = payload.get("rounding", ROUND_NEAREST_EVEN)
+    if not isinstance(mode, str) or mode not in ROUNDING_MODES:
+        raise ApiError(400, f"Unknown rounding mode '{mode}', expected one of {list(ROUNDING_MODES)}")
+    if "values" not in payload:
+        raise ApiError(400, "Expected a 'values' list.")
+    patterns = [_encode_value(v, preset, mode) for v in _batch(payload, "values")]
+    return {"preset": payload.get("preset", "FLOAT32"), "bits": [bits_to_hex(b, preset) for b in patterns]}
+
+def handle_decode(payload: dict, cache: Optional[CachedEngine] = None) -> dict:
+    preset = _preset(payload)
+    if "bits" not in payload:
+        raise ApiError(400, "Expected a 'bits' list.")
+    patterns = _patterns(payload, preset)
+    result = {"preset": payload.get("preset", "FLOAT32"),
+              "values": [_json_float(bits_to_float(b, preset)) for b in patterns]}
+    if payload.get("exact"):
+        expand = cache.exact_decimal if cache is not None else exact_decimal
+        result["exact"] = [expand(b, preset) for b in patterns]
+    return result
+
+def handle_fields(payload: dict, cache: Optional[CachedEngine] = None) -> dict:
+    preset = _preset(payload)
+    return {"preset": payload.get("preset", "FLOAT32"),
+            "fields": [list(extract_bit_fields(b, preset)) for b in _patterns(payload, preset)]}
+
+def handle_classify(payload: dict, cache: Optional[CachedEngine] = None) -> dict:
+    preset = _preset(payload)
+    patterns = _patterns(payload, preset)
+    return {"preset": payload.get("preset", "FLOAT32"),
+            "classes": [classify_bits(b, preset) for b in patterns],
+            "signs": [b >> (preset.total_bits - 1) for b in patterns]}
+
+def handle_derive(payload: dict, cache: Optional[CachedEngine] = None) -> dict:
+    preset = _preset(payload)
+    key = "bits" if "bits" in payload else "values"
+    if key not in payload:
+        raise ApiError(400, "Expected a 'bits' or 'values' list.")
+    items = _batch(payload, key)
+    if len(items) > MAX_DERIVATIONS:
+        raise ApiError(413, f"A derivation batch holds at most {MAX_DERIVATIONS} items, got {len(items)}.")
+    if key == "bits":
+        derivations = [derive_bits(_parse_bits(b, preset), preset) for b in items]
+    else:
+        derivations = [derive(_parse_value(v), preset) for v in items]
+    return {"preset": payload.get("preset", "FLOAT32"), "derivations": [as_dict(d) for d in derivations]}
+
+ROUTES: Dict[str, Callable[[dict, Optional[CachedEngine]], dict]] = {
+    "/v1/encode": handle_encode,
+    "/v1/decode": handle_decode,
+    "/v1/fields": handle_fields,
+    "/v1/classify": handle_classify,
+    "/v1/derive": handle_derive,
+}
+
+class EngineRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the handlers; HTTP/1.1 with Content-Length keeps connections alive."""
+    protocol_version = "HTTP/1.1"
+    server_version = "IEEE754TutorAPI/1"
+    # Headers and body go out in separate writes; with Nagle on, delayed ACKs add ~40 ms per keep-alive request
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/v1/presets":
+            self._send_json(200, {name: vars(p) for name, p in PRESETS.items()})
+        elif self.path == "/v1/cache":
+            cache = self.server.engine_cache
+            stats = cache.stats() if cache is not None else None
+            self._send_json(200, {"enabled": False} if stats is None else
+                            {"enabled": True, **vars(stats), "hit_rate": stats.hit_rate})
+        else:
+            self._send_json(404, {"error": f"No route for GET {self.path}"})
+
+    def do_POST(self) -> None:
+        try:
+            body = self.rfile.read(self._content_length())
+            handler = ROUTES.get(self.path)
+            if handler is None:
+                raise ApiError(404, f"No route for POST {self.path}")
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ApiError(400, "Expected a JSON object.")
+            self._send_json(200, handler(payload, self.server.engine_cache))
+        except ApiError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except (ValueError, TypeError, OverflowError) as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception:
+            # Log the traceback like an unhandled error, but still answer and drop the connection
+            self.close_connection = True
+            self.server.handle_error(self.request, self.client_address)
+            self._send_json(500, {"error": "Internal server error."})
+
+    def _content_length(self) -> int:
+        """The request's Content-Length; an invalid one closes the connection, as the body cannot be skipped."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise ApiError(400, "Invalid Content-Length header.")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ApiError(413, f"Request bodies are limited to {MAX_BODY_BYTES} bytes.")
+        return length
+
+    def _send_json(self, status: int, obj: dict) -> None:
+        data = json.dumps(obj, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+def make_server(host: str = "127.0.0.1", port: int = 8754, verbose: bool = False,
+                cache_size: int = 0) -> ThreadingHTTPServer:
+    """
+    Binds the API server (port 0 picks a free port); call serve_forever() to run it.
+    `cache_size` > 0 puts a shared CachedEngine of that many entries in front of the exact expansions.
+    """
+    server = ThreadingHTTPServer((host, port), EngineRequestHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    server.engine_cache = CachedEngine(cache_size) if cache_size > 0 else None
+    return server
@@ -1,13 +1,85 @@
+import random
 from abc import ABC, abstractmethod
+from typing import Any, Sequence
+
+from src.ui import get_input_source, get_latency_recorder
 
 class BaseMode(ABC):
     """
     Abstract base class for all IEEE 754 Tutor educational modes.
     """
     def __init__(self):
-        # We can store the mode name or ID here if needed, 
-        # but the main menu handles routing.
-        pass
+        # The main menu handles routing; it binds a progress store, a scheduler, a difficulty model and the menu id.
+        self.progress = None
+        self.scheduler = None
+        self.difficulty = None
+        self.mode_id = None
+        # Index in src.difficulty.LEVELS of the current generated question (None for fixed questions)
+        self.level = None
+        # [question index, all steps correct so far (None before the first graded step)]
+        self._pending = None
+
+    def bind_progress(self, store, mode_id: int) -> None:
+        """
+        Records every graded step of this mode in `store` (a ProgressStore) under `mode_id`.
+        """
+        self.progress = store
+        self.mode_id = mode_id
+
+    def bind_scheduler(self, scheduler, mode_id: int) -> None:
+        """
+        Lets `scheduler` (a Scheduler) pick this mode's questions in select_question().
+        """
+        self.scheduler = scheduler
+        self.mode_id = mode_id
+
+    def bind_difficulty(self, model, mode_id: int) -> None:
+        """
+        Lets `model` (a DifficultyModel) pick the level of generated questions and rate every graded step.
+        """
+        self.difficulty = model
+        self.mode_id = mode_id
+
+    def record_attempt(self, step: str, correct: bool) -> bool:
+        """
+        Records one graded step (a no-op while unbound) and returns `correct`,
+        so a check can be wrapped in place: `if self.record_attempt("sign", ok):`.
+        """
+        if self.progress is not None:
+            self.progress.record(self.mode_id, step, correct)
+        recorder = get_latency_recorder()
+        if recorder is not None:
+            recorder.observe_step(self.mode_id, step, correct)
+        # Transcripts record the verdicts, so a replay catches changed questions or grading
+        source = get_input_source()
+        if hasattr(source, "observe_step"):
+            source.observe_step(self.mode_id, step, correct)
+        if self.difficulty is not None and self.level is not None:
+            self.difficulty.update(self.mode_id, self.level, correct)
+        if self._pending is not None:
+            self._pending[1] = correct if self._pending[1] is None else self._pending[1] and correct
+        return correct
+
+    def select_question(self, questions: Sequence[Any]) -> Any:
+        """
+        Picks the next question: the scheduler's most overdue item when bound, otherwise a random one.
+        The previous question is reviewed first, as correct only if all of its graded steps were.
+        `questions` is usually a mode's module-level QUESTIONS tuple of NamedTuple records, built
+        once per process and shared by every session since the records are immutable.
+        """
+        self.finish_question()
+        if self.scheduler is None:
+            return random.choice(questions)
+        self.scheduler.ensure(self.mode_id, len(questions))
+        index = self.scheduler.next_index(self.mode_id)
+        self._pending = [index, None]
+        return questions[index]
+
+    def finish_question(self) -> None:
+        """Reports the current question to the scheduler, unless no step of it was graded."""
+        if self._pending is not None and self._pending[1] is not None:
+            self.scheduler.review(self.mode_id, self._pending[0], self._pending[1])
+        self._pending = None
         
     @abstractmethod
     def run_round(self) -> bool:
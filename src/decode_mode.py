@@ -1,23 +1,44 @@
 import random
 import math
+from typing import Optional
+import src.engine as engine
 from src.base_mode import BaseMode
+from src.derivation import derive, render_text
 from src.engine import (
     FLOAT32, FLOAT64, IEEEPresets,
-    float_to_bin32, float_to_bin64, extract_fields,
     bin32_to_float, bin64_to_float
 )
+from src.permutation import PermutationSampler
+from src.question_bank import QuestionBank
+from src.result_cache import CachedEngine
 from src.ui import prompt_input, clear_screen, UserQuitException
 
 class DecodeMode(BaseMode):
     """Handles Mode 2 (32-bit) and Mode 4 (64-bit) Decoding."""
     
-    def __init__(self, is_64_bit: bool = False):
+    def __init__(self, is_64_bit: bool = False, cache: Optional[CachedEngine] = None,
+                 bank: Optional[QuestionBank] = None):
         super().__init__()
         self.preset = FLOAT64 if is_64_bit else FLOAT32
         self.is_64_bit = is_64_bit
+        # Conversions go through the shared result cache when one is passed in (opt-in, see src/result_cache.py)
+        self.cache = cache
+        # Questions and their ground truth come from a precompiled bank when one is passed in
+        # (opt-in, see src/question_bank.py), walked in a repeat-free permutation order
+        if bank is not None and bank.preset != self.preset:
+            raise ValueError(f"{bank.path} holds {bank.preset.total_bits}-bit questions.")
+        self.bank = bank
+        self._bank_order = PermutationSampler(len(bank)) if bank is not None else None
+        self.question = None
         self.mode_name = "64-bit Decoding" if is_64_bit else "32-bit Decoding"
 
     def _generate_target(self) -> float:
+        if self.bank is not None:
+            self.question = self.bank[next(self._bank_order)]
+            return engine.bits_to_float(self.question.bits, self.preset)
+        if self.difficulty is not None:
+            self.level, value = self.difficulty.draw(self.mode_id, self.preset)
+            return value
         sign = random.choice([-1, 1])
         base = random.randint(1, 100)
         frac = random.choice([0.0, 0.25, 0.5, 0.75, 0.125])
@@ -26,12 +47,18 @@ class DecodeMode(BaseMode):
     def run_round(self) -> bool:
         target_val = self._generate_target()
         
-        if self.is_64_bit:
-            binary_str = float_to_bin64(target_val)
+        convert = self.cache if self.cache is not None else engine
+        question = self.question if self.bank is not None else None
+        if question is not None:
+            # The bank already holds the ground truth, so nothing is recomputed
+            binary_str = f"{question.bits:0{self.preset.total_bits}b}"
+            gt_s, gt_e, gt_f = question.sign, question.exponent, question.fraction
         else:
-            binary_str = float_to_bin32(target_val)
-            
-        gt_s, gt_e, gt_f = extract_fields(binary_str, self.preset)
+            if self.is_64_bit:
+                binary_str = convert.float_to_bin64(target_val)
+            else:
+                binary_str = convert.float_to_bin32(target_val)
+            gt_s, gt_e, gt_f = convert.extract_fields(binary_str, self.preset)
         
         try:
             clear_screen()
@@ -44,7 +71,7 @@ class DecodeMode(BaseMode):
             print("Step 1: Extract Bits")
             print("Enter the sign bit (s):")
             ans_s = prompt_input("")
-            if ans_s == str(gt_s):
+            if self.record_attempt("sign", ans_s == str(gt_s)):
                 print(f"Correct. ({'Negative' if gt_s == 1 else 'Positive'})\n")
             else:
                 print(f"Incorrect. The sign is 1 for negative and 0 for positive, so s = {gt_s}.\n")
@@ -53,7 +80,7 @@ class DecodeMode(BaseMode):
             gt_e_bin = f"{gt_e:0{self.preset.e_bits}b}"
             print(f"Enter the exponent sequence:")
             ans_e = prompt_input("")
-            if ans_e == gt_e_bin:
+            if self.record_attempt("exponent", ans_e == gt_e_bin):
                 print("Correct.\n")
             else:
                 print(f"Incorrect. The exponent is the {self.preset.e_bits} bits following the sign bit: {gt_e_bin}.\n")
@@ -69,12 +96,15 @@ class DecodeMode(BaseMode):
                 except ValueError:
                     print("Please enter a valid integer.")
             
-            if int_ans_e == gt_e:
+            if self.record_attempt("biased_exponent", int_ans_e == gt_e):
                 print("Correct.\n")
             else:
                 print(f"Incorrect. The decimal value of the binary sequence {gt_e_bin} is {gt_e}.\n")
 
-            unbiased_e = gt_e - self.preset.bias
+            # A zero exponent field marks a subnormal: its true exponent is fixed at 1 - bias and its leading bit is 0
+            subnormal = gt_e == 0
+            unbiased_e = 1 - self.preset.bias if subnormal else gt_e - self.preset.bias
+            lead = 0 if subnormal else 1
             print(f"Enter the unbiased true exponent:")
             while True:
                 ans_ue = prompt_input("")
@@ -84,33 +114,42 @@ class DecodeMode(BaseMode):
                 except ValueError:
                     print("Please enter a valid integer.")
             
-            if int_ans_ue == unbiased_e:
+            if self.record_attempt("unbiased_exponent", int_ans_ue == unbiased_e):
                 print(f"Correct. (True Exponent = {unbiased_e})\n")
+            elif subnormal:
+                print(f"Incorrect. An all-zero exponent marks a subnormal, whose true exponent is fixed at 1 - bias ({self.preset.bias}) = {unbiased_e}.\n")
             else:
                 print(f"Incorrect. True exponent is biased exponent - bias ({self.preset.bias}), so {gt_e} - {self.preset.bias} = {unbiased_e}.\n")
                 
             # Step 3: Final Value
             print("Step 3: Final Value")
             print("Enter the implicit leading bit:")
-            # For this simple mock we assume normalized, meaning e != 0.
-            # Real logic would check if it's subnormal, but our _generate_target avoids them.
             ans_lead = prompt_input("")
-            if ans_lead == "1":
-                print("Correct. (Normalized value)\n")
+            if self.record_attempt("leading_bit", ans_lead == str(lead)):
+                print(f"Correct. ({'Subnormal' if subnormal else 'Normalized'} value)\n")
+            elif subnormal:
+                print("Incorrect. The exponent is all zeros, so it is subnormal, thus 0.\n")
             else:
                 print("Incorrect. It is normalized, thus 1.\n")
                 
             print("Enter the final decimal value:")
             ans_dec = prompt_input("")
             try:
-                if math.isclose(float(ans_dec), target_val, rel_tol=1e-5):
+                value_correct = self.record_attempt("value", math.isclose(float(ans_dec), target_val, rel_tol=1e-5))
+                if value_correct:
                     print("Correct.\n")
                 else:
-                    print(f"Incorrect. The value is (-1)^sign * (1 + fraction) * 2^(true exponent), so (-1)^{gt_s} * (1 + {gt_f / (2**self.preset.f_bits)}) * 2^{unbiased_e} = {target_val}.\n")
+                    print(f"Incorrect. The value is (-1)^sign * ({lead} + fraction) * 2^(true exponent), so (-1)^{gt_s} * ({lead} + {gt_f / (2**self.preset.f_bits)}) * 2^{unbiased_e} = {target_val}.\n")
             except ValueError:
-                print(f"Incorrect format. The value is (-1)^sign * (1 + fraction) * 2^(true exponent), so {target_val}.\n")
+                value_correct = self.record_attempt("value", False)
+                print(f"Incorrect format. The value is (-1)^sign * ({lead} + fraction) * 2^(true exponent), so {target_val}.\n")
+            if not value_correct:
+                # Read bottom-up, the (cached) encoding derivation shows where every field comes from
+                print("Worked derivation:")
+                for line in render_text(derive(target_val, self.preset)):
+                    print(line)
+                print("")
 
-            
             prompt_input("Press Enter to continue.")
             
             return True
@@ -1,56 +1,106 @@
-import random
+import os
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple
 from src.base_mode import BaseMode
 from src.ui import prompt_input, clear_screen, UserQuitException
+from src.engine import FLOAT32, extract_bit_fields
+from src.problem_generator import DENORMALS_SPECS, MODEL_CACHE_PATH, ModelCache
+
+class DenormalsQuestion(NamedTuple):
+    """A Mode 7 sequence with its type (N, D or S), the reason, leading bit and true exponent."""
+    seq: str
+    type: str
+    reason: str
+    lead: str
+    bias_exp: str
+
+QUESTIONS: Tuple[DenormalsQuestion, ...] = (
+    DenormalsQuestion(
+        seq="00000000011000000000000000000000",
+        type="D",
+        reason="The exponent is all 0s and fraction is non-zero.",
+        lead="0",
+        bias_exp="-126" # 1 - 127
+    ),
+    DenormalsQuestion(
+        seq="01000000011000000000000000000000",
+        type="N",
+        reason="The exponent is neither all 0s nor all 1s.",
+        lead="1",
+        bias_exp="1" # 128 - 127
+    ),
+    DenormalsQuestion(
+        seq="01111111100000000000000000000000",
+        type="S",
+        reason="The exponent is all 1s and the fraction is all 0s (+INF).",
+        lead="None",
+        bias_exp="N/A"
+    ),
+)
+
+def _cached_questions(cache: ModelCache, per_spec: int = 16) -> List[DenormalsQuestion]:
+    """Builds question entries from cached FLOAT32 models; returns [] when the cache is cold."""
+    e_all_ones = (1 << FLOAT32.e_bits) - 1
+    questions = []
+    for spec in DENORMALS_SPECS:
+        for bits in cache.get(spec)[:per_spec]:
+            s, e, f = extract_bit_fields(bits, FLOAT32)
+            seq = f"{bits:032b}"
+            if e == 0:
+                questions.append(DenormalsQuestion(seq, "D", "The exponent is all 0s and fraction is non-zero.",
+                                                   "0", str(1 - FLOAT32.bias)))
+            elif e == e_all_ones:
+                reason = (f"The exponent is all 1s and the fraction is all 0s ({'-' if s else '+'}INF)." if f == 0
+                          else "The exponent is all 1s and the fraction is non-zero (NaN).")
+                questions.append(DenormalsQuestion(seq, "S", reason, "None", "N/A"))
+            else:
+                questions.append(DenormalsQuestion(seq, "N", "The exponent is neither all 0s nor all 1s.",
+                                                   "1", str(e - FLOAT32.bias)))
+    return questions
+
+def _model_cache_stamp() -> Optional[Tuple[int, int]]:
+    """(mtime, size) of the model cache file, or None without one; changes whenever the cache is rewritten."""
+    try:
+        stat = os.stat(MODEL_CACHE_PATH)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+@lru_cache(maxsize=1)
+def _question_bank(stamp: Optional[Tuple[int, int]] = None) -> Tuple[DenormalsQuestion, ...]:
+    """
+    The static questions plus the solver-generated drills, read from the model cache only
+    (warm it with tools/generate_problems.py). Loaded once per `stamp` (see _model_cache_stamp),
+    not on every mode entry, so warming the cache while the tutor runs reaches the next entry.
+    """
+    return QUESTIONS + tuple(_cached_questions(ModelCache()))
 
 class DenormalsMode(BaseMode):
     """Handles Mode 7: Subnormals (Normalized vs Denormalized)."""
     
     def __init__(self):
         super().__init__()
-
-        self.questions = [
-            {
-                "seq": "00000000011000000000000000000000",
-                "type": "D",
-                "reason": "The exponent is all 0s and fraction is non-zero.",
-                "lead": "0",
-                "bias_exp": "-126" # 1 - 127
-            },
-            {
-                "seq": "01000000011000000000000000000000",
-                "type": "N",
-                "reason": "The exponent is neither all 0s nor all 1s.",
-                "lead": "1",
-                "bias_exp": "1" # 128 - 127
-            },
-            {
-                "seq": "01111111100000000000000000000000",
-                "type": "S",
-                "reason": "The exponent is all 1s and the fraction is all 0s (+INF).",
-                "lead": "None",
-                "bias_exp": "N/A"
-            }
-        ]
+        self.questions = _question_bank(_model_cache_stamp())
 
     def run_round(self) -> bool:
-        target = random.choice(self.questions)
+        target = self.select_question(self.questions)
         
         try:
             clear_screen()
             print("-" * 60)
             print("MODE 7: Subnormals")
             print("-" * 60)
-            print(f"Analyze the sequence: {target['seq']}\n")
+            print(f"Analyze the sequence: {target.seq}\n")
             
             # Step 1: Type
             print("Enter the value type ('N' for Normalized, 'D' for Denormalized, or 'S' for Special Case):")
             ans_type = prompt_input("").strip().upper()
-            if ans_type == target['type']:
-                print(f"Correct. {target['reason']}\n")
+            if self.record_attempt("type", ans_type == target.type):
+                print(f"Correct. {target.reason}\n")
             else:
-                print(f"Incorrect. It is type '{target['type']}'. {target['reason']}\n")
+                print(f"Incorrect. It is type '{target.type}'. {target.reason}\n")
             
-            if target['type'] == 'S':
+            if target.type == 'S':
                 # Special cases don't ask about leading bit or unbiased exponent generally.
                 prompt_input("Press Enter to continue.")
                 return
@@ -58,13 +108,13 @@ class DenormalsMode(BaseMode):
             # Step 2: Leading Bit
             print("Enter the implicit leading bit:")
             ans_lead = prompt_input("").strip()
-            if ans_lead == target['lead']:
+            if self.record_attempt("leading_bit", ans_lead == target.lead):
                 if ans_lead == "0":
                     print("Correct. Denormalized values have an implicit leading 0.\n")
                 else:
                     print("Correct. Normalized values have an implicit leading 1.\n")
             else:
-                if target['lead'] == "0":
+                if target.lead == "0":
                     print("Incorrect. Denormalized values have an implicit leading 0 because their exponent is minimum (0).\n")
                 else:
                     print("Incorrect. Normalized values have an implicit leading 1 per the IEEE 754 standard.\n")
@@ -72,13 +122,13 @@ class DenormalsMode(BaseMode):
             # Step 3: Unbiased Exponent
             print("Enter the true (unbiased) exponent:")
             ans_exp = prompt_input("").strip()
-            if ans_exp == target['bias_exp']:
+            if self.record_attempt("exponent", ans_exp == target.bias_exp):
                 print("Correct.\n")
             else:
-                if target['type'] == 'D':
-                    print(f"Incorrect. Subnormals have a fixed true exponent of 1 - bias (127), so 1 - 127 = {target['bias_exp']}.\n")
+                if target.type == 'D':
+                    print(f"Incorrect. Subnormals have a fixed true exponent of 1 - bias (127), so 1 - 127 = {target.bias_exp}.\n")
                 else:
-                    print(f"Incorrect. Normalized true exponent is biased exponent - bias (127), resulting in {target['bias_exp']}.\n")
+                    print(f"Incorrect. Normalized true exponent is biased exponent - bias (127), resulting in {target.bias_exp}.\n")
             
             
             prompt_input("Press Enter to continue.")
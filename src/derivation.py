@@ -0,0 +1,173 @@
+"""
+Worked derivations of how a value is stored in a preset: sign, binary expansion,
+normalization shift, rounding, biased exponent and fraction, as structured one-sentence
+steps that every front end renders its own way (render_text for the terminal and curses
+screens, as_dict for the HTTP API). Derivations use exact integer arithmetic and are kept
+in a shared BoundedCache keyed on the preset layout and the input's float64 bits, so a
+repeated value costs one lookup after the first time.
+"""
+import math
+import re
+from functools import partial
+from typing import List, NamedTuple, Tuple
+
+from src.engine import _DOUBLE, IEEEPresets, bits_to_float, bits_to_hex, exact_decimal, float_to_bits
+from src.result_cache import BoundedCache, CacheStats, _layout
+
+DERIVATION_CACHE_SIZE = 4096
+# Longer runs of zeros are elided from binary expansions (a float64 can span over 1000 places)
+MAX_ZERO_RUN = 12
+_ZERO_RUN = re.compile("0{%d,}" % (MAX_ZERO_RUN + 1))
+STEP_TITLES = {
+    "sign": "Sign", "special": "Special value", "binary": "Binary expansion", "normalize": "Normalization",
+    "round": "Rounding", "bias": "Biased exponent", "fraction": "Fraction", "result": "Result",
+}
+
+class DerivationStep(NamedTuple):
+    """One step: `text` is a single sentence and `result` the step's answer (e.g. '01111011')."""
+    name: str
+    title: str
+    text: str
+    result: str
+
+class Derivation(NamedTuple):
+    value: float
+    preset: IEEEPresets
+    bits: int
+    steps: Tuple[DerivationStep, ...]
+
+    def step(self, name: str) -> DerivationStep:
+        for step in self.steps:
+            if step.name == name:
+                return step
+        raise KeyError(f"The derivation of {self.value!r} has no '{name}' step.")
+
+_cache = BoundedCache(DERIVATION_CACHE_SIZE)
+
+def _step(name: str, text: str, result: str) -> DerivationStep:
+    return DerivationStep(name, STEP_TITLES[name], text, result)
+
+def _elide(match: "re.Match") -> str:
+    return f"0[{len(match.group()) - 2} zeros]0"
+
+def _binary(num: int, places: int) -> str:
+    """Positional binary expansion of num / 2^places, with long runs of zeros elided."""
+    text = bin(num >> places)[2:]
+    rest = num & ((1 << places) - 1)
+    if rest:
+        text += "." + format(rest, f"0{places}b").rstrip("0")
+    return _ZERO_RUN.sub(_elide, text)
+
+def _shift(k: int) -> str:
+    if k == 0:
+        return "The binary point is already after the leading 1, which"
+    return f"Moving the binary point {abs(k)} place{'s' if abs(k) != 1 else ''} {'left' if k > 0 else 'right'}"
+
+def _result(bits: int, preset: IEEEPresets) -> DerivationStep:
+    pattern = f"{bits:0{preset.total_bits}b}"
+    return _step("result", f"The stored pattern is {pattern}, exactly {exact_decimal(bits, preset)}.", pattern)
+
+def _overflow(reason: str, preset: IEEEPresets) -> List[DerivationStep]:
+    """Exponent and fraction steps of a finite value too large for `preset`; `reason` starts the exponent sentence."""
+    return [_step("bias", f"{reason}, so the value overflows to infinity, which stores an all-ones exponent.", "1" * preset.e_bits),
+            _step("fraction", f"Infinity stores an all-zero fraction: {0:0{preset.f_bits}b}.", f"{0:0{preset.f_bits}b}")]
+
+def _derive(value: float, preset: IEEEPresets) -> Derivation:
+    """Builds the derivation; derive() caches it."""
+    bits = float_to_bits(value, preset)
+    sign = 1 if math.copysign(1.0, value) < 0 else 0
+    steps = [_step("sign", f"The value is {'negative' if sign else 'positive'}, so the sign bit is {sign}.", str(sign))]
+    if math.isnan(value) or math.isinf(value) or value == 0:
+        kind = "NaN" if math.isnan(value) else ("Infinity" if math.isinf(value) else "Zero")
+        fields = {"NaN": "an all-ones exponent and a nonzero fraction", "Infinity": "an all-ones exponent and a zero fraction",
+                  "Zero": "an all-zero exponent and fraction"}[kind]
+        steps += [_step("special", f"{kind} is stored with {fields}.", kind.lower()), _result(bits, preset)]
+        return Derivation(value, preset, bits, tuple(steps))
+
+    # |value| = num / 2^places exactly, with a true exponent of k
+    num, den = abs(value).as_integer_ratio()
+    places = den.bit_length() - 1
+    k = num.bit_length() - 1 - places
+    emin = 1 - preset.bias
+    digits = bin(num)[3:].rstrip("0")
+    normalized = "1." + _ZERO_RUN.sub(_elide, digits) if digits else "1"
+    steps.append(_step("binary", f"In binary, |{value!r}| = {_binary(num, places)}.", _binary(num, places)))
+
+    f_bits, e_max = preset.f_bits, (1 << preset.e_bits) - 1
+    if k > preset.bias:
+        steps.append(_step("normalize", f"{_shift(k)} gives {normalized} x 2^{k}, so the true exponent is {k}.", str(k)))
+        steps += _overflow(f"The true exponent {k} exceeds the maximum {preset.bias}", preset)
+        steps.append(_result(bits, preset))
+        return Derivation(value, preset, bits, tuple(steps))
+    subnormal = k < emin
+    if subnormal:
+        # Subnormal: the fraction holds the bits after the point of 0.f x 2^emin
+        fraction_digits = "0" * (emin - k - 1) + bin(num)[2:].rstrip("0")
+        shown = _ZERO_RUN.sub(_elide, fraction_digits)
+        steps.append(_step("normalize", f"{_shift(k)} gives {normalized} x 2^{k}, which as a subnormal is 0.{shown} x 2^{emin}.",
+                           str(emin)))
+    else:
+        fraction_digits = digits
+        steps.append(_step("normalize", f"{_shift(k)} gives {normalized} x 2^{k}, so the true exponent is {k}.", str(k)))
+
+    # Rounding comes before the exponent, since a carry out of the fraction changes it
+    exponent = emin if subnormal else k
+    if len(fraction_digits) <= f_bits:
+        steps.append(_step("round", f"All {len(fraction_digits)} fraction bits fit in the {f_bits}-bit field, so no rounding is needed.",
+                           "exact"))
+        fraction = int(fraction_digits.ljust(f_bits, "0"), 2)
+    else:
+        kept = fraction_digits[:f_bits]
+        guard, round_bit = fraction_digits[f_bits], fraction_digits[f_bits + 1:f_bits + 2] or "0"
+        sticky = "1" if "1" in fraction_digits[f_bits + 2:] else "0"
+        up = guard == "1" and "1" in (round_bit, sticky, kept[-1])
+        fraction = int(kept, 2) + up
+        carry = ""
+        if fraction >> f_bits:
+            fraction = 0
+            if subnormal:
+                subnormal = False
+                carry = f", and the carry makes it the smallest normal number, 1.0 x 2^{emin}"
+            else:
+                exponent += 1
+                carry = f", and the carry renormalizes it to 1.0 x 2^{exponent}"
+        steps.append(_step("round", f"Only {f_bits} of the {len(fraction_digits)} fraction bits fit, and with guard bit {guard}, "
+                                    f"round bit {round_bit} and sticky bit {sticky}, Round to Nearest, Ties to Even "
+                                    f"{'rounds up' if up else 'truncates'}{carry}.", "up" if up else "down"))
+
+    if exponent > preset.bias:
+        steps += _overflow(f"The rounded exponent {exponent} exceeds the maximum {preset.bias}", preset)
+        steps.append(_result(bits, preset))
+        return Derivation(value, preset, bits, tuple(steps))
+    if subnormal:
+        steps.append(_step("bias", f"The true exponent {k} is below the minimum {emin}, so the value is subnormal "
+                                   f"and stores an all-zero exponent, {0:0{preset.e_bits}b}.", f"{0:0{preset.e_bits}b}"))
+    else:
+        biased = exponent + preset.bias
+        steps.append(_step("bias", f"The biased exponent is true exponent + bias ({preset.bias}), so {exponent} + {preset.bias} = {biased}, "
+                                   f"or {biased:0{preset.e_bits}b} in binary.", f"{biased:0{preset.e_bits}b}"))
+    form = f"0.f x 2^{emin}" if subnormal else "1.f"
+    steps.append(_step("fraction", f"The fraction field holds the bits after the binary point of {form}, padded to "
+                                   f"{f_bits} bits: {fraction:0{f_bits}b}.", f"{fraction:0{f_bits}b}"))
+    steps.append(_result(bits, preset))
+    return Derivation(value, preset, bits, tuple(steps))
+
+def derive(value: float, preset: IEEEPresets) -> Derivation:
+    """The worked derivation of storing `value` in `preset`, cached per (preset, float64 bits of value)."""
+    return _cache.get_or_compute((_layout(preset), _DOUBLE.pack(value)), partial(_derive, value, preset))
+
+def derive_bits(bits: int, preset: IEEEPresets) -> Derivation:
+    """The derivation of the value a pattern of `preset` holds."""
+    return derive(bits_to_float(bits, preset), preset)
+
+def cache_stats() -> CacheStats:
+    return _cache.stats()
+
+def render_text(derivation: Derivation) -> List[str]:
+    """Numbered lines for the terminal and curses front ends."""
+    return [f"{i}. {step.title}: {step.text}" for i, step in enumerate(derivation.steps, 1)]
+
+def as_dict(derivation: Derivation) -> dict:
+    """JSON-ready form for the HTTP API."""
+    return {"value": repr(derivation.value), "bits": bits_to_hex(derivation.bits, derivation.preset),
+            "steps": [step._asdict() for step in derivation.steps]}
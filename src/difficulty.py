@@ -0,0 +1,115 @@
+"""
+Adaptive difficulty for the generated encode/decode rounds (modes 1 to 4). A fixed
+ladder of levels widens the exponent spread, lengthens the fraction and mixes in
+subnormals; the top level spans the preset's whole range, so the 64-bit modes reach
+much further than the 32-bit ones. Every graded step is an Elo match between the
+learner's per-mode rating and the level it was asked at, and the next level is the
+one the learner is expected to answer TARGET_SUCCESS of the time. Both the update
+and the level choice are O(1). Normal values are drawn through one PermutationSampler
+per mode and level, so a level's values do not repeat until all of them were asked.
+"""
+import math
+import random
+from typing import Dict, NamedTuple, Tuple
+
+from src.engine import IEEEPresets, bits_to_float
+from src.permutation import PermutationSampler
+
+INITIAL_RATING = 1000.0
+K_FACTOR = 16.0
+# Share of steps the learner should answer correctly at the chosen level
+TARGET_SUCCESS = 0.75
+# Level i is rated LEVEL_BASE + i * LEVEL_STEP
+LEVEL_BASE = 800.0
+LEVEL_STEP = 150.0
+
+class Level(NamedTuple):
+    """One rung of the ladder; exponents are true exponents, clamped to the preset's normal range."""
+    min_exponent: int
+    max_exponent: int
+    fraction_bits: int  # significant bits after the binary point
+    subnormal_rate: float
+
+LEVELS = (
+    Level(0, 6, 3, 0.0),  # close to the fixed generators: 1 to 120 with three fraction bits
+    Level(-4, 8, 6, 0.0),
+    Level(-10, 12, 10, 0.0),
+    Level(-30, 30, 16, 0.05),
+    Level(-126, 127, 23, 0.15),
+    Level(-1022, 1023, 52, 0.25),
+)
+
+def level_rating(level: int) -> float:
+    return LEVEL_BASE + level * LEVEL_STEP
+
+def expected_score(rating: float, level: int) -> float:
+    """Elo expectation that a learner rated `rating` answers a step at `level` correctly."""
+    return 1.0 / (1.0 + 10.0 ** ((level_rating(level) - rating) / 400.0))
+
+def _exponent_range(level: Level, preset: IEEEPresets) -> Tuple[int, int]:
+    return max(level.min_exponent, 1 - preset.bias), min(level.max_exponent, preset.bias)
+
+def normal_count(level: Level, preset: IEEEPresets) -> int:
+    """Number of distinct normal values of `level` (both signs, every exponent, every short fraction)."""
+    lo, hi = _exponent_range(level, preset)
+    return 2 * (hi - lo + 1) << min(level.fraction_bits, preset.f_bits)
+
+def normal_pattern(index: int, level: Level, preset: IEEEPresets) -> int:
+    """The `index`-th normal bit pattern of `level`: sign, then fraction digits, then exponent."""
+    width = min(level.fraction_bits, preset.f_bits)
+    lo, _ = _exponent_range(level, preset)
+    sign, rest = index & 1, index >> 1
+    e = lo + (rest >> width) + preset.bias
+    f = (rest & ((1 << width) - 1)) << (preset.f_bits - width)
+    return (sign << (preset.total_bits - 1)) | (e << preset.f_bits) | f
+
+def subnormal_pattern(level: Level, preset: IEEEPresets, rng=random) -> int:
+    """A random subnormal whose significant bits (first and last set) sit anywhere in the fraction field."""
+    width = max(1, min(level.fraction_bits, preset.f_bits))
+    digits = rng.getrandbits(width) | 1 | (1 << (width - 1))
+    f = digits << rng.randint(0, preset.f_bits - width)
+    return (rng.getrandbits(1) << (preset.total_bits - 1)) | f
+
+def generate_value(level: Level, preset: IEEEPresets, rng=random) -> float:
+    """A random finite nonzero value of `preset` with the exponent spread and fraction length of `level`."""
+    if level.subnormal_rate and rng.random() < level.subnormal_rate:
+        return bits_to_float(subnormal_pattern(level, preset, rng), preset)
+    return bits_to_float(normal_pattern(rng.randrange(normal_count(level, preset)), level, preset), preset)
+
+class DifficultyModel:
+    """Per-mode Elo ratings of the learner against the fixed ratings of LEVELS."""
+
+    def __init__(self, k_factor: float = K_FACTOR, target: float = TARGET_SUCCESS,
+                 initial: float = INITIAL_RATING):
+        self.k_factor = k_factor
+        self.initial = initial
+        # The level rated this far below the learner is answered with probability `target`
+        self._margin = 400.0 * math.log10(target / (1.0 - target))
+        self._ratings: Dict[int, float] = {}
+        self._samplers: Dict[Tuple[int, int], PermutationSampler] = {}
+
+    def rating(self, mode_id: int) -> float:
+        return self._ratings.get(mode_id, self.initial)
+
+    def level(self, mode_id: int) -> int:
+        """Index in LEVELS of the level closest to the target success rate."""
+        index = round((self.rating(mode_id) - self._margin - LEVEL_BASE) / LEVEL_STEP)
+        return min(max(index, 0), len(LEVELS) - 1)
+
+    def update(self, mode_id: int, level: int, correct: bool) -> float:
+        """Scores one graded step at `level` and returns the learner's new rating."""
+        rating = self.rating(mode_id)
+        rating += self.k_factor * ((1.0 if correct else 0.0) - expected_score(rating, level))
+        self._ratings[mode_id] = rating
+        return rating
+
+    def draw(self, mode_id: int, preset: IEEEPresets, rng=random) -> Tuple[int, float]:
+        """(level, value) of the next generated question of `mode_id`; normal values repeat only after a full pass."""
+        index = self.level(mode_id)
+        level = LEVELS[index]
+        if level.subnormal_rate and rng.random() < level.subnormal_rate:
+            return index, bits_to_float(subnormal_pattern(level, preset, rng), preset)
+        sampler = self._samplers.get((mode_id, index))
+        if sampler is None:
+            sampler = self._samplers[(mode_id, index)] = PermutationSampler(normal_count(level, preset), rng)
+        return index, bits_to_float(normal_pattern(next(sampler), level, preset), preset)
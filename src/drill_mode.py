@@ -0,0 +1,161 @@
+"""
+Mode 10: timed drill. Rapid single-answer questions from the encode, decode and
+classify generators are chained under a time budget; every answer is timed with
+time.perf_counter_ns, and each drill ends with questions/minute, accuracy and
+latency percentiles. Answers are graded into the progress store like any mode,
+and the finished drill is logged there as well (ProgressStore.record_drill).
+Classify patterns are walked in keyed permutation order, so none repeats before its class runs out.
+While a transcript is recorded or replayed the drill runs on the session clock of the
+input source instead, so a replay ends every drill after the same answer as the recording.
+"""
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, NamedTuple, Optional
+
+from src.base_mode import BaseMode
+from src.decode_mode import DecodeMode
+from src.encode_mode import EncodeMode
+from src.engine import FLOAT32, classify_bits, extract_bit_fields, float_to_bits
+from src.permutation import PermutationSampler, class_pattern, class_size
+from src.ui import get_input_source, prompt_input, clear_screen, UserQuitException
+
+DEFAULT_TIME_BUDGET = 60.0  # seconds per drill
+CLASS_NAMES = ("zero", "subnormal", "normal", "inf", "nan")
+PERCENTILES = (50, 90, 99)
+
+def _session_clock() -> Callable[[], int]:
+    """A nanosecond clock: the input source's session clock (in seconds) when it has one, else perf_counter_ns."""
+    source = get_input_source()
+    if source is None or not hasattr(source, "clock"):
+        return time.perf_counter_ns
+    return lambda: round(source.clock() * 1e9)
+
+class DrillQuestion(NamedTuple):
+    """One drill question; `kind` is also the step name graded in the progress store."""
+    kind: str
+    text: str
+    expected: str
+
+@dataclass
+class DrillResult:
+    """Answers of one drill: per-answer latencies in nanoseconds and the drill's wall time."""
+    latencies_ns: List[int] = field(default_factory=list)
+    correct: int = 0
+    elapsed_ns: int = 0
+
+    @property
+    def questions(self) -> int:
+        return len(self.latencies_ns)
+
+    @property
+    def per_minute(self) -> float:
+        return 60e9 * self.questions / self.elapsed_ns if self.elapsed_ns else 0.0
+
+    @property
+    def accuracy(self) -> float:
+        return 100.0 * self.correct / self.questions if self.questions else 0.0
+
+    def percentile_ns(self, p: float) -> int:
+        """Nearest-rank percentile of the answer latencies."""
+        if not self.latencies_ns:
+            return 0
+        ordered = sorted(self.latencies_ns)
+        return ordered[min(len(ordered), max(1, math.ceil(p / 100 * len(ordered)))) - 1]
+
+def is_correct(question: DrillQuestion, answer: str) -> bool:
+    """Exact match, except that a class may be given by any unambiguous prefix ('sub', 'i', 'na')."""
+    answer = answer.strip().lower()
+    if question.kind != "classify":
+        return answer == question.expected
+    matches = [name for name in CLASS_NAMES if answer and name.startswith(answer)]
+    return matches == [question.expected]
+
+class DrillMode(BaseMode):
+    """Handles Mode 10: Timed Drill."""
+
+    def __init__(self, time_budget: float = DEFAULT_TIME_BUDGET, clock: Optional[Callable[[], int]] = None):
+        super().__init__()
+        self.preset = FLOAT32
+        self.time_budget_ns = int(time_budget * 1e9)
+        # None picks the session clock when each drill starts (the input source may change after construction)
+        self.clock = clock
+        # The drill reuses the value generators of the encoding and decoding modes
+        self._encode = EncodeMode()
+        self._decode = DecodeMode()
+        self.generators = (self._encode_question, self._decode_question, self._classify_question)
+        # One repeat-free walk over every pattern of each class (e.g. all 2^24 - 2 float32 subnormals)
+        self._patterns = {name: PermutationSampler(class_size(name, self.preset)) for name in CLASS_NAMES}
+
+    def _encode_question(self) -> DrillQuestion:
+        value = self._encode._generate_target()
+        _, e, _ = extract_bit_fields(float_to_bits(value, self.preset), self.preset)
+        return DrillQuestion("encode", f"Biased exponent of {value} (8 bits)?", f"{e:08b}")
+
+    def _decode_question(self) -> DrillQuestion:
+        bits = float_to_bits(self._decode._generate_target(), self.preset)
+        _, e, _ = extract_bit_fields(bits, self.preset)
+        return DrillQuestion("decode", f"True exponent of {bits:032b}?", str(e - self.preset.bias))
+
+    def _classify_question(self) -> DrillQuestion:
+        kind = random.choice(CLASS_NAMES)
+        bits = class_pattern(kind, next(self._patterns[kind]), self.preset)
+        return DrillQuestion("classify", f"Class of {bits:032b}? (zero/subnormal/normal/inf/nan)",
+                             classify_bits(bits, self.preset))
+
+    def next_question(self) -> DrillQuestion:
+        return random.choice(self.generators)()
+
+    def run_round(self) -> bool:
+        """One drill: questions until the time budget is spent, then the summary."""
+        result = DrillResult()
+        try:
+            clear_screen()
+            print("-" * 60)
+            print("MODE 10: Timed Drill")
+            print("-" * 60)
+            print(f"Answer as many questions as you can in {self.time_budget_ns / 1e9:g} seconds.")
+            print("Classes may be abbreviated (e.g. 'sub', 'i', 'na').\n")
+            prompt_input("Press Enter to start.")
+
+            clock = self.clock if self.clock is not None else _session_clock()
+            start = clock()
+            while clock() - start < self.time_budget_ns:
+                question = self.next_question()
+                print(question.text)
+                shown = clock()
+                answer = prompt_input("")
+                answered = clock()
+                result.latencies_ns.append(answered - shown)
+                result.elapsed_ns = answered - start
+                if self.record_attempt(question.kind, is_correct(question, answer)):
+                    result.correct += 1
+                    print(f"Correct. ({(answered - shown) / 1e9:.2f} s)\n")
+                else:
+                    print(f"Incorrect. The answer is {question.expected}.\n")
+
+            self._report(result)
+            prompt_input("Press Enter to continue.")
+            return True
+        except UserQuitException:
+            # A drill cut short still reports (and records) the answers given so far
+            if result.questions:
+                self._report(result)
+            print("\nExiting mode context...\n")
+            return False
+
+    def _report(self, result: DrillResult) -> None:
+        """Prints the drill summary and logs the drill in the progress store when bound."""
+        if self.progress is not None and result.questions:
+            self.progress.record_drill(self.mode_id, result.questions, result.correct, result.elapsed_ns / 1e9)
+        latencies = " | ".join(f"p{p} {result.percentile_ns(p) / 1e9:.2f} s" for p in PERCENTILES)
+        print("Drill results:")
+        print(f"Questions:  {result.questions} in {result.elapsed_ns / 1e9:.1f} s")
+        print(f"Throughput: {result.per_minute:.1f} questions/minute")
+        print(f"Accuracy:   {result.accuracy:.1f}%")
+        print(f"Latency:    {latencies}")
+        totals = self.progress.drill_totals(self.mode_id) if self.progress is not None else None
+        if totals is not None:
+            print(f"Best:       {totals.best_per_minute:.1f} questions/minute over {totals.sessions} drill(s)")
+        print("")
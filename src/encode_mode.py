@@ -1,21 +1,40 @@
 import random
+from typing import Optional
+import src.engine as engine
 from src.base_mode import BaseMode
-from src.engine import (
-    FLOAT32, FLOAT64, IEEEPresets,
-    float_to_bin32, float_to_bin64, extract_fields
-)
+from src.derivation import derive, render_text
+from src.engine import FLOAT32, FLOAT64, IEEEPresets
+from src.permutation import PermutationSampler
+from src.question_bank import QuestionBank
+from src.result_cache import CachedEngine
 from src.ui import prompt_input, clear_screen, UserQuitException
 
 class EncodeMode(BaseMode):
     """Handles Mode 1 (32-bit) and Mode 3 (64-bit) Encoding."""
     
-    def __init__(self, is_64_bit: bool = False):
+    def __init__(self, is_64_bit: bool = False, cache: Optional[CachedEngine] = None,
+                 bank: Optional[QuestionBank] = None):
         super().__init__()
         self.preset = FLOAT64 if is_64_bit else FLOAT32
         self.is_64_bit = is_64_bit
+        # Conversions go through the shared result cache when one is passed in (opt-in, see src/result_cache.py)
+        self.cache = cache
+        # Questions and their ground truth come from a precompiled bank when one is passed in
+        # (opt-in, see src/question_bank.py), walked in a repeat-free permutation order
+        if bank is not None and bank.preset != self.preset:
+            raise ValueError(f"{bank.path} holds {bank.preset.total_bits}-bit questions.")
+        self.bank = bank
+        self._bank_order = PermutationSampler(len(bank)) if bank is not None else None
+        self.question = None
         self.mode_name = "64-bit Encoding" if is_64_bit else "32-bit Encoding"
 
     def _generate_target(self) -> float:
+        if self.bank is not None:
+            self.question = self.bank[next(self._bank_order)]
+            return engine.bits_to_float(self.question.bits, self.preset)
+        if self.difficulty is not None:
+            self.level, value = self.difficulty.draw(self.mode_id, self.preset)
+            return value
         # Generate a semi-random float that is nice to calculate manually.
         # e.g., +/- random integer or simple fraction
         sign = random.choice([-1, 1])
@@ -27,12 +46,18 @@ class EncodeMode(BaseMode):
         target_val = self._generate_target()
         
         # Calculate ground truth
-        if self.is_64_bit:
-            binary_str = float_to_bin64(target_val)
+        convert = self.cache if self.cache is not None else engine
+        question = self.question if self.bank is not None else None
+        if question is not None:
+            # The bank already holds the ground truth, so nothing is recomputed
+            binary_str = f"{question.bits:0{self.preset.total_bits}b}"
+            gt_s, gt_e, gt_f = question.sign, question.exponent, question.fraction
         else:
-            binary_str = float_to_bin32(target_val)
-            
-        gt_s, gt_e, gt_f = extract_fields(binary_str, self.preset)
+            if self.is_64_bit:
+                binary_str = convert.float_to_bin64(target_val)
+            else:
+                binary_str = convert.float_to_bin32(target_val)
+            gt_s, gt_e, gt_f = convert.extract_fields(binary_str, self.preset)
         
         # Prepare tracking variables
         steps_total = 3
@@ -49,11 +74,11 @@ class EncodeMode(BaseMode):
             print("Step 1: Determine the Sign Bit (s)")
             print("Enter the sign bit (s):")
             ans_s = prompt_input("")
-            if ans_s == str(gt_s):
+            if self.record_attempt("sign", ans_s == str(gt_s)):
                 print(f"Correct. s = {gt_s}\n")
                 steps_correct += 1
             else:
-                print(f"Incorrect. The sign is 1 for negative and 0 for positive, so s = {gt_s}.\n")
+                print(f"Incorrect. {derive(target_val, self.preset).step('sign').text}\n")
                 
             # Step 2: Exponent
             print("Step 2: Determine the Exponent (e)")
@@ -61,41 +86,43 @@ class EncodeMode(BaseMode):
             # We enforce unspaced binary sequences per mandates
             ans_e = prompt_input("")
             gt_e_bin = f"{gt_e:0{self.preset.e_bits}b}"
-            if ans_e == gt_e_bin:
+            if self.record_attempt("exponent", ans_e == gt_e_bin):
                 print(f"Correct. e = {gt_e_bin}\n")
                 steps_correct += 1
             else:
-                print(f"Incorrect. The biased exponent is true exponent + bias ({self.preset.bias}), so {gt_e - self.preset.bias} + {self.preset.bias} = {gt_e} ({gt_e_bin} in binary).\n")
+                print(f"Incorrect. {derive(target_val, self.preset).step('bias').text}\n")
                 
             # Step 3: Fraction
             print("Step 3: Determine the Fraction (f)")
             print(f"Enter the fraction in binary (pad with 0s):")
             ans_f = prompt_input("")
             gt_f_bin = f"{gt_f:0{self.preset.f_bits}b}"
-            if ans_f == gt_f_bin:
+            if self.record_attempt("fraction", ans_f == gt_f_bin):
                 print(f"Correct. f = {gt_f_bin}\n")
                 steps_correct += 1
             else:
-                print(f"Incorrect. The fraction represents the digits after the binary point of the normalized value: {gt_f_bin}.\n")
+                print(f"Incorrect. {derive(target_val, self.preset).step('fraction').text}\n")
                 
             # Final Results
             print("Results:")
             print(f"Sign:     {gt_s}")
             print(f"Exponent: {gt_e_bin}")
             print(f"Fraction: {gt_f_bin}")
-            print(f"Full Binary: {binary_str}\n")
-            
-                
+            print(f"Full Binary: {binary_str}")
+            exact = question.exact if question is not None else convert.exact_decimal(int(binary_str, 2), self.preset)
+            print(f"Exact Value: {exact}\n")
+            if steps_correct < steps_total:
+                # Derivations are cached per value, so the feedback above and this walkthrough share one
+                print("Worked derivation:")
+                for line in render_text(derive(target_val, self.preset)):
+                    print(line)
+                print("")
             
             prompt_input("Press Enter to continue.")
             
             return True
         except UserQuitException:
-            # We must record the attempted questions even if they quit mid-way?
-            # The spec says "preserving grades correctly up to that point."
-            # Actually, per the modes spec we just drop back to the main menu. 
-            # We already track dynamically but to keep it simple, we don't record sub-steps 
-            # unless they are completed, or we record as we go. We didn't call `record_attempt` 
-            # as we went above, so let's call it individually per step in the real implementation.
+            # Every graded step was recorded via record_attempt as it was answered,
+            # so grades up to this point are preserved when dropping back to the menu.
             print("\nExiting mode context...\n")
             return False
@@ -1,11 +1,16 @@
 """
 Mathematical engine for IEEE 754 precision conversions and bit manipulation.
 """
+import re
 import struct
+import sys
+from array import array
 from dataclasses import dataclass
-from typing import Tuple
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Tuple
 
-@dataclass
+# Frozen so presets are hashable and can key caches alongside bit patterns.
+@dataclass(frozen=True)
 class IEEEPresets:
     bias: int
     e_bits: int
@@ -15,6 +20,10 @@ class IEEEPresets:
 FLOAT32 = IEEEPresets(bias=127, e_bits=8, f_bits=23, total_bits=32)
 FLOAT64 = IEEEPresets(bias=1023, e_bits=11, f_bits=52, total_bits=64)
 
+# Precompiled big-endian codecs for the direct (non-string) conversion paths.
+_DOUBLE, _QWORD = struct.Struct('>d'), struct.Struct('>Q')
+_SINGLE, _DWORD = struct.Struct('>f'), struct.Struct('>I')
+
 def float_to_bin32(value: float) -> str:
     """Convert a python float to a 32-bit binary string representation."""
     if value == 0.0:
@@ -79,3 +88,398 @@ def extract_fields(binary_str: str, preset: IEEEPresets) -> Tuple[int, int, int]
     f = int(f_str, 2) if f_str else 0
     
     return s, e, f
+
+FLOAT16 = IEEEPresets(bias=15, e_bits=5, f_bits=10, total_bits=16)
+BFLOAT16 = IEEEPresets(bias=127, e_bits=8, f_bits=7, total_bits=16)
+
+PRESETS = {
+    "FLOAT16": FLOAT16,
+    "BFLOAT16": BFLOAT16,
+    "FLOAT32": FLOAT32,
+    "FLOAT64": FLOAT64,
+}
+
+# IEEE 754 rounding-direction attributes (abbreviations follow Z3's FPA theory).
+ROUND_NEAREST_EVEN = "RNE"
+ROUND_NEAREST_AWAY = "RNA"
+ROUND_TOWARD_ZERO = "RTZ"
+ROUND_TOWARD_POSITIVE = "RTP"
+ROUND_TOWARD_NEGATIVE = "RTN"
+ROUNDING_MODES = (
+    ROUND_NEAREST_EVEN, ROUND_NEAREST_AWAY, ROUND_TOWARD_ZERO,
+    ROUND_TOWARD_POSITIVE, ROUND_TOWARD_NEGATIVE,
+)
+
+# Event flags reported by round_exact.
+FLAG_INEXACT = 1        # the result differs from the exact value
+FLAG_OVERFLOW = 2       # the magnitude exceeded the largest finite value
+FLAG_UNDERFLOW = 4      # the result is tiny (subnormal or zero) and inexact
+FLAG_SUBNORMAL = 8      # the result is a non-zero subnormal
+FLAG_FLUSH_TO_ZERO = 16 # a non-zero value rounded to zero
+FLAG_TIE = 32           # the discarded bits were exactly half an ULP
+
+def extract_bit_fields(bits: int, preset: IEEEPresets) -> Tuple[int, int, int]:
+    """
+    Integer counterpart of extract_fields: splits a raw bit pattern into
+    Sign, Exponent, and Fraction with shifts and masks instead of string slicing.
+    """
+    if bits < 0 or bits >> preset.total_bits:
+        raise ValueError(f"Expected a {preset.total_bits}-bit pattern, got {bits:#x}")
+        
+    f = bits & ((1 << preset.f_bits) - 1)
+    e = (bits >> preset.f_bits) & ((1 << preset.e_bits) - 1)
+    s = bits >> (preset.total_bits - 1)
+    
+    return s, e, f
+
+def classify_bits(bits: int, preset: IEEEPresets) -> str:
+    """The IEEE class of a pattern: zero, subnormal, normal, inf or nan."""
+    _, e, f = extract_bit_fields(bits, preset)
+    if e == (1 << preset.e_bits) - 1:
+        return "nan" if f else "inf"
+    if e == 0:
+        return "subnormal" if f else "zero"
+    return "normal"
+
+def decode_exact(bits: int, preset: IEEEPresets) -> Tuple[int, int, int]:
+    """
+    Returns (sign, significand, exponent) such that the pattern's value is exactly
+    (-1)^sign * significand * 2^exponent. INF and NaN have no finite value and raise ValueError.
+    """
+    s, e, f = extract_bit_fields(bits, preset)
+    if e == (1 << preset.e_bits) - 1:
+        raise ValueError("INF and NaN patterns have no exact finite value.")
+    if e == 0:
+        return s, f, 1 - preset.bias - preset.f_bits
+    return s, f | (1 << preset.f_bits), e - preset.bias - preset.f_bits
+
+def _rounds_up(mode: str, sign: int, lsb: int, rem: int, half: int) -> bool:
+    """Decides whether a non-zero remainder increments the kept significand."""
+    if mode == ROUND_NEAREST_EVEN:
+        return rem > half or (rem == half and lsb == 1)
+    if mode == ROUND_NEAREST_AWAY:
+        return rem >= half
+    if mode == ROUND_TOWARD_POSITIVE:
+        return sign == 0
+    if mode == ROUND_TOWARD_NEGATIVE:
+        return sign == 1
+    return False
+
+def round_exact(sign: int, significand: int, exponent: int, preset: IEEEPresets,
+                mode: str = ROUND_NEAREST_EVEN) -> Tuple[int, int]:
+    """
+    Rounds the exact value (-1)^sign * significand * 2^exponent into `preset`
+    using integer arithmetic only. Returns the encoded bit pattern and its FLAG_* events.
+    """
+    if mode not in ROUNDING_MODES:
+        raise ValueError(f"Unknown rounding mode '{mode}', expected one of {ROUNDING_MODES}")
+        
+    sign_bit = sign << (preset.total_bits - 1)
+    if significand == 0:
+        return sign_bit, 0
+        
+    # The quantum is the weight of the last fraction bit in the value's binade,
+    # clamped at the subnormal binade.
+    e_min = 1 - preset.bias
+    top = significand.bit_length() - 1 + exponent
+    quantum = max(top, e_min) - preset.f_bits
+    shift = quantum - exponent
+    flags = 0
+    if shift > significand.bit_length() + 1:
+        # Below half the smallest subnormal every mode only sees "non-zero, under half an ULP",
+        # so 1 * 2^(quantum - 2) stands in rather than building masks as wide as the exponent
+        significand, shift = 1, 2
+    
+    if shift <= 0:
+        sig = significand << -shift
+    else:
+        sig = significand >> shift
+        rem = significand & ((1 << shift) - 1)
+        if rem:
+            flags |= FLAG_INEXACT
+            half = 1 << (shift - 1)
+            if rem == half:
+                flags |= FLAG_TIE
+            if _rounds_up(mode, sign, sig & 1, rem, half):
+                sig += 1
+                
+    # Rounding up can carry out of the significand into the next binade.
+    if sig >> (preset.f_bits + 1):
+        sig >>= 1
+        quantum += 1
+        
+    if sig == 0:
+        return sign_bit, flags | FLAG_UNDERFLOW | FLAG_FLUSH_TO_ZERO
+        
+    if sig >> preset.f_bits == 0:
+        flags |= FLAG_SUBNORMAL
+        if flags & FLAG_INEXACT:
+            flags |= FLAG_UNDERFLOW
+        return sign_bit | sig, flags
+        
+    e_all_ones = (1 << preset.e_bits) - 1
+    e = quantum + preset.f_bits + preset.bias
+    if e >= e_all_ones:
+        flags |= FLAG_OVERFLOW | FLAG_INEXACT
+        to_infinity = (mode in (ROUND_NEAREST_EVEN, ROUND_NEAREST_AWAY)
+                       or (mode == ROUND_TOWARD_POSITIVE and sign == 0)
+                       or (mode == ROUND_TOWARD_NEGATIVE and sign == 1))
+        if to_infinity:
+            return sign_bit | (e_all_ones << preset.f_bits), flags
+        return sign_bit | (((e_all_ones - 1) << preset.f_bits) | ((1 << preset.f_bits) - 1)), flags
+        
+    f = sig & ((1 << preset.f_bits) - 1)
+    return sign_bit | (e << preset.f_bits) | f, flags
+
+def bits_to_float(bits: int, preset: IEEEPresets) -> float:
+    """
+    Decodes a raw bit pattern of any preset directly into a python float,
+    without a binary-string round trip. Values beyond float64 range saturate to INF.
+    """
+    if preset is FLOAT64 or preset is FLOAT32:
+        if bits < 0 or bits >> preset.total_bits:
+            raise ValueError(f"Expected a {preset.total_bits}-bit pattern, got {bits:#x}")
+        if preset is FLOAT64:
+            return _DOUBLE.unpack(_QWORD.pack(bits))[0]
+        return _SINGLE.unpack(_DWORD.pack(bits))[0]
+        
+    s, e, f = extract_bit_fields(bits, preset)
+    if e == (1 << preset.e_bits) - 1:
+        value = float('nan') if f else float('inf')
+    else:
+        import math
+        _, significand, exponent = decode_exact(bits, preset)
+        try:
+            value = math.ldexp(significand, exponent)
+        except OverflowError:
+            value = float('inf')
+    return -value if s else value
+
+@lru_cache(maxsize=None)
+def _pow5(k: int) -> int:
+    """Cached powers of five; float64 needs at most 1074 + 52 distinct exponents."""
+    return 5 ** k
+
+@lru_cache(maxsize=65536)
+def exact_decimal(bits: int, preset: IEEEPresets) -> str:
+    """
+    Returns the exact decimal expansion of a bit pattern (e.g. float32 0.1 is
+    0.100000001490116119384765625) using shifted big-integer arithmetic, never float.
+    Every finite binary fraction terminates in decimal because 2^-k == 5^k / 10^k.
+    """
+    s, e, f = extract_bit_fields(bits, preset)
+    sign = "-" if s else ""
+    if e == (1 << preset.e_bits) - 1:
+        return "nan" if f else sign + "inf"
+        
+    _, significand, exponent = decode_exact(bits, preset)
+    if significand == 0:
+        return sign + "0"
+    if exponent >= 0:
+        return sign + str(significand << exponent)
+        
+    # Cancel common factors of two first so the expansion has no trailing zeros.
+    k = -exponent
+    trailing = min((significand & -significand).bit_length() - 1, k)
+    significand >>= trailing
+    k -= trailing
+    if k == 0:
+        return sign + str(significand)
+        
+    digits = str(significand * _pow5(k)).rjust(k + 1, "0")
+    return f"{sign}{digits[:-k]}.{digits[-k:]}"
+
+_HEX_FLOAT = re.compile(
+    r"([+-]?)0x([0-9a-f]*)(?:\.([0-9a-f]*))?(?:p([+-]?[0-9]+))?[fl]?", re.IGNORECASE
+)
+_HEX_SPECIAL = re.compile(r"([+-]?)(inf|infinity|nan)", re.IGNORECASE)
+_TYPECODES = {16: 'H', 32: 'I', 64: 'Q'}
+
+def float_to_bits(value: float, preset: IEEEPresets, mode: str = ROUND_NEAREST_EVEN) -> int:
+    """
+    Encodes a python float into the raw bit pattern of any preset (rounding with `mode`),
+    without a binary-string round trip.
+    """
+    if preset is FLOAT64:
+        return _QWORD.unpack(_DOUBLE.pack(value))[0]
+    if preset is FLOAT32 and mode == ROUND_NEAREST_EVEN:
+        try:
+            return _DWORD.unpack(_SINGLE.pack(value))[0]
+        except OverflowError:
+            pass
+            
+    import math
+    sign = 1 if math.copysign(1.0, value) < 0 else 0
+    e_all_ones = (1 << preset.e_bits) - 1
+    if math.isnan(value):
+        return (sign << (preset.total_bits - 1)) | (e_all_ones << preset.f_bits) | (1 << (preset.f_bits - 1))
+    if math.isinf(value):
+        return (sign << (preset.total_bits - 1)) | (e_all_ones << preset.f_bits)
+    numerator, denominator = abs(value).as_integer_ratio()
+    bits, _ = round_exact(sign, numerator, 1 - denominator.bit_length(), preset, mode)
+    return bits
+
+def bits_to_hex(bits: int, preset: IEEEPresets) -> str:
+    """Formats a raw bit pattern as a zero-padded hex word, e.g. 0x3f800000."""
+    if bits < 0 or bits >> preset.total_bits:
+        raise ValueError(f"Expected a {preset.total_bits}-bit pattern, got {bits:#x}")
+    return f"0x{bits:0{(preset.total_bits + 3) // 4}x}"
+
+def hex_to_bits(text: str, preset: IEEEPresets) -> int:
+    """Parses a raw hex word (optional 0x prefix and underscores, spaces ignored) into a bit pattern."""
+    bits = int(text.replace(" ", ""), 16)
+    if bits >> preset.total_bits:
+        raise ValueError(f"Hex word '{text}' is wider than {preset.total_bits} bits.")
+    return bits
+
+def format_hex_float(bits: int, preset: IEEEPresets) -> str:
+    """
+    Formats a bit pattern as a C99 %a hex-float literal, e.g. 0x1.8p+1.
+    Subnormals print as 0x0.<fraction>p<emin>, as glibc does.
+    """
+    s, e, f = extract_bit_fields(bits, preset)
+    sign = "-" if s else ""
+    if e == (1 << preset.e_bits) - 1:
+        return sign + ("nan" if f else "inf")
+    if e == 0 and f == 0:
+        return sign + "0x0p+0"
+        
+    # Left-align the fraction on a nibble boundary, then drop trailing zero digits.
+    digits = (preset.f_bits + 3) // 4
+    frac = f"{f << (4 * digits - preset.f_bits):0{digits}x}".rstrip("0") if digits else ""
+    lead = "0" if e == 0 else "1"
+    exponent = (1 if e == 0 else e) - preset.bias
+    return f"{sign}0x{lead}{'.' + frac if frac else ''}p{exponent:+d}"
+
+def parse_hex_float(text: str, preset: IEEEPresets, mode: str = ROUND_NEAREST_EVEN) -> int:
+    """
+    Parses a C99 hex-float literal (e.g. -0x1.99999ap-4, 0x1p3f, inf, nan) straight into a
+    bit pattern of `preset`, rounding exactly with `mode` when the literal has too many digits.
+    """
+    clean = text.strip()
+    special = _HEX_SPECIAL.fullmatch(clean)
+    if special:
+        sign = 1 if special.group(1) == "-" else 0
+        e_all_ones = (1 << preset.e_bits) - 1
+        quiet = 1 << (preset.f_bits - 1) if special.group(2).lower() == "nan" else 0
+        return (sign << (preset.total_bits - 1)) | (e_all_ones << preset.f_bits) | quiet
+        
+    match = _HEX_FLOAT.fullmatch(clean)
+    if not match or not (match.group(2) or match.group(3)):
+        raise ValueError(f"Invalid hex-float literal: '{text}'")
+    sign = 1 if match.group(1) == "-" else 0
+    int_digits, frac_digits = match.group(2), match.group(3) or ""
+    significand = int(int_digits + frac_digits, 16)
+    exponent = int(match.group(4) or 0) - 4 * len(frac_digits)
+    bits, _ = round_exact(sign, significand, exponent, preset, mode)
+    return bits
+
+def _words_to_array(words: Iterable[str], preset: IEEEPresets) -> array:
+    """Decodes big-endian hex words into a native-order typed array in one bytes.fromhex call."""
+    width = preset.total_bits // 4
+    parts = []
+    for word in words:
+        clean = word[2:] if word[:2] in ("0x", "0X") else word
+        if not clean:
+            # A bare prefix must not pad to 0; hex_to_bits rejects it too
+            raise ValueError(f"Hex word '{word}' has no hex digits.")
+        if len(clean) > width:
+            raise ValueError(f"Hex word '{word}' is wider than {preset.total_bits} bits.")
+        parts.append(clean.zfill(width))
+    out = array(_TYPECODES[preset.total_bits])
+    out.frombytes(bytes.fromhex("".join(parts)))
+    if sys.byteorder == "little":
+        out.byteswap()
+    return out
+
+def parse_hex_words(words: Iterable[str], preset: IEEEPresets) -> array:
+    """
+    Bulk variant of hex_to_bits: accepts an iterable of hex words or a whitespace-separated
+    hex dump and returns the bit patterns as a typed array.
+    """
+    if isinstance(words, str):
+        words = words.split()
+    return _words_to_array(words, preset)
+
+def hex_words_to_floats(words: Iterable[str], preset: IEEEPresets) -> array:
+    """
+    Bulk hex-dump decoder returning array('d'). FLOAT32/FLOAT64 words are reinterpreted
+    with a single memoryview cast; other presets decode per element.
+    """
+    patterns = parse_hex_words(words, preset)
+    if preset == FLOAT64:
+        return array('d', memoryview(patterns).cast('B').cast('d'))
+    if preset == FLOAT32:
+        return array('d', memoryview(patterns).cast('B').cast('f'))
+    return array('d', (bits_to_float(b, preset) for b in patterns))
+
+def floats_to_hex_words(values: Iterable[float], preset: IEEEPresets) -> List[str]:
+    """Bulk encoder: formats python floats as raw hex words of `preset` (round to nearest even)."""
+    if preset in (FLOAT32, FLOAT64):
+        packed = array('f' if preset == FLOAT32 else 'd', values)
+        if sys.byteorder == "little":
+            packed.byteswap()
+        raw = packed.tobytes().hex()
+        width = preset.total_bits // 4
+        return ["0x" + raw[i:i + width] for i in range(0, len(raw), width)]
+    return [bits_to_hex(float_to_bits(v, preset), preset) for v in values]
+
+def format_hex_floats(patterns: Iterable[int], preset: IEEEPresets) -> List[str]:
+    """Bulk variant of format_hex_float."""
+    return [format_hex_float(b, preset) for b in patterns]
+
+def parse_hex_floats(texts: Iterable[str], preset: IEEEPresets, mode: str = ROUND_NEAREST_EVEN) -> array:
+    """Bulk variant of parse_hex_float returning the bit patterns as a typed array."""
+    return array(_TYPECODES[preset.total_bits], (parse_hex_float(t, preset, mode) for t in texts))
+
+_BYTE_ORDERS = {"little": "<", "big": ">"}
+_FLOAT_CODES = {FLOAT16: 'e', FLOAT32: 'f', FLOAT64: 'd'}
+
+def _buffer_view(buffer, preset: IEEEPresets, byteorder: str) -> memoryview:
+    """Validates a buffer-protocol object and returns a flat byte view of it (no copy)."""
+    if byteorder not in _BYTE_ORDERS:
+        raise ValueError(f"byteorder must be 'little' or 'big', got '{byteorder}'")
+    view = memoryview(buffer).cast('B')
+    if len(view) % (preset.total_bits // 8):
+        size = len(view)
+        view.release()
+        raise ValueError(f"Buffer of {size} bytes is not a whole number of {preset.total_bits}-bit values.")
+    return view
+
+def iter_buffer_bits(buffer, preset: IEEEPresets, byteorder: str = "little") -> Iterator[int]:
+    """
+    Yields the raw bit patterns stored in any buffer-protocol object (bytes, bytearray,
+    mmap, array). Native byte order is read through a memoryview cast, the other order
+    through struct.iter_unpack; neither copies the buffer, so memory stays flat.
+    """
+    code = _TYPECODES[preset.total_bits]
+    with _buffer_view(buffer, preset, byteorder) as view:
+        if byteorder == sys.byteorder:
+            with view.cast(code) as typed:
+                yield from typed
+        else:
+            for (bits,) in struct.iter_unpack(_BYTE_ORDERS[byteorder] + code, view):
+                yield bits
+
+def iter_buffer_fields(buffer, preset: IEEEPresets, byteorder: str = "little") -> Iterator[Tuple[int, int, int]]:
+    """Yields the (Sign, Exponent, Fraction) fields of every value in a buffer."""
+    for bits in iter_buffer_bits(buffer, preset, byteorder):
+        yield extract_bit_fields(bits, preset)
+
+def iter_buffer_values(buffer, preset: IEEEPresets, byteorder: str = "little") -> Iterator[float]:
+    """
+    Yields the python float value of every element in a buffer. FLOAT16/32/64 decode
+    natively (struct 'e'/'f'/'d'); other presets decode via their bit patterns.
+    """
+    code = _FLOAT_CODES.get(preset)
+    if code is None:
+        for bits in iter_buffer_bits(buffer, preset, byteorder):
+            yield bits_to_float(bits, preset)
+        return
+    with _buffer_view(buffer, preset, byteorder) as view:
+        if byteorder == sys.byteorder and code != 'e':
+            with view.cast(code) as typed:
+                yield from typed
+        else:
+            for (value,) in struct.iter_unpack(_BYTE_ORDERS[byteorder] + code, view):
+                yield value
@@ -0,0 +1,113 @@
+"""
+Response-latency instrumentation: prompt_input measures the monotonic time from
+showing a prompt to receiving the answer, BaseMode.record_attempt files it under
+(mode, step, correct) in fixed-bucket histograms, and the histograms are exported
+at session end as JSON or Prometheus text exposition format.
+"""
+import bisect
+import json
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; a final +Inf bucket catches the rest
+ANSWER_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+# Tutor-side time between an answer and the next prompt (grading, feedback, rendering)
+TUTOR_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+class Histogram:
+    """Cumulative-on-export histogram over fixed bucket upper bounds."""
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Adds one observation in O(log buckets)."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        pairs, running = [], 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            running += n
+            pairs.append((bound, running))
+        return pairs
+
+class LatencyRecorder:
+    """
+    Collects answer latencies per (mode, step, correct) and tutor-side latencies.
+    prompt_input reports every answer via `answered()`; only the latest one is kept
+    until a graded step claims it with `observe_step()`.
+    """
+    def __init__(self, answer_buckets: Sequence[float] = ANSWER_BUCKETS,
+                 tutor_buckets: Sequence[float] = TUTOR_BUCKETS):
+        self.answer_buckets = tuple(answer_buckets)
+        self.answers: Dict[Tuple[str, str, bool], Histogram] = {}
+        self.tutor = Histogram(tutor_buckets)
+        self._pending: Optional[float] = None
+
+    def answered(self, seconds: float, tutor_seconds: Optional[float] = None) -> None:
+        """Called by prompt_input with the answer time (and the tutor time before the prompt)."""
+        self._pending = seconds
+        if tutor_seconds is not None:
+            self.tutor.observe(tutor_seconds)
+
+    def observe_step(self, mode_id, step: str, correct: bool) -> None:
+        """Files the latest answer time under a graded step; a no-op if no answer is pending."""
+        if self._pending is None:
+            return
+        key = (str(mode_id), step, bool(correct))
+        histogram = self.answers.get(key)
+        if histogram is None:
+            histogram = self.answers[key] = Histogram(self.answer_buckets)
+        histogram.observe(self._pending)
+        self._pending = None
+
+    def to_json(self) -> dict:
+        """All histograms as a JSON-serialisable dict."""
+        return {
+            "answers": [{"mode": m, "step": s, "correct": c, **_histogram_json(h)}
+                        for (m, s, c), h in sorted(self.answers.items())],
+            "tutor": _histogram_json(self.tutor),
+        }
+
+    def to_prometheus(self) -> str:
+        """All histograms in the Prometheus text exposition format."""
+        lines = ["# HELP ieee754_tutor_answer_seconds Time from prompt to answer per graded step.",
+                 "# TYPE ieee754_tutor_answer_seconds histogram"]
+        for (mode, step, correct), h in sorted(self.answers.items()):
+            labels = f'mode="{mode}",step="{step}",correct="{str(correct).lower()}"'
+            lines.extend(_prometheus_series("ieee754_tutor_answer_seconds", labels, h))
+        lines += ["# HELP ieee754_tutor_tutor_seconds Tutor-side time from an answer to the next prompt.",
+                  "# TYPE ieee754_tutor_tutor_seconds histogram"]
+        lines.extend(_prometheus_series("ieee754_tutor_tutor_seconds", "", self.tutor))
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str) -> None:
+        """Writes Prometheus text for `.prom`/`.txt` paths and JSON otherwise."""
+        if os.path.splitext(path)[1] in (".prom", ".txt"):
+            text = self.to_prometheus()
+        else:
+            text = json.dumps(self.to_json(), indent=2) + "\n"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+def _histogram_json(h: Histogram) -> dict:
+    """Count, sum and cumulative buckets of one histogram."""
+    return {"count": h.count, "sum": h.total,
+            "buckets": [["+Inf" if b == float("inf") else b, n] for b, n in h.cumulative()]}
+
+def _prometheus_series(name: str, labels: str, h: Histogram) -> list:
+    """The _bucket, _sum and _count lines of one histogram."""
+    sep = "," if labels else ""
+    lines = [f'{name}_bucket{{{labels}{sep}le="{"+Inf" if b == float("inf") else repr(b)}"}} {n}'
+             for b, n in h.cumulative()]
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {h.total!r}")
+    lines.append(f"{name}_count{suffix} {h.count}")
+    return lines
@@ -0,0 +1,120 @@
+"""
+Batch narrowing-conversion simulator (float64 -> FLOAT32/FLOAT16/BFLOAT16) built on
+the engine's integer field extraction and exact rounding.
+"""
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, Tuple
+
+from src.engine import (
+    FLOAT32, FLOAT64, IEEEPresets, ROUND_NEAREST_EVEN,
+    FLAG_INEXACT, FLAG_OVERFLOW,
+    extract_bit_fields, decode_exact, round_exact, iter_buffer_bits
+)
+
+# Set when rounding through FLOAT32 first gives a different result than rounding
+# the float64 source directly (only possible for targets narrower than FLOAT32).
+FLAG_DOUBLE_ROUNDING = 64
+
+_TYPECODES = {16: 'H', 32: 'I', 64: 'Q'}
+
+@dataclass
+class NarrowResult:
+    """Per-element output of a narrowing pass, stored in compact typed arrays."""
+    bits: array
+    ulp_error: array
+    flags: array
+
+    def count(self, flag: int) -> int:
+        """Returns how many elements raised the given flag."""
+        return sum(1 for f in self.flags if f & flag)
+
+def narrow_pattern(bits: int, source: IEEEPresets, target: IEEEPresets,
+                   mode: str = ROUND_NEAREST_EVEN) -> Tuple[int, int]:
+    """
+    Narrows one bit pattern from `source` into `target`.
+    Returns the target bit pattern and its FLAG_* events.
+    """
+    s, e, f = extract_bit_fields(bits, source)
+    sign_bit = s << (target.total_bits - 1)
+    e_all_ones = (1 << target.e_bits) - 1
+
+    if e == (1 << source.e_bits) - 1:
+        if f == 0:
+            return sign_bit | (e_all_ones << target.f_bits), 0
+        # Keep the top payload bits and force the quiet bit so the NaN stays a NaN.
+        payload = f >> (source.f_bits - target.f_bits)
+        quiet = 1 << (target.f_bits - 1)
+        return sign_bit | (e_all_ones << target.f_bits) | payload | quiet, 0
+
+    return round_exact(*decode_exact(bits, source), target, mode)
+
+def _ulp_error(bits: int, narrowed: int, target: IEEEPresets, flags: int) -> float:
+    """Signed error of the narrowed float64 pattern, in ULPs of the result."""
+    s, e, f = extract_bit_fields(narrowed, target)
+    if e == (1 << target.e_bits) - 1:
+        if f:
+            return float('nan')
+        if flags & FLAG_OVERFLOW:
+            return float('-inf') if s else float('inf')
+        return 0.0
+
+    _, significand, exponent = decode_exact(bits, FLOAT64)
+    _, r_sig, r_exp = decode_exact(narrowed, target)
+    shift = exponent - r_exp
+    if shift >= 0:
+        err = r_sig - (significand << shift)
+    else:
+        err = ((r_sig << -shift) - significand) / (1 << -shift)
+    return float(-err if s else err)
+
+def narrow_bit_patterns(patterns: Iterable[int], target: IEEEPresets,
+                        mode: str = ROUND_NEAREST_EVEN) -> NarrowResult:
+    """
+    Narrows float64 bit patterns into `target`, returning the narrowed bits,
+    the error in ULPs and per-element flags (including FLAG_DOUBLE_ROUNDING).
+    """
+    result = NarrowResult(array(_TYPECODES[target.total_bits]), array('d'), array('B'))
+    check_double = target.f_bits < FLOAT32.f_bits
+
+    for bits in patterns:
+        narrowed, flags = narrow_pattern(bits, FLOAT64, target, mode)
+        if check_double and flags & FLAG_INEXACT:
+            via, _ = narrow_pattern(narrow_pattern(bits, FLOAT64, FLOAT32, mode)[0], FLOAT32, target, mode)
+            if via != narrowed:
+                flags |= FLAG_DOUBLE_ROUNDING
+        result.bits.append(narrowed)
+        result.ulp_error.append(_ulp_error(bits, narrowed, target, flags))
+        result.flags.append(flags)
+
+    return result
+
+def narrow_values(values: Iterable[float], target: IEEEPresets,
+                  mode: str = ROUND_NEAREST_EVEN) -> NarrowResult:
+    """Narrows Python floats, reinterpreting the whole batch as 64-bit patterns in one cast."""
+    doubles = values if isinstance(values, array) and values.typecode == 'd' else array('d', values)
+    return narrow_bit_patterns(memoryview(doubles).cast('B').cast('Q'), target, mode)
+
+def narrow_stream(stream: BinaryIO, target: IEEEPresets, mode: str = ROUND_NEAREST_EVEN,
+                  chunk_size: int = 65536, byteorder: str = "little") -> Iterator[NarrowResult]:
+    """
+    Narrows a binary stream of raw float64 values chunk by chunk, so inputs larger
+    than RAM are processed with a single reusable read buffer.
+    """
+    item_size = FLOAT64.total_bits // 8
+    buffer = bytearray(chunk_size * item_size)
+    view = memoryview(buffer)
+
+    while True:
+        # Pipes and sockets may return short reads, so fill the buffer before decoding.
+        n = 0
+        while n < len(buffer):
+            got = stream.readinto(view[n:])
+            if not got:
+                break
+            n += got
+        if not n:
+            return
+        if n % item_size:
+            raise ValueError(f"Stream ended mid-value: {n % item_size} trailing bytes.")
+        yield narrow_bit_patterns(iter_buffer_bits(view[:n], FLOAT64, byteorder), target, mode)
@@ -0,0 +1,108 @@
+"""
+Repeat-free sampling over large index spaces in O(1) memory. KeyedPermutation is a
+keyed Feistel network over the smallest power-of-four domain covering the space,
+cycle-walked back into range, so index i maps to a unique position without storing
+the order. PermutationSampler walks one permutation with a counter and re-keys after
+each full pass, so a session never repeats an item within a pass and never keeps a
+seen-set. class_size and class_pattern number the patterns of one class (e.g. every
+float32 subnormal), which gives class-filtered spaces without rejection sampling.
+"""
+import random
+from typing import Tuple
+
+from src.engine import IEEEPresets
+
+ROUNDS = 4
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+def _mix(x: int) -> int:
+    """splitmix64 finalizer: a fast 64-bit mixing function for the Feistel rounds."""
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+class KeyedPermutation:
+    """A pseudo-random bijection of range(size) selected by `key`."""
+    __slots__ = ("size", "key", "_half_bits", "_half_mask", "_round_keys")
+
+    def __init__(self, size: int, key: int):
+        if size < 1:
+            raise ValueError(f"A permutation needs at least one item, got {size}.")
+        self.size = size
+        self.key = key
+        # Two halves of equal width; the domain is less than four times the size, so walks stay short
+        self._half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._half_mask = (1 << self._half_bits) - 1
+        self._round_keys = tuple(_mix((key + r * _GOLDEN) & _MASK64) for r in range(ROUNDS))
+
+    def _feistel(self, x: int) -> int:
+        left, right = x >> self._half_bits, x & self._half_mask
+        for round_key in self._round_keys:
+            left, right = right, left ^ (_mix(right ^ round_key) & self._half_mask)
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(f"Index {index} is outside a permutation of {self.size} items.")
+        # Cycle-walking: re-encrypt until the result falls back into range
+        x = self._feistel(index)
+        while x >= self.size:
+            x = self._feistel(x)
+        return x
+
+    def __len__(self) -> int:
+        return self.size
+
+class PermutationSampler:
+    """
+    Endless iterator over range(size): every pass is a fresh keyed permutation, so no
+    index repeats within a pass. Keys come from `rng`, so a seeded RNG replays the order.
+    """
+    __slots__ = ("rng", "passes", "position", "_permutation")
+
+    def __init__(self, size: int, rng=random):
+        self.rng = rng
+        self.passes = 0
+        self.position = 0
+        self._permutation = KeyedPermutation(size, rng.getrandbits(64))
+
+    def __iter__(self) -> "PermutationSampler":
+        return self
+
+    def __next__(self) -> int:
+        if self.position == self._permutation.size:
+            self._permutation = KeyedPermutation(self._permutation.size, self.rng.getrandbits(64))
+            self.passes += 1
+            self.position = 0
+        index = self._permutation[self.position]
+        self.position += 1
+        return index
+
+def _class_layout(cls: str, preset: IEEEPresets) -> Tuple[int, int]:
+    """(exponent field, number of fraction values) shared by the patterns of a non-normal class."""
+    e_max = (1 << preset.e_bits) - 1
+    fractions = (1 << preset.f_bits) - 1
+    layouts = {"zero": (0, 1), "subnormal": (0, fractions), "inf": (e_max, 1), "nan": (e_max, fractions)}
+    if cls not in layouts:
+        raise ValueError(f"Unknown class '{cls}'.")
+    return layouts[cls]
+
+def class_size(cls: str, preset: IEEEPresets) -> int:
+    """Number of bit patterns of `preset` in class `cls` (as named by engine.classify_bits), both signs."""
+    if cls == "normal":
+        return 2 * (((1 << preset.e_bits) - 2) << preset.f_bits)
+    return 2 * _class_layout(cls, preset)[1]
+
+def class_pattern(cls: str, index: int, preset: IEEEPresets) -> int:
+    """The `index`-th bit pattern of class `cls`; the low bit of the index is the sign."""
+    if not 0 <= index < class_size(cls, preset):
+        raise IndexError(f"Class '{cls}' has no pattern {index}.")
+    sign, rest = index & 1, index >> 1
+    if cls == "normal":
+        e, f = (rest >> preset.f_bits) + 1, rest & ((1 << preset.f_bits) - 1)
+    else:
+        e, fractions = _class_layout(cls, preset)
+        # Subnormals and NaNs need a nonzero fraction
+        f = rest + 1 if fractions > 1 else 0
+    return (sign << (preset.total_bits - 1)) | (e << preset.f_bits) | f
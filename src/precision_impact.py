@@ -1,60 +1,68 @@
-import random
+from typing import NamedTuple, Tuple
 from src.base_mode import BaseMode
 from src.ui import prompt_input, clear_screen, UserQuitException
 
+class PrecisionQuestion(NamedTuple):
+    """A Mode 8 drill: a sequence, its value, the sequence with the fraction LSB flipped, and the effect."""
+    orig_seq: str
+    val: str
+    mod_seq: str
+    dir: str  # "+" or "-"
+    diff: str
+
+QUESTIONS: Tuple[PrecisionQuestion, ...] = (
+    PrecisionQuestion(
+        orig_seq="01000000000000000000000000000000",
+        val="2.0",
+        mod_seq="01000000000000000000000000000001",
+        dir="+",
+        diff="2^-22"
+    ),
+    PrecisionQuestion(
+        orig_seq="11000000000000000000000000000000",
+        val="-2.0",
+        mod_seq="11000000000000000000000000000001",
+        dir="-",
+        diff="2^-22"
+    ),
+    PrecisionQuestion(
+        orig_seq="00111111100000000000000000000000",
+        val="1.0",
+        mod_seq="00111111100000000000000000000001",
+        dir="+",
+        diff="2^-23"
+    ),
+)
+
 class PrecisionImpactMode(BaseMode):
     """Handles Mode 8: Precision Impact."""
     
     def __init__(self):
         super().__init__()
-        
-        # Format: (Original Seq, Value, Flipped Seq, direction (+ or -), difference)
-        self.questions = [
-            {
-                "orig_seq": "01000000000000000000000000000000",
-                "val": "2.0",
-                "mod_seq": "01000000000000000000000000000001",
-                "dir": "+",
-                "diff": "2^-22"
-            },
-            {
-                "orig_seq": "11000000000000000000000000000000",
-                "val": "-2.0",
-                "mod_seq": "11000000000000000000000000000001",
-                "dir": "-",
-                "diff": "2^-22"
-            },
-            {
-                "orig_seq": "00111111100000000000000000000000",
-                "val": "1.0",
-                "mod_seq": "00111111100000000000000000000001",
-                "dir": "+",
-                "diff": "2^-23"
-            }
-        ]
+        self.questions = QUESTIONS
 
     def run_round(self) -> bool:
-        target = random.choice(self.questions)
+        target = self.select_question(self.questions)
         
         try:
             clear_screen()
             print("-" * 60)
             print("MODE 8: Precision Impact")
             print("-" * 60)
-            print(f"Original sequence: {target['orig_seq']} (Value: {target['val']})")
+            print(f"Original sequence: {target.orig_seq} (Value: {target.val})")
             print("Bit flipped at fraction LSB:")
-            print(f"Modified seq:      {target['mod_seq']}\n")
+            print(f"Modified seq:      {target.mod_seq}\n")
             
             # Step 1: Direction
             print("Determine if the value increased or decreased ('+' or '-'):")
             ans_dir = prompt_input("").strip()
-            if ans_dir == target['dir']:
+            if self.record_attempt("direction", ans_dir == target.dir):
                 if ans_dir == "+":
                     print("Correct. The magnitude increased and the number is positive.\n")
                 else:
                     print("Correct. The magnitude increased and the number is negative.\n")
             else:
-                if target['dir'] == '+':
+                if target.dir == '+':
                     print(f"Incorrect. Flipping a 0 to 1 increases the magnitude, and since the sign is positive (+), the value increases.\n")
                 else:
                     print(f"Incorrect. Flipping a 0 to 1 increases the magnitude, but since the sign is negative (-), the value decreases further from zero.\n")
@@ -62,10 +70,10 @@ class PrecisionImpactMode(BaseMode):
             # Step 2: Epsilon Difference
             print("Enter the value of the machine epsilon for this exponent:")
             ans_diff = prompt_input("").strip()
-            if ans_diff == target['diff']:
-                print(f"Correct. The precision step at this exponent is {target['diff']}.\n")
+            if self.record_attempt("difference", ans_diff == target.diff):
+                print(f"Correct. The precision step at this exponent is {target.diff}.\n")
             else:
-                print(f"Incorrect. The precision step is 2^(true exponent - fraction bits), which evaluates to {target['diff']}.\n")
+                print(f"Incorrect. The precision step is 2^(true exponent - fraction bits), which evaluates to {target.diff}.\n")
             
 
             
@@ -0,0 +1,164 @@
+"""
+Constrained problem generator: describes drill targets as Z3 FP/BitVec constraints
+(the same theories the BMC suites use), enumerates many distinct models per solver
+with blocking clauses and caches them on disk by constraint hash. Interactive modes
+only read the cache, so a round never waits on the solver; z3 is imported lazily.
+"""
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass, asdict
+from typing import List, Optional
+
+from src.engine import FLOAT64, PRESETS
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_CACHE_PATH = os.path.join(PROJECT_ROOT, ".model_cache.json")
+
+# Bump when the constraint encoding changes so previously cached models are not reused
+GENERATOR_VERSION = 1
+PROBLEM_KINDS = ("subnormal", "normal", "special", "rounding")
+
+@dataclass(frozen=True)
+class ProblemSpec:
+    """
+    A family of target bit patterns in `preset`:
+    - subnormal / normal / special: the value class, optionally with exactly
+      `fraction_ones` set fraction bits.
+    - rounding: a float64 pattern whose narrowing into `preset` sees the given
+      guard, round and sticky bits (None leaves a bit unconstrained).
+    """
+    kind: str
+    preset: str = "FLOAT32"
+    fraction_ones: Optional[int] = None
+    guard: Optional[int] = None
+    round: Optional[int] = None
+    sticky: Optional[int] = None
+
+    def key(self) -> str:
+        """Stable hash of the constraint description, used as the cache key."""
+        text = json.dumps({"version": GENERATOR_VERSION, **asdict(self)}, sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# The drills DenormalsMode draws from the cache: one per answer type plus a few subnormal densities
+DENORMALS_SPECS = (
+    ProblemSpec("subnormal", fraction_ones=1),
+    ProblemSpec("subnormal", fraction_ones=3),
+    ProblemSpec("normal", fraction_ones=2),
+    ProblemSpec("special"),
+)
+
+def build_constraints(spec: ProblemSpec, bits) -> list:
+    """Returns the Z3 assertions over the bit-vector `bits` that describe `spec`."""
+    import z3
+
+    if spec.kind not in PROBLEM_KINDS:
+        raise ValueError(f"Unknown problem kind '{spec.kind}', expected one of {PROBLEM_KINDS}")
+    if spec.preset not in PRESETS:
+        raise ValueError(f"Unknown preset '{spec.preset}', expected one of {sorted(PRESETS)}")
+    target = PRESETS[spec.preset]
+    target_sort = z3.FPSort(target.e_bits, target.f_bits + 1)
+
+    if spec.kind == "rounding":
+        if target.f_bits >= FLOAT64.f_bits:
+            raise ValueError("Rounding problems need a target narrower than FLOAT64.")
+        value = z3.fpBVToFP(bits, z3.FPSort(FLOAT64.e_bits, FLOAT64.f_bits + 1))
+        rounded = z3.fpToFP(z3.RoundNearestTiesToEven(), value, target_sort)
+        # Keep the source inside the target's normal range, so the guard bit sits right below the kept fraction
+        biased = z3.Extract(FLOAT64.total_bits - 2, FLOAT64.f_bits, bits)
+        shift = FLOAT64.f_bits - target.f_bits
+        assertions = [
+            z3.fpIsNormal(value), z3.fpIsNormal(rounded),
+            z3.UGE(biased, FLOAT64.bias + 1 - target.bias), z3.ULE(biased, FLOAT64.bias + target.bias),
+        ]
+        if spec.guard is not None:
+            assertions.append(z3.Extract(shift - 1, shift - 1, bits) == spec.guard)
+        if spec.round is not None:
+            assertions.append(z3.Extract(shift - 2, shift - 2, bits) == spec.round)
+        if spec.sticky is not None:
+            tail = z3.Extract(shift - 3, 0, bits)
+            assertions.append(tail != 0 if spec.sticky else tail == 0)
+        return assertions
+
+    value = z3.fpBVToFP(bits, target_sort)
+    assertions = [{
+        "subnormal": z3.fpIsSubnormal(value),
+        "normal": z3.fpIsNormal(value),
+        "special": z3.Or(z3.fpIsInf(value), z3.fpIsNaN(value)),
+    }[spec.kind]]
+    if spec.fraction_ones is not None:
+        fraction = z3.Extract(target.f_bits - 1, 0, bits)
+        width = target.f_bits.bit_length()
+        ones = z3.Sum([z3.ZeroExt(width - 1, z3.Extract(i, i, fraction)) for i in range(target.f_bits)])
+        assertions.append(ones == spec.fraction_ones)
+    return assertions
+
+def enumerate_models(spec: ProblemSpec, count: int = 64, seed: int = 0,
+                     timeout_ms: int = 10000) -> List[int]:
+    """
+    Solves `spec` once and enumerates up to `count` distinct bit patterns on the same
+    solver, adding a blocking clause after each model. Random bit assumptions spread
+    the models out; they are dropped whenever they make the query unsatisfiable.
+    """
+    import z3
+
+    width = (FLOAT64 if spec.kind == "rounding" else PRESETS[spec.preset]).total_bits
+    bits = z3.BitVec("bits", width)
+    solver = z3.Solver()
+    solver.set("random_seed", seed)
+    solver.set("timeout", timeout_ms)
+    solver.add(*build_constraints(spec, bits))
+
+    rng = random.Random(seed)
+    models = []
+    while len(models) < count:
+        hints = [z3.Extract(i, i, bits) == rng.getrandbits(1) for i in rng.sample(range(width), 3)]
+        result = solver.check(*hints)
+        if result != z3.sat:
+            result = solver.check()
+        if result != z3.sat:
+            break
+        value = solver.model().eval(bits, model_completion=True).as_long()
+        models.append(value)
+        solver.add(bits != value)
+    return models
+
+class ModelCache:
+    """On-disk store of enumerated models, keyed by ProblemSpec.key()."""
+    def __init__(self, path: str = MODEL_CACHE_PATH):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, spec: ProblemSpec) -> List[int]:
+        """Cached models for `spec` (empty if it was never solved)."""
+        entry = self.entries.get(spec.key())
+        return list(entry["models"]) if entry else []
+
+    def requested(self, spec: ProblemSpec) -> int:
+        """How many models were asked for when `spec` was last solved (0 if never); small spaces yield fewer."""
+        entry = self.entries.get(spec.key())
+        return entry["requested"] if entry else 0
+
+    def put(self, spec: ProblemSpec, models: List[int], requested: int) -> None:
+        """Replaces the cached models for `spec`."""
+        self.entries[spec.key()] = {"spec": asdict(spec), "models": list(models), "requested": requested}
+
+    def save(self) -> None:
+        """Writes the cache atomically so a concurrent reader never sees a truncated file."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, sort_keys=True)
+        os.replace(tmp, self.path)
+
+def ensure_models(spec: ProblemSpec, cache: ModelCache, count: int = 64, seed: int = 0) -> List[int]:
+    """Returns the cached models for `spec`, solving and storing them first unless `count` were already requested."""
+    if cache.requested(spec) >= count:
+        return cache.get(spec)
+    models = enumerate_models(spec, count, seed)
+    cache.put(spec, models, count)
+    return models
@@ -0,0 +1,69 @@
+"""
+Opt-in session profiling: wraps each mode's rounds in a per-mode cProfile profiler
+and tracemalloc snapshots, then dumps the profiles (pstats binary plus a text
+summary) and the top allocation sites when the session ends. main.py only creates
+a SessionProfiler when profiling is requested, so a normal session pays nothing.
+"""
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+from collections import Counter
+from typing import Dict
+
+class SessionProfiler:
+    """Accumulates one cProfile profile and allocation growth per mode id across a session."""
+    def __init__(self, directory: str, top: int = 25):
+        self.directory = directory
+        self.top = top
+        self.profiles: Dict[int, cProfile.Profile] = {}
+        # mode id -> allocation site ("file:line") -> bytes still allocated after its rounds
+        self.allocations: Dict[int, Counter] = {}
+        self._started_tracing = False
+
+    def run_mode(self, mode_id: int, mode) -> None:
+        """Runs `mode.run_round()` until it returns False, profiled and with allocations traced."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        profile = self.profiles.setdefault(mode_id, cProfile.Profile())
+        before = tracemalloc.take_snapshot()
+        profile.enable()
+        try:
+            while mode.run_round():
+                pass
+        finally:
+            profile.disable()
+            after = tracemalloc.take_snapshot()
+            sites = self.allocations.setdefault(mode_id, Counter())
+            ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            for stat in after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno"):
+                if stat.size_diff:
+                    frame = stat.traceback[0]
+                    sites[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+
+    def summary(self, mode_id: int) -> str:
+        """Text report of a mode: the top functions by cumulative time and the top allocation sites."""
+        out = io.StringIO()
+        out.write(f"=== Mode {mode_id}: top {self.top} functions by cumulative time ===\n")
+        pstats.Stats(self.profiles[mode_id], stream=out).sort_stats("cumulative").print_stats(self.top)
+        out.write(f"=== Mode {mode_id}: top {self.top} allocation sites (bytes retained) ===\n")
+        for site, size in self.allocations.get(mode_id, Counter()).most_common(self.top):
+            out.write(f"{size:>12,} B  {site}\n")
+        return out.getvalue()
+
+    def dump(self) -> list:
+        """Writes mode_<id>.prof (load with pstats or snakeviz) and mode_<id>.txt per mode; returns the paths."""
+        os.makedirs(self.directory, exist_ok=True)
+        paths = []
+        for mode_id, profile in sorted(self.profiles.items()):
+            base = os.path.join(self.directory, f"mode_{mode_id}")
+            profile.dump_stats(base + ".prof")
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(self.summary(mode_id))
+            paths += [base + ".prof", base + ".txt"]
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return paths
@@ -0,0 +1,237 @@
+"""
+Persistent learner progress: every graded step is appended to a compact text log
+and folded into in-memory per-mode (and per-step) aggregates, so accuracy lookups
+cost O(1) no matter how long the history grows. The log is periodically compacted
+into a JSON snapshot of the aggregates and truncated. Timed drills (Mode 10)
+additionally log one line per finished drill, folded into per-mode DrillTotals.
+
+Several processes may share one progress directory: appends hold a shared
+flock on the log and compaction an exclusive one, and compaction folds in what
+is on disk rather than one process's memory, so no process's answers are lost.
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # e.g. Windows; the store then assumes one process per directory
+    fcntl = None
+
+DEFAULT_PROGRESS_DIR = os.path.join(os.path.expanduser("~"), ".ieee754_tutor")
+LOG_NAME = "progress.log"
+SNAPSHOT_NAME = "progress.json"
+
+def _lock(fd: int, exclusive: bool) -> None:
+    """Takes an advisory flock on `fd`, shared or exclusive (a no-op without fcntl)."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+def _unlock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+@dataclass(frozen=True)
+class DrillTotals:
+    """Cumulative timed-drill results of a mode."""
+    sessions: int
+    questions: int
+    correct: int
+    seconds: float
+    best_per_minute: float
+
+    @property
+    def per_minute(self) -> float:
+        return 60.0 * self.questions / self.seconds if self.seconds else 0.0
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        return 100.0 * self.correct / self.questions if self.questions else None
+
+class ProgressStore:
+    """
+    Append-only progress log plus aggregates. One `record()` costs a single
+    O_APPEND write and a dict update; `directory=None` keeps everything in memory.
+    Files are only created on the first write.
+    """
+    def __init__(self, directory: Optional[str] = None, compact_every: int = 1000):
+        self.directory = directory
+        self.compact_every = compact_every
+        self._modes: Dict[int, List[int]] = {}
+        self._steps: Dict[Tuple[int, str], List[int]] = {}
+        # mode id -> [drills, questions, correct, seconds, best questions/minute]
+        self._drills: Dict[int, list] = {}
+        self._since_compact = 0
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+        if directory:
+            self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _apply(self, mode_id: int, step: str, correct: int, count: int = 1) -> None:
+        """Folds `count` attempts (of which `correct` were right) into the aggregates."""
+        totals = self._modes.setdefault(mode_id, [0, 0])
+        totals[0] += correct
+        totals[1] += count
+        step_totals = self._steps.setdefault((mode_id, step), [0, 0])
+        step_totals[0] += correct
+        step_totals[1] += count
+
+    def _apply_drill(self, mode_id: int, questions: int, correct: int, seconds: float,
+                     sessions: int = 1, best: Optional[float] = None) -> None:
+        """Folds finished drills into the drill aggregates; `best` defaults to this drill's own rate."""
+        totals = self._drills.setdefault(mode_id, [0, 0, 0, 0.0, 0.0])
+        totals[0] += sessions
+        totals[1] += questions
+        totals[2] += correct
+        totals[3] += seconds
+        if best is None:
+            best = 60.0 * questions / seconds if seconds else 0.0
+        totals[4] = max(totals[4], best)
+
+    def _load(self) -> None:
+        """Restores the snapshot, then replays the log entries written after it."""
+        try:
+            log = open(self._path(LOG_NAME), "rb")
+        except OSError:
+            self._read_snapshot()
+            return
+        # A shared lock, so no compaction swaps the snapshot and truncates the log midway
+        with log:
+            _lock(log.fileno(), exclusive=False)
+            try:
+                self._replay(log, self._read_snapshot())
+            finally:
+                _unlock(log.fileno())
+
+    def _read_snapshot(self) -> int:
+        """Folds the snapshot into the aggregates, returning the log offset it covers (0 without one)."""
+        try:
+            with open(self._path(SNAPSHOT_NAME), "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = snapshot["offset"]
+            for key, (correct, attempts) in snapshot["steps"].items():
+                mode_id, step = key.split("\t", 1)
+                self._apply(int(mode_id), step, correct, attempts)
+            for mode_id, (sessions, questions, correct, seconds, best) in snapshot.get("drills", {}).items():
+                self._apply_drill(int(mode_id), questions, correct, seconds, sessions, best)
+            return offset
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _replay(self, log: BinaryIO, offset: int) -> None:
+        """Folds the log lines from `offset` on into the aggregates."""
+        log.seek(0, os.SEEK_END)
+        # A log shorter than the offset was truncated by a compaction that then stopped early
+        log.seek(offset if offset <= log.tell() else 0)
+        for raw in log:
+            if not raw.endswith(b"\n"):
+                break  # a torn final write; it is ignored rather than misread
+            try:
+                fields = raw.decode("utf-8").rstrip("\n").split("\t")
+                if fields[0] == "drill":
+                    _, mode_id, questions, correct, seconds, _ = fields
+                    self._apply_drill(int(mode_id), int(questions), int(correct), float(seconds))
+                else:
+                    mode_id, step, correct, _ = fields
+                    self._apply(int(mode_id), step, int(correct))
+                self._since_compact += 1
+            except ValueError:
+                continue
+
+    def record(self, mode_id: int, step: str, correct: bool) -> None:
+        """Appends one graded step and updates the aggregates."""
+        with self._lock:
+            self._apply(mode_id, step, 1 if correct else 0)
+            self._append_locked(f"{mode_id}\t{step}\t{1 if correct else 0}\t{int(time.time())}\n")
+
+    def record_drill(self, mode_id: int, questions: int, correct: int, seconds: float) -> None:
+        """Appends one finished timed drill (its question count, correct answers and duration)."""
+        with self._lock:
+            self._apply_drill(mode_id, questions, correct, seconds)
+            self._append_locked(f"drill\t{mode_id}\t{questions}\t{correct}\t{seconds:.6f}\t{int(time.time())}\n")
+
+    def _append_locked(self, line: str) -> None:
+        """One O_APPEND write of a log line (nothing in memory-only stores), compacting when due."""
+        if not self.directory:
+            return
+        fd = self._open_log_locked()
+        # Appends from several processes may interleave; only a compaction must exclude them
+        _lock(fd, exclusive=False)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            _unlock(fd)
+        self._since_compact += 1
+        if self._since_compact >= self.compact_every:
+            self._compact_locked()
+
+    def accuracy(self, mode_id: int) -> Optional[float]:
+        """Cumulative accuracy of a mode in percent, or None if it was never attempted."""
+        correct, attempts = self._modes.get(mode_id, (0, 0))
+        return 100.0 * correct / attempts if attempts else None
+
+    def totals(self, mode_id: int) -> Tuple[int, int]:
+        """(correct, attempts) of a mode."""
+        correct, attempts = self._modes.get(mode_id, (0, 0))
+        return correct, attempts
+
+    def step_totals(self, mode_id: int) -> Dict[str, Tuple[int, int]]:
+        """(correct, attempts) of every step of a mode, keyed by step name."""
+        return {step: tuple(v) for (m, step), v in self._steps.items() if m == mode_id}
+
+    def drill_totals(self, mode_id: int) -> Optional[DrillTotals]:
+        """Cumulative drill results of a mode, or None if it never finished a drill."""
+        totals = self._drills.get(mode_id)
+        return DrillTotals(*totals) if totals else None
+
+    def compact(self) -> None:
+        """Writes the aggregates to the snapshot and truncates the log."""
+        with self._lock:
+            self._compact_locked()
+
+    def _open_log_locked(self) -> int:
+        """The O_APPEND log descriptor, creating the directory and log on first use."""
+        if self._fd is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._fd = os.open(self._path(LOG_NAME), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _compact_locked(self) -> None:
+        if not self.directory:
+            return
+        fd = self._open_log_locked()
+        _lock(fd, exclusive=True)
+        try:
+            # Other processes may have appended since this one loaded, so the aggregates
+            # are rebuilt from the snapshot and log on disk, which hold this process's answers too
+            self._modes, self._steps, self._drills = {}, {}, {}
+            with open(self._path(LOG_NAME), "rb") as log:
+                self._replay(log, self._read_snapshot())
+            # First persist the aggregates as covering the whole log, only then drop the log
+            self._write_snapshot(os.fstat(fd).st_size)
+            os.ftruncate(fd, 0)
+            self._write_snapshot(0)
+        finally:
+            _unlock(fd)
+        self._since_compact = 0
+
+    def _write_snapshot(self, offset: int) -> None:
+        steps = {f"{m}\t{step}": v for (m, step), v in self._steps.items()}
+        drills = {str(m): v for m, v in self._drills.items()}
+        tmp = self._path(SNAPSHOT_NAME) + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"offset": offset, "steps": steps, "drills": drills}, f)
+        os.replace(tmp, self._path(SNAPSHOT_NAME))
+
+    def close(self) -> None:
+        """Closes the log file descriptor."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
@@ -0,0 +1,142 @@
+"""
+Precompiled on-disk question banks. compile_bank writes one binary file per format:
+a header, fixed-width records with each question's bits, fields and answer keys, an
+offset index and the variable-length exact decimal expansions those offsets point
+into. QuestionBank memory-maps the file and decodes question k in O(1) straight from
+the map, so a bank of millions of questions costs no resident memory until its
+pages are touched and no round recomputes the ground truth. Feedback text is not
+stored: the step-by-step explanation shown after a wrong answer is still built at
+runtime by src.derivation.derive, and only for the answers that need it.
+
+Layout (little-endian):
+    header   HEADER                 magic, version, preset name, question count
+    records  count * RECORD         bits, fraction, exponent, true exponent, sign, leading bit, class
+    index    (count + 1) * uint64   start of each question's text; the last entry is the end
+    text     ASCII                  exact decimal expansions
+"""
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterable, NamedTuple
+
+from src.engine import PRESETS, IEEEPresets, classify_bits, exact_decimal, extract_bit_fields
+
+MAGIC = b"IEEE754Q"
+VERSION = 1
+HEADER = struct.Struct("<8sH14sQ")
+RECORD = struct.Struct("<QQHhBBBx")
+_SPAN = struct.Struct("<QQ")
+CLASSES = ("zero", "subnormal", "normal", "inf", "nan")
+BANK_SUFFIX = ".qbank"
+
+class BankQuestion(NamedTuple):
+    """One precompiled question: the pattern, its fields and the answers the modes check."""
+    bits: int
+    sign: int
+    exponent: int
+    fraction: int
+    true_exponent: int
+    leading_bit: int
+    cls: str
+    exact: str
+
+def _preset_name(preset: IEEEPresets) -> str:
+    for name, known in PRESETS.items():
+        if known == preset:
+            return name
+    raise ValueError(f"Preset {preset} has no name in engine.PRESETS.")
+
+def bank_path(directory: str, preset: IEEEPresets) -> str:
+    """Conventional file name of a preset's bank in `directory`, e.g. float32.qbank."""
+    return os.path.join(directory, _preset_name(preset).lower() + BANK_SUFFIX)
+
+def compile_bank(path: str, preset: IEEEPresets, patterns: Iterable[int]) -> int:
+    """
+    Writes the questions for `patterns` (bit patterns of `preset`) to `path` and returns
+    how many were written. Records stream to the file as they are built; only the offset
+    index is kept in memory. The file is replaced atomically. Raises ValueError, leaving
+    any existing bank in place, when `patterns` is empty: modes cannot sample an empty bank.
+    """
+    name = _preset_name(preset)
+    offsets = array("Q", [0])
+    # Bypass exact_decimal's LRU so compiling millions of patterns does not fill it
+    expand = exact_decimal.__wrapped__
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as out, tempfile.TemporaryFile() as text:
+        out.write(b"\0" * HEADER.size)
+        for bits in patterns:
+            s, e, f = extract_bit_fields(bits, preset)
+            # A subnormal's true exponent is fixed at 1 - bias and it has no implicit leading 1
+            true_e, lead = (1 - preset.bias, 0) if e == 0 else (e - preset.bias, 1)
+            out.write(RECORD.pack(bits, f, e, true_e, s, lead, CLASSES.index(classify_bits(bits, preset))))
+            expansion = expand(bits, preset).encode("ascii")
+            text.write(expansion)
+            offsets.append(offsets[-1] + len(expansion))
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        offsets.tofile(out)
+        text.seek(0)
+        shutil.copyfileobj(text, out)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, name.encode("ascii"), len(offsets) - 1))
+    if len(offsets) == 1:
+        os.remove(tmp)
+        raise ValueError(f"No patterns to compile into {path}; a bank needs at least one question.")
+    os.replace(tmp, path)
+    return len(offsets) - 1
+
+class QuestionBank:
+    """Read-only, memory-mapped view of a compiled bank; `bank[k]` is a BankQuestion."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, name, count = HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} question bank.")
+        self.preset = PRESETS[name.rstrip(b"\0").decode("ascii")]
+        self._count = count
+        self._index = HEADER.size + count * RECORD.size
+        self._text = self._index + (count + 1) * 8
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, k: int) -> BankQuestion:
+        if not 0 <= k < self._count:
+            raise IndexError(f"Question {k} is outside a bank of {self._count}.")
+        bits, f, e, true_e, s, lead, cls = RECORD.unpack_from(self._map, HEADER.size + k * RECORD.size)
+        start, end = _SPAN.unpack_from(self._map, self._index + 8 * k)
+        exact = self._map[self._text + start:self._text + end].decode("ascii")
+        return BankQuestion(bits, s, e, f, true_e, lead, CLASSES[cls], exact)
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "QuestionBank":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def open_banks(directory: str) -> Dict[IEEEPresets, QuestionBank]:
+    """Opens every preset's bank found in `directory` (see bank_path), keyed by preset; empty banks are skipped."""
+    banks = {}
+    for preset in PRESETS.values():
+        path = bank_path(directory, preset)
+        if os.path.exists(path):
+            bank = QuestionBank(path)
+            if len(bank):
+                banks[preset] = bank
+            else:
+                bank.close()
+    return banks
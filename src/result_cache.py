@@ -0,0 +1,113 @@
+"""
+Opt-in bounded result cache for engine conversions. BoundedCache is a thread-safe
+LRU mapping with hit/miss/eviction counters; CachedEngine puts one in front of
+float_to_bin32/64, extract_fields and the exact-decimal explanation text, keyed
+on the preset and the input bits, so skewed traffic (0.1, 1.0, powers of two)
+is served from memory while the footprint stays capped.
+"""
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Tuple
+
+from src.engine import FLOAT32, FLOAT64, IEEEPresets, exact_decimal, extract_fields, float_to_bin32, float_to_bin64
+
+_DOUBLE = struct.Struct('>d')
+_MISSING = object()
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a BoundedCache at one point in time."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class BoundedCache:
+    """Size-bounded LRU mapping; every operation holds one lock, so threads can share it."""
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, computing and storing it on a miss.
+        `compute` runs outside the lock, so concurrent misses on one key may both compute it.
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Stores `value`, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._data), self.maxsize)
+
+    def clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+def _layout(preset: IEEEPresets) -> Tuple[int, int]:
+    """
+    The key part naming a preset. Hashing the frozen dataclass itself rehashes all four
+    fields on every lookup, which costs more than the cheaper conversions being cached.
+    """
+    return preset.e_bits, preset.f_bits
+
+class CachedEngine:
+    """
+    Engine conversions behind one shared BoundedCache. Float inputs are keyed by their
+    float64 bytes, so 0.0/-0.0 and NaN payloads stay distinct.
+    """
+    def __init__(self, maxsize: int = 4096):
+        self.cache = BoundedCache(maxsize)
+
+    def float_to_bin32(self, value: float) -> str:
+        return self.cache.get_or_compute(("bin32", _DOUBLE.pack(value)), lambda: float_to_bin32(value))
+
+    def float_to_bin64(self, value: float) -> str:
+        return self.cache.get_or_compute(("bin64", _DOUBLE.pack(value)), lambda: float_to_bin64(value))
+
+    def extract_fields(self, binary_str: str, preset: IEEEPresets) -> Tuple[int, int, int]:
+        return self.cache.get_or_compute(("fields", _layout(preset), binary_str),
+                                         lambda: extract_fields(binary_str, preset))
+
+    def exact_decimal(self, bits: int, preset: IEEEPresets) -> str:
+        # Bypass the engine's own lru_cache so the entry is only held (and bounded) here
+        return self.cache.get_or_compute(("exact", _layout(preset), bits), lambda: exact_decimal.__wrapped__(bits, preset))
+
+    def stats(self) -> CacheStats:
+        return self.cache.stats()
@@ -0,0 +1,102 @@
+"""
+Spaced-repetition scheduler: every (mode, question) item carries a due time and an
+SM-2 style ease factor. Each mode keeps its items in a binary heap ordered by due
+time, so picking the next question and rescheduling a reviewed one are O(log n),
+which keeps rounds instant even for generated banks of hundreds of thousands of items.
+"""
+import heapq
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# Intervals in seconds: a missed item comes back within the session, learned ones drift apart
+RETRY_INTERVAL = 30.0
+FIRST_INTERVAL = 60.0
+SECOND_INTERVAL = 600.0
+
+class Card:
+    """Scheduling state of one item. `version` invalidates its older heap entries."""
+    __slots__ = ("due", "ease", "interval", "reps", "lapses", "version", "order")
+
+    def __init__(self, due: float, order: float):
+        self.due = due
+        self.ease = DEFAULT_EASE
+        self.interval = 0.0
+        self.reps = 0
+        self.lapses = 0
+        self.version = 0
+        self.order = order
+
+class Scheduler:
+    """
+    Per-mode heaps of (due, order, index, version) entries over the mode's question indices.
+    A review pushes a fresh entry instead of re-heapifying; stale entries are dropped lazily
+    when they reach the top, and a heap is rebuilt once it holds twice as many entries as items.
+    """
+    def __init__(self, clock: Callable[[], float] = time.time, seed: Optional[int] = None):
+        self.clock = clock
+        self._rng = random.Random(seed)
+        self._cards: Dict[int, List[Card]] = {}
+        self._heaps: Dict[int, list] = {}
+
+    def ensure(self, mode_id: int, count: int) -> None:
+        """Registers question indices up to `count` for `mode_id`; new items are due now, in random order."""
+        cards = self._cards.setdefault(mode_id, [])
+        heap = self._heaps.setdefault(mode_id, [])
+        now = self.clock()
+        for index in range(len(cards), count):
+            card = Card(now, self._rng.random())
+            cards.append(card)
+            heapq.heappush(heap, (card.due, card.order, index, card.version))
+
+    def size(self, mode_id: int) -> int:
+        """Number of items registered for `mode_id`."""
+        return len(self._cards.get(mode_id, ()))
+
+    def card(self, mode_id: int, index: int) -> Card:
+        """Scheduling state of one item."""
+        return self._cards[mode_id][index]
+
+    def next_index(self, mode_id: int) -> int:
+        """Index of the item due soonest (the earliest one when nothing is due yet)."""
+        heap = self._heaps.get(mode_id)
+        if not heap:
+            raise ValueError(f"No items are registered for mode {mode_id}.")
+        cards = self._cards[mode_id]
+        while heap[0][3] != cards[heap[0][2]].version:
+            heapq.heappop(heap)
+        return heap[0][2]
+
+    def review(self, mode_id: int, index: int, correct: bool) -> None:
+        """Reschedules an item after it was answered (SM-2: ease drops on a lapse, intervals grow by it otherwise)."""
+        card = self._cards[mode_id][index]
+        if correct:
+            card.reps += 1
+            if card.reps == 1:
+                card.interval = FIRST_INTERVAL
+            elif card.reps == 2:
+                card.interval = SECOND_INTERVAL
+            else:
+                card.interval *= card.ease
+            card.ease += 0.1
+        else:
+            card.reps = 0
+            card.lapses += 1
+            card.interval = RETRY_INTERVAL
+            card.ease = max(MIN_EASE, card.ease - 0.2)
+        card.due = self.clock() + card.interval
+        card.version += 1
+
+        heap = self._heaps[mode_id]
+        heapq.heappush(heap, (card.due, card.order, index, card.version))
+        if len(heap) > 2 * len(self._cards[mode_id]) + 64:
+            self._rebuild(mode_id)
+
+    def _rebuild(self, mode_id: int) -> None:
+        """Drops every stale entry of a mode's heap in O(n)."""
+        cards = self._cards[mode_id]
+        heap = [(c.due, c.order, i, c.version) for i, c in enumerate(cards)]
+        heapq.heapify(heap)
+        self._heaps[mode_id] = heap
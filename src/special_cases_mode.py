@@ -1,80 +1,58 @@
-import random
+from typing import NamedTuple, Tuple
 from src.base_mode import BaseMode
 from src.ui import prompt_input, clear_screen, UserQuitException
 
+class SpecialCase(NamedTuple):
+    """A Mode 6 special value and its sign bit, exponent class and fraction class."""
+    name: str
+    sign: str
+    exp: str
+    frac: str
+
+QUESTIONS: Tuple[SpecialCase, ...] = (
+    SpecialCase(name="Positive Infinity (+INF)", sign="0", exp="1s", frac="0s"),
+    SpecialCase(name="Negative Infinity (-INF)", sign="1", exp="1s", frac="0s"),
+    SpecialCase(name="Positive NaN (+NaN)", sign="0", exp="1s", frac="NZ"),
+    SpecialCase(name="Negative NaN (-NaN)", sign="1", exp="1s", frac="NZ"),
+    SpecialCase(name="Positive Zero (+0)", sign="0", exp="0s", frac="0s"),
+    SpecialCase(name="Negative Zero (-0)", sign="1", exp="0s", frac="0s"),
+)
+
 class SpecialCasesMode(BaseMode):
     """Handles Mode 6: Special Cases (NaN, INF, 0)."""
     
     def __init__(self):
         super().__init__()
-
-        self.questions = [
-            {
-                "name": "Positive Infinity (+INF)",
-                "sign": "0",
-                "exp": "1s",
-                "frac": "0s"
-            },
-            {
-                "name": "Negative Infinity (-INF)",
-                "sign": "1",
-                "exp": "1s",
-                "frac": "0s"
-            },
-            {
-                "name": "Positive NaN (+NaN)",
-                "sign": "0",
-                "exp": "1s",
-                "frac": "NZ"
-            },
-            {
-                "name": "Negative NaN (-NaN)",
-                "sign": "1",
-                "exp": "1s",
-                "frac": "NZ"
-            },
-             {
-                "name": "Positive Zero (+0)",
-                "sign": "0",
-                "exp": "0s",
-                "frac": "0s"
-            },
-            {
-                "name": "Negative Zero (-0)",
-                "sign": "1",
-                "exp": "0s",
-                "frac": "0s"
-            }
-        ]
+        self.questions = QUESTIONS
 
     def run_round(self) -> bool:
-        target = random.choice(self.questions)
+        target = self.select_question(self.questions)
         
         try:
             clear_screen()
             print("-" * 60)
             print("MODE 6: Special Cases (32-bit)")
             print("-" * 60)
-            print(f"Identify the required bit patterns for encoding: {target['name']}\n")
+            print(f"Identify the required bit patterns for encoding: {target.name}\n")
             
             # Step 1: Sign
             print("Step 1: Enter the sign bit (s):")
             ans_s = prompt_input("")
-            if ans_s == target['sign']:
+            if self.record_attempt("sign", ans_s == target.sign):
                 print("Correct.\n")
             else:
-                explanation = "0 for positive" if target['sign'] == "0" else "1 for negative"
-                print(f"Incorrect. The sign revolves around {explanation}, so s = {target['sign']}.\n")
+                explanation = "0 for positive" if target.sign == "0" else "1 for negative"
+                print(f"Incorrect. The sign revolves around {explanation}, so s = {target.sign}.\n")
                 
             # Step 2: Exponent
             print("Step 2: Exponent Pattern")
             print("Enter the exponent pattern ('0s', '1s', or 'N' for neither):")
             ans_e = prompt_input("").strip()
-            if ans_e.lower() == target['exp'].lower() or \
-               ans_e.lower() + "s" == target['exp'].lower(): # allow "0" for "0s"
-                print(f"Correct. (All {target['exp']})\n")
+            if self.record_attempt("exponent", ans_e.lower() == target.exp.lower() or \
+               ans_e.lower() + "s" == target.exp.lower()): # allow "0" for "0s"
+                print(f"Correct. (All {target.exp})\n")
             else:
-                if target['exp'] == "1s":
+                if target.exp == "1s":
                     print(f"Incorrect. Infinity and NaN require the maximum exponent of all 1s (255).\n")
                 else:
                     print(f"Incorrect. Zero requires the minimum exponent of all 0s (0).\n")
@@ -83,10 +61,10 @@ class SpecialCasesMode(BaseMode):
             print("Step 3: Fraction Pattern")
             print("Enter the fraction pattern ('0s' or 'NZ' for non-zero):")
             ans_f = prompt_input("").strip().upper()
-            if ans_f == target['frac'] or ans_f + "s" == target['frac'] or ans_f + "S" == target['frac']:
-                print(f"Correct. ({'All 0s' if target['frac'] == '0s' else 'Non-Zero'})\n")
+            if self.record_attempt("fraction", ans_f == target.frac or ans_f + "s" == target.frac or ans_f + "S" == target.frac):
+                print(f"Correct. ({'All 0s' if target.frac == '0s' else 'Non-Zero'})\n")
             else:
-                if target['frac'] == "0s":
+                if target.frac == "0s":
                     print(f"Incorrect. Infinity and Zero require empty fractions (all 0s) so they aren't parsed as NaN or subnormals.\n")
                 else:
                     print(f"Incorrect. NaN requires a non-zero (NZ) fraction to distinguish it from Infinity.\n")
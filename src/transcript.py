@@ -0,0 +1,206 @@
+"""
+Keystroke transcripts: TranscriptRecorder captures a real session (the RNG seed,
+then every prompt and answer with its time offset, and the verdict of every graded
+step) as JSON Lines, and replay() drives main.py or any BaseMode from a transcript
+with no terminal and at full speed, reporting prompts and verdicts that no longer
+match the recording. Prompts are mostly empty, so the verdicts are what catch a
+change in question generation or grading.
+
+The scheduler's clock is the offset of the latest answer in both cases, so a
+replay picks exactly the questions the recorded session saw.
+"""
+import contextlib
+import gzip
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from src.scheduler import Scheduler
+from src.ui import set_input_source
+
+TRANSCRIPT_VERSION = 2
+
+def _open_text(path: str, mode: str):
+    """Opens `path` as text, gzip-compressed when it ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+@dataclass
+class Transcript:
+    """
+    A recorded session: `entries` are (seconds since start, prompt message, raw answer) and
+    `verdicts` are (answers given so far, mode id, step, correct) for every graded step.
+    """
+    seed: int
+    target: str = "main"
+    entries: List[Tuple[float, str, str]] = field(default_factory=list)
+    verdicts: List[Tuple[int, Optional[int], str, bool]] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str) -> "Transcript":
+        """Reads a transcript (plain or .gz JSON Lines); a torn final line is ignored."""
+        with _open_text(path, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("transcript") != TRANSCRIPT_VERSION:
+                raise ValueError(f"{path} is not a version {TRANSCRIPT_VERSION} transcript.")
+            entries, verdicts = [], []
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if isinstance(record, dict):
+                    verdicts.append(_verdict(record))
+                else:
+                    t, message, answer = record
+                    entries.append((t, message, answer))
+        return cls(header["seed"], header.get("target", "main"), entries, verdicts)
+
+    def save(self, path: str) -> None:
+        """Writes the transcript as JSON Lines (gzip-compressed for .gz paths)."""
+        with _open_text(path, "w") as f:
+            f.write(json.dumps({"transcript": TRANSCRIPT_VERSION, "seed": self.seed, "target": self.target}) + "\n")
+            verdicts = iter(self.verdicts)
+            verdict = next(verdicts, None)
+            for position, entry in enumerate(self.entries, 1):
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                # Each verdict follows the answer that produced it
+                while verdict is not None and verdict[0] <= position:
+                    f.write(_verdict_line(verdict))
+                    verdict = next(verdicts, None)
+            while verdict is not None:
+                f.write(_verdict_line(verdict))
+                verdict = next(verdicts, None)
+
+def _verdict(record: dict) -> Tuple[int, Optional[int], str, bool]:
+    return record["after"], record["mode"], record["step"], record["correct"]
+
+def _verdict_line(verdict: Tuple[int, Optional[int], str, bool]) -> str:
+    after, mode_id, step, correct = verdict
+    return json.dumps({"after": after, "mode": mode_id, "step": step, "correct": correct}, separators=(",", ":")) + "\n"
+
+class TranscriptRecorder:
+    """
+    Input source for `set_input_source` that reads from the terminal and appends each
+    answer and step verdict to `path` as it is given, so a session that crashes keeps its
+    transcript. Seeds the global RNG with `seed` (a random one if None).
+    """
+    def __init__(self, path: str, seed: Optional[int] = None, target: str = "main"):
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        random.seed(self.seed)
+        self._start = time.monotonic()
+        self._now = 0.0
+        self._answers = 0
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"transcript": TRANSCRIPT_VERSION, "seed": self.seed, "target": target}) + "\n")
+        self._file.flush()
+
+    def __call__(self, message: str) -> str:
+        answer = input(">> ")
+        self._now = round(time.monotonic() - self._start, 3)
+        self._answers += 1
+        self._file.write(json.dumps([self._now, message, answer], separators=(",", ":")) + "\n")
+        self._file.flush()
+        return answer
+
+    def observe_step(self, mode_id: Optional[int], step: str, correct: bool) -> None:
+        """Called by BaseMode.record_attempt for every graded step."""
+        self._file.write(_verdict_line((self._answers, mode_id, step, correct)))
+        self._file.flush()
+
+    def clock(self) -> float:
+        """Session time as of the latest answer (the scheduler clock while recording)."""
+        return self._now
+
+    def close(self) -> None:
+        self._file.close()
+
+class TranscriptExhausted(Exception):
+    """Raised internally when a replay asks for more answers than were recorded."""
+
+class TranscriptReplayer:
+    """Input source that answers from a transcript and notes prompts and verdicts that differ from the recording."""
+    def __init__(self, transcript: Transcript):
+        self.transcript = transcript
+        self.position = 0
+        self.mismatches: List[Tuple[int, str, str]] = []
+        self.verdicts: List[Tuple[int, Optional[int], str, bool]] = []
+        self._now = 0.0
+
+    def __call__(self, message: str) -> str:
+        if self.position >= len(self.transcript.entries):
+            raise TranscriptExhausted()
+        t, expected, answer = self.transcript.entries[self.position]
+        if message != expected:
+            self.mismatches.append((self.position, expected, message))
+        self.position += 1
+        self._now = t
+        return answer
+
+    def observe_step(self, mode_id: Optional[int], step: str, correct: bool) -> None:
+        self.verdicts.append((self.position, mode_id, step, correct))
+
+    def verdict_mismatches(self) -> List[Tuple[int, str, str]]:
+        """(answer position, recorded verdict, replayed verdict) for graded steps that differ, up to the first divergence."""
+        recorded, replayed = self.transcript.verdicts, self.verdicts
+        for i in range(max(len(recorded), len(replayed))):
+            expected = recorded[i] if i < len(recorded) else None
+            actual = replayed[i] if i < len(replayed) else None
+            if expected != actual:
+                # Later verdicts follow from the first divergence, so only it is reported
+                position = (expected or actual)[0]
+                return [(position, _describe(expected), _describe(actual))]
+        return []
+
+    def clock(self) -> float:
+        """Recorded time of the latest replayed answer."""
+        return self._now
+
+def _describe(verdict: Optional[Tuple[int, Optional[int], str, bool]]) -> str:
+    if verdict is None:
+        return "no graded step"
+    _, mode_id, step, correct = verdict
+    return f"mode {mode_id} {step}: {'correct' if correct else 'incorrect'}"
+
+@dataclass
+class ReplayResult:
+    """Outcome of replaying one transcript."""
+    answers: int
+    recorded: int
+    mismatches: List[Tuple[int, str, str]]
+    exhausted: bool
+    seconds: float
+    verdict_mismatches: List[Tuple[int, str, str]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if every recorded answer was consumed, with matching prompts and verdicts and nothing more asked."""
+        return (not self.mismatches and not self.verdict_mismatches and not self.exhausted
+                and self.answers == self.recorded)
+
+def replay(transcript: Transcript, run: Callable[[Scheduler], None]) -> ReplayResult:
+    """
+    Replays `transcript` headlessly: seeds the RNG, routes prompt_input to the recording,
+    discards output and calls `run(scheduler)` (which drives main() or a mode) until it
+    returns, exits or runs out of recorded answers.
+    """
+    replayer = TranscriptReplayer(transcript)
+    random.seed(transcript.seed)
+    exhausted = False
+    set_input_source(replayer, headless=True)
+    start = time.perf_counter()
+    try:
+        with open(os.devnull, "w") as null, contextlib.redirect_stdout(null):
+            run(Scheduler(clock=replayer.clock, seed=transcript.seed))
+    except SystemExit:
+        pass
+    except TranscriptExhausted:
+        exhausted = True
+    finally:
+        set_input_source(None)
+    return ReplayResult(replayer.position, len(transcript.entries), replayer.mismatches,
+                        exhausted, time.perf_counter() - start, replayer.verdict_mismatches())
@@ -1,17 +1,211 @@
 """
 UI module handling user input, formatting, and the central context quit mechanism.
+
+By default output goes to the terminal with print() and a full clear between screens.
+run_curses() swaps in an optional full-screen curses front end (CursesScreen) that keeps
+a persistent layout and redraws only the lines that changed; modes run through it unchanged.
 """
 import os
-from typing import Any, List, Dict
+import re
+import sys
+import time
+from typing import Any, List, Dict, Optional, Tuple
+
+try:
+    import curses
+except ImportError:  # e.g. Windows builds of CPython; the plain terminal UI still works
+    curses = None
+
+# Optional LatencyRecorder fed by prompt_input (see src/latency.py); None disables timing
+_latency_recorder = None
+_last_answer_at: Optional[float] = None
+# Optional callable(message) -> answer replacing the terminal (see src/transcript.py); headless skips clearing
+_input_source = None
+_headless = False
+# Active CursesScreen while run_curses() is running; None means the plain terminal
+_screen = None
+
+QUIT_HINT = "Press `q` to exit."
+# A labelled field ("Sign:     0", "Exponent: 01111111") or a whole 32/64-bit pattern
+_FIELD_LABEL = re.compile(r"^(Sign|Exponent|Fraction):\s*(\S+)")
+_BIT_PATTERN = re.compile(r"(?<![01])([01]{64}|[01]{32})(?![01])")
+_FIELD_WIDTHS = {32: (1, 8, 23), 64: (1, 11, 52)}
+_FIELDS = ("sign", "exponent", "fraction")
 
 class UserQuitException(Exception):
     """Raised when the user enters 'q' to abort the current context."""
     pass
 
 def clear_screen() -> None:
-    """Clear the terminal screen."""
+    """Clear the terminal screen (skipped in headless runs; under curses only the body is reset)."""
+    if _headless:
+        return
+    if _screen is not None:
+        _screen.clear()
+        return
     os.system('cls' if os.name == 'nt' else 'clear')
 
+def field_spans(line: str) -> List[Tuple[int, int, str]]:
+    """
+    The (start, end, field) spans of `line` to colour as sign, exponent or fraction:
+    the value of a "Sign:"/"Exponent:"/"Fraction:" line, or the three fields of a
+    32- or 64-bit pattern written out in full.
+    """
+    label = _FIELD_LABEL.match(line)
+    if label:
+        return [(label.start(2), label.end(2), label.group(1).lower())]
+    spans = []
+    for match in _BIT_PATTERN.finditer(line):
+        start = match.start()
+        for field, width in zip(_FIELDS, _FIELD_WIDTHS[len(match.group())]):
+            spans.append((start, start + width, field))
+            start += width
+    return spans
+
+class CursesScreen:
+    """
+    Full-screen curses front end. Printed text accumulates in a scrolling body; the
+    last two rows are a fixed quit hint and the `>>` prompt. Every render compares
+    the new frame with what is on screen and rewrites only the rows that differ.
+
+    Installed as sys.stdout by run_curses(), so modes keep using print().
+    """
+    FIELD_COLORS = {"sign": "COLOR_BLUE", "exponent": "COLOR_GREEN", "fraction": "COLOR_RED"}
+
+    def __init__(self, window):
+        self.window = window
+        self.lines: List[str] = []
+        self._partial = ""
+        self._shown: List[Optional[str]] = []
+        self._size: Tuple[int, int] = (0, 0)
+        self._attrs = {field: curses.A_BOLD for field in _FIELDS}
+        # Lets curses send a terminal scroll instead of rewriting every row when the body scrolls
+        window.idlok(True)
+        if curses.has_colors():
+            curses.start_color()
+            try:
+                curses.use_default_colors()
+                background = -1
+            except curses.error:
+                background = curses.COLOR_BLACK
+            for pair, field in enumerate(_FIELDS, start=1):
+                curses.init_pair(pair, getattr(curses, self.FIELD_COLORS[field]), background)
+                self._attrs[field] = curses.color_pair(pair)
+
+    def write(self, text: str) -> int:
+        """File-like write: complete lines join the body, a trailing partial line waits for its newline."""
+        *complete, self._partial = (self._partial + text).split("\n")
+        self.lines.extend(complete)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        """Empties the body; the terminal is not cleared, the next render rewrites only what changed."""
+        self.lines = []
+        self._partial = ""
+
+    def render(self, prompt: str = ">> ") -> int:
+        """Brings the screen up to date and returns the number of rows rewritten."""
+        height, width = self.window.getmaxyx()
+        if (height, width) != self._size:
+            # First frame or a resize: nothing on screen can be trusted
+            self._size = (height, width)
+            self._shown = [None] * height
+            self.window.clear()
+        body_rows = max(0, height - 2)
+        usable = max(1, width - 1)
+        # Wrap like a terminal would, walking back from the newest line until the body is full
+        body: List[str] = []
+        for line in reversed(self.lines):
+            if len(body) >= body_rows:
+                break
+            body[:0] = [line[i:i + usable] for i in range(0, len(line), usable)] or [""]
+        body = body[max(0, len(body) - body_rows):] if body_rows else []
+        frame = body + [""] * (body_rows - len(body)) + [QUIT_HINT, prompt]
+        redrawn = 0
+        for row, text in enumerate(frame[len(frame) - height:]):
+            text = text[:usable]
+            if self._shown[row] != text:
+                self._draw(row, text)
+                self._shown[row] = text
+                redrawn += 1
+        self.window.refresh()
+        return redrawn
+
+    def _draw(self, row: int, text: str) -> None:
+        self.window.move(row, 0)
+        self.window.clrtoeol()
+        pos = 0
+        for start, end, field in field_spans(text):
+            if start > pos:
+                self.window.addstr(row, pos, text[pos:start])
+            self.window.addstr(row, start, text[start:end], self._attrs[field])
+            pos = end
+        if pos < len(text):
+            self.window.addstr(row, pos, text[pos:])
+
+    def read_line(self, prompt: str = ">> ") -> str:
+        """Renders, reads one line at the prompt row and echoes it into the body like a terminal would."""
+        if self._partial:
+            self.write("\n")
+        self.render(prompt)
+        height, width = self._size
+        curses.echo()
+        try:
+            raw = self.window.getstr(height - 1, len(prompt), max(1, width - len(prompt) - 1))
+        finally:
+            curses.noecho()
+        answer = raw.decode("utf-8", "replace")
+        self.lines.append(prompt + answer)
+        # The typed characters are on the prompt row now; the next render must rewrite it
+        self._shown[height - 1] = None
+        return answer
+
+def run_curses(fn, *args, **kwargs):
+    """
+    Runs fn(*args, **kwargs) inside the curses front end (terminal restored afterwards,
+    also on exceptions and sys.exit). Raises RuntimeError where curses is unavailable.
+    """
+    if curses is None:
+        raise RuntimeError("The curses interface is not available on this platform.")
+    return curses.wrapper(_run_in_screen, fn, args, kwargs)
+
+def _run_in_screen(window, fn, args: tuple, kwargs: dict):
+    global _screen
+    screen = CursesScreen(window)
+    saved_stdout = sys.stdout
+    _screen, sys.stdout = screen, screen
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _screen, sys.stdout = None, saved_stdout
+
+def set_input_source(source, headless: bool = False) -> None:
+    """
+    Routes prompt_input answers through `source(message) -> str` instead of the terminal
+    (None restores input()). `headless` also turns clear_screen into a no-op. A source
+    with an observe_step(mode_id, step, correct) method also sees every graded step.
+    """
+    global _input_source, _headless
+    _input_source = source
+    _headless = headless
+
+def get_input_source():
+    """The installed input source, or None for the terminal."""
+    return _input_source
+
+def set_latency_recorder(recorder) -> None:
+    """Installs (or with None removes) the LatencyRecorder that times every answer."""
+    global _latency_recorder, _last_answer_at
+    _latency_recorder = recorder
+    _last_answer_at = None
+
+def get_latency_recorder():
+    """The installed LatencyRecorder, or None."""
+    return _latency_recorder
+
 def prompt_input(message: str) -> str:
     """
     Prompts the user for input, automatically appending the quit instructions 
@@ -20,28 +214,53 @@ def prompt_input(message: str) -> str:
     Raises:
         UserQuitException: if the user types 'q' (case-insensitive).
     """
+    global _last_answer_at
+    recorder = _latency_recorder
+    if recorder is not None:
+        shown_at = time.monotonic()
     if message:
         print(message)
-    print("Press `q` to exit.")
-    user_input = input(">> ").strip()
+    # Under curses the quit hint is a fixed row of the layout rather than a printed line
+    if _screen is None:
+        print(QUIT_HINT)
+    if _input_source is not None:
+        user_input = _input_source(message)
+    elif _screen is not None:
+        user_input = _screen.read_line()
+    else:
+        user_input = input(">> ")
+    user_input = user_input.strip()
+    if recorder is not None:
+        answered_at = time.monotonic()
+        recorder.answered(answered_at - shown_at,
+                          None if _last_answer_at is None else shown_at - _last_answer_at)
+        _last_answer_at = answered_at
     
     if user_input.lower() == 'q':
         raise UserQuitException()
         
     return user_input
 
-def display_main_menu(modes: Dict[int, str]) -> None:
+def display_main_menu(modes: Dict[int, str], scores: Optional[Dict[int, Optional[float]]] = None) -> None:
     """
     Prints the main menu and mode descriptions.
+    With `scores` (mode id -> accuracy percent, None if never attempted) an accuracy column is shown.
     """
     print("============================================================")
     print("                  IEEE 754 TUTOR TERMINAL")
     print("============================================================")
     print("")
-    print(" Mode Description")
-    print("------------------------------------------------------------")
-    
-    for mode_id, desc in modes.items():
-        print(f" {mode_id}. {desc}")
+    if scores is None:
+        print(" Mode Description")
+        print("------------------------------------------------------------")
+        for mode_id, desc in modes.items():
+            print(f" {mode_id}. {desc}")
+    else:
+        print("Accuracy | Mode Description")
+        print("---------+--------------------------------------------------")
+        for mode_id, desc in modes.items():
+            score = scores.get(mode_id)
+            cell = f"  {score:5.1f}% " if score is not None else "   --    "
+            print(f"{cell}| {mode_id}. {desc}")
     
     print("")
@@ -1,6 +1,14 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from src.engine import IEEEPresets, FLOAT32, FLOAT64, bin32_to_float, bin64_to_float, extract_fields, float_to_bin32, float_to_bin64
+from src.engine import (
+    FLOAT16, extract_bit_fields, decode_exact, round_exact, _rounds_up, bits_to_float,
+    exact_decimal, _pow5, float_to_bits, bits_to_hex, hex_to_bits, format_hex_float,
+    parse_hex_float, _words_to_array, parse_hex_words, hex_words_to_floats,
+    floats_to_hex_words, format_hex_floats, parse_hex_floats,
+    _buffer_view, iter_buffer_bits, iter_buffer_fields, iter_buffer_values,
+    ROUND_NEAREST_EVEN, ROUND_TOWARD_ZERO
+)
 from src.ui import UserQuitException, clear_screen, display_main_menu, prompt_input
 from src.base_mode import BaseMode
 from src.encode_mode import EncodeMode
@@ -40,6 +48,80 @@ class TestEverySingleDefinition(unittest.TestCase):
         b = float_to_bin64(1.0)
         self.assertEqual(b, "0011111111110000000000000000000000000000000000000000000000000000")
 
+    def test_engine_extract_bit_fields(self):
+        s, e, f = extract_bit_fields(0x3f800000, FLOAT32)
+        self.assertEqual((s, e, f), (0, 127, 0))
+
+    def test_engine_decode_exact(self):
+        self.assertEqual(decode_exact(0x3f800000, FLOAT32), (0, 1 << 23, -23))
+
+    def test_engine_rounds_up(self):
+        self.assertTrue(_rounds_up(ROUND_NEAREST_EVEN, 0, 1, 4, 4))
+        self.assertFalse(_rounds_up(ROUND_NEAREST_EVEN, 0, 0, 4, 4))
+        self.assertFalse(_rounds_up(ROUND_TOWARD_ZERO, 0, 1, 7, 4))
+
+    def test_engine_bits_to_float(self):
+        self.assertEqual(bits_to_float(0x3c00, FLOAT16), 1.0)
+        self.assertEqual(bits_to_float(0xff800000, FLOAT32), float('-inf'))
+
+    def test_engine_pow5(self):
+        self.assertEqual(_pow5(3), 125)
+
+    def test_engine_exact_decimal(self):
+        self.assertEqual(exact_decimal(0x3e000000, FLOAT32), "0.125")
+
+    def test_engine_float_to_bits(self):
+        self.assertEqual(float_to_bits(1.0, FLOAT16), 0x3c00)
+
+    def test_engine_bits_to_hex(self):
+        self.assertEqual(bits_to_hex(0x3c00, FLOAT16), "0x3c00")
+
+    def test_engine_hex_to_bits(self):
+        self.assertEqual(hex_to_bits("0x3f800000", FLOAT32), 0x3f800000)
+
+    def test_engine_format_hex_float(self):
+        self.assertEqual(format_hex_float(0x40400000, FLOAT32), "0x1.8p+1")
+
+    def test_engine_parse_hex_float(self):
+        self.assertEqual(parse_hex_float("0x1.8p+1", FLOAT32), 0x40400000)
+
+    def test_engine_words_to_array(self):
+        self.assertEqual(list(_words_to_array(["3c00", "0x1"], FLOAT16)), [0x3c00, 1])
+        with self.assertRaises(ValueError):
+            _words_to_array(["0x"], FLOAT16)
+
+    def test_engine_parse_hex_words(self):
+        self.assertEqual(list(parse_hex_words("3f800000 40000000", FLOAT32)), [0x3f800000, 0x40000000])
+
+    def test_engine_hex_words_to_floats(self):
+        self.assertEqual(list(hex_words_to_floats(["3f800000"], FLOAT32)), [1.0])
+
+    def test_engine_floats_to_hex_words(self):
+        self.assertEqual(floats_to_hex_words([1.0], FLOAT64), ["0x3ff0000000000000"])
+
+    def test_engine_format_hex_floats(self):
+        self.assertEqual(format_hex_floats([0x3c00], FLOAT16), ["0x1p+0"])
+
+    def test_engine_parse_hex_floats(self):
+        self.assertEqual(list(parse_hex_floats(["0x1p+0"], FLOAT16)), [0x3c00])
+
+    def test_engine_buffer_view(self):
+        self.assertEqual(len(_buffer_view(b"\x00" * 8, FLOAT32, "little")), 8)
+
+    def test_engine_iter_buffer_bits(self):
+        self.assertEqual(list(iter_buffer_bits(bytes.fromhex("3f800000"), FLOAT32, "big")), [0x3f800000])
+
+    def test_engine_iter_buffer_fields(self):
+        self.assertEqual(list(iter_buffer_fields(bytes.fromhex("3f800000"), FLOAT32, "big")), [(0, 127, 0)])
+
+    def test_engine_iter_buffer_values(self):
+        self.assertEqual(list(iter_buffer_values(bytes.fromhex("3f800000"), FLOAT32, "big")), [1.0])
+
+    def test_engine_round_exact(self):
+        bits, flags = round_exact(0, 1, 0, FLOAT32)
+        self.assertEqual(bits, 0x3f800000)
+        self.assertEqual(flags, 0)
+
     # --- UI ---
     def test_ui_UserQuitException(self):
         with self.assertRaises(UserQuitException):
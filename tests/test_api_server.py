@@ -0,0 +1,307 @@
+import http.client
+import json
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.api_server import (
+    MAX_BATCH, MAX_DERIVATIONS, MAX_EXPONENT, MAX_NUMBER_CHARS, ApiError, EngineRequestHandler, _batch, _encode_value,
+    _is_hex, _json_float, _parse_bits, _parse_hex, _parse_value, _patterns, _preset, _round_ratio,
+    classify_bits, handle_classify, handle_decode, handle_derive, handle_encode, handle_fields, make_server
+)
+from src.engine import BFLOAT16, FLOAT16, FLOAT32, FLOAT64, exact_decimal
+from tools.load_generator import LoadReport, build_body, run_load
+
+class TestApiServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server(port=0)
+        cls.host, cls.port = cls.server.server_address[:2]
+        # A short poll interval so shutdown() returns promptly
+        cls.thread = threading.Thread(target=cls.server.serve_forever, args=(0.01,), daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def request(self, conn, method: str, path: str, payload=None, raw: bytes = None):
+        body = raw if raw is not None else (None if payload is None else json.dumps(payload).encode("utf-8"))
+        conn.request(method, path, body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_api_server_ApiError_init(self):
+        error = ApiError(413, "too big")
+        self.assertEqual((error.status, str(error)), (413, "too big"))
+
+    def test_api_server_preset(self):
+        self.assertIs(_preset({}), FLOAT32)
+        self.assertIs(_preset({"preset": "BFLOAT16"}), BFLOAT16)
+        for bad in ("FLOAT8", [], {"a": 1}):
+            with self.assertRaises(ApiError):
+                _preset({"preset": bad})
+
+    def test_api_server_batch(self):
+        self.assertEqual(_batch({"bits": 5}, "bits"), [5])
+        self.assertEqual(len(_batch({"bits": [0] * MAX_BATCH}, "bits")), MAX_BATCH)
+        with self.assertRaises(ApiError) as cm:
+            _batch({"bits": [0] * (MAX_BATCH + 1)}, "bits")
+        self.assertEqual(cm.exception.status, 413)
+
+    def test_api_server_parse_value(self):
+        self.assertEqual(_parse_value(2), 2.0)
+        self.assertEqual(_parse_value(" 0x1.8p1 "), 3.0)
+        self.assertEqual(str(_parse_value("-0.0")), "-0.0")
+        self.assertEqual(_parse_value("-inf"), float("-inf"))
+        for bad in ("abc", True, None, [1], 10 ** 400, "0x1p", "0x1.00000000000001p0"):
+            with self.assertRaises(ApiError):
+                _parse_value(bad)
+
+    def test_api_server_is_hex(self):
+        self.assertTrue(_is_hex(" -0X1.8p1"))
+        self.assertFalse(_is_hex("1.5"))
+        self.assertFalse(_is_hex(3))
+        with self.assertRaises(ApiError):
+            _is_hex(None)
+        # Exponents and lengths are bounded before anything is parsed
+        self.assertTrue(_is_hex(f"0x1p-{MAX_EXPONENT}"))
+        self.assertFalse(_is_hex(f"1e{MAX_EXPONENT}"))
+        self.assertFalse(_is_hex("0." + "0" * (MAX_NUMBER_CHARS - 3) + "1"))
+        for bad in (f"0x1p-{MAX_EXPONENT + 1}", "0x1p-20000000000", f"-1E+{MAX_EXPONENT + 1}",
+                    "0x" + "f" * MAX_NUMBER_CHARS):
+            with self.assertRaises(ApiError) as ctx:
+                _is_hex(bad)
+            self.assertEqual(ctx.exception.status, 400)
+
+    def test_api_server_parse_hex(self):
+        self.assertEqual(_parse_hex("0x1p-1", FLOAT16, "RNE"), 0x3800)
+        with self.assertRaises(ApiError):
+            _parse_hex("0xg", FLOAT16, "RNE")
+
+    def test_api_server_encode_value(self):
+        # 1 + 2^-11 + 2^-68 is just above a FLOAT16 tie, but rounds to the tie as a double
+        literal = "0x1.002" + "0" * 13 + "01p0"
+        self.assertEqual(_encode_value(literal, FLOAT16), 0x3C01)
+        self.assertEqual(_encode_value(literal, FLOAT16, "RTZ"), 0x3C00)
+        # The same holds for integers wider than a double's significand
+        self.assertEqual(_encode_value(2 ** 60 + 2 ** 36 + 1, FLOAT32), 0x5D800001)
+        self.assertEqual(_encode_value(-(10 ** 400), FLOAT32), 0xFF800000)
+        self.assertEqual(_encode_value(0, FLOAT32), 0)
+        self.assertEqual(_encode_value("0.1", FLOAT32), 0x3DCCCCCD)
+        # ...and for decimal strings: this one is just below float32(0.1), but rounds up to it as a double
+        self.assertEqual(_encode_value("0.100000001490116119384765624", FLOAT32, "RTZ"), 0x3DCCCCCC)
+        self.assertEqual(_encode_value(" -1E-50 ", FLOAT32, "RTN"), 0x80000001)
+        self.assertEqual(_encode_value("-0.0", FLOAT16), 0x8000)
+        self.assertEqual(_encode_value("-inf", FLOAT16), 0xFC00)
+
+    def test_api_server_round_ratio(self):
+        self.assertEqual(_round_ratio(0, 1, 10, FLOAT32, "RNE"), 0x3DCCCCCD)
+        self.assertEqual(_round_ratio(0, 1, 10, FLOAT32, "RTZ"), 0x3DCCCCCC)
+        self.assertEqual(_round_ratio(1, 3, 1, FLOAT16, "RNE"), 0xC200)
+        # Bits far below a tie still break it upward
+        self.assertEqual(_round_ratio(0, 2 ** 24 + 2 ** 13 + 1, 2 ** 24, FLOAT16, "RNE"), 0x3C01)
+
+    def test_api_server_parse_bits(self):
+        self.assertEqual(_parse_bits("0x3c00", FLOAT16), 0x3C00)
+        self.assertEqual(_parse_bits(15360, FLOAT16), 0x3C00)
+        for bad in ("0xzz", 1 << 16, -1, 1.5, False):
+            with self.assertRaises(ApiError):
+                _parse_bits(bad, FLOAT16)
+
+    def test_api_server_patterns(self):
+        self.assertEqual(_patterns({"values": [1.0]}, FLOAT32), [0x3F800000])
+        self.assertEqual(_patterns({"bits": ["0x3f800000"]}, FLOAT32), [0x3F800000])
+        with self.assertRaises(ApiError):
+            _patterns({}, FLOAT32)
+
+    def test_api_server_json_float(self):
+        self.assertEqual([_json_float(v) for v in (1.5, float("nan"), float("inf"), float("-inf"))],
+                         [1.5, "nan", "inf", "-inf"])
+
+    def test_api_server_classify_bits(self):
+        cases = {0x0000: "zero", 0x0001: "subnormal", 0x3C00: "normal", 0x7C00: "inf", 0x7E00: "nan"}
+        for bits, name in cases.items():
+            self.assertEqual(classify_bits(bits, FLOAT16), name)
+
+    def test_api_server_handle_encode(self):
+        result = handle_encode({"preset": "FLOAT32", "values": [0.1, "nan", 1e39]})
+        self.assertEqual(result["bits"], ["0x3dcccccd", "0x7fc00000", "0x7f800000"])
+        self.assertEqual(handle_encode({"preset": "FLOAT16", "values": [1.0009765625 + 1e-9], "rounding": "RTZ"})["bits"],
+                         ["0x3c01"])
+        with self.assertRaises(ApiError):
+            handle_encode({"values": [1.0], "rounding": "UP"})
+        with self.assertRaises(ApiError):
+            handle_encode({"bits": [1]})
+
+    def test_api_server_handle_decode(self):
+        result = handle_decode({"preset": "FLOAT64", "bits": ["0x3ff0000000000000", "0xfff0000000000000"], "exact": True})
+        self.assertEqual(result["values"], [1.0, "-inf"])
+        self.assertEqual(result["exact"], ["1", "-inf"])
+        self.assertNotIn("exact", handle_decode({"bits": [0]}))
+        with self.assertRaises(ApiError):
+            handle_decode({"values": [1.0]})
+
+    def test_api_server_handle_fields(self):
+        self.assertEqual(handle_fields({"preset": "FLOAT32", "values": [-2.0]})["fields"], [[1, 128, 0]])
+        self.assertEqual(handle_fields({"preset": "FLOAT64", "bits": [1]})["fields"], [[0, 0, 1]])
+
+    def test_api_server_handle_classify(self):
+        result = handle_classify({"preset": "BFLOAT16", "values": [-0.0, 1e-40, "nan"]})
+        self.assertEqual(result["classes"], ["zero", "subnormal", "nan"])
+        self.assertEqual(result["signs"], [1, 0, 0])
+
+    def test_api_server_handle_derive(self):
+        # Patterns take precedence over values
+        result = handle_derive({"preset": "FLOAT16", "values": [1.5], "bits": ["0xc100"]})
+        self.assertEqual(result["derivations"][0]["value"], "-2.5")
+        steps = handle_derive({"values": [0.1]})["derivations"][0]["steps"]
+        self.assertEqual([step["name"] for step in steps], ["sign", "binary", "normalize", "round", "bias", "fraction", "result"])
+        self.assertEqual(steps[4]["result"], "01111011")
+        with self.assertRaises(ApiError) as ctx:
+            handle_derive({"values": [1.0] * (MAX_DERIVATIONS + 1)})
+        self.assertEqual(ctx.exception.status, 413)
+        with self.assertRaises(ApiError):
+            handle_derive({"preset": "FLOAT32"})
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        status, body = self.request(conn, "POST", "/v1/derive", {"preset": "BFLOAT16", "values": ["inf"]})
+        self.assertEqual((status, body["derivations"][0]["bits"]), (200, "0x7f80"))
+        conn.close()
+
+    def test_api_server_EngineRequestHandler(self):
+        # Many requests share one HTTP/1.1 connection
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        for i in range(20):
+            status, body = self.request(conn, "POST", "/v1/fields", {"preset": "FLOAT16", "bits": [i]})
+            self.assertEqual((status, body["fields"]), (200, [[0, 0, i]]))
+        self.assertEqual(EngineRequestHandler.protocol_version, "HTTP/1.1")
+        conn.close()
+
+    def test_api_server_do_GET(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        self.assertEqual(self.request(conn, "GET", "/healthz"), (200, {"status": "ok"}))
+        status, presets = self.request(conn, "GET", "/v1/presets")
+        self.assertEqual((status, presets["FLOAT16"]["f_bits"]), (200, 10))
+        self.assertEqual(self.request(conn, "GET", "/nope")[0], 404)
+        conn.close()
+
+    def test_api_server_do_POST(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        # A small batch limit; test_api_server_exhaustive.py sends a full MAX_BATCH
+        with patch("src.api_server.MAX_BATCH", 100):
+            status, body = self.request(conn, "POST", "/v1/decode", {"preset": "FLOAT32", "bits": list(range(100))})
+            self.assertEqual((status, len(body["values"])), (200, 100))
+            self.assertEqual(self.request(conn, "POST", "/v1/decode", {"bits": [0] * 101})[0], 413)
+        self.assertEqual(self.request(conn, "POST", "/v1/encode", raw=b"{not json")[0], 400)
+        self.assertEqual(self.request(conn, "POST", "/v1/encode", [1, 2])[0], 400)
+        self.assertEqual(self.request(conn, "POST", "/v1/missing", {})[0], 404)
+        # Wrongly typed fields are client errors, not dropped connections
+        self.assertEqual(self.request(conn, "POST", "/v1/encode", {"preset": [], "values": [1]})[0], 400)
+        self.assertEqual(self.request(conn, "POST", "/v1/derive", {"values": [10 ** 400]})[0], 400)
+        self.assertEqual(self.request(conn, "POST", "/v1/encode", {"values": [10 ** 400]})[1]["bits"], ["0x7f800000"])
+        # Absurd exponents are refused up front instead of tying up the worker
+        start = time.perf_counter()
+        for path in ("/v1/encode", "/v1/fields", "/v1/classify"):
+            status, body = self.request(conn, "POST", path, {"values": ["0x1p-1000000000"] * 100})
+            self.assertEqual(status, 400)
+            self.assertIn("Exponents are limited", body["error"])
+        self.assertLess(time.perf_counter() - start, 1.0)
+        # Decimal strings round once in the requested mode
+        payload = {"preset": "FLOAT32", "values": ["0.100000001490116119384765624"], "rounding": "RTZ"}
+        self.assertEqual(self.request(conn, "POST", "/v1/encode", payload)[1]["bits"], ["0x3dcccccc"])
+        with patch.dict("src.api_server.ROUTES", {"/v1/encode": lambda payload, cache: 1 / 0}), \
+             patch.object(self.server, "handle_error") as mock_error:
+            self.assertEqual(self.request(conn, "POST", "/v1/encode", {}), (500, {"error": "Internal server error."}))
+        self.assertTrue(mock_error.called)
+        conn.close()
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        # The connection is still usable after client errors
+        self.assertEqual(self.request(conn, "POST", "/v1/classify", {"values": [1.0]})[1]["classes"], ["normal"])
+        conn.close()
+        with patch("src.api_server.MAX_BODY_BYTES", 10):
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+            self.assertEqual(self.request(conn, "POST", "/v1/encode", {"values": [1.0, 2.0]})[0], 413)
+            conn.close()
+
+    def test_api_server_content_length(self):
+        for length, status in (("abc", 400), ("-5", 400), (str(10 ** 9), 413)):
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+            conn.putrequest("POST", "/v1/encode")
+            conn.putheader("Content-Length", length)
+            conn.endheaders()
+            response = conn.getresponse()
+            self.assertEqual(response.status, status)
+            self.assertIn("error", json.loads(response.read()))
+            # The body cannot be skipped, so the server closes the connection
+            self.assertEqual(response.getheader("Connection"), "close")
+            conn.close()
+
+    def test_api_server_send_json(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        conn.request("GET", "/healthz")
+        response = conn.getresponse()
+        body = response.read()
+        self.assertEqual(response.getheader("Content-Type"), "application/json")
+        self.assertEqual(int(response.getheader("Content-Length")), len(body))
+        conn.close()
+
+    def test_api_server_log_message(self):
+        with patch("http.server.BaseHTTPRequestHandler.log_message") as mock_log:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+            self.request(conn, "GET", "/healthz")
+            self.server.verbose = True
+            self.request(conn, "GET", "/healthz")
+            self.server.verbose = False
+            conn.close()
+        self.assertEqual(mock_log.call_count, 1)
+
+    def test_api_server_make_server(self):
+        server = make_server(port=0, verbose=True)
+        self.assertTrue(server.daemon_threads)
+        self.assertTrue(server.verbose)
+        self.assertNotEqual(server.server_address[1], 0)
+        server.server_close()
+
+    def test_api_server_cache(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        self.assertEqual(self.request(conn, "GET", "/v1/cache"), (200, {"enabled": False}))
+        conn.close()
+        server = make_server(port=0, cache_size=2)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address[:2], timeout=10)
+            payload = {"preset": "FLOAT32", "bits": ["0x3dcccccd", "0x3dcccccd", "0x3f800000"], "exact": True}
+            status, body = self.request(conn, "POST", "/v1/decode", payload)
+            self.assertEqual(body["exact"], [exact_decimal(0x3DCCCCCD, FLOAT32)] * 2 + ["1"])
+            status, stats = self.request(conn, "GET", "/v1/cache")
+            self.assertEqual((stats["enabled"], stats["hits"], stats["misses"], stats["maxsize"]), (True, 1, 2, 2))
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_load_generator_LoadReport(self):
+        report = LoadReport("decode", 1, 1, 2.0, latencies=[i / 100 for i in range(1, 101)])
+        self.assertEqual(report.requests, 100)
+        self.assertEqual(report.requests_per_second, 50.0)
+        self.assertEqual(report.percentile(99), 0.99)
+        self.assertEqual(report.percentile(50), 0.5)
+        self.assertEqual(LoadReport("decode", 1, 1, 0.0).percentile(99), 0.0)
+
+    def test_load_generator_build_body(self):
+        payload = json.loads(build_body("encode", "FLOAT16", 3))
+        self.assertEqual((payload["preset"], len(payload["values"])), ("FLOAT16", 3))
+        self.assertTrue(all(b.startswith("0x") for b in json.loads(build_body("decode", "FLOAT32", 5))["bits"]))
+
+    def test_load_generator_run_load(self):
+        report = run_load(self.host, self.port, "classify", "FLOAT64", batch=10, connections=3, requests=31)
+        self.assertEqual((report.requests, report.errors), (31, 0))
+        self.assertGreater(report.requests_per_second, 0)
+        report = run_load(self.host, self.port, "decode", connections=2, duration=0.05)
+        self.assertGreater(report.requests, 0)
+        with self.assertRaises(ValueError):
+            run_load(self.host, self.port, "divide")
+
+if __name__ == '__main__':
+    unittest.main()
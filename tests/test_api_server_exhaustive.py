@@ -0,0 +1,32 @@
+import http.client
+import json
+import threading
+import unittest
+from src.api_server import MAX_BATCH, _json_float, make_server
+from src.engine import FLOAT32, bits_to_float
+
+class TestApiServerExhaustive(unittest.TestCase):
+    """A full MAX_BATCH request through a live server, spread over every float32 class."""
+
+    def request(self, conn, payload):
+        conn.request("POST", "/v1/decode", json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_api_server_full_batch(self):
+        server = make_server(port=0)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        try:
+            conn = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+            bits = [k * ((1 << 32) // MAX_BATCH) for k in range(MAX_BATCH)]
+            status, body = self.request(conn, {"preset": "FLOAT32", "bits": bits})
+            self.assertEqual((status, len(body["values"])), (200, MAX_BATCH))
+            self.assertEqual(body["values"], [_json_float(bits_to_float(k, FLOAT32)) for k in bits])
+            self.assertEqual(self.request(conn, {"bits": [0] * (MAX_BATCH + 1)})[0], 413)
+            conn.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
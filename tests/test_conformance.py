@@ -0,0 +1,90 @@
+import math
+import unittest
+from collections import Counter
+from unittest.mock import patch
+from src.engine import FLOAT16, BFLOAT16, FLOAT32, FLOAT64, extract_bit_fields
+from tools.conformance import (
+    boundary_patterns, stratified_patterns, struct_reference, check_pattern, z3_reference,
+    engine_class, numpy_reference, check_patterns, run_chunk, run_conformance, _same
+)
+
+try:
+    import z3
+    HAVE_Z3 = True
+except ImportError:
+    HAVE_Z3 = False
+
+class TestConformance(unittest.TestCase):
+    def test_same_and_struct_reference(self):
+        self.assertTrue(_same(float('nan'), float('nan')))
+        self.assertFalse(_same(0.0, -0.0))
+        self.assertEqual(struct_reference(0x3c00, FLOAT16), 1.0)
+        self.assertEqual(struct_reference(0x4049, BFLOAT16), 3.140625)
+        self.assertEqual(struct_reference(0x00000001, FLOAT32), 2.0 ** -149)
+        self.assertEqual(struct_reference(0x8000000000000000, FLOAT64), -0.0)
+
+    def test_boundary_and_stratified_patterns(self):
+        edges = boundary_patterns(FLOAT16)
+        self.assertIn(0x0001, edges)
+        self.assertIn(0x7bff, edges)
+        self.assertIn(0xfc00, edges)
+        self.assertEqual(len(edges), len(set(edges)))
+        patterns = list(stratified_patterns(FLOAT16, 32 * 10, seed=1))
+        self.assertEqual(patterns, list(stratified_patterns(FLOAT16, 32 * 10, seed=1)))
+        # Every biased exponent (subnormal and special ones included) gets the same share
+        exponents = Counter(extract_bit_fields(b, FLOAT16)[1] for b in patterns)
+        self.assertEqual(set(exponents.values()), {10})
+
+    def test_check_pattern_reports_first_mismatch(self):
+        for preset in (FLOAT16, BFLOAT16, FLOAT32, FLOAT64):
+            for bits in boundary_patterns(preset):
+                self.assertIsNone(check_pattern(bits, preset, struct_reference(bits, preset)))
+        counterexample = check_pattern(0x3c00, FLOAT16, 2.0)
+        self.assertEqual((counterexample["check"], counterexample["bits"]), ("bits_to_float", "0x3c00"))
+        with patch("tools.conformance.float_to_bits", return_value=0):
+            self.assertEqual(check_pattern(0x3c00, FLOAT16, 1.0)["check"], "float_to_bits")
+
+    @unittest.skipUnless(HAVE_Z3, "z3-solver is not installed")
+    def test_z3_reference_and_engine_class(self):
+        self.assertEqual(z3_reference(0x0001, FLOAT16), (2.0 ** -24, "subnormal"))
+        self.assertEqual(z3_reference(0xbc00, FLOAT16), (-1.0, "normal"))
+        value, name = z3_reference(0x7fc1, BFLOAT16)
+        self.assertTrue(math.isnan(value))
+        self.assertEqual(name, "nan")
+        for bits, name in ((0x0000, "zero"), (0x0001, "subnormal"), (0x3c00, "normal"), (0x7c00, "inf"), (0x7e00, "nan")):
+            self.assertEqual(engine_class(bits, FLOAT16), name)
+
+    def test_numpy_reference(self):
+        reference = numpy_reference([0x3c00, 0x0001], FLOAT16)
+        try:
+            import numpy
+        except ImportError:
+            self.assertIsNone(reference)
+            return
+        self.assertEqual(reference.tolist(), [1.0, 2.0 ** -24])
+
+    def test_check_patterns_and_run_chunk(self):
+        oracles = ("struct", "z3", "numpy") if HAVE_Z3 else ("struct", "numpy")
+        result = check_patterns(range(0x3c00, 0x3c00 + 64), FLOAT16, oracles, z3_every=16)
+        self.assertEqual(result.checked, 64)
+        self.assertEqual(result.z3_checked, 4 if HAVE_Z3 else 0)
+        self.assertIsNone(result.counterexample)
+        chunk = run_chunk("BFLOAT16", 200, 3, ("struct",), 1, True)
+        self.assertEqual(chunk.checked, 200 + len(boundary_patterns(BFLOAT16)))
+        # A broken decoder is caught and checking stops at the first counterexample
+        with patch("tools.conformance.bits_to_float", return_value=0.5):
+            broken = check_patterns([0x3c00, 0x4000], FLOAT16)
+        self.assertEqual((broken.checked, broken.counterexample["check"]), (1, "bits_to_float"))
+
+    def test_run_conformance(self):
+        report = run_conformance("FLOAT32", 1000, workers=2, z3_samples=3 if HAVE_Z3 else 0, chunk_size=500)
+        self.assertIsNone(report.counterexample)
+        self.assertEqual(report.samples, 1000 + len(boundary_patterns(FLOAT32)))
+        if HAVE_Z3:
+            self.assertGreaterEqual(report.z3_checked, 3)
+        self.assertGreater(report.values_per_second, 0)
+        with self.assertRaises(ValueError):
+            run_conformance("FLOAT8", 10)
+
+if __name__ == '__main__':
+    unittest.main()
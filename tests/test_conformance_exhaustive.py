@@ -0,0 +1,19 @@
+import unittest
+from src.engine import FLOAT16, BFLOAT16
+from tools.conformance import check_patterns
+
+class TestConformanceExhaustive(unittest.TestCase):
+    """Every 16-bit pattern through every engine codec, against struct (and NumPy when installed)."""
+
+    def test_float16_exhaustive(self):
+        result = check_patterns(range(1 << 16), FLOAT16, ("struct", "numpy"))
+        self.assertIsNone(result.counterexample)
+        self.assertEqual(result.checked, 1 << 16)
+
+    def test_bfloat16_exhaustive(self):
+        result = check_patterns(range(1 << 16), BFLOAT16, ("struct", "numpy"))
+        self.assertIsNone(result.counterexample)
+        self.assertEqual(result.checked, 1 << 16)
+
+if __name__ == '__main__':
+    unittest.main()
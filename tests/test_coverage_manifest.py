@@ -1,13 +1,13 @@
 import unittest
-import ast
 import os
-import glob
 import json
+from tools.definition_index import DefinitionIndex
 
 class TestCoverageManifest(unittest.TestCase):
     """
     Dynamically proves 100% test coverage and compliance matrix traceability.
-    Generates doc/coverage_manifest.md as permanent proof of all functions, classes, and methods.
+    Checks doc/coverage_manifest.md, the permanent proof of all functions, classes, and methods, against the tree.
+    The tracked file is only rewritten when IEEE754_UPDATE_MANIFEST=1 (`python3 run_tests.py --update-manifest`).
     """
     
     def test_generate_and_verify_coverage_manifest(self):
@@ -16,53 +16,18 @@ class TestCoverageManifest(unittest.TestCase):
         tests_dir = os.path.join(project_root, "tests")
         doc_dir = os.path.join(project_root, "doc")
         
-        # 1. Parse all source definitions
-        definitions = []
-        py_files = glob.glob(os.path.join(src_dir, "*.py"))
-        
-        for py_file in py_files:
-            if os.path.basename(py_file) == "__init__.py":
-                continue
-                
-            with open(py_file, 'r') as f:
-                tree = ast.parse(f.read())
-                
-            module_name = os.path.basename(py_file).replace(".py", "")
-            
-            class DefinitionVisitor(ast.NodeVisitor):
-                def __init__(self):
-                    self.current_class = None
-                    
-                def visit_ClassDef(self, node):
-                    definitions.append((module_name, "class", node.name))
-                    old_class = self.current_class
-                    self.current_class = node.name
-                    self.generic_visit(node)
-                    self.current_class = old_class
-                    
-                def visit_FunctionDef(self, node):
-                    # We capture methods, nested functions, and top level functions
-                    if self.current_class:
-                        definitions.append((module_name, "method", f"{self.current_class}.{node.name}"))
-                    else:
-                        definitions.append((module_name, "function", node.name))
-                    self.generic_visit(node)
-                    
-                def visit_AsyncFunctionDef(self, node):
-                    self.visit_FunctionDef(node)
-
-            visitor = DefinitionVisitor()
-            visitor.visit(tree)
+        # 1. Parse all source definitions (shared index: only files changed since the last run are re-parsed)
+        index = DefinitionIndex(os.path.join(project_root, ".definition_index.json"))
+        definitions = index.scan(src_dir, pattern="*.py")
+        self.assertEqual(index.errors, {}, "Source files failed to parse")
             
         # 2. Extract all test names from the entire test suite
         test_funcs = set()
-        test_files = glob.glob(os.path.join(tests_dir, "test_*.py"))
-        for tf in test_files:
-            with open(tf, 'r') as f:
-                tree = ast.parse(f.read())
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name.startswith("test_"):
-                    test_funcs.add(node.name)
+        for _, dtype, name in index.scan(tests_dir, pattern="test_*.py"):
+            base_name = name.split('.')[-1]
+            if dtype != "class" and base_name.startswith("test_"):
+                test_funcs.add(base_name)
+        index.save()
                     
         # 3. Load Compliance Matrix
         matrix_file = os.path.join(doc_dir, "compliance_matrix.json")
@@ -93,7 +58,8 @@ class TestCoverageManifest(unittest.TestCase):
             expected_fragments = [mod, base_name]
             
             matched_test = None
-            for t_func in test_funcs:
+            # Sorted, so the manifest does not depend on the set's hash order
+            for t_func in sorted(test_funcs):
                 if all(frag.lower() in t_func.lower() for frag in expected_fragments):
                     matched_test = t_func
                     break
@@ -110,10 +76,16 @@ class TestCoverageManifest(unittest.TestCase):
                 
             manifest_lines.append(f"| `{mod}` | {dtype} | `{name}` | `{matched_test}` | {'✅ Yes' if is_tracked else '❌ No'} |")
             
-        # Write to manifest
+        # Write the manifest only when asked, so test runs leave the tracked file alone
         manifest_file = os.path.join(doc_dir, "coverage_manifest.md")
-        with open(manifest_file, "w") as f:
-            f.write("\n".join(manifest_lines) + "\n")
+        manifest = "\n".join(manifest_lines) + "\n"
+        if os.environ.get("IEEE754_UPDATE_MANIFEST") == "1":
+            with open(manifest_file, "w") as f:
+                f.write(manifest)
+        elif not missing_tests:
+            with open(manifest_file) as f:
+                self.assertEqual(f.read(), manifest,
+                                 "doc/coverage_manifest.md is stale; regenerate it with python3 run_tests.py --update-manifest")
             
         # 5. Assert 100% Success
         self.assertEqual(len(missing_tests), 0, "Missing test coverage or traceability:\n" + "\n".join(missing_tests))
@@ -0,0 +1,101 @@
+import os
+import json
+import tempfile
+import textwrap
+import unittest
+from tools.definition_index import DefinitionIndex, DefinitionVisitor, parse_definitions, definitions_to_json
+from tools.ast_analyzer import get_all_ast_definitions
+from tools.bench_definition_index import make_tree, run_benchmark
+
+SAMPLE = textwrap.dedent("""
+    class Outer:
+        def __init__(self):
+            def inner():
+                pass
+
+        async def fetch(self):
+            pass
+
+        class Nested:
+            def method(self):
+                pass
+
+    def top():
+        pass
+""")
+
+class TestDefinitionIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "tree")
+        os.makedirs(os.path.join(self.root, "pkg"))
+        self.write("pkg/sample.py", SAMPLE)
+        self.write("pkg/__init__.py", "def package_level():\n    pass\n")
+        self.write("broken.py", "def broken(:\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, rel, text):
+        with open(os.path.join(self.root, rel), "w") as f:
+            f.write(text)
+
+    def test_definition_visitor_and_parse_definitions(self):
+        definitions, error = parse_definitions(os.path.join(self.root, "pkg", "sample.py"))
+        self.assertEqual(error, "")
+        self.assertEqual(definitions, [
+            ("class", "Outer"), ("method", "Outer.__init__"), ("method", "Outer.inner"),
+            ("method", "Outer.fetch"), ("class", "Nested"), ("method", "Nested.method"), ("function", "top"),
+        ])
+        self.assertEqual(DefinitionVisitor().definitions, [])
+        definitions, error = parse_definitions(os.path.join(self.root, "broken.py"))
+        self.assertIsNone(definitions)
+        self.assertIn("SyntaxError", error)
+
+    def test_definition_index_scan_reuses_unchanged_files(self):
+        cache = os.path.join(self.tmp.name, "index.json")
+        index = DefinitionIndex(cache)
+        defs = index.scan(self.root)
+        index.save()
+        self.assertIn(("pkg.sample", "function", "top"), defs)
+        self.assertNotIn("package_level", [n for _, _, n in defs])
+        self.assertEqual(list(index.errors), [os.path.join(self.root, "broken.py")])
+        self.assertEqual((index.parsed, index.reused), (2, 0))
+
+        warm = DefinitionIndex(cache)
+        self.assertEqual(warm.scan(self.root), defs)
+        self.assertEqual((warm.parsed, warm.reused), (0, 2))
+
+        # Growing a file changes its size, so only that file is re-parsed
+        self.write("pkg/sample.py", SAMPLE + "def added():\n    pass\n")
+        changed = DefinitionIndex(cache)
+        self.assertIn(("pkg.sample", "function", "added"), changed.scan(self.root))
+        self.assertEqual((changed.parsed, changed.reused), (1, 1))
+        self.assertIn(("pkg.__init__", "function", "package_level"), changed.scan(self.root, exclude_init=False))
+
+        with open(cache, "w") as f:
+            f.write("{not json")
+        self.assertEqual(DefinitionIndex(cache).files, {})
+
+    def test_definition_index_parallel_matches_serial(self):
+        make_tree(os.path.join(self.tmp.name, "big"), 40, per_dir=10)
+        big = os.path.join(self.tmp.name, "big")
+        serial = DefinitionIndex(workers=1).scan(big)
+        parallel = DefinitionIndex(workers=2, parallel_threshold=1)
+        self.assertEqual(parallel.scan(big), serial)
+        self.assertEqual(parallel.parsed, 40)
+        self.assertEqual(len(serial), 40 * 6)
+
+    def test_definition_index_json_and_ast_analyzer(self):
+        defs = get_all_ast_definitions(self.root)
+        self.assertEqual(defs, DefinitionIndex().scan(self.root))
+        data = json.loads(definitions_to_json(defs))
+        self.assertEqual(data[0], {"module": "pkg.sample", "type": "class", "name": "Nested"})
+
+    def test_definition_index_benchmark(self):
+        rows = run_benchmark(30, 2, 0.1)
+        self.assertEqual([(parsed, reused) for _, parsed, reused, _ in rows],
+                         [(30, 0), (30, 0), (0, 30), (3, 27)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import random
+import re
+import unittest
+from unittest.mock import call, patch
+from src.decode_mode import DecodeMode
+from src.derivation import (
+    MAX_ZERO_RUN, STEP_TITLES, Derivation, DerivationStep, _binary, _cache, _derive, _elide, _overflow, _result, _shift, _step,
+    as_dict, cache_stats, derive, derive_bits, render_text
+)
+from src.encode_mode import EncodeMode
+from src.engine import BFLOAT16, FLOAT16, FLOAT32, FLOAT64, bits_to_float, extract_bit_fields, float_to_bits
+
+class TestDerivation(unittest.TestCase):
+    def assertConsistent(self, value, preset):
+        derivation = _derive(value, preset)
+        bits = float_to_bits(value, preset)
+        s, e, f = extract_bit_fields(bits, preset)
+        self.assertEqual(derivation.bits, bits)
+        self.assertEqual(derivation.step("sign").result, str(s))
+        self.assertEqual(derivation.step("result").result, f"{bits:0{preset.total_bits}b}")
+        if "special" in [step.name for step in derivation.steps]:
+            return
+        # Every step's answer is the stored field, also when rounding carries into the exponent
+        self.assertEqual(derivation.step("bias").result, f"{e:0{preset.e_bits}b}")
+        self.assertEqual(derivation.step("fraction").result, f"{f:0{preset.f_bits}b}")
+        self.assertEqual(derivation.step("fraction").text.endswith(f"0.f x 2^{1 - preset.bias}, padded to {preset.f_bits} bits: "
+                                                                   f"{f:0{preset.f_bits}b}."), e == 0)
+
+    def test_derivation_DerivationStep(self):
+        step = DerivationStep("sign", "Sign", "The value is positive, so the sign bit is 0.", "0")
+        self.assertEqual(step.title, STEP_TITLES["sign"])
+        self.assertEqual(step._asdict()["result"], "0")
+
+    def test_derivation_Derivation_step(self):
+        derivation = derive(0.1, FLOAT32)
+        self.assertIsInstance(derivation, Derivation)
+        self.assertEqual(derivation.step("bias").result, "01111011")
+        self.assertEqual(derivation.step("fraction").result, "10011001100110011001101")
+        with self.assertRaises(KeyError):
+            derivation.step("special")
+
+    def test_derivation_step(self):
+        self.assertEqual(_step("round", "No rounding is needed.", "exact"),
+                         DerivationStep("round", "Rounding", "No rounding is needed.", "exact"))
+        with self.assertRaises(KeyError):
+            _step("missing", "", "")
+
+    def test_derivation_elide(self):
+        match = re.search("0+", "1" + "0" * 20 + "1")
+        self.assertEqual(_elide(match), "0[18 zeros]0")
+
+    def test_derivation_binary(self):
+        self.assertEqual(_binary(13, 0), "1101")
+        self.assertEqual(_binary(13, 3), "1.101")
+        self.assertEqual(_binary(1, 4), "0.0001")
+        # Runs longer than MAX_ZERO_RUN are elided
+        self.assertEqual(_binary(1 << 40, 0), "1" + "0[38 zeros]0")
+        self.assertEqual(_binary(1 << MAX_ZERO_RUN, 0), "1" + "0" * MAX_ZERO_RUN)
+
+    def test_derivation_shift(self):
+        self.assertEqual(_shift(0), "The binary point is already after the leading 1, which")
+        self.assertEqual(_shift(1), "Moving the binary point 1 place left")
+        self.assertEqual(_shift(-4), "Moving the binary point 4 places right")
+
+    def test_derivation_result(self):
+        step = _result(0x3C00, FLOAT16)
+        self.assertEqual(step.result, "0011110000000000")
+        self.assertEqual(step.text, "The stored pattern is 0011110000000000, exactly 1.")
+
+    def test_derivation_overflow(self):
+        bias, fraction = _overflow("The true exponent 16 exceeds the maximum 15", FLOAT16)
+        self.assertEqual((bias.name, bias.result), ("bias", "11111"))
+        self.assertEqual(bias.text, "The true exponent 16 exceeds the maximum 15, so the value overflows to infinity, "
+                                    "which stores an all-ones exponent.")
+        self.assertEqual((fraction.name, fraction.result), ("fraction", "0" * 10))
+
+    def test_derivation_derive(self):
+        # A small sample; test_derivation_exhaustive.py sweeps many more
+        rng = random.Random(754)
+        for preset in (FLOAT16, BFLOAT16, FLOAT32, FLOAT64):
+            for _ in range(50):
+                self.assertConsistent(bits_to_float(rng.getrandbits(64), FLOAT64), preset)
+                self.assertConsistent(bits_to_float(rng.getrandbits(preset.total_bits), preset), preset)
+        # Rounding carries into the exponent, out of the subnormals, and overflows
+        carried = derive(1.99951171875 + 2 ** -12, FLOAT16)
+        self.assertIn("carry renormalizes it to 1.0 x 2^1", carried.step("round").text)
+        self.assertEqual(carried.step("bias").result, "10000")
+        promoted = derive(2 ** -126 * (1 - 2 ** -25), FLOAT32)
+        self.assertIn("smallest normal number", promoted.step("round").text)
+        self.assertEqual((promoted.step("bias").result, promoted.bits), ("00000001", 0x00800000))
+        self.assertIn("of 1.f,", promoted.step("fraction").text)
+        for value, preset in ((65520.0, FLOAT16), (3.4028235677973366e38, FLOAT32)):
+            derivation = derive(value, preset)
+            self.assertIn("The rounded exponent", derivation.step("bias").text)
+            self.assertEqual(derivation.step("result").text.split()[-1], "inf.")
+            self.assertConsistent(value, preset)
+        self.assertIn("overflows to infinity", derive(1e39, FLOAT32).step("bias").text)
+        for value, preset in ((1e39, FLOAT32), (2 ** -126 * (1 - 2 ** -25), FLOAT32), (2 ** -25, FLOAT16), (1e-50, FLOAT32)):
+            self.assertConsistent(value, preset)
+        self.assertEqual(derive(1e-50, FLOAT32).bits, 0)
+        subnormal = derive(bits_to_float(3, FLOAT32), FLOAT32)
+        self.assertEqual(subnormal.step("bias").result, "00000000")
+        self.assertIn("0.f x 2^-126", subnormal.step("fraction").text)
+        # Specials skip straight to the stored pattern
+        for value, kind in ((float("nan"), "nan"), (float("-inf"), "infinity"), (-0.0, "zero")):
+            self.assertEqual([step.name for step in derive(value, FLOAT32).steps], ["sign", "special", "result"])
+            self.assertEqual(derive(value, FLOAT32).step("special").result, kind)
+        self.assertEqual(derive(-0.0, FLOAT32).step("sign").result, "1")
+        # Every step is one sentence
+        for step in derive(0.1, FLOAT64).steps:
+            self.assertTrue(step.text.endswith("."))
+            self.assertEqual(step.text.count(". "), 0)
+
+    def test_derivation_derive_bits(self):
+        self.assertEqual(derive_bits(0x3F800000, FLOAT32).step("result").result, "0" + "01111111" + "0" * 23)
+        self.assertEqual(derive_bits(1, FLOAT64).bits, 1)
+
+    def test_derivation_cache_stats(self):
+        _cache.clear()
+        before = cache_stats()
+        first = derive(0.375, BFLOAT16)
+        self.assertIs(derive(0.375, BFLOAT16), first)
+        after = cache_stats()
+        self.assertEqual((after.misses - before.misses, after.hits - before.hits), (1, 1))
+        # The key is the value's float64 bits, so -0.0 and 0.0 are cached apart
+        self.assertNotEqual(derive(0.0, BFLOAT16).bits, derive(-0.0, BFLOAT16).bits)
+        self.assertIsNot(derive(0.375, FLOAT16), first)
+
+    def test_derivation_render_text(self):
+        lines = render_text(derive(1.0, FLOAT32))
+        self.assertEqual(lines[0], "1. Sign: The value is positive, so the sign bit is 0.")
+        self.assertEqual(lines[2], "3. Normalization: The binary point is already after the leading 1, which gives 1 x 2^0, "
+                                   "so the true exponent is 0.")
+        self.assertEqual(lines[3], "4. Rounding: All 0 fraction bits fit in the 23-bit field, so no rounding is needed.")
+        self.assertEqual(lines[4], "5. Biased exponent: The biased exponent is true exponent + bias (127), so 0 + 127 = 127, "
+                                   "or 01111111 in binary.")
+        self.assertEqual(len(lines), 7)
+
+    def test_derivation_as_dict(self):
+        result = as_dict(derive(-2.5, FLOAT16))
+        self.assertEqual(result["value"], "-2.5")
+        self.assertEqual(result["bits"], "0xc100")
+        self.assertEqual(result["steps"][0], {"name": "sign", "title": "Sign",
+                                              "text": "The value is negative, so the sign bit is 1.", "result": "1"})
+        self.assertEqual(result["steps"][-1]["name"], "result")
+
+    @patch('src.encode_mode.clear_screen')
+    @patch('src.encode_mode.prompt_input')
+    def test_derivation_encode_mode(self, mock_prompt, mock_clear):
+        mode = EncodeMode()
+        with patch.object(mode, '_generate_target', return_value=0.1):
+            mock_prompt.side_effect = ['1', '01111011', '1' * 23, '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Incorrect. The value is positive, so the sign bit is 0.\n")
+        mock_print.assert_any_call("Worked derivation:")
+        for line in render_text(derive(0.1, FLOAT32)):
+            mock_print.assert_any_call(line)
+        # A fully correct round has no walkthrough
+        with patch.object(mode, '_generate_target', return_value=0.1):
+            mock_prompt.side_effect = ['0', '01111011', '10011001100110011001101', '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        self.assertNotIn(call("Worked derivation:"), mock_print.call_args_list)
+
+    @patch('src.decode_mode.clear_screen')
+    @patch('src.decode_mode.prompt_input')
+    def test_derivation_decode_mode(self, mock_prompt, mock_clear):
+        mode = DecodeMode()
+        with patch.object(mode, '_generate_target', return_value=-2.5):
+            mock_prompt.side_effect = ['1', '10000000', '128', '1', '1', '-3', '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Worked derivation:")
+        mock_print.assert_any_call("5. Biased exponent: The biased exponent is true exponent + bias (127), so 1 + 127 = 128, "
+                                   "or 10000000 in binary.")
+        with patch.object(mode, '_generate_target', return_value=-2.5):
+            mock_prompt.side_effect = ['1', '10000000', '128', '1', '1', '-2.5', '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        self.assertNotIn(call("Worked derivation:"), mock_print.call_args_list)
+
+if __name__ == '__main__':
+    unittest.main()
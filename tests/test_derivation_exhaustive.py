@@ -0,0 +1,35 @@
+import random
+import unittest
+from src.derivation import _derive
+from src.engine import BFLOAT16, FLOAT16, FLOAT32, FLOAT64, bits_to_float, extract_bit_fields, float_to_bits
+
+class TestDerivationExhaustive(unittest.TestCase):
+    """Every step's answer against the engine's fields: all 16-bit patterns and a large random sample of wider inputs."""
+
+    def assertFieldsMatch(self, value, preset):
+        derivation = _derive(value, preset)
+        bits = float_to_bits(value, preset)
+        s, e, f = extract_bit_fields(bits, preset)
+        self.assertEqual(derivation.bits, bits)
+        self.assertEqual(derivation.step("sign").result, str(s))
+        if "special" not in [step.name for step in derivation.steps]:
+            self.assertEqual(derivation.step("bias").result, f"{e:0{preset.e_bits}b}")
+            self.assertEqual(derivation.step("fraction").result, f"{f:0{preset.f_bits}b}")
+
+    def test_derivation_every_16_bit_pattern(self):
+        for preset in (FLOAT16, BFLOAT16):
+            for bits in range(1 << 16):
+                self.assertFieldsMatch(bits_to_float(bits, preset), preset)
+
+    def test_derivation_random_doubles(self):
+        # Doubles round into every preset, including carries into the exponent and overflows
+        rng = random.Random(754)
+        for preset in (FLOAT16, BFLOAT16, FLOAT32, FLOAT64):
+            for _ in range(5000):
+                self.assertFieldsMatch(bits_to_float(rng.getrandbits(64), FLOAT64), preset)
+                # Values just off a pattern of the preset exercise the guard, round and sticky bits
+                value = bits_to_float(rng.getrandbits(preset.total_bits), preset)
+                self.assertFieldsMatch(value * (1 + rng.random() * 2 ** -20), preset)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+import random
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from src.decode_mode import DecodeMode
+from src.difficulty import (
+    INITIAL_RATING, LEVEL_BASE, LEVEL_STEP, LEVELS, TARGET_SUCCESS, DifficultyModel, Level, _exponent_range,
+    expected_score, generate_value, level_rating, normal_count, normal_pattern, subnormal_pattern
+)
+from src.encode_mode import EncodeMode
+from src.engine import FLOAT16, FLOAT32, FLOAT64, bits_to_float, extract_bit_fields, float_to_bits
+from src.progress import ProgressStore
+from src.rounding_mode import RoundingMode
+from src.ui import UserQuitException
+import main as tutor
+
+def fields(value, preset):
+    return extract_bit_fields(float_to_bits(value, preset), preset)
+
+class TestDifficulty(unittest.TestCase):
+    def test_difficulty_Level(self):
+        self.assertEqual(LEVELS[0], Level(min_exponent=0, max_exponent=6, fraction_bits=3, subnormal_rate=0.0))
+        # Every rung is at least as hard as the one below it
+        for easier, harder in zip(LEVELS, LEVELS[1:]):
+            self.assertLessEqual(harder.min_exponent, easier.min_exponent)
+            self.assertGreaterEqual(harder.max_exponent, easier.max_exponent)
+            self.assertGreaterEqual(harder.fraction_bits, easier.fraction_bits)
+            self.assertGreaterEqual(harder.subnormal_rate, easier.subnormal_rate)
+
+    def test_difficulty_level_rating(self):
+        self.assertEqual(level_rating(0), LEVEL_BASE)
+        self.assertEqual(level_rating(2), LEVEL_BASE + 2 * LEVEL_STEP)
+
+    def test_difficulty_expected_score(self):
+        self.assertAlmostEqual(expected_score(level_rating(3), 3), 0.5)
+        self.assertAlmostEqual(expected_score(level_rating(1) + 400, 1), 10 / 11)
+        self.assertLess(expected_score(INITIAL_RATING, 5), expected_score(INITIAL_RATING, 0))
+
+    def test_difficulty_generate_value(self):
+        rng = random.Random(754)
+        for preset in (FLOAT32, FLOAT64):
+            for level in LEVELS:
+                lo, hi = max(level.min_exponent, 1 - preset.bias), min(level.max_exponent, preset.bias)
+                for _ in range(100):
+                    value = generate_value(level, preset, rng)
+                    s, e, f = fields(value, preset)
+                    self.assertEqual(bits_to_float(float_to_bits(value, preset), preset), value)
+                    # Only the top `fraction_bits` of a normal fraction are set
+                    width = min(level.fraction_bits, preset.f_bits)
+                    if e == 0:
+                        self.assertGreater(level.subnormal_rate, 0)
+                        self.assertNotEqual(f, 0)
+                    else:
+                        self.assertTrue(lo <= e - preset.bias <= hi)
+                        self.assertEqual(f & ((1 << (preset.f_bits - width)) - 1), 0)
+        # The top level spans the whole exponent range of the wider format
+        exponents = {fields(generate_value(LEVELS[-1], FLOAT64, rng), FLOAT64)[1] for _ in range(2000)}
+        self.assertGreater(max(exponents) - 1023, 900)
+        self.assertIn(0, exponents)
+        self.assertEqual(fields(generate_value(Level(0, 0, 0, 1.0), FLOAT16, rng), FLOAT16)[1], 0)
+
+    def test_difficulty_exponent_range(self):
+        self.assertEqual(_exponent_range(LEVELS[-1], FLOAT32), (-126, 127))
+        self.assertEqual(_exponent_range(LEVELS[-1], FLOAT64), (-1022, 1023))
+        self.assertEqual(_exponent_range(LEVELS[1], FLOAT64), (-4, 8))
+
+    def test_difficulty_normal_count(self):
+        # Level 0: two signs, exponents 0 to 6 and three fraction bits
+        self.assertEqual(normal_count(LEVELS[0], FLOAT32), 2 * 7 * 8)
+        self.assertEqual(normal_count(LEVELS[-1], FLOAT32), 2 * 254 << 23)
+
+    def test_difficulty_normal_pattern(self):
+        level = LEVELS[0]
+        patterns = {normal_pattern(i, level, FLOAT32) for i in range(normal_count(level, FLOAT32))}
+        self.assertEqual(len(patterns), normal_count(level, FLOAT32))
+        self.assertEqual(normal_pattern(0, level, FLOAT32), float_to_bits(1.0, FLOAT32))
+        self.assertEqual(normal_pattern(1, level, FLOAT32), float_to_bits(-1.0, FLOAT32))
+        self.assertEqual(max(bits_to_float(b, FLOAT32) for b in patterns), 120.0)
+
+    def test_difficulty_subnormal_pattern(self):
+        rng = random.Random(1)
+        for _ in range(200):
+            s, e, f = extract_bit_fields(subnormal_pattern(LEVELS[3], FLOAT32, rng), FLOAT32)
+            self.assertEqual(e, 0)
+            # 16 significant bits, first and last set
+            self.assertEqual((f >> (f & -f).bit_length() - 1).bit_length(), 16)
+
+    def test_difficulty_generate_value_speed(self):
+        start = time.perf_counter()
+        for _ in range(1000):
+            generate_value(LEVELS[-1], FLOAT64)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_difficulty_DifficultyModel_init(self):
+        model = DifficultyModel(k_factor=8.0, initial=1200.0)
+        self.assertEqual((model.k_factor, model.rating(1)), (8.0, 1200.0))
+
+    def test_difficulty_DifficultyModel_rating(self):
+        model = DifficultyModel()
+        model.update(1, 0, True)
+        self.assertGreater(model.rating(1), INITIAL_RATING)
+        self.assertEqual(model.rating(3), INITIAL_RATING)
+
+    def test_difficulty_DifficultyModel_level(self):
+        model = DifficultyModel()
+        self.assertEqual(model.level(1), 0)
+        # The chosen level is the one answered with roughly the target success rate
+        for rating in (1100.0, 1400.0, 1600.0):
+            model._ratings[1] = rating
+            self.assertLess(abs(expected_score(rating, model.level(1)) - TARGET_SUCCESS), 0.12)
+        model._ratings[1] = 10_000.0
+        self.assertEqual(model.level(1), len(LEVELS) - 1)
+        model._ratings[1] = -10_000.0
+        self.assertEqual(model.level(1), 0)
+
+    def test_difficulty_DifficultyModel_update(self):
+        model = DifficultyModel(k_factor=32.0)
+        rating = model.update(2, 0, False)
+        self.assertAlmostEqual(rating, INITIAL_RATING - 32.0 * expected_score(INITIAL_RATING, 0))
+        # A learner who answers everything climbs the ladder; one who misses everything stays at the bottom
+        for _ in range(200):
+            model.update(2, model.level(2), True)
+            model.update(4, model.level(4), False)
+        self.assertEqual(model.level(2), len(LEVELS) - 1)
+        self.assertEqual(model.level(4), 0)
+
+    def test_difficulty_DifficultyModel_draw(self):
+        model = DifficultyModel()
+        rng = random.Random(5)
+        # Level 0 holds 112 values: a full pass asks each of them once
+        values = [model.draw(1, FLOAT32, rng) for _ in range(112)]
+        self.assertEqual({level for level, _ in values}, {0})
+        self.assertEqual(len({v for _, v in values}), 112)
+        # Each mode walks its own order
+        self.assertEqual(len({model.draw(3, FLOAT64, rng)[1] for _ in range(112)}), 112)
+        model._ratings[1] = 2000.0
+        level, value = model.draw(1, FLOAT32, rng)
+        self.assertEqual(level, len(LEVELS) - 1)
+        self.assertEqual(len(model._samplers), 3)
+        # Subnormals come from the subnormal share
+        with patch.object(rng, "random", return_value=0.0):
+            self.assertEqual(fields(model.draw(1, FLOAT32, rng)[1], FLOAT32)[1], 0)
+
+    def test_base_mode_bind_difficulty(self):
+        mode = RoundingMode()
+        model = DifficultyModel()
+        self.assertIsNone(mode.difficulty)
+        mode.bind_difficulty(model, 9)
+        self.assertIs(mode.difficulty, model)
+        # Fixed questions have no level and are not rated
+        mode.record_attempt("decision", True)
+        self.assertEqual(model.rating(9), INITIAL_RATING)
+
+    @patch('src.encode_mode.clear_screen')
+    @patch('src.encode_mode.prompt_input')
+    def test_difficulty_encode_mode(self, mock_prompt, mock_clear):
+        mode = EncodeMode()
+        model = DifficultyModel()
+        mode.bind_difficulty(model, 1)
+        model._ratings[1] = 1500.0
+        with patch('src.difficulty.bits_to_float', return_value=bits_to_float(0x00000003, FLOAT32)):
+            mock_prompt.side_effect = ['0', '00000001', '0' * 23, '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        self.assertEqual(mode.level, 3)
+        mock_print.assert_any_call("Incorrect. The true exponent -148 is below the minimum -126, so the value is subnormal and stores an all-zero exponent, 00000000.\n")
+        mock_print.assert_any_call("Incorrect. The fraction field holds the bits after the binary point of 0.f x 2^-126, padded to 23 bits: " + "0" * 21 + "11.\n")
+        # One step right and two wrong move the rating at level 3
+        self.assertNotEqual(model.rating(1), 1500.0)
+
+    @patch('src.decode_mode.clear_screen')
+    @patch('src.decode_mode.prompt_input')
+    def test_difficulty_decode_mode(self, mock_prompt, mock_clear):
+        mode = DecodeMode(is_64_bit=True)
+        mode.bind_difficulty(DifficultyModel(), 4)
+        value = -bits_to_float(1 << 51, FLOAT64)  # -0.5 * 2^-1022
+        with patch('src.difficulty.bits_to_float', return_value=value):
+            mock_prompt.side_effect = ['1', '0' * 11, '0', '-1022', '0', str(value), '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Correct. (True Exponent = -1022)\n")
+        mock_print.assert_any_call("Correct. (Subnormal value)\n")
+        self.assertGreater(mode.difficulty.rating(4), INITIAL_RATING)
+        # Normal-rule answers to a subnormal get the subnormal explanation
+        with patch('src.difficulty.bits_to_float', return_value=value):
+            mock_prompt.side_effect = ['1', '0' * 11, '0', '-1023', '1', 'x', '']
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Incorrect. An all-zero exponent marks a subnormal, whose true exponent is fixed at 1 - bias (1023) = -1022.\n")
+        mock_print.assert_any_call("Incorrect. The exponent is all zeros, so it is subnormal, thus 0.\n")
+        mock_print.assert_any_call(f"Incorrect format. The value is (-1)^sign * (0 + fraction) * 2^(true exponent), so {value}.\n")
+
+    @patch('main.prompt_input')
+    @patch('main.clear_screen')
+    @patch('main.display_main_menu')
+    def test_difficulty_main(self, mock_menu, mock_clear, mock_prompt):
+        mock_prompt.side_effect = ['2', UserQuitException()]
+        model = DifficultyModel()
+        with patch('main.DecodeMode') as mock_decode:
+            mock_decode.return_value.run_round.return_value = False
+            with self.assertRaises(SystemExit):
+                tutor.main(store=ProgressStore(), difficulty=model)
+        mock_decode.return_value.bind_difficulty.assert_called_once_with(model, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import time
+import unittest
+from unittest.mock import patch
+from src.drill_mode import CLASS_NAMES, DrillMode, DrillQuestion, DrillResult, _session_clock, is_correct
+from src.engine import FLOAT32, classify_bits, extract_bit_fields, float_to_bits
+from src.progress import ProgressStore
+
+def fake_clock(step_ns):
+    """A clock that advances `step_ns` on every reading."""
+    now = [0]
+    def clock():
+        now[0] += step_ns
+        return now[0]
+    return clock
+
+class TestDrillMode(unittest.TestCase):
+    def test_drill_mode_DrillQuestion(self):
+        question = DrillQuestion("decode", "True exponent?", "3")
+        self.assertEqual(question.kind, "decode")
+        with self.assertRaises(AttributeError):
+            question.expected = "4"
+
+    def test_drill_mode_DrillResult(self):
+        result = DrillResult()
+        self.assertEqual((result.questions, result.per_minute, result.accuracy), (0, 0.0, 0.0))
+        self.assertEqual(result.percentile_ns(99), 0)
+
+    def test_drill_mode_DrillResult_questions(self):
+        self.assertEqual(DrillResult([1, 2, 3]).questions, 3)
+
+    def test_drill_mode_DrillResult_per_minute(self):
+        self.assertEqual(DrillResult([1] * 15, elapsed_ns=30 * 10**9).per_minute, 30.0)
+
+    def test_drill_mode_DrillResult_accuracy(self):
+        self.assertEqual(DrillResult([1] * 8, correct=6).accuracy, 75.0)
+
+    def test_drill_mode_DrillResult_percentile_ns(self):
+        result = DrillResult(list(range(100, 0, -1)))
+        self.assertEqual([result.percentile_ns(p) for p in (50, 90, 99, 100)], [50, 90, 99, 100])
+        self.assertEqual(DrillResult([7]).percentile_ns(0), 7)
+
+    def test_drill_mode_is_correct(self):
+        encode = DrillQuestion("encode", "", "01111111")
+        self.assertTrue(is_correct(encode, " 01111111 "))
+        self.assertFalse(is_correct(encode, "1111111"))
+        classify = DrillQuestion("classify", "", "normal")
+        for answer in ("normal", "NOR", "no"):
+            self.assertTrue(is_correct(classify, answer), answer)
+        # 'n' is ambiguous between normal and nan; an empty answer matches nothing
+        self.assertFalse(is_correct(classify, "n"))
+        self.assertFalse(is_correct(classify, ""))
+        self.assertTrue(is_correct(DrillQuestion("classify", "", "nan"), "na"))
+
+    def test_drill_mode_DrillMode_init(self):
+        mode = DrillMode(time_budget=1.5)
+        self.assertEqual(mode.time_budget_ns, 1_500_000_000)
+        self.assertIs(mode.preset, FLOAT32)
+        self.assertEqual(len(mode.generators), 3)
+
+    def test_drill_mode_encode_question(self):
+        mode = DrillMode()
+        with patch.object(mode._encode, "_generate_target", return_value=1.0):
+            question = mode._encode_question()
+        self.assertEqual((question.kind, question.expected), ("encode", "01111111"))
+        self.assertIn("1.0", question.text)
+
+    def test_drill_mode_decode_question(self):
+        mode = DrillMode()
+        with patch.object(mode._decode, "_generate_target", return_value=-0.375):
+            question = mode._decode_question()
+        self.assertEqual((question.kind, question.expected), ("decode", "-2"))
+        self.assertIn(f"{float_to_bits(-0.375, FLOAT32):032b}", question.text)
+
+    def test_drill_mode_classify_question(self):
+        mode = DrillMode()
+        for name in CLASS_NAMES:
+            seen = set()
+            for _ in range(20):
+                with patch("src.drill_mode.random.choice", return_value=name):
+                    question = mode._classify_question()
+                bits = int(question.text.split()[2].rstrip("?"), 2)
+                self.assertEqual(question.expected, name)
+                self.assertEqual(classify_bits(bits, FLOAT32), name)
+                seen.add(bits)
+            # Patterns only repeat once a class is exhausted (two zeros, two infinities)
+            self.assertEqual(len(seen), 2 if name in ("zero", "inf") else 20)
+
+    def test_drill_mode_next_question(self):
+        mode = DrillMode()
+        kinds = {mode.next_question().kind for _ in range(200)}
+        self.assertEqual(kinds, {"encode", "decode", "classify"})
+        question = mode.next_question()
+        if question.kind == "encode":
+            value = float(question.text.split()[3])
+            self.assertEqual(question.expected, f"{extract_bit_fields(float_to_bits(value, FLOAT32), FLOAT32)[1]:08b}")
+
+    @patch("src.drill_mode.clear_screen")
+    @patch("src.drill_mode.prompt_input")
+    def test_drill_mode_run_round(self, mock_prompt, mock_clear):
+        # Every clock reading advances 1 s; each question takes three readings after the start, so a 7 s drill asks two in 6 s
+        mode = DrillMode(time_budget=7, clock=fake_clock(10**9))
+        store = ProgressStore()
+        mode.bind_progress(store, 10)
+        questions = [DrillQuestion("decode", "q1", "3"), DrillQuestion("classify", "q2", "inf")]
+        mock_prompt.side_effect = ["", "3", "nan", ""]
+        with patch.object(mode, "next_question", side_effect=questions), patch("builtins.print") as mock_print:
+            self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Correct. (1.00 s)\n")
+        mock_print.assert_any_call("Incorrect. The answer is inf.\n")
+        mock_print.assert_any_call("Questions:  2 in 6.0 s")
+        mock_print.assert_any_call("Latency:    p50 1.00 s | p90 1.00 s | p99 1.00 s")
+        self.assertEqual(store.totals(10), (1, 2))
+        totals = store.drill_totals(10)
+        self.assertEqual((totals.sessions, totals.questions, totals.correct, totals.seconds), (1, 2, 1, 6.0))
+
+    @patch("src.drill_mode.clear_screen")
+    @patch("src.drill_mode.prompt_input")
+    def test_drill_mode_run_round_quit(self, mock_prompt, mock_clear):
+        from src.ui import UserQuitException
+        mode = DrillMode(clock=fake_clock(10**9))
+        store = ProgressStore()
+        mode.bind_progress(store, 10)
+        mock_prompt.side_effect = ["", "0", UserQuitException()]
+        with patch.object(mode, "next_question", return_value=DrillQuestion("decode", "q", "0")), \
+             patch("builtins.print"):
+            self.assertFalse(mode.run_round())
+        # The answers given before quitting are still logged as a drill
+        self.assertEqual(store.drill_totals(10).questions, 1)
+        mock_prompt.side_effect = [UserQuitException()]
+        with patch("builtins.print"):
+            self.assertFalse(DrillMode().run_round())
+
+    def test_drill_mode_session_clock(self):
+        from src.transcript import Transcript, TranscriptReplayer
+        from src.ui import set_input_source
+        self.assertIs(_session_clock(), time.perf_counter_ns)
+        set_input_source(lambda message: "")
+        self.assertIs(_session_clock(), time.perf_counter_ns)
+        # A transcript source's seconds become nanoseconds
+        replayer = TranscriptReplayer(Transcript(1, entries=[(2.5, "", "")]))
+        set_input_source(replayer)
+        try:
+            clock = _session_clock()
+            replayer("")
+            self.assertEqual(clock(), 2_500_000_000)
+        finally:
+            set_input_source(None)
+
+    def test_drill_mode_report(self):
+        mode = DrillMode()
+        result = DrillResult([2 * 10**9, 4 * 10**9], correct=1, elapsed_ns=6 * 10**9)
+        with patch("builtins.print") as mock_print:
+            mode._report(result)
+        mock_print.assert_any_call("Throughput: 20.0 questions/minute")
+        mock_print.assert_any_call("Accuracy:   50.0%")
+        store = ProgressStore()
+        mode.bind_progress(store, 10)
+        with patch("builtins.print") as mock_print:
+            mode._report(result)
+            mode._report(DrillResult([10**9] * 3, correct=3, elapsed_ns=6 * 10**9))
+        mock_print.assert_any_call("Best:       30.0 questions/minute over 2 drill(s)")
+
+if __name__ == '__main__':
+    unittest.main()
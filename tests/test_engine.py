@@ -86,3 +86,290 @@ class TestEngine(unittest.TestCase):
         self.assertEqual(s, 1)
         self.assertEqual(e, 2)
         self.assertEqual(f, 0)
+
+class TestEngineExactRounding(unittest.TestCase):
+    def test_engine_classify_bits(self):
+        from src.engine import FLOAT16, classify_bits
+        self.assertEqual([classify_bits(b, FLOAT32) for b in (0x80000000, 0x00000001, 0x3F800000, 0xFF800000, 0x7FC00000)],
+                         ["zero", "subnormal", "normal", "inf", "nan"])
+        self.assertEqual(classify_bits(0x0400, FLOAT16), "normal")
+
+    def test_extract_bit_fields_matches_string_path(self):
+        from src.engine import extract_bit_fields
+        b_str = float_to_bin32(-13.625)
+        self.assertEqual(extract_bit_fields(int(b_str, 2), FLOAT32), extract_fields(b_str, FLOAT32))
+        b_str = float_to_bin64(0.1)
+        self.assertEqual(extract_bit_fields(int(b_str, 2), FLOAT64), extract_fields(b_str, FLOAT64))
+        with self.assertRaises(ValueError):
+            extract_bit_fields(1 << 32, FLOAT32)
+        with self.assertRaises(ValueError):
+            extract_bit_fields(-1, FLOAT32)
+
+    def test_decode_exact(self):
+        from src.engine import decode_exact
+        # 1.5 = 3 * 2^-1 scaled to a 24-bit significand
+        s, m, q = decode_exact(int(float_to_bin32(-1.5), 2), FLOAT32)
+        self.assertEqual(s, 1)
+        self.assertEqual(m * 2.0 ** q, 1.5)
+        # Smallest subnormal
+        self.assertEqual(decode_exact(1, FLOAT32), (0, 1, -149))
+        with self.assertRaises(ValueError):
+            decode_exact(int(float_to_bin32(float('inf')), 2), FLOAT32)
+
+    def test_round_exact_modes(self):
+        from src.engine import (
+            round_exact, FLOAT16, ROUNDING_MODES, FLAG_INEXACT, FLAG_TIE,
+            ROUND_NEAREST_EVEN, ROUND_NEAREST_AWAY, ROUND_TOWARD_ZERO,
+            ROUND_TOWARD_POSITIVE, ROUND_TOWARD_NEGATIVE
+        )
+        # 1 + 2^-11 is exactly halfway between 1.0 (0x3c00) and the next float16 (0x3c01)
+        halfway = (0, (1 << 11) + 1, -11)
+        expected = {
+            ROUND_NEAREST_EVEN: 0x3c00,
+            ROUND_NEAREST_AWAY: 0x3c01,
+            ROUND_TOWARD_ZERO: 0x3c00,
+            ROUND_TOWARD_POSITIVE: 0x3c01,
+            ROUND_TOWARD_NEGATIVE: 0x3c00,
+        }
+        for mode in ROUNDING_MODES:
+            bits, flags = round_exact(*halfway, FLOAT16, mode)
+            self.assertEqual(bits, expected[mode], mode)
+            self.assertEqual(flags, FLAG_INEXACT | FLAG_TIE)
+        # Negative values mirror the directed modes
+        bits, _ = round_exact(1, (1 << 11) + 1, -11, FLOAT16, ROUND_TOWARD_NEGATIVE)
+        self.assertEqual(bits, 0xbc01)
+        with self.assertRaises(ValueError):
+            round_exact(*halfway, FLOAT16, "nearest")
+
+    def test_round_exact_boundaries(self):
+        from src.engine import (
+            round_exact, FLOAT16, ROUND_TOWARD_ZERO, ROUND_TOWARD_POSITIVE,
+            FLAG_OVERFLOW, FLAG_UNDERFLOW, FLAG_SUBNORMAL, FLAG_FLUSH_TO_ZERO
+        )
+        # Exact zero keeps its sign
+        self.assertEqual(round_exact(1, 0, 0, FLOAT16), (0x8000, 0))
+        # 65520 rounds to INF under RNE but saturates to 65504 toward zero
+        bits, flags = round_exact(0, 65520, 0, FLOAT16)
+        self.assertEqual(bits, 0x7c00)
+        self.assertTrue(flags & FLAG_OVERFLOW)
+        bits, _ = round_exact(0, 65520, 0, FLOAT16, ROUND_TOWARD_ZERO)
+        self.assertEqual(bits, 0x7bff)
+        # Carry out of the significand moves to the next binade: 2047/1024 -> 2.0
+        bits, _ = round_exact(0, 4095, -11, FLOAT16)
+        self.assertEqual(bits, 0x4000)
+        # 2^-25 is half the smallest subnormal: ties-to-even flushes it to zero
+        bits, flags = round_exact(0, 1, -25, FLOAT16)
+        self.assertEqual(bits, 0)
+        self.assertTrue(flags & FLAG_FLUSH_TO_ZERO)
+        # ...but rounding toward +INF lands on the smallest subnormal
+        bits, flags = round_exact(0, 1, -25, FLOAT16, ROUND_TOWARD_POSITIVE)
+        self.assertEqual(bits, 1)
+        self.assertTrue(flags & FLAG_SUBNORMAL)
+        self.assertTrue(flags & FLAG_UNDERFLOW)
+        # Exact subnormals are not underflows
+        self.assertEqual(round_exact(0, 3, -24, FLOAT16), (3, FLAG_SUBNORMAL))
+
+    def test_round_exact_absurd_exponents(self):
+        import time
+        from src.engine import (
+            round_exact, parse_hex_float, FLOAT16, ROUNDING_MODES, ROUND_TOWARD_POSITIVE, ROUND_TOWARD_NEGATIVE,
+            FLAG_INEXACT, FLAG_UNDERFLOW, FLAG_SUBNORMAL, FLAG_FLUSH_TO_ZERO
+        )
+        start = time.perf_counter()
+        # Far below the smallest subnormal: zero, or the smallest subnormal when rounding away from zero
+        for sign in (0, 1):
+            for mode in ROUNDING_MODES:
+                bits, flags = round_exact(sign, 3, -(10 ** 12), FLOAT16, mode)
+                away = mode == (ROUND_TOWARD_NEGATIVE if sign else ROUND_TOWARD_POSITIVE)
+                self.assertEqual(bits, (sign << 15) | (1 if away else 0))
+                self.assertEqual(flags, FLAG_INEXACT | FLAG_UNDERFLOW | (FLAG_SUBNORMAL if away else FLAG_FLUSH_TO_ZERO))
+                # Just past the cut-off the two paths agree
+                self.assertEqual(round_exact(sign, 1, -27, FLOAT16, mode), round_exact(sign, 3, -28, FLOAT16, mode))
+        self.assertEqual(parse_hex_float("0x1p-20000000000", FLOAT32), 0)
+        self.assertEqual(parse_hex_float("-0x1p-1000000000", FLOAT32, ROUND_TOWARD_NEGATIVE), 0x80000001)
+        self.assertEqual(parse_hex_float("0x1p+20000000000", FLOAT32), 0x7f800000)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_bits_to_float_all_presets(self):
+        from src.engine import bits_to_float, FLOAT16, BFLOAT16
+        self.assertEqual(bits_to_float(int(float_to_bin64(0.1), 2), FLOAT64), 0.1)
+        self.assertEqual(bits_to_float(int(float_to_bin32(-13.625), 2), FLOAT32), -13.625)
+        self.assertEqual(bits_to_float(0x7bff, FLOAT16), 65504.0)
+        self.assertEqual(bits_to_float(0x0001, FLOAT16), 2.0 ** -24)
+        self.assertEqual(bits_to_float(0x4049, BFLOAT16), 3.140625)
+        self.assertTrue(math.isnan(bits_to_float(0x7e00, FLOAT16)))
+        self.assertEqual(math.copysign(1.0, bits_to_float(0x8000, BFLOAT16)), -1.0)
+
+    def test_exact_decimal(self):
+        from src.engine import exact_decimal, FLOAT16
+        self.assertEqual(exact_decimal(int(float_to_bin32(0.1), 2), FLOAT32), "0.100000001490116119384765625")
+        self.assertEqual(exact_decimal(int(float_to_bin64(0.1), 2), FLOAT64),
+                         "0.1000000000000000055511151231257827021181583404541015625")
+        self.assertEqual(exact_decimal(int(float_to_bin32(-13.625), 2), FLOAT32), "-13.625")
+        self.assertEqual(exact_decimal(int(float_to_bin32(2.0 ** 40), 2), FLOAT32), "1099511627776")
+        self.assertEqual(exact_decimal(0x7bff, FLOAT16), "65504")
+        self.assertEqual(exact_decimal(0x0001, FLOAT16), "0.000000059604644775390625")
+        self.assertEqual(exact_decimal(0x8000, FLOAT16), "-0")
+        self.assertEqual(exact_decimal(0xfc00, FLOAT16), "-inf")
+        self.assertEqual(exact_decimal(0x7e00, FLOAT16), "nan")
+        # The smallest float64 subnormal has 751 significant digits after 323 leading zeros
+        tiny = exact_decimal(1, FLOAT64)
+        self.assertTrue(tiny.startswith("0." + "0" * 323 + "4940656458412465"))
+        self.assertEqual(len(tiny), 2 + 1074)
+
+    def test_exact_decimal_matches_decimal_module(self):
+        from decimal import Decimal
+        from src.engine import exact_decimal
+        for value in (1 / 3, 1e300, 5e-324, 123456.789, -2.5e-8):
+            expected = format(Decimal(value), 'f')
+            if '.' in expected:
+                expected = expected.rstrip('0').rstrip('.')
+            self.assertEqual(exact_decimal(int(float_to_bin64(value), 2), FLOAT64), expected)
+
+    def test_exact_decimal_is_cached(self):
+        from src.engine import exact_decimal
+        exact_decimal.cache_clear()
+        exact_decimal(0x3f800000, FLOAT32)
+        exact_decimal(0x3f800000, FLOAT32)
+        self.assertEqual(exact_decimal.cache_info().hits, 1)
+
+class TestEngineHexIO(unittest.TestCase):
+    def test_float_to_bits_every_preset(self):
+        from src.engine import float_to_bits, FLOAT16, BFLOAT16, ROUND_TOWARD_ZERO
+        self.assertEqual(float_to_bits(0.1, FLOAT64), int(float_to_bin64(0.1), 2))
+        self.assertEqual(float_to_bits(0.1, FLOAT32), int(float_to_bin32(0.1), 2))
+        self.assertEqual(float_to_bits(0.1, FLOAT32, ROUND_TOWARD_ZERO), int(float_to_bin32(0.1), 2) - 1)
+        self.assertEqual(float_to_bits(1e39, FLOAT32), 0x7f800000)
+        self.assertEqual(float_to_bits(-0.0, FLOAT16), 0x8000)
+        self.assertEqual(float_to_bits(float('-inf'), BFLOAT16), 0xff80)
+        self.assertEqual(float_to_bits(float('nan'), FLOAT16), 0x7e00)
+        self.assertEqual(float_to_bits(3.14159, BFLOAT16), 0x4049)
+
+    def test_raw_hex_words(self):
+        from src.engine import bits_to_hex, hex_to_bits, FLOAT16
+        self.assertEqual(bits_to_hex(0x3f800000, FLOAT32), "0x3f800000")
+        self.assertEqual(bits_to_hex(1, FLOAT64), "0x0000000000000001")
+        self.assertEqual(hex_to_bits("3F80 0000", FLOAT32), 0x3f800000)
+        self.assertEqual(hex_to_bits("0x3f80_0000", FLOAT32), 0x3f800000)
+        self.assertEqual(hex_to_bits("0x3c00", FLOAT16), 0x3c00)
+        with self.assertRaises(ValueError):
+            hex_to_bits("0x1ffff", FLOAT16)
+        with self.assertRaises(ValueError):
+            bits_to_hex(1 << 16, FLOAT16)
+        with self.assertRaises(ValueError):
+            hex_to_bits("xyz", FLOAT32)
+
+    def test_format_hex_float_matches_c99(self):
+        from src.engine import format_hex_float, FLOAT16, BFLOAT16
+        self.assertEqual(format_hex_float(int(float_to_bin32(0.1), 2), FLOAT32), "0x1.99999ap-4")
+        self.assertEqual(format_hex_float(int(float_to_bin64(0.1), 2), FLOAT64), "0x1.999999999999ap-4")
+        self.assertEqual(format_hex_float(int(float_to_bin64(-1.0), 2), FLOAT64), "-0x1p+0")
+        self.assertEqual(format_hex_float(1, FLOAT64), "0x0.0000000000001p-1022")
+        self.assertEqual(format_hex_float(1, FLOAT32), "0x0.000002p-126")
+        self.assertEqual(format_hex_float(0x7bff, FLOAT16), "0x1.ffcp+15")
+        self.assertEqual(format_hex_float(0x4049, BFLOAT16), "0x1.92p+1")
+        self.assertEqual(format_hex_float(0x8000, FLOAT16), "-0x0p+0")
+        self.assertEqual(format_hex_float(0xfc00, FLOAT16), "-inf")
+        self.assertEqual(format_hex_float(0x7e00, FLOAT16), "nan")
+
+    def test_parse_hex_float(self):
+        from src.engine import parse_hex_float, format_hex_float, FLOAT16, ROUND_TOWARD_POSITIVE
+        for value in (0.1, -13.625, 5e-324, 1.7976931348623157e308, 1 / 3):
+            bits = int(float_to_bin64(value), 2)
+            self.assertEqual(parse_hex_float(value.hex(), FLOAT64), bits)
+            self.assertEqual(parse_hex_float(format_hex_float(bits, FLOAT64), FLOAT64), bits)
+        # Narrowing happens during parsing, with exact rounding
+        self.assertEqual(parse_hex_float(float(0.1).hex(), FLOAT32), int(float_to_bin32(0.1), 2))
+        self.assertEqual(parse_hex_float("0x1.002p+0", FLOAT16), 0x3c00)
+        self.assertEqual(parse_hex_float("0x1.002p+0", FLOAT16, ROUND_TOWARD_POSITIVE), 0x3c01)
+        # C literal forms: suffixes, missing exponent, leading dot, specials
+        self.assertEqual(parse_hex_float("0x1p3f", FLOAT32), 0x41000000)
+        self.assertEqual(parse_hex_float("0X.8P1", FLOAT32), 0x3f800000)
+        self.assertEqual(parse_hex_float("0x10", FLOAT32), 0x41800000)
+        self.assertEqual(parse_hex_float("-Infinity", FLOAT16), 0xfc00)
+        self.assertEqual(parse_hex_float("nan", FLOAT16), 0x7e00)
+        for bad in ("1.5", "0x", "0x1.8q3", ""):
+            with self.assertRaises(ValueError):
+                parse_hex_float(bad, FLOAT32)
+
+    def test_bulk_hex_paths(self):
+        from array import array
+        from src.engine import (
+            parse_hex_words, hex_words_to_floats, floats_to_hex_words,
+            format_hex_floats, parse_hex_floats, FLOAT16, BFLOAT16
+        )
+        dump = "3f800000 c0200000\n3dcccccd"
+        self.assertEqual(list(parse_hex_words(dump, FLOAT32)), [0x3f800000, 0xc0200000, 0x3dcccccd])
+        self.assertEqual(parse_hex_words(["0x3c00"], FLOAT16).typecode, 'H')
+        with self.assertRaises(ValueError):
+            parse_hex_words(["0x13c00"], FLOAT16)
+        # A prefix without digits is malformed, not zero, just as in hex_to_bits
+        for bad in ("0x", "0X", ""):
+            with self.assertRaises(ValueError):
+                parse_hex_words(["3c00", bad], FLOAT16)
+            with self.assertRaises(ValueError):
+                hex_words_to_floats([bad], FLOAT32)
+
+        values = [1.0, -2.5, 0.1, float('inf')]
+        for preset in (FLOAT32, FLOAT64, FLOAT16, BFLOAT16):
+            words = floats_to_hex_words(values, preset)
+            decoded = hex_words_to_floats(words, preset)
+            self.assertIsInstance(decoded, array)
+            self.assertEqual(list(decoded[:2]), [1.0, -2.5])
+            self.assertEqual(decoded[3], float('inf'))
+        self.assertEqual(floats_to_hex_words([0.1], FLOAT64), ["0x3fb999999999999a"])
+
+        texts = format_hex_floats([0x3c00, 0x0001], FLOAT16)
+        self.assertEqual(texts, ["0x1p+0", "0x0.004p-14"])
+        self.assertEqual(list(parse_hex_floats(texts, FLOAT16)), [0x3c00, 0x0001])
+
+class TestEngineBufferDecode(unittest.TestCase):
+    def test_buffer_protocol_inputs(self):
+        import mmap
+        import struct
+        from array import array
+        from src.engine import iter_buffer_bits, iter_buffer_values
+        values = [1.0, -2.5, 0.1]
+        packed = struct.pack('<3d', *values)
+        for buffer in (packed, bytearray(packed), array('d', values)):
+            self.assertEqual(list(iter_buffer_values(buffer, FLOAT64)), values)
+        with mmap.mmap(-1, len(packed)) as mm:
+            mm.write(packed)
+            self.assertEqual(list(iter_buffer_values(mm, FLOAT64)), values)
+            self.assertEqual(list(iter_buffer_bits(mm, FLOAT64))[0], 0x3ff0000000000000)
+        # An exhausted iterator releases its view, so the mmap above could close.
+        self.assertTrue(mm.closed)
+
+    def test_byte_orders(self):
+        import struct
+        from src.engine import iter_buffer_bits, iter_buffer_values, iter_buffer_fields, FLOAT16, BFLOAT16
+        self.assertEqual(list(iter_buffer_values(struct.pack('>2f', 1.5, -0.25), FLOAT32, "big")), [1.5, -0.25])
+        self.assertEqual(list(iter_buffer_bits(struct.pack('>H', 0x3c00), FLOAT16, "big")), [0x3c00])
+        self.assertEqual(list(iter_buffer_values(struct.pack('<2e', 1.0, 65504.0), FLOAT16)), [1.0, 65504.0])
+        self.assertEqual(list(iter_buffer_values(struct.pack('>e', 2.0), FLOAT16, "big")), [2.0])
+        self.assertEqual(list(iter_buffer_values(bytes.fromhex("3f804049"), BFLOAT16, "big")), [1.0, 3.140625])
+        self.assertEqual(list(iter_buffer_fields(struct.pack('<f', -13.625), FLOAT32)),
+                         [extract_fields(float_to_bin32(-13.625), FLOAT32)])
+
+    def test_buffer_errors(self):
+        from src.engine import iter_buffer_bits, iter_buffer_values
+        with self.assertRaises(ValueError):
+            list(iter_buffer_bits(b"\x00" * 6, FLOAT32))
+        with self.assertRaises(ValueError):
+            list(iter_buffer_values(b"\x00" * 8, FLOAT32, "middle"))
+
+    def test_buffer_decode_memory_is_flat(self):
+        import tracemalloc
+        from src.engine import iter_buffer_values, iter_buffer_fields
+        blob = bytearray(8 * 8192)
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_buffer_values(blob, FLOAT64, "big"))
+            count += sum(1 for _ in iter_buffer_fields(blob, FLOAT64))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 16_384)
+        # Decoding 64 KB must not materialise copies of the buffer: a single copy is already
+        # four times the 16 KB limit (test_engine_exhaustive.py decodes 800 KB)
+        self.assertLess(peak, 16 * 1024)
@@ -206,5 +206,37 @@ class TestEngineBMC(unittest.TestCase):
         self.assertEqual(solver.check(), unsat, "Z3 engine violates NaN bit definition")
         solver.pop()
 
+    def test_bmc_round_exact_matches_fpa(self):
+        # PROOF: round_exact / narrow_pattern against Z3's FPA rounding
+        # For boundary doubles (ties, overflow, subnormal and flush-to-zero cases),
+        # assert that Z3's fpToFP under every rounding mode disagrees with the engine
+        # and require UNSAT for each combination.
+        import struct
+        from z3 import (
+            FPVal, FPSort, fpToFP, fpToIEEEBV, RoundNearestTiesToEven, RoundNearestTiesToAway,
+            RoundTowardZero, RoundTowardPositive, RoundTowardNegative
+        )
+        from src.engine import FLOAT16, BFLOAT16, ROUNDING_MODES
+        from src.narrowing import narrow_pattern
+
+        z3_modes = dict(zip(ROUNDING_MODES, [
+            RoundNearestTiesToEven(), RoundNearestTiesToAway(), RoundTowardZero(),
+            RoundTowardPositive(), RoundTowardNegative()
+        ]))
+        values = [1.0 + 2 ** -11, -(1.0 + 2 ** -11), 1.0 + 2 ** -11 + 2 ** -40, 65519.0, 65520.0,
+                  2 ** -25, -2 ** -25, 3 * 2 ** -26, 0.1, -3.4e38, 1e-40]
+        solver = Solver()
+        for preset in (FLOAT16, BFLOAT16):
+            sort = FPSort(preset.e_bits, preset.f_bits + 1)
+            for value in values:
+                [src_bits] = struct.unpack('>Q', struct.pack('>d', value))
+                for mode, rm in z3_modes.items():
+                    expected, _ = narrow_pattern(src_bits, FLOAT64, preset, mode)
+                    solver.push()
+                    solver.add(fpToIEEEBV(fpToFP(rm, FPVal(value, FPSort(11, 53)), sort))
+                               != BitVecVal(expected, preset.total_bits))
+                    self.assertEqual(solver.check(), unsat, f"round_exact disagrees with Z3 for {value} {mode}")
+                    solver.pop()
+
 if __name__ == '__main__':
     unittest.main()
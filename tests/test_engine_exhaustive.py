@@ -0,0 +1,22 @@
+import tracemalloc
+import unittest
+from src.engine import FLOAT64, iter_buffer_fields, iter_buffer_values
+
+class TestEngineExhaustive(unittest.TestCase):
+    """Streaming decode of a large buffer in constant memory."""
+
+    def test_buffer_decode_memory_is_flat_800_kb(self):
+        blob = bytearray(8 * 100_000)
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_buffer_values(blob, FLOAT64, "big"))
+            count += sum(1 for _ in iter_buffer_fields(blob, FLOAT64))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 200_000)
+        # Decoding 800 KB must not materialise copies of the buffer
+        self.assertLess(peak, 16 * 1024)
+
+if __name__ == '__main__':
+    unittest.main()
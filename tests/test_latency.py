@@ -0,0 +1,131 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.latency import Histogram, LatencyRecorder, _histogram_json, _prometheus_series
+from src.rounding_mode import RoundingMode
+from src.ui import get_latency_recorder, prompt_input, set_latency_recorder
+
+class TestLatency(unittest.TestCase):
+    def tearDown(self):
+        set_latency_recorder(None)
+
+    def test_latency_Histogram_init(self):
+        h = Histogram((1.0, 2.0))
+        self.assertEqual((h.counts, h.count, h.total), ([0, 0, 0], 0, 0.0))
+        recorder = LatencyRecorder(answer_buckets=(1.0,))
+        self.assertEqual(recorder.answer_buckets, (1.0,))
+
+    def test_latency_observe(self):
+        h = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 9.0):
+            h.observe(value)
+        # Bucket bounds are inclusive upper bounds (Prometheus `le`)
+        self.assertEqual(h.counts, [2, 1, 1])
+        self.assertEqual((h.count, h.total), (4, 12.0))
+
+    def test_latency_cumulative(self):
+        h = Histogram((1.0, 2.0))
+        for value in (0.5, 1.5, 9.0):
+            h.observe(value)
+        self.assertEqual(h.cumulative(), [(1.0, 1), (2.0, 2), (float("inf"), 3)])
+
+    def test_latency_LatencyRecorder(self):
+        recorder = LatencyRecorder()
+        recorder.answered(3.0)
+        recorder.observe_step(1, "sign", True)
+        recorder.answered(12.0, tutor_seconds=0.002)
+        recorder.observe_step(1, "sign", False)
+        self.assertEqual(set(recorder.answers), {("1", "sign", True), ("1", "sign", False)})
+        self.assertEqual(recorder.tutor.count, 1)
+
+    def test_latency_answered(self):
+        recorder = LatencyRecorder()
+        recorder.answered(1.0)
+        recorder.answered(2.0, 0.01)
+        self.assertEqual(recorder._pending, 2.0)
+        self.assertEqual(recorder.tutor.total, 0.01)
+
+    def test_latency_observe_step(self):
+        recorder = LatencyRecorder()
+        recorder.observe_step(2, "value", True)  # nothing pending
+        self.assertEqual(recorder.answers, {})
+        recorder.answered(4.0)
+        recorder.observe_step(2, "value", True)
+        recorder.observe_step(2, "value", True)  # already claimed
+        self.assertEqual(recorder.answers[("2", "value", True)].count, 1)
+
+    def test_latency_to_json(self):
+        recorder = LatencyRecorder(answer_buckets=(1.0,))
+        recorder.answered(0.5)
+        recorder.observe_step(9, "decision", False)
+        data = json.loads(json.dumps(recorder.to_json()))
+        self.assertEqual(data["answers"], [{"mode": "9", "step": "decision", "correct": False,
+                                            "count": 1, "sum": 0.5, "buckets": [[1.0, 1], ["+Inf", 1]]}])
+        self.assertEqual(data["tutor"]["count"], 0)
+
+    def test_latency_to_prometheus(self):
+        recorder = LatencyRecorder(answer_buckets=(1.0,))
+        recorder.answered(2.5, 0.004)
+        recorder.observe_step(5, "exponent", True)
+        text = recorder.to_prometheus()
+        self.assertIn("# TYPE ieee754_tutor_answer_seconds histogram", text)
+        self.assertIn('ieee754_tutor_answer_seconds_bucket{mode="5",step="exponent",correct="true",le="1.0"} 0', text)
+        self.assertIn('ieee754_tutor_answer_seconds_bucket{mode="5",step="exponent",correct="true",le="+Inf"} 1', text)
+        self.assertIn('ieee754_tutor_answer_seconds_count{mode="5",step="exponent",correct="true"} 1', text)
+        self.assertIn("ieee754_tutor_tutor_seconds_count 1", text)
+
+    def test_latency_histogram_json(self):
+        h = Histogram((1.0,))
+        h.observe(3.0)
+        self.assertEqual(_histogram_json(h), {"count": 1, "sum": 3.0, "buckets": [[1.0, 0], ["+Inf", 1]]})
+
+    def test_latency_prometheus_series(self):
+        h = Histogram((1.0,))
+        h.observe(0.25)
+        self.assertEqual(_prometheus_series("x", "", h),
+                         ['x_bucket{le="1.0"} 1', 'x_bucket{le="+Inf"} 1', "x_sum 0.25", "x_count 1"])
+
+    def test_latency_export(self):
+        recorder = LatencyRecorder()
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder.export(os.path.join(tmp, "latency.json"))
+            recorder.export(os.path.join(tmp, "latency.prom"))
+            with open(os.path.join(tmp, "latency.json"), encoding="utf-8") as f:
+                self.assertIn("tutor", json.load(f))
+            with open(os.path.join(tmp, "latency.prom"), encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith("# HELP"))
+
+    def test_ui_set_latency_recorder(self):
+        recorder = LatencyRecorder()
+        set_latency_recorder(recorder)
+        with patch("builtins.input", side_effect=["1", "2"]), patch("builtins.print"), \
+             patch("src.ui.time.monotonic", side_effect=[10.0, 13.0, 13.5, 15.0]):
+            prompt_input("first")
+            prompt_input("second")
+        self.assertEqual(recorder._pending, 1.5)
+        self.assertEqual(recorder.tutor.total, 0.5)
+        set_latency_recorder(None)
+        with patch("builtins.input", return_value="1"), patch("builtins.print"):
+            prompt_input("untimed")
+        self.assertEqual(recorder._pending, 1.5)
+
+    def test_ui_get_latency_recorder(self):
+        self.assertIsNone(get_latency_recorder())
+        recorder = LatencyRecorder()
+        set_latency_recorder(recorder)
+        self.assertIs(get_latency_recorder(), recorder)
+
+    def test_latency_mode_round_steps(self):
+        recorder = LatencyRecorder()
+        set_latency_recorder(recorder)
+        mode = RoundingMode()
+        mode.mode_id = 9
+        with patch("builtins.input", side_effect=["+1", ""]), patch("builtins.print"), \
+             patch("src.rounding_mode.clear_screen"):
+            self.assertTrue(mode.run_round())
+        self.assertEqual(list(recorder.answers), [("9", "decision", True)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -61,9 +61,9 @@ class TestLoopLogic(unittest.TestCase):
     @patch('main.clear_screen')
     @patch('main.display_main_menu')
     def test_main_loop_all_modes_routing(self, mock_menu, mock_clear, mock_prompt):
-        # Verify all modes 1-9 are routed correctly
+        # Verify all modes 1-10 are routed correctly
         # We'll mock run_round to return False so it doesn't loop forever in a mode.
-        mock_prompt.side_effect = ['1', '2', '3', '4', '5', '6', '7', '8', '9', UserQuitException()]
+        mock_prompt.side_effect = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', UserQuitException()]
         
         with patch('main.EncodeMode') as m1, \
              patch('main.DecodeMode') as m2, \
@@ -71,7 +71,8 @@ class TestLoopLogic(unittest.TestCase):
              patch('main.SpecialCasesMode') as m6, \
              patch('main.DenormalsMode') as m7, \
              patch('main.PrecisionImpactMode') as m8, \
-             patch('main.RoundingMode') as m9:
+             patch('main.RoundingMode') as m9, \
+             patch('main.DrillMode') as m10:
             
             for m in [m1, m2, m3 := MagicMock(), m4 := MagicMock(), m5, m6, m7, m8, m9]:
                 # Handle m3 and m4 which are also just Encode/Decode with is_64_bit=True
@@ -88,6 +89,7 @@ class TestLoopLogic(unittest.TestCase):
             m7.return_value = inst
             m8.return_value = inst
             m9.return_value = inst
+            m10.return_value = inst
                 
             with self.assertRaises(SystemExit):
                 main()
@@ -100,6 +102,7 @@ class TestLoopLogic(unittest.TestCase):
             self.assertTrue(m7.called)
             self.assertTrue(m8.called)
             self.assertTrue(m9.called)
+            self.assertTrue(m10.called)
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,12 +1,16 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from src.encode_mode import EncodeMode
 from src.decode_mode import DecodeMode
-from src.min_max_mode import MinMaxMode
-from src.special_cases_mode import SpecialCasesMode
-from src.denormals_mode import DenormalsMode
-from src.precision_impact import PrecisionImpactMode
-from src.rounding_mode import RoundingMode
+from src.min_max_mode import MinMaxMode, MinMaxQuestion
+from src.special_cases_mode import SpecialCasesMode, SpecialCase
+from src.denormals_mode import (
+    DenormalsMode, DenormalsQuestion, QUESTIONS as DENORMALS_QUESTIONS, _model_cache_stamp, _question_bank
+)
+from src.precision_impact import PrecisionImpactMode, PrecisionQuestion
+from src.rounding_mode import RoundingMode, RoundingQuestion
 
 from src.ui import UserQuitException
 
@@ -74,6 +78,15 @@ class TestModes(unittest.TestCase):
         self.assertTrue(mode.run_round())
         self.assertEqual(mock_prompt.call_count, 4)
 
+    @patch('src.encode_mode.prompt_input')
+    def test_encode_mode_shows_exact_value(self, mock_prompt):
+        mode = EncodeMode(is_64_bit=False)
+        mode._generate_target = MagicMock(return_value=0.1)
+        mock_prompt.side_effect = ['0', '0', '0', '']
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Exact Value: 0.100000001490116119384765625\n")
+
     @patch('src.decode_mode.prompt_input')
     def test_decode_mode_functional_32bit(self, mock_prompt):
         mode = DecodeMode(is_64_bit=False)
@@ -136,3 +149,54 @@ class TestModes(unittest.TestCase):
             self.assertTrue(mode.run_round())
             self.assertEqual(mock_prompt.call_count, 2)
 
+    def test_min_max_mode_MinMaxQuestion(self):
+        # Banks are built once per process and shared by every session
+        self.assertIs(MinMaxMode().questions, MinMaxMode().questions)
+        question = MinMaxMode().questions[0]
+        self.assertIsInstance(question, MinMaxQuestion)
+        self.assertEqual((question.exp, question.frac), ("11111110", "1" * 23))
+        with self.assertRaises(AttributeError):
+            question.sign = "1"
+
+    def test_special_cases_mode_SpecialCase(self):
+        self.assertIs(SpecialCasesMode().questions, SpecialCasesMode().questions)
+        self.assertEqual(SpecialCasesMode().questions[-1], SpecialCase("Negative Zero (-0)", "1", "0s", "0s"))
+        self.assertFalse(hasattr(SpecialCasesMode().questions[0], "__dict__"))
+
+    def test_denormals_mode_DenormalsQuestion(self):
+        mode = DenormalsMode()
+        self.assertEqual(mode.questions[:3], DENORMALS_QUESTIONS)
+        self.assertTrue(all(isinstance(q, DenormalsQuestion) for q in mode.questions))
+
+    def test_denormals_mode_question_bank(self):
+        # The model cache is read on first use only, not on every mode entry
+        stamp = _model_cache_stamp()
+        with patch('src.denormals_mode.ModelCache') as mock_cache:
+            self.assertIs(DenormalsMode().questions, _question_bank(stamp))
+            mock_cache.assert_not_called()
+        # A rewritten cache (new stamp) is picked up on the next entry without a restart
+        with patch('src.denormals_mode.ModelCache') as mock_cache, \
+                patch('src.denormals_mode._model_cache_stamp', return_value=(1, 2)):
+            mock_cache.return_value.get.return_value = []
+            self.assertEqual(DenormalsMode().questions, DENORMALS_QUESTIONS)
+            mock_cache.assert_called_once()
+
+    def test_denormals_mode_model_cache_stamp(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "models.json")
+            with patch('src.denormals_mode.MODEL_CACHE_PATH', path):
+                self.assertIsNone(_model_cache_stamp())
+                with open(path, "w") as f:
+                    f.write("{}")
+                os.utime(path, ns=(1, 1))
+                self.assertEqual(_model_cache_stamp(), (1, 2))
+
+    def test_precision_impact_PrecisionQuestion(self):
+        self.assertIs(PrecisionImpactMode().questions, PrecisionImpactMode().questions)
+        self.assertEqual(PrecisionImpactMode().questions[2], PrecisionQuestion(
+            "00111111100000000000000000000000", "1.0", "00111111100000000000000000000001", "+", "2^-23"))
+
+    def test_rounding_mode_RoundingQuestion(self):
+        self.assertIs(RoundingMode().questions, RoundingMode().questions)
+        self.assertEqual([q.dec for q in RoundingMode().questions], ["0.1", "0.05"])
+        self.assertIsInstance(RoundingMode().questions[0], RoundingQuestion)
@@ -0,0 +1,90 @@
+import io
+import math
+import struct
+import unittest
+from array import array
+from src.engine import (
+    FLOAT16, FLOAT32, FLOAT64, BFLOAT16, ROUND_TOWARD_ZERO,
+    FLAG_INEXACT, FLAG_OVERFLOW, FLAG_SUBNORMAL, FLAG_FLUSH_TO_ZERO, FLAG_TIE
+)
+from src.narrowing import (
+    NarrowResult, FLAG_DOUBLE_ROUNDING,
+    narrow_pattern, _ulp_error, narrow_bit_patterns, narrow_values, narrow_stream
+)
+
+def bits64(value):
+    [bits] = struct.unpack('>Q', struct.pack('>d', value))
+    return bits
+
+class TestNarrowing(unittest.TestCase):
+    def test_narrowing_NarrowResult(self):
+        result = NarrowResult(array('H'), array('d'), array('B'))
+        self.assertEqual(len(result.bits), 0)
+
+    def test_narrowing_count(self):
+        result = narrow_values([1.0, 0.1, 1e10], FLOAT16)
+        self.assertEqual(result.count(FLAG_INEXACT), 2)
+        self.assertEqual(result.count(FLAG_OVERFLOW), 1)
+
+    def test_narrowing_narrow_pattern(self):
+        # Matches the host's own float32 conversion
+        bits, flags = narrow_pattern(bits64(0.1), FLOAT64, FLOAT32)
+        self.assertEqual(bits, struct.unpack('>I', struct.pack('>f', 0.1))[0])
+        self.assertEqual(flags, FLAG_INEXACT)
+        # Special values keep their class and sign
+        self.assertEqual(narrow_pattern(bits64(float('-inf')), FLOAT64, FLOAT16)[0], 0xfc00)
+        nan_bits, _ = narrow_pattern(bits64(float('nan')), FLOAT64, BFLOAT16)
+        self.assertEqual(nan_bits & 0x7f80, 0x7f80)
+        self.assertNotEqual(nan_bits & 0x7f, 0)
+
+    def test_narrowing_ulp_error(self):
+        narrowed, flags = narrow_pattern(bits64(1.0 + 2 ** -12), FLOAT64, FLOAT16)
+        self.assertEqual(_ulp_error(bits64(1.0 + 2 ** -12), narrowed, FLOAT16, flags), -0.25)
+        narrowed, flags = narrow_pattern(bits64(-1e6), FLOAT64, FLOAT16)
+        self.assertEqual(_ulp_error(bits64(-1e6), narrowed, FLOAT16, flags), float('-inf'))
+        narrowed, flags = narrow_pattern(bits64(float('inf')), FLOAT64, FLOAT16)
+        self.assertEqual(_ulp_error(bits64(float('inf')), narrowed, FLOAT16, flags), 0.0)
+
+    def test_narrowing_narrow_bit_patterns(self):
+        patterns = [bits64(v) for v in (1.0, 1e-6, 1e-9, 65520.0)]
+        result = narrow_bit_patterns(patterns, FLOAT16)
+        self.assertEqual(result.bits.typecode, 'H')
+        self.assertEqual(list(result.flags)[0], 0)
+        self.assertTrue(result.flags[1] & FLAG_SUBNORMAL)
+        self.assertTrue(result.flags[2] & FLAG_FLUSH_TO_ZERO)
+        self.assertTrue(result.flags[3] & FLAG_OVERFLOW)
+        self.assertEqual(result.bits[3], 0x7c00)
+
+    def test_narrowing_double_rounding_hazard(self):
+        # 1 + 2^-11 + 2^-40 rounds up directly, but the float32 step drops the
+        # 2^-40 term and leaves an exact tie that then rounds down to even.
+        value = 1.0 + 2 ** -11 + 2 ** -40
+        result = narrow_values([value, 1.0 + 2 ** -11], FLOAT16)
+        self.assertEqual(result.bits[0], 0x3c01)
+        self.assertTrue(result.flags[0] & FLAG_DOUBLE_ROUNDING)
+        self.assertFalse(result.flags[1] & FLAG_DOUBLE_ROUNDING)
+        self.assertTrue(result.flags[1] & FLAG_TIE)
+
+    def test_narrowing_narrow_values(self):
+        result = narrow_values(array('d', [1.5, -2.75]), FLOAT32, ROUND_TOWARD_ZERO)
+        self.assertEqual(list(result.bits), [0x3fc00000, 0xc0300000])
+        self.assertEqual(list(result.ulp_error), [0.0, 0.0])
+        self.assertTrue(math.isnan(narrow_values([float('nan')], FLOAT32).ulp_error[0]))
+
+    def test_narrowing_narrow_stream(self):
+        values = [float(i) + 0.1 for i in range(10)]
+        raw = io.BytesIO(struct.pack('<10d', *values))
+        chunks = list(narrow_stream(raw, FLOAT32, chunk_size=4))
+        self.assertEqual([len(c.bits) for c in chunks], [4, 4, 2])
+        streamed = [b for c in chunks for b in c.bits]
+        self.assertEqual(streamed, list(narrow_values(values, FLOAT32).bits))
+
+        big_endian = io.BytesIO(struct.pack('>2d', 1.0, 2.0))
+        [chunk] = narrow_stream(big_endian, FLOAT16, byteorder="big")
+        self.assertEqual(list(chunk.bits), [0x3c00, 0x4000])
+
+        with self.assertRaises(ValueError):
+            list(narrow_stream(io.BytesIO(b'\x00' * 12), FLOAT32))
+
+if __name__ == '__main__':
+    unittest.main()
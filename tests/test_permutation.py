@@ -0,0 +1,103 @@
+import random
+import sys
+import unittest
+from src.engine import BFLOAT16, FLOAT16, FLOAT32, classify_bits
+from src.permutation import ROUNDS, KeyedPermutation, PermutationSampler, _class_layout, _mix, class_pattern, class_size
+
+class TestPermutation(unittest.TestCase):
+    def test_permutation_mix(self):
+        self.assertEqual(_mix(0), 0)
+        self.assertNotEqual(_mix(1), _mix(2))
+        self.assertLess(_mix((1 << 64) - 1), 1 << 64)
+
+    def test_permutation_KeyedPermutation_init(self):
+        perm = KeyedPermutation(1000, key=7)
+        self.assertEqual(perm._half_bits, 5)
+        self.assertEqual(len(perm._round_keys), ROUNDS)
+        with self.assertRaises(ValueError):
+            KeyedPermutation(0, key=7)
+
+    def test_permutation_KeyedPermutation_feistel(self):
+        # The Feistel network alone permutes the whole power-of-four domain
+        perm = KeyedPermutation(200, key=3)
+        self.assertEqual(sorted(perm._feistel(x) for x in range(256)), list(range(256)))
+
+    def test_permutation_KeyedPermutation__getitem__(self):
+        for size in (1, 2, 3, 100, 257, 1000):
+            perm = KeyedPermutation(size, key=size)
+            self.assertEqual(sorted(perm[i] for i in range(size)), list(range(size)))
+        first, second = KeyedPermutation(1000, 1), KeyedPermutation(1000, 2)
+        self.assertNotEqual([first[i] for i in range(20)], [second[i] for i in range(20)])
+        self.assertEqual([first[i] for i in range(20)], [KeyedPermutation(1000, 1)[i] for i in range(20)])
+        with self.assertRaises(IndexError):
+            first[1000]
+
+    def test_permutation_KeyedPermutation__len__(self):
+        self.assertEqual(len(KeyedPermutation(1 << 32, 0)), 1 << 32)
+
+    def test_permutation_PermutationSampler_init(self):
+        sampler = PermutationSampler(10, random.Random(1))
+        self.assertEqual((sampler.passes, sampler.position), (0, 0))
+        self.assertFalse(hasattr(sampler, "__dict__"))
+
+    def test_permutation_PermutationSampler__iter__(self):
+        sampler = PermutationSampler(50, random.Random(1))
+        self.assertIs(iter(sampler), sampler)
+
+    def test_permutation_PermutationSampler__next__(self):
+        sampler = PermutationSampler(500, random.Random(2))
+        first = [next(sampler) for _ in range(500)]
+        second = [next(sampler) for _ in range(500)]
+        # Each pass covers the space once, in a newly keyed order
+        self.assertEqual(sorted(first), list(range(500)))
+        self.assertEqual(sorted(second), list(range(500)))
+        self.assertNotEqual(first, second)
+        self.assertEqual(sampler.passes, 1)
+        # A seeded RNG replays the same order
+        replay = PermutationSampler(500, random.Random(2))
+        self.assertEqual([next(replay) for _ in range(500)], first)
+
+    def test_permutation_PermutationSampler_memory(self):
+        # The state stays a key and a counter however far a session walks into 2^32 patterns
+        sampler = PermutationSampler(1 << 32, random.Random(3))
+        size = sys.getsizeof(sampler)
+        seen = {next(sampler) for _ in range(2000)}
+        self.assertEqual(len(seen), 2000)
+        self.assertEqual(sys.getsizeof(sampler), size)
+
+    def test_permutation_class_layout(self):
+        self.assertEqual(_class_layout("inf", FLOAT16), (31, 1))
+        with self.assertRaises(ValueError):
+            _class_layout("tiny", FLOAT16)
+
+    def test_permutation_class_size(self):
+        self.assertEqual(class_size("zero", FLOAT32), 2)
+        self.assertEqual(class_size("subnormal", FLOAT32), 2 * ((1 << 23) - 1))
+        # The five classes partition every pattern of the format
+        for preset in (FLOAT16, BFLOAT16, FLOAT32):
+            total = sum(class_size(cls, preset) for cls in ("zero", "subnormal", "normal", "inf", "nan"))
+            self.assertEqual(total, 1 << preset.total_bits)
+
+    def test_permutation_class_pattern(self):
+        # The ends of every class space and a sample between; test_permutation_exhaustive.py covers every index
+        rng = random.Random(3)
+        for preset in (FLOAT16, BFLOAT16, FLOAT32):
+            for cls in ("zero", "subnormal", "normal", "inf", "nan"):
+                size = class_size(cls, preset)
+                indices = set(range(min(size, 4))) | set(range(max(0, size - 4), size)) | {rng.randrange(size) for _ in range(64)}
+                patterns = {class_pattern(cls, i, preset) for i in indices}
+                self.assertEqual(len(patterns), len(indices))
+                self.assertTrue(all(classify_bits(bits, preset) == cls for bits in patterns))
+        self.assertEqual(class_pattern("inf", 1, FLOAT32), 0xFF800000)
+        with self.assertRaises(IndexError):
+            class_pattern("zero", 2, FLOAT32)
+
+    def test_permutation_class_filtered_sampling(self):
+        # Repeat-free float32 subnormals straight from the class space, no rejection sampling
+        sampler = PermutationSampler(class_size("subnormal", FLOAT32), random.Random(4))
+        patterns = [class_pattern("subnormal", next(sampler), FLOAT32) for _ in range(1000)]
+        self.assertEqual(len(set(patterns)), 1000)
+        self.assertTrue(all(classify_bits(bits, FLOAT32) == "subnormal" for bits in patterns))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from src.engine import BFLOAT16, FLOAT16, classify_bits
+from src.permutation import KeyedPermutation, class_pattern, class_size
+
+class TestPermutationExhaustive(unittest.TestCase):
+    """Full enumerations of the 16-bit class spaces and of a permutation domain."""
+
+    def test_permutation_class_pattern_every_index(self):
+        for preset in (FLOAT16, BFLOAT16):
+            seen = set()
+            for cls in ("zero", "subnormal", "normal", "inf", "nan"):
+                patterns = {class_pattern(cls, i, preset) for i in range(class_size(cls, preset))}
+                self.assertEqual(len(patterns), class_size(cls, preset))
+                self.assertTrue(all(classify_bits(bits, preset) == cls for bits in patterns))
+                seen |= patterns
+            # The five classes partition the whole pattern space
+            self.assertEqual(seen, set(range(1 << 16)))
+
+    def test_permutation_is_a_bijection(self):
+        for size in (1, 2, 3, 1000, 1 << 16, 100003):
+            perm = KeyedPermutation(size, key=size)
+            self.assertEqual(sorted(perm[i] for i in range(size)), list(range(size)))
+
+if __name__ == '__main__':
+    unittest.main()
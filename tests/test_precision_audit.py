@@ -0,0 +1,109 @@
+import os
+import struct
+import tempfile
+import unittest
+from array import array
+from tools.precision_audit import (
+    ColumnAudit, AuditReport, read_npy_header, iter_npy_chunks, iter_csv_chunks,
+    csv_header, column_names, audit_columns, audit_file
+)
+from src.engine import FLOAT32, FLOAT16
+
+def write_npy(path, rows, descr='<f8'):
+    n_cols = len(rows[0])
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d, %d), }" % (descr, len(rows), n_cols)
+    header += ' ' * ((64 - (11 + len(header)) % 64) % 64) + '\n'
+    code = descr[0] + ('d' if descr.endswith('8') else 'f') * n_cols
+    with open(path, 'wb') as f:
+        f.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1'))
+        for row in rows:
+            f.write(struct.pack(code, *row))
+
+class TestPrecisionAudit(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "data.csv")
+        with open(self.csv_path, "w") as f:
+            f.write("exact,tenth,label\n")
+            for i in range(10):
+                f.write(f"{i * 0.5},{i / 10},row{i}\n")
+        self.npy_path = os.path.join(self.tmp.name, "data.npy")
+        write_npy(self.npy_path, [(1.0, 0.1), (2.0, 1e39), (0.25, 1e-46)])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_column_audit_add(self):
+        audit = ColumnAudit("x")
+        audit.add(array('d', [1.0, 0.1, 1e39, 1e-46, 0.0]), FLOAT32)
+        self.assertEqual(audit.values, 5)
+        self.assertEqual(audit.inexact, 3)
+        self.assertEqual(audit.overflow, 1)
+        self.assertEqual(audit.underflow, 1)
+        self.assertEqual(audit.max_rel_error, float('inf'))
+        self.assertEqual((audit.min_exp, audit.max_exp), (-153, 129))
+
+    def test_audit_report_values_per_second(self):
+        report = AuditReport("p", "FLOAT32", 2, 0.5, None, [ColumnAudit("a", values=2), ColumnAudit("b", values=2)])
+        self.assertEqual(report.values_per_second, 8.0)
+        self.assertEqual(AuditReport("p", "FLOAT32", 0, 0.0, None, []).values_per_second, 0.0)
+
+    def test_read_npy_header(self):
+        with open(self.npy_path, "rb") as f:
+            descr, fortran, shape, offset = read_npy_header(f)
+        self.assertEqual((descr, fortran, shape, offset), ('<f8', False, (3, 2), 128))
+        bad = os.path.join(self.tmp.name, "bad.npy")
+        with open(bad, "wb") as f:
+            f.write(b"not numpy")
+        with open(bad, "rb") as f, self.assertRaises(ValueError):
+            read_npy_header(f)
+
+    def test_iter_npy_chunks(self):
+        chunks = list(iter_npy_chunks(self.npy_path, [1], chunk_rows=2))
+        self.assertEqual([rows for rows, _ in chunks], [2, 1])
+        self.assertEqual(list(chunks[0][1][1]), [0.1, 1e39])
+        big_endian = os.path.join(self.tmp.name, "be.npy")
+        write_npy(big_endian, [(1.5,), (2.5,)], descr='>f4')
+        [(rows, chunk)] = iter_npy_chunks(big_endian, [0], chunk_rows=10)
+        self.assertEqual(list(chunk[0]), [1.5, 2.5])
+
+    def test_iter_csv_chunks(self):
+        chunks = list(iter_csv_chunks(self.csv_path, [0, 2], chunk_rows=4))
+        self.assertEqual([rows for rows, _, _ in chunks], [4, 4, 2])
+        self.assertEqual(list(chunks[0][1][0]), [0.0, 0.5, 1.0, 1.5])
+        self.assertEqual(chunks[0][2][2], 4)
+
+    def test_csv_header_and_column_names(self):
+        self.assertEqual(csv_header(self.csv_path), ["exact", "tenth", "label"])
+        plain = os.path.join(self.tmp.name, "plain.csv")
+        with open(plain, "w") as f:
+            f.write("1.0,2.0\n3.0,4.0\n")
+        self.assertIsNone(csv_header(plain))
+        self.assertEqual(column_names(plain), ["col0", "col1"])
+        self.assertEqual(column_names(self.npy_path), ["col0", "col1"])
+
+    def test_audit_columns(self):
+        rows, audits = audit_columns(self.csv_path, "FLOAT32", [0, 1, 2], chunk_rows=3)
+        self.assertEqual(rows, 10)
+        exact, tenth, label = audits
+        self.assertEqual(exact.inexact, 0)
+        self.assertEqual(tenth.inexact, 8)  # 0.0 and 0.5 are exact
+        self.assertLess(tenth.max_rel_error, 2 ** -24)
+        self.assertEqual((label.values, label.skipped), (0, 10))
+
+    def test_audit_file(self):
+        report = audit_file(self.npy_path, "FLOAT16")
+        self.assertEqual(report.rows, 3)
+        self.assertEqual(report.columns[0].inexact, 0)
+        self.assertEqual(report.columns[1].overflow, 1)
+        with self.assertRaises(ValueError):
+            audit_file(self.npy_path, "FLOAT128")
+
+    def test_audit_file_workers(self):
+        serial = audit_file(self.csv_path, "FLOAT32", chunk_rows=4)
+        parallel = audit_file(self.csv_path, "FLOAT32", chunk_rows=4, workers=2)
+        self.assertEqual([c.name for c in parallel.columns], ["exact", "tenth", "label"])
+        self.assertEqual([c.inexact for c in parallel.columns], [c.inexact for c in serial.columns])
+
+if __name__ == '__main__':
+    unittest.main()
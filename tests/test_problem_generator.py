@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.engine import FLOAT16, FLOAT32, FLOAT64, FLAG_INEXACT, FLAG_TIE, extract_bit_fields
+from src.narrowing import narrow_pattern
+from src.problem_generator import (
+    ProblemSpec, DENORMALS_SPECS, ModelCache, build_constraints, enumerate_models, ensure_models
+)
+from src.denormals_mode import _cached_questions
+
+try:
+    import z3
+    HAVE_Z3 = True
+except ImportError:
+    HAVE_Z3 = False
+
+class TestProblemGenerator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "models.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_problem_generator_ProblemSpec_key(self):
+        a = ProblemSpec("subnormal", fraction_ones=3)
+        self.assertEqual(a.key(), ProblemSpec("subnormal", "FLOAT32", 3).key())
+        self.assertNotEqual(a.key(), ProblemSpec("subnormal", fraction_ones=2).key())
+        self.assertNotEqual(a.key(), ProblemSpec("subnormal", "FLOAT16", 3).key())
+        self.assertEqual(len({spec.key() for spec in DENORMALS_SPECS}), len(DENORMALS_SPECS))
+
+    @unittest.skipUnless(HAVE_Z3, "z3-solver is not installed")
+    def test_problem_generator_build_constraints(self):
+        bits = z3.BitVec("bits", 32)
+        self.assertEqual(len(build_constraints(ProblemSpec("subnormal", fraction_ones=1), bits)), 2)
+        with self.assertRaises(ValueError):
+            build_constraints(ProblemSpec("tiny"), bits)
+        with self.assertRaises(ValueError):
+            build_constraints(ProblemSpec("normal", preset="FLOAT8"), bits)
+        with self.assertRaises(ValueError):
+            build_constraints(ProblemSpec("rounding", preset="FLOAT64"), z3.BitVec("bits", 64))
+
+    @unittest.skipUnless(HAVE_Z3, "z3-solver is not installed")
+    def test_problem_generator_enumerate_models_value_classes(self):
+        models = enumerate_models(ProblemSpec("subnormal", fraction_ones=3), 16, seed=1)
+        self.assertEqual(len(set(models)), 16)
+        for bits in models:
+            _, e, f = extract_bit_fields(bits, FLOAT32)
+            self.assertEqual((e, bin(f).count("1")), (0, 3))
+        # Exactly 23 positions x 2 signs exist, and the blocking clauses exhaust them
+        self.assertEqual(len(set(enumerate_models(ProblemSpec("subnormal", fraction_ones=1), 64))), 46)
+        for bits in enumerate_models(ProblemSpec("special", preset="FLOAT16"), 8):
+            self.assertEqual(extract_bit_fields(bits, FLOAT16)[1], 0x1f)
+
+    @unittest.skipUnless(HAVE_Z3, "z3-solver is not installed")
+    def test_problem_generator_enumerate_models_rounding(self):
+        # guard=1, round=0, sticky=0 is an exact tie when narrowing to FLOAT32
+        for bits in enumerate_models(ProblemSpec("rounding", guard=1, round=0, sticky=0), 8):
+            _, flags = narrow_pattern(bits, FLOAT64, FLOAT32)
+            self.assertTrue(flags & FLAG_TIE)
+        for bits in enumerate_models(ProblemSpec("rounding", guard=0, round=0, sticky=0), 8):
+            _, flags = narrow_pattern(bits, FLOAT64, FLOAT32)
+            self.assertFalse(flags & FLAG_INEXACT)
+
+    def test_problem_generator_ModelCache_init_get_requested_put_save(self):
+        cache = ModelCache(self.path)
+        spec = ProblemSpec("normal")
+        self.assertEqual((cache.get(spec), cache.requested(spec)), ([], 0))
+        cache.put(spec, [1, 2, 3], 4)
+        cache.save()
+        reloaded = ModelCache(self.path)
+        self.assertEqual((reloaded.get(spec), reloaded.requested(spec)), ([1, 2, 3], 4))
+        with open(self.path, "w") as f:
+            f.write("{truncated")
+        self.assertEqual(ModelCache(self.path).entries, {})
+
+    def test_problem_generator_ensure_models(self):
+        cache = ModelCache(self.path)
+        spec = ProblemSpec("special")
+        cache.put(spec, [0x7f800000], 64)
+        with patch("src.problem_generator.enumerate_models") as solve:
+            # A small space solved once is never re-solved for the same request size
+            self.assertEqual(ensure_models(spec, cache, 64), [0x7f800000])
+            solve.assert_not_called()
+            solve.return_value = [1, 2]
+            self.assertEqual(ensure_models(spec, cache, 128), [1, 2])
+            self.assertEqual(cache.requested(spec), 128)
+
+    def test_denormals_mode_cached_questions_reads_cache_only(self):
+        cache = ModelCache(self.path)
+        cache.put(DENORMALS_SPECS[0], [0x00000001], 64)
+        cache.put(DENORMALS_SPECS[2], [0x40600000], 64)
+        cache.put(DENORMALS_SPECS[3], [0xff800000, 0x7fc00000], 64)
+        with patch("src.problem_generator.enumerate_models") as solve:
+            questions = _cached_questions(cache)
+            solve.assert_not_called()
+        self.assertEqual([(q.seq, q.type, q.lead, q.bias_exp) for q in questions], [
+            ("00000000000000000000000000000001", "D", "0", "-126"),
+            ("01000000011000000000000000000000", "N", "1", "1"),
+            ("11111111100000000000000000000000", "S", "None", "N/A"),
+            ("01111111110000000000000000000000", "S", "None", "N/A"),
+        ])
+        self.assertIn("-INF", questions[2].reason)
+        self.assertIn("NaN", questions[3].reason)
+        self.assertEqual(_cached_questions(ModelCache(os.path.join(self.tmp.name, "none.json"))), [])
+
+if __name__ == '__main__':
+    unittest.main()
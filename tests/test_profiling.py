@@ -0,0 +1,80 @@
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import MagicMock, patch
+from src.profiling import SessionProfiler
+from src.progress import ProgressStore
+from src.ui import UserQuitException
+from main import main
+
+class AllocatingMode:
+    """Stand-in mode whose rounds keep allocating until `rounds` are played."""
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+        self.kept = []
+
+    def run_round(self) -> bool:
+        self.kept.append([0] * 10000)
+        self.rounds -= 1
+        return self.rounds > 0
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_profiling_SessionProfiler_init(self):
+        profiler = SessionProfiler(self.tmp.name, top=5)
+        self.assertEqual((profiler.directory, profiler.top, profiler.profiles), (self.tmp.name, 5, {}))
+
+    def test_profiling_run_mode(self):
+        profiler = SessionProfiler(self.tmp.name)
+        mode = AllocatingMode(3)
+        profiler.run_mode(9, mode)
+        profiler.run_mode(9, AllocatingMode(1))
+        self.assertEqual(mode.rounds, 0)
+        calls = pstats.Stats(profiler.profiles[9]).stats
+        run_round = [v for (f, _, name), v in calls.items() if name == "run_round" and f == __file__]
+        self.assertEqual(run_round[0][1], 4)  # both visits accumulate into one profile
+        self.assertGreater(sum(profiler.allocations[9].values()), 3 * 10000 * 8)
+        profiler.dump()
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_profiling_summary(self):
+        profiler = SessionProfiler(self.tmp.name, top=3)
+        profiler.run_mode(5, AllocatingMode(2))
+        text = profiler.summary(5)
+        self.assertIn("Mode 5: top 3 functions by cumulative time", text)
+        self.assertIn("run_round", text)
+        self.assertIn("test_profiling.py", text.split("allocation sites")[1])
+        profiler.dump()
+
+    def test_profiling_dump(self):
+        profiler = SessionProfiler(os.path.join(self.tmp.name, "out"))
+        profiler.run_mode(1, AllocatingMode(1))
+        profiler.run_mode(2, AllocatingMode(1))
+        paths = profiler.dump()
+        self.assertEqual([os.path.basename(p) for p in paths], ["mode_1.prof", "mode_1.txt", "mode_2.prof", "mode_2.txt"])
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+        pstats.Stats(paths[0])  # loadable
+
+    @patch('main.prompt_input')
+    @patch('main.clear_screen')
+    @patch('main.display_main_menu')
+    def test_profiling_main_profile_dir(self, mock_menu, mock_clear, mock_prompt):
+        mock_prompt.side_effect = ['9', UserQuitException()]
+        out = os.path.join(self.tmp.name, "profiles")
+        with patch('main.RoundingMode') as m9, patch("builtins.print"):
+            inst = MagicMock()
+            inst.run_round.return_value = False
+            m9.return_value = inst
+            with self.assertRaises(SystemExit):
+                main(store=ProgressStore(), profile_dir=out)
+        self.assertEqual(sorted(os.listdir(out)), ["mode_9.prof", "mode_9.txt"])
+
+if __name__ == '__main__':
+    unittest.main()
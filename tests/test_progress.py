@@ -0,0 +1,276 @@
+import fcntl
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.progress import LOG_NAME, SNAPSHOT_NAME, DrillTotals, ProgressStore, _lock, _unlock
+from src.rounding_mode import RoundingMode
+from src.ui import display_main_menu
+
+class TestProgress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "learner")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_progress_ProgressStore_init(self):
+        store = ProgressStore(self.dir)
+        self.assertEqual(store.compact_every, 1000)
+        # Nothing is created until the first answer is recorded
+        self.assertFalse(os.path.exists(self.dir))
+        self.assertIsNone(ProgressStore().directory)
+
+    def test_progress_path(self):
+        self.assertEqual(ProgressStore(self.dir)._path(LOG_NAME), os.path.join(self.dir, LOG_NAME))
+
+    def test_progress_apply(self):
+        store = ProgressStore()
+        store._apply(3, "sign", 1)
+        store._apply(3, "exponent", 2, 5)
+        self.assertEqual(store.totals(3), (3, 6))
+        self.assertEqual(store.step_totals(3), {"sign": (1, 1), "exponent": (2, 5)})
+
+    def test_progress_record(self):
+        store = ProgressStore(self.dir)
+        store.record(1, "sign", True)
+        store.record(1, "exponent", False)
+        store.close()
+        with open(os.path.join(self.dir, LOG_NAME), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual([line.split("\t")[:3] for line in lines], [["1", "sign", "1"], ["1", "exponent", "0"]])
+        # In-memory stores never touch the disk
+        memory = ProgressStore()
+        memory.record(2, "sign", True)
+        self.assertEqual(memory.totals(2), (1, 1))
+
+    def test_progress_accuracy(self):
+        store = ProgressStore()
+        self.assertIsNone(store.accuracy(1))
+        for correct in (True, True, True, False):
+            store.record(1, "sign", correct)
+        self.assertAlmostEqual(store.accuracy(1), 75.0)
+        # Lookups come from the aggregates, never from the log
+        with patch("builtins.open", side_effect=AssertionError("log read")):
+            self.assertAlmostEqual(store.accuracy(1), 75.0)
+
+    def test_progress_totals(self):
+        store = ProgressStore()
+        self.assertEqual(store.totals(9), (0, 0))
+        store.record(9, "decision", False)
+        self.assertEqual(store.totals(9), (0, 1))
+
+    def test_progress_step_totals(self):
+        store = ProgressStore()
+        store.record(7, "type", True)
+        store.record(7, "type", False)
+        store.record(8, "direction", True)
+        self.assertEqual(store.step_totals(7), {"type": (1, 2)})
+        self.assertEqual(store.step_totals(1), {})
+
+    def test_progress_load(self):
+        store = ProgressStore(self.dir, compact_every=3)
+        for i in range(5):
+            store.record(2, "value", i % 2 == 0)
+        store.close()
+        # Three answers were compacted into the snapshot, two are still in the log
+        with open(os.path.join(self.dir, LOG_NAME), "rb") as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+        with open(os.path.join(self.dir, LOG_NAME), "ab") as f:
+            f.write(b"2\tvalue\t1\t17")  # torn final write
+        reloaded = ProgressStore(self.dir)
+        self.assertEqual(reloaded.totals(2), (3, 5))
+        self.assertEqual(reloaded._since_compact, 2)
+
+    def test_progress_compact(self):
+        store = ProgressStore(self.dir)
+        store.record(4, "sign", True)
+        store.record(4, "sign", False)
+        store.compact()
+        store.record(4, "sign", True)
+        store.close()
+        self.assertTrue(os.path.exists(os.path.join(self.dir, SNAPSHOT_NAME)))
+        self.assertEqual(ProgressStore(self.dir).totals(4), (2, 3))
+        ProgressStore().compact()  # no-op in memory
+
+    def test_progress_compact_locked(self):
+        store = ProgressStore(self.dir)
+        store.record(5, "fraction", True)
+        store._compact_locked()
+        store.close()
+        self.assertEqual(os.path.getsize(os.path.join(self.dir, LOG_NAME)), 0)
+        self.assertEqual(store._since_compact, 0)
+        self.assertEqual(ProgressStore(self.dir).totals(5), (1, 1))
+
+    def test_progress_write_snapshot(self):
+        store = ProgressStore(self.dir)
+        store.record(6, "exponent", True)
+        store.close()
+        log_path = os.path.join(self.dir, LOG_NAME)
+        # A compaction interrupted right after truncating: the snapshot offset lies past the end of the log
+        store._write_snapshot(os.path.getsize(log_path))
+        open(log_path, "wb").close()
+        self.assertEqual(ProgressStore(self.dir).totals(6), (1, 1))
+        self.assertFalse(os.path.exists(os.path.join(self.dir, SNAPSHOT_NAME + ".tmp")))
+
+    def test_progress_close(self):
+        store = ProgressStore(self.dir)
+        store.record(1, "sign", True)
+        self.assertIsNotNone(store._fd)
+        store.close()
+        self.assertIsNone(store._fd)
+        store.close()
+
+    def test_progress_lock(self):
+        with open(os.path.join(self.tmp.name, "lockfile"), "w") as held, open(held.name) as other:
+            _lock(held.fileno(), exclusive=True)
+            with self.assertRaises(BlockingIOError):
+                fcntl.flock(other.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+            _unlock(held.fileno())
+            # Shared locks admit each other
+            _lock(held.fileno(), exclusive=False)
+            fcntl.flock(other.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+            with patch("src.progress.fcntl", None):
+                _lock(held.fileno(), exclusive=True)  # no-op without fcntl
+
+    def test_progress_unlock(self):
+        with open(os.path.join(self.tmp.name, "lockfile"), "w") as held, open(held.name) as other:
+            _lock(held.fileno(), exclusive=True)
+            _unlock(held.fileno())
+            fcntl.flock(other.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            with patch("src.progress.fcntl", None):
+                _unlock(held.fileno())
+
+    def test_progress_read_snapshot(self):
+        store = ProgressStore(self.dir)
+        self.assertEqual(store._read_snapshot(), 0)
+        store.record(3, "sign", True)
+        store.compact()
+        store.record(3, "sign", False)
+        store.close()
+        fresh = ProgressStore()
+        fresh.directory = self.dir
+        self.assertEqual(fresh._read_snapshot(), 0)
+        self.assertEqual(fresh.totals(3), (1, 1))
+
+    def test_progress_replay(self):
+        store = ProgressStore(self.dir)
+        store.record(3, "sign", True)
+        store.record_drill(10, 4, 3, 8.0)
+        store.close()
+        fresh = ProgressStore()
+        with open(os.path.join(self.dir, LOG_NAME), "rb") as log:
+            first = log.readline()
+            fresh._replay(log, len(first))
+        self.assertEqual((fresh.totals(3), fresh.drill_totals(10).questions), ((0, 0), 4))
+        self.assertEqual(fresh._since_compact, 1)
+
+    def test_progress_open_log_locked(self):
+        store = ProgressStore(self.dir)
+        fd = store._open_log_locked()
+        self.assertTrue(os.path.exists(os.path.join(self.dir, LOG_NAME)))
+        self.assertEqual(store._open_log_locked(), fd)
+        store.close()
+
+    def test_progress_shared_directory(self):
+        # Two processes on one IEEE754_TUTOR_HOME, each compacting on its own schedule
+        first, second = ProgressStore(self.dir, compact_every=3), ProgressStore(self.dir, compact_every=5)
+        for i in range(20):
+            first.record(1, "sign", True)
+            second.record(2, "value", i % 2 == 0)
+        first.record_drill(10, 5, 4, 10.0)
+        second.compact()
+        # A compaction folds in the other store's answers instead of dropping them
+        self.assertEqual((second.totals(1), second.totals(2)), ((20, 20), (10, 20)))
+        first.record(1, "sign", False)
+        first.close()
+        second.close()
+        reloaded = ProgressStore(self.dir)
+        self.assertEqual((reloaded.totals(1), reloaded.totals(2)), ((20, 21), (10, 20)))
+        self.assertEqual(reloaded.drill_totals(10).sessions, 1)
+
+    def test_progress_DrillTotals_per_minute(self):
+        totals = DrillTotals(sessions=2, questions=30, correct=27, seconds=120.0, best_per_minute=18.0)
+        self.assertEqual(totals.per_minute, 15.0)
+        self.assertEqual(totals.accuracy, 90.0)
+        self.assertEqual(DrillTotals(0, 0, 0, 0.0, 0.0).per_minute, 0.0)
+        self.assertIsNone(DrillTotals(0, 0, 0, 0.0, 0.0).accuracy)
+
+    def test_progress_apply_drill(self):
+        store = ProgressStore()
+        store._apply_drill(10, 20, 18, 60.0)
+        store._apply_drill(10, 5, 5, 60.0)
+        self.assertEqual(store.drill_totals(10), DrillTotals(2, 25, 23, 120.0, 20.0))
+        # A snapshot restores several drills and their best rate at once
+        store._apply_drill(10, 100, 90, 300.0, sessions=4, best=31.5)
+        self.assertEqual(store.drill_totals(10).best_per_minute, 31.5)
+
+    def test_progress_record_drill(self):
+        store = ProgressStore(self.dir)
+        store.record_drill(10, 12, 9, 30.0)
+        store.record(10, "decode", True)
+        store.close()
+        with open(os.path.join(self.dir, LOG_NAME), encoding="utf-8") as f:
+            self.assertTrue(f.readline().startswith("drill\t10\t12\t9\t30.000000\t"))
+        reopened = ProgressStore(self.dir)
+        self.assertEqual(reopened.drill_totals(10), DrillTotals(1, 12, 9, 30.0, 24.0))
+        self.assertEqual(reopened.totals(10), (1, 1))
+        # Drill totals survive compaction into the snapshot
+        reopened.compact()
+        reopened.close()
+        self.assertEqual(ProgressStore(self.dir).drill_totals(10), DrillTotals(1, 12, 9, 30.0, 24.0))
+
+    def test_progress_append_locked(self):
+        store = ProgressStore(self.dir, compact_every=2)
+        store.record_drill(10, 1, 1, 2.0)
+        store.record(1, "sign", True)
+        store.close()
+        # The second line triggered a compaction, so the log is empty and the snapshot holds both
+        self.assertEqual(os.path.getsize(os.path.join(self.dir, LOG_NAME)), 0)
+        reopened = ProgressStore(self.dir)
+        self.assertEqual((reopened.totals(1), reopened.drill_totals(10).sessions), ((1, 1), 1))
+        ProgressStore()._append_locked("ignored\n")  # memory-only stores write nothing
+
+    def test_progress_drill_totals(self):
+        self.assertIsNone(ProgressStore().drill_totals(10))
+
+    def test_base_mode_bind_progress(self):
+        mode = RoundingMode()
+        self.assertIsNone(mode.progress)
+        store = ProgressStore()
+        mode.bind_progress(store, 9)
+        self.assertIs(mode.progress, store)
+        self.assertEqual(mode.mode_id, 9)
+
+    def test_base_mode_record_attempt(self):
+        mode = RoundingMode()
+        self.assertTrue(mode.record_attempt("decision", True))  # unbound: no-op
+        store = ProgressStore()
+        mode.bind_progress(store, 9)
+        self.assertFalse(mode.record_attempt("decision", False))
+        self.assertEqual(store.totals(9), (0, 1))
+
+    def test_progress_mode_round_records_steps(self):
+        mode = RoundingMode()
+        store = ProgressStore()
+        mode.bind_progress(store, 9)
+        with patch("src.rounding_mode.prompt_input", side_effect=["?", ""]), \
+             patch("src.rounding_mode.clear_screen"), patch("builtins.print"):
+            self.assertTrue(mode.run_round())
+        self.assertEqual(store.step_totals(9), {"decision": (0, 1)})
+
+    def test_progress_menu_accuracy_column(self):
+        captured = io.StringIO()
+        with patch.object(sys, "stdout", captured):
+            display_main_menu({1: "One", 2: "Two", 3: "Three"}, {1: 85.0, 2: None, 3: 100.0})
+        lines = captured.getvalue().splitlines()
+        self.assertIn("Accuracy | Mode Description", lines)
+        self.assertIn("   85.0% | 1. One", lines)
+        self.assertIn("   --    | 2. Two", lines)
+        self.assertIn("  100.0% | 3. Three", lines)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,228 @@
+import os
+import tempfile
+import textwrap
+import unittest
+from tools.proof_runner import (
+    ProofSpec, ProofResult, ProofBudget, ProofCache, ProofTimeout, discover_proofs, _is_verdict, _proof_worker,
+    run_proofs, summarize, format_cache_report, TESTS_DIR
+)
+
+try:
+    import z3  # noqa: F401
+    HAVE_Z3 = True
+except ImportError:
+    HAVE_Z3 = False
+
+# Far beyond a 100 ms budget (42 as a sum of three cubes), so the solver can only answer `unknown`
+GIVES_UP = textwrap.dedent("""
+    import unittest
+    from z3 import Int, Solver, unsat
+
+    class TestGivesUpBMC(unittest.TestCase):
+        def test_gives_up(self):
+            solver = Solver()
+            x, y, z = Int("x"), Int("y"), Int("z")
+            solver.add(x * x * x + y * y * y + z * z * z == 42, x > 10 ** 6)
+            self.assertEqual(solver.check(), unsat)
+""")
+
+class FakeSolver:
+    """Records the timeouts ProofBudget hands a solver."""
+    def __init__(self):
+        self.timeouts = []
+
+    def set(self, key, value):
+        self.timeouts.append((key, value))
+
+    def reason_unknown(self):
+        return "timeout"
+
+FAKE_SUITE = textwrap.dedent("""
+    import time
+    import unittest
+
+    class TestFakeBMC(unittest.TestCase):
+        def test_proved(self):
+            self.assertTrue(True)
+
+        def test_counterexample(self):
+            self.assertEqual("sat", "unsat", "found a counterexample")
+
+        def test_hangs(self):
+            time.sleep(30)
+
+        def test_raises(self):
+            raise RuntimeError("solver crashed")
+""")
+
+class TestProofRunner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.tmp.name, "test_fake_bmc.py"), "w") as f:
+            f.write(FAKE_SUITE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_proof_spec_name(self):
+        spec = ProofSpec(TESTS_DIR, "test_engine_bmc", "TestEngineBMC", "test_z3_fp_equivalence")
+        self.assertEqual(spec.name, "test_engine_bmc.TestEngineBMC.test_z3_fp_equivalence")
+        self.assertEqual(ProofResult("p", "passed", 0.1).detail, "")
+
+    def test_discover_proofs(self):
+        names = [s.name for s in discover_proofs()]
+        self.assertIn("test_engine_bmc.TestEngineBMC.test_bmc_round_exact_matches_fpa", names)
+        self.assertIn("test_ui_bmc.TestUIBMC.test_bmc_ui_prompt_state_machine", names)
+        self.assertTrue(all(".test_" in n for n in names))
+        fake = discover_proofs(self.tmp.name)
+        self.assertEqual([s.method for s in fake], ["test_proved", "test_counterexample", "test_hangs", "test_raises"])
+
+    def test_proof_worker(self):
+        import multiprocessing
+        spec = discover_proofs(self.tmp.name)[0]
+        parent, child = multiprocessing.Pipe(duplex=False)
+        check = z3.Solver.check if HAVE_Z3 else None
+        _proof_worker(spec, 1000, child)
+        result = parent.recv()
+        self.assertEqual((result.name, result.status), (spec.name, "passed"))
+        if HAVE_Z3:
+            # Run in-process, the worker hands back the unbudgeted check
+            self.assertIs(z3.Solver.check, check)
+
+    def test_run_proofs(self):
+        # Without the hanging proof nothing waits out the budget; test_proof_runner_exhaustive.py kills it
+        specs = [s for s in discover_proofs(self.tmp.name) if s.method != "test_hangs"]
+        results = run_proofs(specs, jobs=4, timeout_ms=100, wall_timeout=0.5)
+        self.assertEqual([r.name for r in results], [s.name for s in specs])
+        self.assertEqual([r.status for r in results], ["passed", "failed", "error"])
+        self.assertIn("found a counterexample", results[1].detail)
+        self.assertIn("solver crashed", results[2].detail)
+
+    def test_proof_budget(self):
+        now = [0.0]
+        budget = ProofBudget(1000, "unknown", clock=lambda: now[0])
+        solver = FakeSolver()
+
+        def check(solver, *assumptions):
+            now[0] += 0.4
+            return "unsat"
+        self.assertEqual(budget.check(solver, check), "unsat")
+        self.assertEqual(budget.check(solver, check, "hint"), "unsat")
+        # The second check only got what the first left over: one budget for the whole proof
+        self.assertEqual(solver.timeouts, [("timeout", 1000), ("timeout", 600)])
+        self.assertEqual(budget.exhausted, "")
+        with self.assertRaises(ProofTimeout):
+            budget.check(solver, lambda solver: "unknown")
+        self.assertEqual(budget.exhausted, "Solver answered unknown: timeout")
+        now[0] = 1.0
+        with self.assertRaises(ProofTimeout):
+            budget.check(solver, check)
+        self.assertIn("spent", budget.exhausted)
+        self.assertEqual(len(solver.timeouts), 3)
+
+    @unittest.skipUnless(HAVE_Z3, "z3-solver is not installed")
+    def test_run_proofs_unknown_is_timeout(self):
+        with open(os.path.join(self.tmp.name, "test_gives_up_bmc.py"), "w") as f:
+            f.write(GIVES_UP)
+        specs = discover_proofs(self.tmp.name, pattern="test_gives_up_bmc.py")
+        path = os.path.join(self.tmp.name, "cache.json")
+        result, = run_proofs(specs, jobs=1, timeout_ms=100, cache=ProofCache(path, self.tmp.name))
+        self.assertEqual(result.status, "timeout")
+        self.assertIn("unknown", result.detail)
+        # Re-solved next run rather than replayed as a permanent failure
+        self.assertEqual(ProofCache(path, self.tmp.name).entries, {})
+
+    def test_summarize(self):
+        results = [ProofResult("a", "passed", 0.5), ProofResult("b", "passed", 0.25), ProofResult("c", "timeout", 1.0)]
+        summary = summarize(results, 1.0)
+        self.assertEqual(summary["counts"], {"passed": 2, "timeout": 1})
+        self.assertEqual(summary["proof_seconds"], 1.75)
+        self.assertEqual(summary["proofs"][2]["status"], "timeout")
+
+    def test_proof_cache_reuses_verdicts(self):
+        specs = discover_proofs(self.tmp.name)[:2]
+        path = os.path.join(self.tmp.name, "cache.json")
+        first = run_proofs(specs, jobs=2, cache=ProofCache(path, self.tmp.name))
+        self.assertFalse(any(r.cached for r in first))
+
+        cache = ProofCache(path, self.tmp.name)
+        second = run_proofs(specs, jobs=2, cache=cache)
+        self.assertTrue(all(r.cached for r in second))
+        self.assertEqual([r.status for r in second], ["passed", "failed"])
+        self.assertIn("found a counterexample", second[1].detail)
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+        # A different solver budget can change the verdict, so it is a different key
+        third = run_proofs(specs, jobs=2, timeout_ms=20000, cache=ProofCache(path, self.tmp.name))
+        self.assertFalse(any(r.cached for r in third))
+
+        summary = summarize(second, 0.01)
+        self.assertEqual((summary["cache_hits"], summary["cache_misses"], summary["proof_seconds"]), (2, 0, 0))
+        self.assertAlmostEqual(summary["skipped_seconds"], sum(r.seconds for r in first))
+        self.assertIn("2 hit, 0 miss", format_cache_report(summary))
+
+    def test_proof_cache_invalidation(self):
+        src = os.path.join(self.tmp.name, "src")
+        tests = os.path.join(self.tmp.name, "tests")
+        os.makedirs(src)
+        os.makedirs(tests)
+        files = {
+            os.path.join(src, "helper.py"): "X = 1\n",
+            os.path.join(src, "engine.py"): "from src.helper import X\n",
+            os.path.join(tests, "test_x_bmc.py"): textwrap.dedent("""
+                import unittest
+                from src.engine import X
+
+                class TestX(unittest.TestCase):
+                    def test_a(self):
+                        self.assertEqual(X, 1)
+
+                    def test_b(self):
+                        self.assertEqual(X, 1)
+            """),
+        }
+        for path, text in files.items():
+            with open(path, "w") as f:
+                f.write(text)
+        a, b = discover_proofs(tests)
+        base = ProofCache(os.devnull, self.tmp.name)
+        keys = (base.key(a), base.key(b))
+        self.assertNotEqual(keys[0], keys[1])
+
+        def rekey(path, old, new):
+            with open(path) as f:
+                text = f.read()
+            with open(path, "w") as f:
+                f.write(text.replace(old, new))
+            cache = ProofCache(os.devnull, self.tmp.name)
+            return cache.key(a) != keys[0], cache.key(b) != keys[1]
+
+        test_file = os.path.join(tests, "test_x_bmc.py")
+        self.assertEqual(rekey(test_file, "def test_b(self):\n        self.assertEqual(X, 1)",
+                               "def test_b(self):\n        self.assertEqual(X, 2)"), (False, True))
+        keys = (keys[0], ProofCache(os.devnull, self.tmp.name).key(b))
+        self.assertEqual(rekey(os.path.join(src, "helper.py"), "X = 1", "X = 2"), (True, True))
+
+        cache = ProofCache(os.devnull, self.tmp.name)
+        self.assertIsNone(cache.get(a))
+        cache.put(a, ProofResult(a.name, "timeout", 1.0))
+        self.assertNotIn(a.name, cache.entries)
+        cache.put(a, ProofResult(a.name, "passed", 1.0))
+        self.assertEqual(cache.get(a).status, "passed")
+
+    def test_proof_cache_skips_solver_timeouts(self):
+        spec = discover_proofs(self.tmp.name)[1]
+        cache = ProofCache(os.devnull, self.tmp.name)
+        gave_up = ProofResult(spec.name, "timeout", 10.0, "Solver answered unknown: timeout")
+        self.assertFalse(_is_verdict(gave_up))
+        self.assertTrue(_is_verdict(ProofResult(spec.name, "failed", 1.0, "AssertionError: sat != unsat")))
+        self.assertTrue(_is_verdict(ProofResult(spec.name, "passed", 1.0)))
+        self.assertFalse(_is_verdict(ProofResult(spec.name, "error", 1.0)))
+        cache.put(spec, ProofResult(spec.name, "failed", 1.0, "AssertionError: sat != unsat"))
+        # An unknown answer is re-solved next time instead of replayed as a permanent failure
+        cache.put(spec, gave_up)
+        self.assertNotIn(spec.name, cache.entries)
+        self.assertNotEqual(cache.key(spec, 100), cache.key(spec, 200))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import tempfile
+import unittest
+from tests.test_proof_runner import FAKE_SUITE
+from tools.proof_runner import discover_proofs, run_proofs
+
+class TestProofRunnerExhaustive(unittest.TestCase):
+    """The full fake suite, including a proof that hangs until the wall-clock budget kills it."""
+
+    def test_run_proofs_kills_hung_proofs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "test_fake_bmc.py"), "w") as f:
+                f.write(FAKE_SUITE)
+            specs = discover_proofs(tmp)
+            results = run_proofs(specs, jobs=4, timeout_ms=100, wall_timeout=0.5)
+        self.assertEqual([r.name for r in results], [s.name for s in specs])
+        self.assertEqual([r.status for r in results], ["passed", "failed", "timeout", "error"])
+        self.assertEqual(results[2].detail, "Killed after 0.5s.")
+        self.assertIn("found a counterexample", results[1].detail)
+        self.assertIn("solver crashed", results[3].detail)
+
+if __name__ == '__main__':
+    unittest.main()
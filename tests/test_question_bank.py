@@ -0,0 +1,190 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.progress import ProgressStore
+from src.ui import UserQuitException
+from src.decode_mode import DecodeMode
+from src.encode_mode import EncodeMode
+from src.engine import BFLOAT16, FLOAT16, FLOAT32, FLOAT64, IEEEPresets, bits_to_float, exact_decimal, float_to_bits
+from src.question_bank import (
+    HEADER, RECORD, BankQuestion, QuestionBank, _preset_name, bank_path, compile_bank, open_banks
+)
+from tools.compile_bank import bank_patterns
+import main as tutor
+
+class TestQuestionBank(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def compile(self, preset, patterns):
+        path = bank_path(self.dir, preset)
+        compile_bank(path, preset, patterns)
+        bank = QuestionBank(path)
+        self.addCleanup(bank.close)
+        return bank
+
+    def test_question_bank_BankQuestion(self):
+        question = BankQuestion(0x3F800000, 0, 127, 0, 0, 1, "normal", "1")
+        self.assertEqual((question.true_exponent, question.cls), (0, "normal"))
+        with self.assertRaises(AttributeError):
+            question.exact = "2"
+
+    def test_question_bank_preset_name(self):
+        self.assertEqual(_preset_name(FLOAT64), "FLOAT64")
+        self.assertEqual(_preset_name(IEEEPresets(bias=127, e_bits=8, f_bits=23, total_bits=32)), "FLOAT32")
+        with self.assertRaises(ValueError):
+            _preset_name(IEEEPresets(bias=3, e_bits=3, f_bits=4, total_bits=8))
+
+    def test_question_bank_bank_path(self):
+        self.assertEqual(bank_path("banks", BFLOAT16), os.path.join("banks", "bfloat16.qbank"))
+
+    def test_question_bank_compile_bank(self):
+        patterns = [float_to_bits(v, FLOAT32) for v in (0.1, -2.0, 1e-45, float("inf"), float("nan"), -0.0)]
+        path = bank_path(self.dir, FLOAT32)
+        self.assertEqual(compile_bank(path, FLOAT32, iter(patterns)), 6)
+        self.assertFalse(os.path.exists(path + ".tmp"))
+        text = sum(len(exact_decimal(b, FLOAT32)) for b in patterns)
+        self.assertEqual(os.path.getsize(path), HEADER.size + 6 * RECORD.size + 7 * 8 + text)
+        # Compiling does not fill exact_decimal's LRU cache
+        exact_decimal.cache_clear()
+        compile_bank(path, FLOAT32, patterns)
+        self.assertEqual(exact_decimal.cache_info().currsize, 0)
+        # An empty bank is refused and the existing one kept
+        with self.assertRaises(ValueError):
+            compile_bank(path, FLOAT32, [])
+        self.assertFalse(os.path.exists(path + ".tmp"))
+        with QuestionBank(path) as bank:
+            self.assertEqual(len(bank), 6)
+
+    def test_question_bank_QuestionBank_init(self):
+        bank = self.compile(FLOAT16, [0x3C00])
+        self.assertIs(bank.preset, FLOAT16)
+        bad = os.path.join(self.dir, "bad.qbank")
+        with open(bad, "wb") as f:
+            f.write(b"not a bank")
+        with self.assertRaises(ValueError):
+            QuestionBank(bad)
+        with open(bad, "wb") as f:
+            f.write(HEADER.pack(b"IEEE754Q", 99, b"FLOAT16", 0))
+        with self.assertRaises(ValueError):
+            QuestionBank(bad)
+
+    def test_question_bank_QuestionBank__len__(self):
+        self.assertEqual(len(self.compile(FLOAT32, [0])), 1)
+        self.assertEqual(len(self.compile(FLOAT64, range(1, 101))), 100)
+
+    def test_question_bank_QuestionBank__getitem__(self):
+        values = [0.1, -3.5, 5e-324, -float("inf"), 1.7976931348623157e308]
+        bank = self.compile(FLOAT64, [float_to_bits(v, FLOAT64) for v in values])
+        self.assertEqual(bank[1], BankQuestion(float_to_bits(-3.5, FLOAT64), 1, 1024, 3 << 50, 1, 1, "normal", "-3.5"))
+        self.assertEqual(bank[2], BankQuestion(1, 0, 0, 1, -1022, 0, "subnormal", exact_decimal(1, FLOAT64)))
+        self.assertEqual((bank[3].cls, bank[3].exact), ("inf", "-inf"))
+        self.assertEqual([bits_to_float(bank[k].bits, FLOAT64) for k in range(len(bank))], values)
+        for k in (-1, 5):
+            with self.assertRaises(IndexError):
+                bank[k]
+
+    def test_question_bank_QuestionBank_random_access(self):
+        # Every class of a small format round-trips through the file in any order
+        # (test_question_bank_exhaustive.py compiles all 65536 patterns)
+        patterns = random.Random(1).sample(range(1 << 16), 500) + [0x0000, 0x0001, 0x7F80, 0xFF80, 0x7FC0, 0x8000]
+        bank = self.compile(BFLOAT16, patterns)
+        for k in random.Random(2).sample(range(len(patterns)), len(patterns)):
+            question = bank[k]
+            self.assertEqual(question.bits, patterns[k])
+            self.assertEqual(question.exact, exact_decimal(patterns[k], BFLOAT16))
+
+    def test_question_bank_QuestionBank_close(self):
+        bank = self.compile(FLOAT32, [1])
+        bank.close()
+        with self.assertRaises(ValueError):
+            bank[0]
+
+    def test_question_bank_QuestionBank__enter__(self):
+        compile_bank(bank_path(self.dir, FLOAT32), FLOAT32, [1])
+        with QuestionBank(bank_path(self.dir, FLOAT32)) as bank:
+            self.assertEqual(bank[0].cls, "subnormal")
+
+    def test_question_bank_QuestionBank__exit__(self):
+        compile_bank(bank_path(self.dir, FLOAT32), FLOAT32, [1])
+        with QuestionBank(bank_path(self.dir, FLOAT32)) as bank:
+            pass
+        self.assertTrue(bank._map.closed)
+
+    def test_question_bank_open_banks(self):
+        compile_bank(bank_path(self.dir, FLOAT64), FLOAT64, [1])
+        banks = open_banks(self.dir)
+        self.assertEqual(list(banks), [FLOAT64])
+        banks[FLOAT64].close()
+        self.assertEqual(open_banks(os.path.join(self.dir, "missing")), {})
+        # A bank with no questions (e.g. written by hand) is ignored rather than handed to a sampler
+        with open(bank_path(self.dir, FLOAT16), "wb") as f:
+            f.write(HEADER.pack(b"IEEE754Q", 1, b"FLOAT16", 0) + b"\0" * 8)
+        banks = open_banks(self.dir)
+        self.assertEqual(list(banks), [FLOAT64])
+        banks[FLOAT64].close()
+
+    @patch('src.encode_mode.clear_screen')
+    @patch('src.encode_mode.prompt_input')
+    def test_question_bank_encode_mode(self, mock_prompt, mock_clear):
+        bank = self.compile(FLOAT32, [float_to_bits(v, FLOAT32) for v in (0.1, 0.2, 0.3)])
+        mode = EncodeMode(bank=bank)
+        mock_prompt.side_effect = ['0', '0', '0', ''] * 3
+        with patch('src.encode_mode.engine.float_to_bin32') as mock_convert, patch('builtins.print') as mock_print:
+            for _ in range(3):
+                self.assertTrue(mode.run_round())
+        # The ground truth comes from the bank, and a pass asks every question once
+        mock_convert.assert_not_called()
+        mock_print.assert_any_call("Exact Value: 0.100000001490116119384765625\n")
+        shown = [c.args[0] for c in mock_print.call_args_list if c.args and str(c.args[0]).startswith("Target Value")]
+        self.assertEqual(len(set(shown)), 3)
+        with self.assertRaises(ValueError):
+            EncodeMode(is_64_bit=True, bank=bank)
+
+    @patch('src.decode_mode.clear_screen')
+    @patch('src.decode_mode.prompt_input')
+    def test_question_bank_decode_mode(self, mock_prompt, mock_clear):
+        bank = self.compile(FLOAT64, [float_to_bits(-2.0, FLOAT64)])
+        mode = DecodeMode(is_64_bit=True, bank=bank)
+        mock_prompt.side_effect = ['1', '10000000000', '1024', '1', '1', '-2', '']
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(mode.run_round())
+        mock_print.assert_any_call(f"Target Sequence: {float_to_bits(-2.0, FLOAT64):064b}\n")
+        mock_print.assert_any_call("Correct. (True Exponent = 1)\n")
+        self.assertEqual(mode.question.cls, "normal")
+
+    def test_question_bank_create_mode(self):
+        bank = self.compile(FLOAT64, [1])
+        self.assertIs(tutor.create_mode(4, banks={FLOAT64: bank}).bank, bank)
+        self.assertIsNone(tutor.create_mode(1, banks={FLOAT64: bank}).bank)
+        self.assertIsNone(tutor.create_mode(3).bank)
+
+    @patch('main.prompt_input')
+    @patch('main.clear_screen')
+    @patch('main.display_main_menu')
+    def test_question_bank_main(self, mock_menu, mock_clear, mock_prompt):
+        compile_bank(bank_path(self.dir, FLOAT32), FLOAT32, [float_to_bits(1.5, FLOAT32)])
+        mock_prompt.side_effect = ['2', UserQuitException()]
+        with patch.dict(os.environ, {"IEEE754_TUTOR_BANK": self.dir}), patch('main.DecodeMode') as mock_decode:
+            mock_decode.return_value.run_round.return_value = False
+            with self.assertRaises(SystemExit):
+                tutor.main(store=ProgressStore())
+        bank = mock_decode.call_args.kwargs["bank"]
+        self.assertEqual(bank.path, bank_path(self.dir, FLOAT32))
+        # The session closed its banks on exit
+        self.assertTrue(bank._map.closed)
+
+    def test_compile_bank_bank_patterns(self):
+        patterns = list(bank_patterns(FLOAT32, 112, level=0))
+        # Level 0 has 112 normal values and no subnormals: one full repeat-free pass
+        self.assertEqual(len(set(patterns)), 112)
+        self.assertEqual(patterns, list(bank_patterns(FLOAT32, 112, level=0)))
+        subnormals = [b for b in bank_patterns(FLOAT64, 2000, level=5) if not (b >> 52) & 0x7FF]
+        self.assertGreater(len(subnormals), 300)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from src.engine import BFLOAT16, FLOAT16, classify_bits, exact_decimal, extract_bit_fields
+from src.question_bank import QuestionBank, bank_path, compile_bank
+
+class TestQuestionBankExhaustive(unittest.TestCase):
+    """Every 16-bit pattern compiled into a bank and read back in random order."""
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_question_bank_every_16_bit_pattern(self):
+        for preset in (FLOAT16, BFLOAT16):
+            path = bank_path(self.dir, preset)
+            self.assertEqual(compile_bank(path, preset, range(1 << 16)), 1 << 16)
+            self.assertGreater(os.path.getsize(path), 1 << 16)
+            with QuestionBank(path) as bank:
+                for k in random.Random(1).sample(range(1 << 16), 1 << 16):
+                    question = bank[k]
+                    self.assertEqual(question.bits, k)
+                    self.assertEqual((question.sign, question.exponent, question.fraction), extract_bit_fields(k, preset))
+                    self.assertEqual(question.cls, classify_bits(k, preset))
+                    self.assertEqual(question.exact, exact_decimal(k, preset))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src.decode_mode import DecodeMode
+from src.encode_mode import EncodeMode
+from src.engine import FLOAT32, FLOAT64, exact_decimal, extract_fields, float_to_bin32, float_to_bin64, float_to_bits
+from src.result_cache import BoundedCache, CachedEngine, CacheStats, _layout
+from tools.bench_result_cache import make_workload, run_benchmark
+import main as tutor
+
+class TestResultCache(unittest.TestCase):
+    def test_result_cache_CacheStats(self):
+        stats = CacheStats(hits=3, misses=1, evictions=0, size=1, maxsize=8)
+        with self.assertRaises(AttributeError):
+            stats.hits = 4
+
+    def test_result_cache_CacheStats_hit_rate(self):
+        self.assertEqual(CacheStats(3, 1, 0, 1, 8).hit_rate, 0.75)
+        self.assertEqual(CacheStats(0, 0, 0, 0, 8).hit_rate, 0.0)
+
+    def test_result_cache_BoundedCache_init(self):
+        self.assertEqual(BoundedCache(2).maxsize, 2)
+        with self.assertRaises(ValueError):
+            BoundedCache(0)
+
+    def test_result_cache_BoundedCache_get_or_compute(self):
+        cache = BoundedCache(2)
+        compute = MagicMock(return_value="one")
+        self.assertEqual(cache.get_or_compute(1, compute), "one")
+        self.assertEqual(cache.get_or_compute(1, compute), "one")
+        self.assertEqual(compute.call_count, 1)
+        # Touching 1 makes 2 the least recently used entry, so 3 evicts it
+        cache.get_or_compute(2, lambda: "two")
+        cache.get_or_compute(1, compute)
+        cache.get_or_compute(3, lambda: "three")
+        self.assertEqual(cache.get_or_compute(2, lambda: "again"), "again")
+        self.assertEqual(cache.stats(), CacheStats(hits=2, misses=4, evictions=2, size=2, maxsize=2))
+
+    def test_result_cache_BoundedCache_put(self):
+        cache = BoundedCache(1)
+        cache.put("a", None)
+        # A cached None is a hit, not a miss
+        self.assertIsNone(cache.get_or_compute("a", lambda: 1))
+        cache.put("b", 2)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_result_cache_BoundedCache_stats(self):
+        cache = BoundedCache(4)
+        cache.get_or_compute("k", lambda: 1)
+        cache.get_or_compute("k", lambda: 1)
+        self.assertEqual(cache.stats().hit_rate, 0.5)
+
+    def test_result_cache_BoundedCache_clear(self):
+        cache = BoundedCache(4)
+        cache.get_or_compute("k", lambda: 1)
+        cache.clear()
+        self.assertEqual(cache.stats(), CacheStats(0, 0, 0, 0, 4))
+
+    def test_result_cache_BoundedCache__len__(self):
+        cache = BoundedCache(2)
+        for k in range(5):
+            cache.put(k, k)
+        self.assertEqual(len(cache), 2)
+
+    def test_result_cache_BoundedCache_threads(self):
+        cache = BoundedCache(64)
+        def work(offset):
+            for i in range(2000):
+                key = (i * 7 + offset) % 100
+                self.assertEqual(cache.get_or_compute(key, lambda: key * key), key * key)
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 8000)
+        self.assertEqual(stats.size, 64)
+        # Two threads missing the same key both count a miss but store it once
+        self.assertGreaterEqual(stats.misses - stats.evictions, stats.size)
+
+    def test_result_cache_layout(self):
+        self.assertEqual(_layout(FLOAT64), (11, 52))
+
+    def test_result_cache_CachedEngine_init(self):
+        self.assertEqual(CachedEngine(16).cache.maxsize, 16)
+
+    def test_result_cache_CachedEngine_float_to_bin32(self):
+        engine = CachedEngine()
+        for v in (0.1, -0.0, 0.0, float("nan"), float("inf"), 1e-45):
+            self.assertEqual(engine.float_to_bin32(v), float_to_bin32(v))
+            self.assertEqual(engine.float_to_bin32(v), float_to_bin32(v))
+        self.assertEqual(engine.stats().hits, 6)
+
+    def test_result_cache_CachedEngine_float_to_bin64(self):
+        engine = CachedEngine()
+        self.assertEqual(engine.float_to_bin64(-0.0), float_to_bin64(-0.0))
+        self.assertEqual(engine.float_to_bin64(0.0), float_to_bin64(0.0))
+        # The 32- and 64-bit strings of one value are separate entries
+        self.assertEqual(engine.float_to_bin32(0.0), float_to_bin32(0.0))
+        self.assertEqual(engine.stats().misses, 3)
+
+    def test_result_cache_CachedEngine_extract_fields(self):
+        engine = CachedEngine()
+        b32 = float_to_bin32(-2.0)
+        self.assertEqual(engine.extract_fields(b32, FLOAT32), extract_fields(b32, FLOAT32))
+        b64 = float_to_bin64(-2.0)
+        self.assertEqual(engine.extract_fields(b64, FLOAT64), extract_fields(b64, FLOAT64))
+        self.assertEqual(engine.stats().misses, 2)
+
+    def test_result_cache_CachedEngine_exact_decimal(self):
+        engine = CachedEngine(2)
+        bits = float_to_bits(0.1, FLOAT64)
+        self.assertEqual(engine.exact_decimal(bits, FLOAT64), exact_decimal(bits, FLOAT64))
+        # One pattern means different values under different presets
+        self.assertEqual(engine.exact_decimal(0x3F800000, FLOAT32), "1")
+        self.assertNotEqual(engine.exact_decimal(0x3F800000, FLOAT64), "1")
+        self.assertEqual(engine.stats().evictions, 1)
+
+    def test_result_cache_CachedEngine_stats(self):
+        engine = CachedEngine(8)
+        engine.float_to_bin32(1.0)
+        self.assertEqual(engine.stats(), CacheStats(0, 1, 0, 1, 8))
+
+    @patch('src.encode_mode.prompt_input')
+    def test_result_cache_encode_mode(self, mock_prompt):
+        cache = CachedEngine()
+        mode = EncodeMode(is_64_bit=False, cache=cache)
+        mode._generate_target = MagicMock(return_value=0.1)
+        mock_prompt.side_effect = ['0', '0', '0', '', '0', '0', '0', '']
+        with patch('builtins.print') as mock_print:
+            self.assertTrue(mode.run_round())
+            self.assertTrue(mode.run_round())
+        mock_print.assert_any_call("Exact Value: 0.100000001490116119384765625\n")
+        self.assertEqual((cache.stats().misses, cache.stats().hits), (3, 3))
+
+    @patch('src.decode_mode.prompt_input')
+    def test_result_cache_decode_mode(self, mock_prompt):
+        cache = CachedEngine()
+        mode = DecodeMode(is_64_bit=True, cache=cache)
+        mode._generate_target = MagicMock(return_value=-1.0)
+        mock_prompt.side_effect = ['1', '01111111111', '1023', '0', '1', '-1.0', '']
+        self.assertTrue(mode.run_round())
+        self.assertEqual(cache.stats().misses, 2)
+
+    def test_result_cache_create_mode(self):
+        cache = CachedEngine()
+        self.assertIs(tutor.create_mode(3, cache).cache, cache)
+        self.assertIsNone(tutor.create_mode(2).cache)
+
+    def test_bench_result_cache_make_workload(self):
+        self.assertEqual(make_workload(50, 1.0, tail=100), make_workload(50, 1.0, tail=100))
+        # A steep skew concentrates on the head of the hot list
+        self.assertGreater(make_workload(1000, 3.0, tail=100).count(0.1), 800)
+
+    def test_bench_result_cache_run_benchmark(self):
+        [row] = run_benchmark(500, [2.0], 64)
+        self.assertGreater(row["hit_rate"], 0.9)
+        self.assertLessEqual(row["size"], 64)
+
+if __name__ == '__main__':
+    unittest.main()
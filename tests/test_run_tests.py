@@ -0,0 +1,115 @@
+import os
+import tempfile
+import textwrap
+import unittest
+import xml.etree.ElementTree as ET
+from run_tests import (
+    CaseRecord, TimingResult, tier_of, discover_modules, shard, run_module, run_modules,
+    write_junit, format_slowest, TESTS_DIR
+)
+
+FAKE_MODULE = textwrap.dedent("""
+    import os
+    import unittest
+
+    class TestFake(unittest.TestCase):
+        def test_ok(self):
+            print("noise")
+            os.system("echo fd-noise")
+
+        def test_fail(self):
+            self.assertEqual(1, 2)
+
+        def test_error(self):
+            raise RuntimeError("boom")
+
+        @unittest.skip("not today")
+        def test_skip(self):
+            pass
+""")
+
+class TestRunTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for name in ("test_fake_runner.py", "test_fake_runner_bmc.py", "test_fake_runner_exhaustive.py"):
+            with open(os.path.join(self.tmp.name, name), "w") as f:
+                f.write(FAKE_MODULE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_run_tests_tiers_and_discovery(self):
+        self.assertEqual(tier_of("test_engine.py"), "fast")
+        self.assertEqual(tier_of("test_engine_bmc.py"), "bmc")
+        self.assertEqual(tier_of("test_float16_exhaustive.py"), "exhaustive")
+        self.assertEqual(discover_modules(self.tmp.name, ["fast"]), ["test_fake_runner"])
+        self.assertEqual(discover_modules(self.tmp.name, ["bmc", "exhaustive"]),
+                         ["test_fake_runner_bmc", "test_fake_runner_exhaustive"])
+        fast = discover_modules(TESTS_DIR, ["fast"])
+        self.assertIn("test_engine", fast)
+        self.assertFalse(any(m.endswith("_bmc") for m in fast))
+
+    def test_run_tests_shard(self):
+        items = list(range(10))
+        shards = [shard(items, i, 3) for i in (1, 2, 3)]
+        self.assertEqual(shards[0], [0, 3, 6, 9])
+        self.assertEqual(sorted(sum(shards, [])), items)
+        self.assertEqual(shard(items, 1, 1), items)
+
+    def test_run_tests_run_module(self):
+        records = run_module(self.tmp.name, "test_fake_runner")
+        by_name = {r.name: r for r in records}
+        self.assertEqual(by_name["test_ok"].status, "passed")
+        self.assertEqual(by_name["test_fail"].status, "failed")
+        self.assertIn("AssertionError", by_name["test_fail"].detail)
+        self.assertEqual(by_name["test_error"].status, "error")
+        self.assertIn("boom", by_name["test_error"].detail)
+        self.assertEqual((by_name["test_skip"].status, by_name["test_skip"].detail), ("skipped", "not today"))
+        self.assertEqual(by_name["test_ok"].id, "test_fake_runner.TestFake.test_ok")
+        self.assertTrue(all(r.tier == "fast" and r.seconds >= 0 for r in records))
+
+        broken = os.path.join(self.tmp.name, "test_broken.py")
+        with open(broken, "w") as f:
+            f.write("import does_not_exist\n")
+        [record] = run_module(self.tmp.name, "test_broken")
+        self.assertEqual((record.name, record.status), ("<import>", "error"))
+
+    def test_run_tests_run_modules_parallel(self):
+        modules = ["test_fake_runner", "test_fake_runner_exhaustive"]
+        records = run_modules(self.tmp.name, modules, jobs=2)
+        self.assertEqual([r.classname.split(".")[0] for r in records], [modules[0]] * 4 + [modules[1]] * 4)
+        self.assertEqual(records[-1].tier, "exhaustive")
+
+    def test_run_tests_timing_result(self):
+        result = TimingResult("fast")
+        self.assertTrue(result.buffer)
+        self.assertEqual(result.records, [])
+
+    def test_run_tests_write_junit(self):
+        records = [
+            CaseRecord("fast", "test_a.TestA", "test_ok", "passed", 0.5),
+            CaseRecord("fast", "test_a.TestA", "test_bad", "failed", 0.25, "Traceback\nAssertionError: 1 != 2"),
+            CaseRecord("bmc", "test_b_bmc.TestB", "test_proof", "passed", 2.0, cached=True),
+            CaseRecord("bmc", "test_b_bmc.TestB", "test_slow", "timeout", 9.0, "Killed after 9.0s."),
+        ]
+        path = os.path.join(self.tmp.name, "junit.xml")
+        write_junit(records, path, 3.0)
+        root = ET.parse(path).getroot()
+        self.assertEqual((root.tag, root.get("tests"), root.get("failures"), root.get("errors")),
+                         ("testsuites", "4", "1", "1"))
+        suites = root.findall("testsuite")
+        self.assertEqual([s.get("name") for s in suites], ["test_a", "test_b_bmc"])
+        self.assertEqual(suites[1].find("properties/property").get("value"), "bmc")
+        bad = suites[0].findall("testcase")[1]
+        self.assertEqual(bad.find("failure").get("message"), "AssertionError: 1 != 2")
+        self.assertEqual(suites[1].findall("testcase")[1].find("error").get("type"), "timeout")
+        self.assertIsNotNone(suites[1].findall("testcase")[0].find("system-out"))
+
+        lines = format_slowest(records, 2)
+        self.assertEqual(lines[0], "Slowest 2 tests:")
+        self.assertIn("test_b_bmc.TestB.test_slow", lines[1])
+        # Cached proofs cost nothing this run and are left out of the report
+        self.assertNotIn("test_proof", "".join(lines))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import time
+import unittest
+from unittest.mock import patch
+from src.scheduler import DEFAULT_EASE, FIRST_INTERVAL, MIN_EASE, RETRY_INTERVAL, SECOND_INTERVAL, Card, Scheduler
+from src.rounding_mode import RoundingMode
+from src.special_cases_mode import SpecialCasesMode
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = Scheduler(clock=self.clock, seed=7)
+
+    def test_scheduler_Card_init(self):
+        card = Card(5.0, 0.5)
+        self.assertEqual((card.due, card.ease, card.reps, card.version), (5.0, DEFAULT_EASE, 0, 0))
+        with self.assertRaises(AttributeError):
+            card.extra = 1  # __slots__ keeps large banks compact
+
+    def test_scheduler_Scheduler_init(self):
+        self.assertIs(self.scheduler.clock, self.clock)
+        self.assertEqual(self.scheduler.size(1), 0)
+
+    def test_scheduler_ensure(self):
+        self.scheduler.ensure(6, 4)
+        self.scheduler.ensure(6, 4)
+        self.assertEqual(self.scheduler.size(6), 4)
+        self.scheduler.ensure(6, 10)
+        self.assertEqual(self.scheduler.size(6), 10)
+        self.assertEqual(self.scheduler.card(6, 9).due, self.clock.now)
+
+    def test_scheduler_size(self):
+        self.scheduler.ensure(1, 3)
+        self.scheduler.ensure(2, 5)
+        self.assertEqual((self.scheduler.size(1), self.scheduler.size(2), self.scheduler.size(3)), (3, 5, 0))
+
+    def test_scheduler_card(self):
+        self.scheduler.ensure(9, 2)
+        self.assertIsInstance(self.scheduler.card(9, 1), Card)
+
+    def test_scheduler_next_index(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.next_index(5)
+        self.scheduler.ensure(5, 3)
+        # Every new item is served once before any answered one comes back
+        seen = []
+        for _ in range(3):
+            index = self.scheduler.next_index(5)
+            seen.append(index)
+            self.scheduler.review(5, index, True)
+        self.assertEqual(sorted(seen), [0, 1, 2])
+
+    def test_scheduler_review(self):
+        self.scheduler.ensure(8, 2)
+        first = self.scheduler.next_index(8)
+        self.scheduler.review(8, first, True)
+        card = self.scheduler.card(8, first)
+        self.assertEqual((card.reps, card.interval, card.due), (1, FIRST_INTERVAL, self.clock.now + FIRST_INTERVAL))
+        self.scheduler.review(8, first, True)
+        self.assertEqual(card.interval, SECOND_INTERVAL)
+        self.scheduler.review(8, first, True)
+        self.assertAlmostEqual(card.interval, SECOND_INTERVAL * (DEFAULT_EASE + 0.2))
+        for _ in range(10):
+            self.scheduler.review(8, first, False)
+        self.assertEqual((card.reps, card.lapses, card.interval, card.ease), (0, 10, RETRY_INTERVAL, MIN_EASE))
+
+    def test_scheduler_weak_items_come_back_first(self):
+        self.scheduler.ensure(6, 3)
+        order = [self.scheduler.next_index(6)]
+        self.scheduler.review(6, order[0], False)
+        for _ in range(2):
+            order.append(self.scheduler.next_index(6))
+            self.scheduler.review(6, order[-1], True)
+        # Nothing is due yet; the missed item has the shortest interval
+        self.assertEqual(self.scheduler.next_index(6), order[0])
+        self.clock.now += RETRY_INTERVAL + 1
+        self.assertEqual(self.scheduler.next_index(6), order[0])
+
+    def test_scheduler_rebuild(self):
+        self.scheduler.ensure(7, 10)
+        for _ in range(200):
+            self.scheduler.review(7, 3, True)
+        self.assertLessEqual(len(self.scheduler._heaps[7]), 2 * 10 + 64)
+        self.scheduler._rebuild(7)
+        self.assertEqual(len(self.scheduler._heaps[7]), 10)
+        self.assertNotEqual(self.scheduler.next_index(7), 3)
+
+    def test_scheduler_large_bank(self):
+        # A tenth of the bank and reviews of test_scheduler_exhaustive.py, at the same per-review budget
+        scheduler = Scheduler(seed=1)
+        scheduler.ensure(1, 20000)
+        start = time.perf_counter()
+        for i in range(2000):
+            scheduler.review(1, scheduler.next_index(1), i % 5 != 0)
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertEqual(scheduler.size(1), 20000)
+
+    def test_base_mode_bind_scheduler(self):
+        mode = RoundingMode()
+        self.assertIsNone(mode.scheduler)
+        mode.bind_scheduler(self.scheduler, 9)
+        self.assertIs(mode.scheduler, self.scheduler)
+        self.assertEqual(mode.mode_id, 9)
+
+    def test_base_mode_select_question(self):
+        mode = SpecialCasesMode()
+        with patch("random.choice", return_value=mode.questions[2]):
+            self.assertIs(mode.select_question(mode.questions), mode.questions[2])  # unbound
+        mode.bind_scheduler(self.scheduler, 6)
+        picks = {id(mode.select_question(mode.questions)) for _ in range(len(mode.questions))}
+        # Ungraded questions are not rescheduled, so the same one is offered again
+        self.assertEqual(len(picks), 1)
+        self.assertEqual(self.scheduler.size(6), len(mode.questions))
+
+    def test_base_mode_finish_question(self):
+        mode = RoundingMode()
+        mode.bind_scheduler(self.scheduler, 9)
+        question = mode.select_question(mode.questions)
+        index = mode.questions.index(question)
+        mode.record_attempt("decision", True)
+        mode.record_attempt("decision", False)
+        mode.finish_question()
+        self.assertEqual(self.scheduler.card(9, index).lapses, 1)
+        mode.finish_question()
+        self.assertEqual(self.scheduler.card(9, index).version, 1)
+
+    def test_scheduler_mode_rounds_follow_schedule(self):
+        mode = SpecialCasesMode()
+        mode.bind_scheduler(self.scheduler, 6)
+        answers = []
+        for q in mode.questions:
+            answers += ["x", "x", "x", ""]  # every step wrong
+        with patch("src.special_cases_mode.prompt_input", side_effect=answers), \
+             patch("src.special_cases_mode.clear_screen"), patch("builtins.print"):
+            for _ in mode.questions:
+                self.assertTrue(mode.run_round())
+        mode.finish_question()
+        self.assertTrue(all(self.scheduler.card(6, i).lapses == 1 for i in range(len(mode.questions))))
+
+if __name__ == '__main__':
+    unittest.main()
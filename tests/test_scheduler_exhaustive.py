@@ -0,0 +1,18 @@
+import time
+import unittest
+from src.scheduler import Scheduler
+
+class TestSchedulerExhaustive(unittest.TestCase):
+    """Scheduling cost at the size of a compiled question bank."""
+
+    def test_scheduler_large_bank(self):
+        scheduler = Scheduler(seed=1)
+        scheduler.ensure(1, 200000)
+        start = time.perf_counter()
+        for i in range(20000):
+            scheduler.review(1, scheduler.next_index(1), i % 5 != 0)
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertEqual(scheduler.size(1), 200000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,284 @@
+import glob
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.progress import ProgressStore
+from src.rounding_mode import RoundingMode
+from src.scheduler import Scheduler
+from src.transcript import (
+    ReplayResult, Transcript, TranscriptExhausted, TranscriptRecorder, TranscriptReplayer, _describe, _open_text, _verdict,
+    _verdict_line, replay
+)
+from src.ui import UserQuitException, clear_screen, get_input_source, prompt_input, set_input_source
+from src.decode_mode import DecodeMode
+import main as tutor
+from tools.replay_transcripts import replay_file, replay_files, session_runner
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transcripts")
+
+class TestTranscript(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        set_input_source(None)
+        self.tmp.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def record_main(self, path: str, answers: list, seed: int = 5) -> None:
+        recorder = TranscriptRecorder(path, seed=seed)
+        set_input_source(recorder)
+        with patch("builtins.input", side_effect=answers), patch("builtins.print"), patch("src.ui.os.system"):
+            with self.assertRaises(SystemExit):
+                tutor.main(store=ProgressStore(), scheduler=Scheduler(clock=recorder.clock, seed=recorder.seed))
+        set_input_source(None)
+        recorder.close()
+
+    def test_transcript_open_text(self):
+        for name in ("t.jsonl", "t.jsonl.gz"):
+            with _open_text(self.path(name), "w") as f:
+                f.write("line\n")
+            with _open_text(self.path(name), "r") as f:
+                self.assertEqual(f.read(), "line\n")
+        with open(self.path("t.jsonl.gz"), "rb") as f:
+            self.assertEqual(f.read(2), b"\x1f\x8b")
+
+    def test_transcript_Transcript(self):
+        transcript = Transcript(7)
+        self.assertEqual((transcript.target, transcript.entries, transcript.verdicts), ("main", [], []))
+
+    def test_transcript_load(self):
+        with open(self.path("a.jsonl"), "w", encoding="utf-8") as f:
+            f.write('{"transcript": 2, "seed": 3, "target": "mode:9"}\n[0.5,"","+1"]\n'
+                    '{"after":1,"mode":9,"step":"decision","correct":true}\n[0.9,"Press Enter to continue.",""]\n[1.2,"","')
+        transcript = Transcript.load(self.path("a.jsonl"))
+        self.assertEqual((transcript.seed, transcript.target), (3, "mode:9"))
+        self.assertEqual(transcript.entries, [(0.5, "", "+1"), (0.9, "Press Enter to continue.", "")])
+        self.assertEqual(transcript.verdicts, [(1, 9, "decision", True)])
+        # Version 1 transcripts recorded no verdicts, so they cannot be checked
+        for version in (1, 99):
+            with open(self.path("b.jsonl"), "w", encoding="utf-8") as f:
+                f.write('{"transcript": %d, "seed": 3}\n' % version)
+            with self.assertRaises(ValueError):
+                Transcript.load(self.path("b.jsonl"))
+
+    def test_transcript_save(self):
+        transcript = Transcript(11, "mode:6", [(0.1, "", "0"), (0.2, "", "q")], [(1, 6, "sign", True), (3, 6, "sign", False)])
+        for name in ("s.jsonl", "s.jsonl.gz"):
+            transcript.save(self.path(name))
+            self.assertEqual(Transcript.load(self.path(name)), transcript)
+        # Verdicts are written after the answer they grade
+        with open(self.path("s.jsonl"), encoding="utf-8") as f:
+            self.assertEqual(f.read().splitlines()[2], '{"after":1,"mode":6,"step":"sign","correct":true}')
+
+    def test_transcript_verdict(self):
+        self.assertEqual(_verdict({"after": 4, "mode": None, "step": "value", "correct": False}), (4, None, "value", False))
+
+    def test_transcript_verdict_line(self):
+        line = _verdict_line((2, 1, "fraction", True))
+        self.assertEqual(line, '{"after":2,"mode":1,"step":"fraction","correct":true}\n')
+        self.assertEqual(_verdict(json.loads(line)), (2, 1, "fraction", True))
+
+    def test_transcript_TranscriptRecorder_init(self):
+        recorder = TranscriptRecorder(self.path("r.jsonl"), seed=42, target="mode:9")
+        recorder.close()
+        loaded = Transcript.load(self.path("r.jsonl"))
+        self.assertEqual((loaded.seed, loaded.target, loaded.entries), (42, "mode:9", []))
+        recorder = TranscriptRecorder(self.path("r2.jsonl"))
+        recorder.close()
+        self.assertIsInstance(recorder.seed, int)
+
+    def test_transcript_TranscriptRecorder__call__(self):
+        recorder = TranscriptRecorder(self.path("r.jsonl"), seed=1)
+        with patch("builtins.input", return_value=" 1 "):
+            self.assertEqual(recorder("Select a mode"), " 1 ")
+        # Flushed per answer, so the transcript survives a crash before close()
+        self.assertEqual(Transcript.load(self.path("r.jsonl")).entries[0][1:], ("Select a mode", " 1 "))
+        recorder.close()
+
+    def test_transcript_TranscriptRecorder_observe_step(self):
+        recorder = TranscriptRecorder(self.path("r.jsonl"), seed=1)
+        set_input_source(recorder)
+        with patch("builtins.input", return_value="0"), patch("builtins.print"):
+            mode = RoundingMode()
+            mode.bind_progress(ProgressStore(), 9)
+            mode.record_attempt("decision", mode.record_attempt("warmup", True) and prompt_input("") == "1")
+        recorder.close()
+        self.assertEqual(Transcript.load(self.path("r.jsonl")).verdicts, [(0, 9, "warmup", True), (1, 9, "decision", False)])
+
+    def test_transcript_clock(self):
+        recorder = TranscriptRecorder(self.path("r.jsonl"), seed=1)
+        self.assertEqual(recorder.clock(), 0.0)
+        with patch("builtins.input", return_value="x"), patch("src.transcript.time.monotonic", return_value=recorder._start + 2.5):
+            recorder("")
+        self.assertEqual(recorder.clock(), 2.5)
+        recorder.close()
+        replayer = TranscriptReplayer(Transcript(1, entries=[(4.0, "", "a")]))
+        replayer("")
+        self.assertEqual(replayer.clock(), 4.0)
+
+    def test_transcript_close(self):
+        recorder = TranscriptRecorder(self.path("r.jsonl"), seed=1)
+        recorder.close()
+        self.assertTrue(recorder._file.closed)
+
+    def test_transcript_TranscriptExhausted(self):
+        replayer = TranscriptReplayer(Transcript(1))
+        with self.assertRaises(TranscriptExhausted):
+            replayer("")
+
+    def test_transcript_TranscriptReplayer_init(self):
+        replayer = TranscriptReplayer(Transcript(1, entries=[(0.0, "", "a")]))
+        self.assertEqual((replayer.position, replayer.mismatches), (0, []))
+
+    def test_transcript_TranscriptReplayer_observe_step(self):
+        replayer = TranscriptReplayer(Transcript(1, entries=[(0.0, "", "a")]))
+        replayer("")
+        replayer.observe_step(2, "sign", True)
+        self.assertEqual(replayer.verdicts, [(1, 2, "sign", True)])
+
+    def test_transcript_verdict_mismatches(self):
+        replayer = TranscriptReplayer(Transcript(1, verdicts=[(1, 2, "sign", True), (2, 2, "exponent", True)]))
+        replayer.verdicts = [(1, 2, "sign", True), (2, 2, "exponent", True)]
+        self.assertEqual(replayer.verdict_mismatches(), [])
+        replayer.verdicts[1] = (2, 2, "exponent", False)
+        self.assertEqual(replayer.verdict_mismatches(), [(2, "mode 2 exponent: correct", "mode 2 exponent: incorrect")])
+        # A step that is no longer graded, or a new one, also diverges
+        replayer.verdicts = replayer.verdicts[:1]
+        self.assertEqual(replayer.verdict_mismatches(), [(2, "mode 2 exponent: correct", "no graded step")])
+
+    def test_transcript_describe(self):
+        self.assertEqual(_describe(None), "no graded step")
+        self.assertEqual(_describe((3, None, "value", True)), "mode None value: correct")
+
+    def test_transcript_TranscriptReplayer__call__(self):
+        replayer = TranscriptReplayer(Transcript(1, entries=[(0.0, "Select", "1"), (0.1, "", "2")]))
+        self.assertEqual(replayer("Select"), "1")
+        self.assertEqual(replayer("Changed prompt"), "2")
+        self.assertEqual(replayer.mismatches, [(1, "", "Changed prompt")])
+
+    def test_transcript_ReplayResult_ok(self):
+        self.assertTrue(ReplayResult(3, 3, [], False, 0.1).ok)
+        self.assertFalse(ReplayResult(2, 3, [], False, 0.1).ok)
+        self.assertFalse(ReplayResult(3, 3, [(0, "a", "b")], False, 0.1).ok)
+        self.assertFalse(ReplayResult(3, 3, [], True, 0.1).ok)
+        self.assertFalse(ReplayResult(3, 3, [], False, 0.1, [(1, "mode 2 sign: correct", "mode 2 sign: incorrect")]).ok)
+
+    def test_transcript_replay(self):
+        answers = ['9', '+1', '', '0', '', 'q', '6', '0', '1s', '0s', '', 'q', 'q']
+        self.record_main(self.path("session.jsonl"), answers)
+        transcript = Transcript.load(self.path("session.jsonl"))
+        self.assertEqual([a for _, _, a in transcript.entries], answers)
+        self.assertEqual([(step, correct) for _, _, step, correct in transcript.verdicts],
+                         [("decision", True), ("decision", False), ("sign", True), ("exponent", False), ("fraction", False)])
+        result = replay(transcript, session_runner("main"))
+        self.assertTrue(result.ok, result)
+        # The same answers graded differently (here: a changed rounding answer key) fail the replay
+        transcript.verdicts[0] = (2, 9, "decision", False)
+        result = replay(transcript, session_runner("main"))
+        self.assertEqual(result.verdict_mismatches, [(2, "mode 9 decision: incorrect", "mode 9 decision: correct")])
+        self.assertFalse(result.ok)
+        # A shortened transcript runs out of answers instead of blocking on the terminal
+        transcript.entries = transcript.entries[:4]
+        result = replay(transcript, session_runner("main"))
+        self.assertTrue(result.exhausted)
+        self.assertFalse(result.ok)
+
+    def test_transcript_replay_same_questions(self):
+        # The recorded seed and answer times reproduce the scheduler's question order
+        asked = []
+        def run(scheduler):
+            mode = RoundingMode()
+            mode.bind_scheduler(scheduler, 9)
+            original = mode.select_question
+            mode.select_question = lambda qs: asked.append(original(qs)) or asked[-1]
+            while mode.run_round():
+                pass
+        transcript = Transcript(8, "mode:9", [(0.0, "", "+1"), (0.0, "Press Enter to continue.", ""),
+                                              (0.0, "", "0"), (0.0, "Press Enter to continue.", ""), (0.1, "", "q")])
+        replay(transcript, run)
+        first, asked[:] = list(asked), []
+        replay(transcript, run)
+        self.assertEqual(asked, first)
+
+    def test_transcript_replay_drill(self):
+        # A drill ends after the same answer in the replay as in the recording, on the session clock
+        path = self.path("drill.jsonl")
+        recorder = TranscriptRecorder(path, seed=9, target="mode:10")
+        ticks = iter(range(0, 1000, 15))
+        set_input_source(recorder)
+        with patch("builtins.input", side_effect=["", "1", "2", "3", "4", "", "q"]), patch("builtins.print"), \
+             patch("src.ui.os.system"), patch("src.transcript.time.monotonic", side_effect=lambda: recorder._start + next(ticks)):
+            session_runner("mode:10")(Scheduler(clock=recorder.clock, seed=recorder.seed))
+        set_input_source(None)
+        recorder.close()
+        transcript = Transcript.load(path)
+        # Answers at 15 s steps: four questions fill the 60 s budget, then the summary
+        self.assertEqual([message for _, message, _ in transcript.entries],
+                         ["Press Enter to start."] + [""] * 4 + ["Press Enter to continue.", "Press Enter to start."])
+        self.assertEqual(len(transcript.verdicts), 4)
+        result = replay(transcript, session_runner("mode:10"))
+        self.assertTrue(result.ok, result)
+
+    def test_transcript_corpus(self):
+        results = replay_files(sorted(glob.glob(os.path.join(CORPUS, "*.jsonl"))))
+        self.assertGreaterEqual(len(results), 3)
+        for r in results:
+            self.assertTrue(r["ok"], r)
+            self.assertTrue(Transcript.load(r["path"]).verdicts, r["path"])
+
+    def test_transcript_corpus_changed_generator(self):
+        # A generator that asks a different question grades the recorded answers differently
+        path = os.path.join(CORPUS, "mode_decode_quit.jsonl")
+        with patch.object(DecodeMode, "_generate_target", return_value=-32.0):
+            summary = replay_file(path)
+        self.assertFalse(summary["ok"])
+        self.assertEqual(summary["mismatches"], [])
+        self.assertEqual(summary["verdict_mismatches"], [(2, "mode 2 sign: correct", "mode 2 sign: incorrect")])
+
+    def test_replay_transcripts_session_runner(self):
+        with self.assertRaises(ValueError):
+            session_runner("mode:42")
+        with self.assertRaises(ValueError):
+            session_runner("menu")
+        transcript = Transcript(3, "mode:9", [(0.0, "", "+1"), (0.1, "Press Enter to continue.", ""), (0.2, "", "q")])
+        # Without its verdict the transcript no longer matches the session
+        self.assertEqual(replay(transcript, session_runner("mode:9")).verdict_mismatches,
+                         [(1, "no graded step", "mode 9 decision: correct")])
+        transcript.verdicts = [(1, 9, "decision", True)]
+        self.assertTrue(replay(transcript, session_runner("mode:9")).ok)
+        # A single replayed mode gets a difficulty model, as under the main menu
+        modes = []
+        create_mode = tutor.create_mode
+        with patch.object(tutor, "create_mode", side_effect=lambda choice: modes.append(create_mode(choice)) or modes[-1]):
+            replay(Transcript(3, "mode:1", [(0.0, "", "q")]), session_runner("mode:1"))
+        self.assertIsNotNone(modes[0].difficulty)
+
+    def test_replay_transcripts_replay_file(self):
+        Transcript(3, "mode:8", [(0.0, "", "q")]).save(self.path("m.jsonl.gz"))
+        summary = replay_file(self.path("m.jsonl.gz"))
+        self.assertTrue(summary["ok"])
+        self.assertEqual(summary["answers"], 1)
+
+    def test_ui_get_input_source(self):
+        self.assertIsNone(get_input_source())
+        replayer = TranscriptReplayer(Transcript(1))
+        set_input_source(replayer, headless=True)
+        self.assertIs(get_input_source(), replayer)
+
+    def test_ui_set_input_source(self):
+        set_input_source(lambda message: f" {message}! ", headless=True)
+        with patch("builtins.print"), patch("src.ui.os.system") as mock_sys:
+            self.assertEqual(prompt_input("hi"), "hi!")
+            clear_screen()
+            self.assertFalse(mock_sys.called)
+        set_input_source(lambda message: "q")
+        with patch("builtins.print"), self.assertRaises(UserQuitException):
+            prompt_input("")
+
+if __name__ == '__main__':
+    unittest.main()
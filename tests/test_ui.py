@@ -1,6 +1,49 @@
+import sys
 import unittest
 from unittest.mock import patch
-from src.ui import UserQuitException, prompt_input, display_main_menu, clear_screen
+import src.ui as ui
+from src.rounding_mode import RoundingMode
+from src.ui import (
+    CursesScreen, UserQuitException, _run_in_screen, clear_screen, display_main_menu, field_spans, prompt_input, run_curses
+)
+
+class FakeWindow:
+    """Stands in for a curses window: records what is drawn and answers getstr from a script."""
+    def __init__(self, answers=(), size=(12, 60)):
+        self.answers = list(answers)
+        self.size = size
+        self.rows = {}
+        self.draws = []
+        self.clears = 0
+
+    def getmaxyx(self):
+        return self.size
+
+    def idlok(self, flag):
+        pass
+
+    def clear(self):
+        self.clears += 1
+        self.rows = {}
+
+    def move(self, row, col):
+        self.rows[row] = self.rows.get(row, "")[:col]
+
+    def clrtoeol(self):
+        pass
+
+    def addstr(self, row, col, text, attr=0):
+        self.draws.append((row, col, text, attr))
+        self.rows[row] = self.rows.get(row, "")[:col].ljust(col) + text
+
+    def refresh(self):
+        pass
+
+    def getstr(self, row, col, n):
+        return self.answers.pop(0).encode("utf-8")
+
+    def text(self, row):
+        return self.rows.get(row, "")
 
 class TestUI(unittest.TestCase):
     def test_prompt_input_normal(self):
@@ -63,3 +106,129 @@ class TestUI(unittest.TestCase):
             with patch('builtins.print') as mock_print:
                 prompt_input("message")
                 mock_print.assert_any_call("Press `q` to exit.")
+
+class TestCursesUI(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("src.ui.curses")
+        self.curses = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.curses.has_colors.return_value = True
+        self.curses.A_BOLD = 1
+        self.curses.color_pair.side_effect = lambda n: 100 + n
+
+    def test_ui_field_spans(self):
+        self.assertEqual(field_spans("Exponent: 01111111"), [(10, 18, "exponent")])
+        self.assertEqual(field_spans("Sign:     1"), [(10, 11, "sign")])
+        seq = "0" + "10000000" + "1" * 23
+        self.assertEqual(field_spans(f"Full Binary: {seq}"), [(13, 14, "sign"), (14, 22, "exponent"), (22, 45, "fraction")])
+        self.assertEqual([end - start for start, end, _ in field_spans("1" * 64)], [1, 11, 52])
+        # Runs of other lengths are not bit patterns
+        self.assertEqual(field_spans("Fraction bits (first 25): " + "1" * 25), [])
+
+    def test_ui_CursesScreen_init(self):
+        screen = CursesScreen(FakeWindow())
+        self.assertEqual(screen._attrs, {"sign": 101, "exponent": 102, "fraction": 103})
+        self.curses.has_colors.return_value = False
+        self.assertEqual(CursesScreen(FakeWindow())._attrs["sign"], 1)
+
+    def test_ui_CursesScreen_write(self):
+        screen = CursesScreen(FakeWindow())
+        print("one\ntwo", end="", file=screen)
+        self.assertEqual(screen.lines, ["one"])
+        print("!", file=screen)
+        self.assertEqual(screen.lines, ["one", "two!"])
+
+    def test_ui_CursesScreen_flush(self):
+        screen = CursesScreen(FakeWindow())
+        screen.write("partial")
+        screen.flush()
+        self.assertEqual(screen.lines, [])
+
+    def test_ui_CursesScreen_clear(self):
+        window = FakeWindow()
+        screen = CursesScreen(window)
+        screen.write("a\nb\n")
+        screen.render()
+        screen.clear()
+        self.assertEqual(screen.lines, [])
+        # Only the two body rows that held text are blanked
+        self.assertEqual(screen.render(), 2)
+        self.assertEqual(window.clears, 1)
+
+    def test_ui_CursesScreen_render(self):
+        window = FakeWindow(size=(6, 40))
+        screen = CursesScreen(window)
+        screen.write("MODE 9\nquestion\n")
+        self.assertEqual(screen.render(), 6)
+        self.assertEqual((window.text(0), window.text(4), window.text(5)), ("MODE 9", "Press `q` to exit.", ">> "))
+        self.assertEqual(screen.render(), 0)
+        screen.write("feedback\n")
+        self.assertEqual(screen.render(), 1)
+        self.assertEqual(window.text(2), "feedback")
+        # Overflowing the body keeps the newest lines
+        screen.write("x\ny\n")
+        screen.render()
+        self.assertEqual([window.text(r) for r in range(4)], ["question", "feedback", "x", "y"])
+        # Long lines wrap instead of being cut off
+        screen.write("z" * 45 + "\n")
+        screen.render()
+        self.assertEqual([window.text(r) for r in range(4)], ["x", "y", "z" * 39, "z" * 6])
+        # A resize repaints the whole frame
+        window.size = (8, 40)
+        self.assertEqual(screen.render(), 8)
+
+    def test_ui_CursesScreen_draw(self):
+        window = FakeWindow()
+        screen = CursesScreen(window)
+        screen._draw(0, "Exponent: 01111111 (127)")
+        self.assertEqual(window.draws, [(0, 0, "Exponent: ", 0), (0, 10, "01111111", 102), (0, 18, " (127)", 0)])
+        self.assertEqual(window.text(0), "Exponent: 01111111 (127)")
+
+    def test_ui_CursesScreen_read_line(self):
+        window = FakeWindow(answers=["+1"])
+        screen = CursesScreen(window)
+        screen.write("Enter the decision:")
+        self.assertEqual(screen.read_line(), "+1")
+        self.assertEqual(screen.lines, ["Enter the decision:", ">> +1"])
+        self.curses.echo.assert_called_once()
+        self.curses.noecho.assert_called_once()
+        # The new body line and the prompt row holding the typed answer are rewritten
+        self.assertEqual(screen.render(), 2)
+
+    def test_ui_run_curses(self):
+        self.curses.wrapper.side_effect = lambda fn, *args: fn(FakeWindow(), *args)
+        self.assertEqual(run_curses(lambda a, b=0: a + b, 1, b=2), 3)
+        with patch("src.ui.curses", None), self.assertRaises(RuntimeError):
+            run_curses(print)
+
+    def test_ui_run_in_screen(self):
+        saved = sys.stdout
+        seen = []
+        def session():
+            seen.append((ui._screen, sys.stdout))
+            raise SystemExit(0)
+        with self.assertRaises(SystemExit):
+            _run_in_screen(FakeWindow(), session, (), {})
+        self.assertIsInstance(seen[0][0], CursesScreen)
+        self.assertIs(seen[0][0], seen[0][1])
+        self.assertIs(sys.stdout, saved)
+        self.assertIsNone(ui._screen)
+
+    def test_ui_curses_mode_rounds(self):
+        # An unchanged mode runs through the curses front end via print(), clear_screen() and prompt_input()
+        window = FakeWindow(answers=["0", "", "+1", "", "q"], size=(24, 80))
+        mode = RoundingMode()
+        redrawn = []
+        render = CursesScreen.render
+        with patch.object(CursesScreen, "render", lambda screen, prompt=">> ": redrawn.append(render(screen, prompt)) or redrawn[-1]), \
+             patch("src.ui.os.system") as mock_sys:
+            results = _run_in_screen(window, lambda: [mode.run_round() for _ in range(3)], (), {})
+        self.assertEqual(results, [True, True, False])
+        self.assertFalse(mock_sys.called)
+        # The first frame paints every row; later frames leave the unchanged header and quit hint alone
+        self.assertEqual(redrawn[0], 24)
+        self.assertTrue(all(n < 16 for n in redrawn[1:]), redrawn)
+        self.assertEqual(window.text(22), "Press `q` to exit.")
+        drawn = [text for _, _, text, _ in window.draws]
+        self.assertIn("so the decision is '+1'.", "".join(drawn))
+        self.assertTrue(any(text.startswith("Correct. Guard bit is 1") for text in drawn))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import os
+import random
+import struct
+import sys
+import time
+import argparse
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine import (
+    FLOAT32, FLOAT64, bin32_to_float, bin64_to_float, float_to_bin32, float_to_bin64,
+    hex_to_bits, bits_to_float, bits_to_hex, float_to_bits, hex_words_to_floats, floats_to_hex_words
+)
+
+def make_hex_dump(count: int, is_64_bit: bool, seed: int = 754) -> List[str]:
+    """Builds a reproducible list of hex words for finite random values."""
+    rng = random.Random(seed)
+    fmt = '>Q' if is_64_bit else '>I'
+    pack = '>d' if is_64_bit else '>f'
+    words = []
+    while len(words) < count:
+        value = rng.uniform(-1e6, 1e6)
+        [bits] = struct.unpack(fmt, struct.pack(pack, value))
+        words.append(f"{bits:0{16 if is_64_bit else 8}x}")
+    return words
+
+def time_call(fn: Callable[[], object], repeat: int) -> float:
+    """Best-of-`repeat` wall time of fn() in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmark(count: int, repeat: int) -> List[Tuple[str, str, float]]:
+    """Times the binary-string path against the direct and bulk hex paths for both widths."""
+    rows = []
+    for is_64_bit, preset, to_float, to_bin, bits in (
+        (False, FLOAT32, bin32_to_float, float_to_bin32, 32),
+        (True, FLOAT64, bin64_to_float, float_to_bin64, 64),
+    ):
+        words = make_hex_dump(count, is_64_bit)
+        values = list(hex_words_to_floats(words, preset))
+        label = preset is FLOAT64 and "FLOAT64" or "FLOAT32"
+
+        rows.append((label, "decode: binary string", time_call(
+            lambda: [to_float(f"{int(w, 16):0{bits}b}") for w in words], repeat)))
+        rows.append((label, "decode: hex per value", time_call(
+            lambda: [bits_to_float(hex_to_bits(w, preset), preset) for w in words], repeat)))
+        rows.append((label, "decode: hex bulk", time_call(
+            lambda: hex_words_to_floats(words, preset), repeat)))
+
+        rows.append((label, "encode: binary string", time_call(
+            lambda: [f"{int(to_bin(v), 2):0{bits // 4}x}" for v in values], repeat)))
+        rows.append((label, "encode: hex per value", time_call(
+            lambda: [bits_to_hex(float_to_bits(v, preset), preset) for v in values], repeat)))
+        rows.append((label, "encode: hex bulk", time_call(
+            lambda: floats_to_hex_words(values, preset), repeat)))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the hex I/O path against the binary-string path.")
+    parser.add_argument("--count", type=int, default=200000, help="Values per benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.count, args.repeat)
+    print(f"{'Preset':<8} | {'Path':<22} | {'Seconds':>8} | {'Values/s':>14}")
+    print("-" * 62)
+    for preset, path, seconds in rows:
+        print(f"{preset:<8} | {path:<22} | {seconds:>8.4f} | {args.count / seconds:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.engine as engine
+from src.engine import FLOAT64, float_to_bits
+from src.result_cache import CachedEngine
+
+# Values learners and clients ask for over and over, most popular first: the classic
+# decimal fractions, the Mode 5 extremes (whose exact expansions run to hundreds of digits)
+# and small powers of two
+HOT_VALUES = ([0.1, 1.0, 2.0, 0.5, -1.0, 0.2, 0.3, 5e-324, 2.2250738585072014e-308, 1.7976931348623157e308,
+               10.0, 0.25, 100.0] + [2.0 ** k for k in range(-8, 9)])
+
+def make_workload(count: int, skew: float, tail: int = 100_000, seed: int = 754) -> List[float]:
+    """
+    `count` values drawn Zipf-like (rank r has weight 1/r**skew) over the hot values
+    followed by `tail` random values; skew 0 is uniform, larger skews concentrate on the head.
+    """
+    rng = random.Random(seed)
+    population = HOT_VALUES + [rng.uniform(-1e6, 1e6) for _ in range(tail)]
+    weights = [1.0 / (rank ** skew) for rank in range(1, len(population) + 1)]
+    return rng.choices(population, weights, k=count)
+
+class _UncachedEngine:
+    """The plain engine conversions; exact_decimal's own unbounded lru_cache would hide the direct cost."""
+    float_to_bin64 = staticmethod(engine.float_to_bin64)
+    extract_fields = staticmethod(engine.extract_fields)
+    exact_decimal = staticmethod(engine.exact_decimal.__wrapped__)
+
+def _convert_all(convert, values: List[float]) -> None:
+    """One 64-bit encoding round per value: binary string, fields and the exact expansion."""
+    for v in values:
+        binary_str = convert.float_to_bin64(v)
+        convert.extract_fields(binary_str, FLOAT64)
+        convert.exact_decimal(float_to_bits(v, FLOAT64), FLOAT64)
+
+def _time(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run_benchmark(count: int, skews: List[float], maxsize: int) -> List[Dict[str, float]]:
+    """Times the workload at each skew directly against the engine and through a fresh CachedEngine."""
+    rows = []
+    for skew in skews:
+        values = make_workload(count, skew)
+        direct = _time(lambda: _convert_all(_UncachedEngine, values))
+        cached_engine = CachedEngine(maxsize)
+        cached = _time(lambda: _convert_all(cached_engine, values))
+        stats = cached_engine.stats()
+        rows.append({"skew": skew, "direct_s": direct, "cached_s": cached, "speedup": direct / cached if cached else 0.0,
+                     "hit_rate": stats.hit_rate, "evictions": stats.evictions, "size": stats.size})
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the bounded result cache on skewed conversion workloads.")
+    parser.add_argument("--count", type=int, default=50000, help="Conversions per workload")
+    parser.add_argument("--skew", type=float, nargs="+", default=[0.0, 1.0, 1.5, 2.0], help="Zipf exponents to run")
+    parser.add_argument("--maxsize", type=int, default=4096, help="Cache entries")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.count, args.skew, args.maxsize)
+    if args.format == 'json':
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'Skew':>5} | {'Direct s':>9} | {'Cached s':>9} | {'Speedup':>7} | {'Hit rate':>8} | {'Evictions':>9}")
+    print("-" * 64)
+    for r in rows:
+        print(f"{r['skew']:>5.1f} | {r['direct_s']:>9.4f} | {r['cached_s']:>9.4f} | {r['speedup']:>6.2f}x | "
+              f"{r['hit_rate']:>7.1%} | {r['evictions']:>9,}")
+
+if __name__ == "__main__":
+    main()
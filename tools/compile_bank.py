@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.difficulty import LEVELS, normal_count, normal_pattern, subnormal_pattern
+from src.engine import PRESETS, IEEEPresets
+from src.permutation import PermutationSampler
+from src.question_bank import bank_path, compile_bank
+
+def bank_patterns(preset: IEEEPresets, count: int, level: int, seed: int = 754) -> Iterator[int]:
+    """
+    `count` patterns at a difficulty level: normals in a repeat-free permutation order of the
+    level's values and subnormals at the level's share, as the adaptive modes would ask them.
+    """
+    rng = random.Random(seed)
+    spec = LEVELS[level]
+    order = PermutationSampler(normal_count(spec, preset), rng)
+    for _ in range(count):
+        if spec.subnormal_rate and rng.random() < spec.subnormal_rate:
+            yield subnormal_pattern(spec, preset, rng)
+        else:
+            yield normal_pattern(next(order), spec, preset)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compiles a memory-mapped question bank for the encoding/decoding modes.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="FLOAT32", help="Format of the questions")
+    parser.add_argument("--count", type=int, default=100000, help="Questions to compile")
+    parser.add_argument("--level", type=int, choices=range(len(LEVELS)), default=2, help="Difficulty level (src/difficulty.py)")
+    parser.add_argument("--seed", type=int, default=754, help="RNG seed")
+    parser.add_argument("--out", default=".", help="Directory of the bank (the file is named after the preset)")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+    if args.count < 1:
+        parser.error("--count must be at least 1: modes cannot sample an empty bank")
+
+    preset = PRESETS[args.preset]
+    os.makedirs(args.out, exist_ok=True)
+    path = bank_path(args.out, preset)
+    start = time.perf_counter()
+    count = compile_bank(path, preset, bank_patterns(preset, args.count, args.level, args.seed))
+    report = {"path": path, "questions": count, "bytes": os.path.getsize(path), "seconds": time.perf_counter() - start}
+    if args.format == 'json':
+        print(json.dumps(report, indent=2))
+        return
+    print(f"Wrote {report['questions']:,} questions ({report['bytes']:,} bytes) to {path} in {report['seconds']:.2f} s.")
+    print(f"Serve them with IEEE754_TUTOR_BANK={args.out} python3 main.py")
+
+if __name__ == "__main__":
+    main()
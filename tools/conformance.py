@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import random
+import struct
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Iterable, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine import (
+    FLOAT16, BFLOAT16, FLOAT32, FLOAT64, IEEEPresets, PRESETS,
+    float_to_bin32, float_to_bin64, bin32_to_float, bin64_to_float, extract_fields,
+    extract_bit_fields, decode_exact, bits_to_float, float_to_bits,
+    bits_to_hex, hex_to_bits, format_hex_float, parse_hex_float
+)
+
+ORACLES = ("struct", "z3", "numpy")
+
+@dataclass
+class ChunkResult:
+    """Counts and the first counterexample of one worker chunk."""
+    checked: int
+    z3_checked: int
+    numpy_checked: int
+    seconds: float
+    counterexample: Optional[dict] = None
+
+@dataclass
+class ConformanceReport:
+    """Totals of a conformance run for one preset."""
+    preset: str
+    samples: int
+    workers: int
+    seconds: float
+    z3_checked: int
+    numpy_checked: int
+    oracles: List[str]
+    counterexample: Optional[dict] = None
+
+    @property
+    def values_per_second(self) -> float:
+        return self.samples / self.seconds if self.seconds else 0.0
+
+def _preset_name(preset: IEEEPresets) -> str:
+    return next(name for name, p in PRESETS.items() if p is preset)
+
+def _same(expected: float, got: float) -> bool:
+    """Bit-exact float comparison (so -0.0 != 0.0) that treats any two NaNs as equal."""
+    if math.isnan(expected) or math.isnan(got):
+        return math.isnan(expected) and math.isnan(got)
+    return struct.pack("<d", expected) == struct.pack("<d", got)
+
+def boundary_patterns(preset: IEEEPresets) -> List[int]:
+    """Signed zeros, subnormal and normal extremes, 1.0 and its neighbours, INF and quiet/signalling NaN."""
+    f_max = (1 << preset.f_bits) - 1
+    e_max = (1 << preset.e_bits) - 1
+    one = preset.bias << preset.f_bits
+    magnitudes = [
+        0, 1, f_max, 1 << preset.f_bits, (1 << preset.f_bits) | 1,
+        one - 1, one, one + 1, ((e_max - 1) << preset.f_bits) | f_max,
+        e_max << preset.f_bits, (e_max << preset.f_bits) | (1 << (preset.f_bits - 1)), (e_max << preset.f_bits) | 1,
+    ]
+    sign = 1 << (preset.total_bits - 1)
+    return magnitudes + [m | sign for m in magnitudes]
+
+def stratified_patterns(preset: IEEEPresets, count: int, seed: int) -> Iterable[int]:
+    """
+    Random bit patterns spread evenly over every biased exponent (so subnormals, each binade
+    and the special encodings get the same share); one in eight fractions is an edge value.
+    """
+    rng = random.Random(seed)
+    f_max = (1 << preset.f_bits) - 1
+    edges = (0, 1, f_max, f_max - 1, 1 << (preset.f_bits - 1))
+    exponents = 1 << preset.e_bits
+    start = rng.randrange(exponents)
+    for i in range(count):
+        e = (start + i) % exponents
+        f = rng.choice(edges) if rng.random() < 0.125 else rng.getrandbits(preset.f_bits)
+        yield (rng.getrandbits(1) << (preset.total_bits - 1)) | (e << preset.f_bits) | f
+
+def struct_reference(bits: int, preset: IEEEPresets) -> float:
+    """Decodes with the C library via struct; BFLOAT16 is the top half of a float32."""
+    if preset is FLOAT16:
+        return struct.unpack("<e", struct.pack("<H", bits))[0]
+    if preset is BFLOAT16:
+        return struct.unpack("<f", struct.pack("<I", bits << 16))[0]
+    if preset is FLOAT32:
+        return struct.unpack("<f", struct.pack("<I", bits))[0]
+    if preset is FLOAT64:
+        return struct.unpack("<d", struct.pack("<Q", bits))[0]
+    raise ValueError(f"No struct reference for {preset}")
+
+def check_pattern(bits: int, preset: IEEEPresets, reference: float) -> Optional[dict]:
+    """
+    Runs every engine codec on one pattern against `reference` (its true value).
+    Returns a counterexample dict for the first disagreement, or None.
+    """
+    def mismatch(check, expected, got):
+        return {"preset": _preset_name(preset), "bits": bits_to_hex(bits, preset), "check": check,
+                "expected": repr(expected), "got": repr(got)}
+
+    value = bits_to_float(bits, preset)
+    if not _same(reference, value):
+        return mismatch("bits_to_float", reference, value)
+    s, e, f = extract_bit_fields(bits, preset)
+    is_nan = e == (1 << preset.e_bits) - 1 and f != 0
+    if not is_nan:
+        # Every preset widens into float64 exactly, so the exact significand must reproduce the value
+        if e != (1 << preset.e_bits) - 1:
+            _, significand, exponent = decode_exact(bits, preset)
+            exact = -math.ldexp(significand, exponent) if s else math.ldexp(significand, exponent)
+            if not _same(reference, exact):
+                return mismatch("decode_exact", reference, exact)
+        encoded = float_to_bits(value, preset)
+        if encoded != bits:
+            return mismatch("float_to_bits", bits_to_hex(bits, preset), bits_to_hex(encoded, preset))
+        parsed = parse_hex_float(format_hex_float(bits, preset), preset)
+        if parsed != bits:
+            return mismatch("parse_hex_float(format_hex_float)", bits_to_hex(bits, preset), bits_to_hex(parsed, preset))
+    if hex_to_bits(bits_to_hex(bits, preset), preset) != bits:
+        return mismatch("hex_to_bits(bits_to_hex)", bits, hex_to_bits(bits_to_hex(bits, preset), preset))
+
+    if preset is FLOAT32 or preset is FLOAT64:
+        binary_str = f"{bits:0{preset.total_bits}b}"
+        if extract_fields(binary_str, preset) != (s, e, f):
+            return mismatch("extract_fields", (s, e, f), extract_fields(binary_str, preset))
+        decoded = (bin32_to_float if preset is FLOAT32 else bin64_to_float)(binary_str)
+        if not _same(reference, decoded):
+            return mismatch("bin_to_float", reference, decoded)
+        if not is_nan:
+            encoded_str = (float_to_bin32 if preset is FLOAT32 else float_to_bin64)(reference)
+            if encoded_str != binary_str:
+                return mismatch("float_to_bin", binary_str, encoded_str)
+    return None
+
+def z3_reference(bits: int, preset: IEEEPresets):
+    """Evaluates the pattern with Z3's FPA theory: (value widened to float64, IEEE class name)."""
+    import z3
+    x = z3.fpBVToFP(z3.BitVecVal(bits, preset.total_bits), z3.FPSort(preset.e_bits, preset.f_bits + 1))
+    for name, test in (("nan", z3.fpIsNaN), ("inf", z3.fpIsInf), ("zero", z3.fpIsZero),
+                       ("subnormal", z3.fpIsSubnormal), ("normal", z3.fpIsNormal)):
+        if z3.is_true(z3.simplify(test(x))):
+            break
+    else:
+        raise AssertionError("Z3 could not classify the pattern.")
+    if name == "nan":
+        # The IEEE bit-vector of a NaN is unspecified in SMT-LIB, so there is no single pattern to compare
+        return float('nan'), name
+    wide = z3.simplify(z3.fpToIEEEBV(z3.fpToFP(z3.RNE(), x, z3.Float64()))).as_long()
+    return struct.unpack("<d", struct.pack("<Q", wide))[0], name
+
+def engine_class(bits: int, preset: IEEEPresets) -> str:
+    """The IEEE class the engine's field extraction implies."""
+    _, e, f = extract_bit_fields(bits, preset)
+    if e == (1 << preset.e_bits) - 1:
+        return "nan" if f else "inf"
+    if e == 0:
+        return "subnormal" if f else "zero"
+    return "normal"
+
+def numpy_reference(patterns: Sequence[int], preset: IEEEPresets):
+    """Decodes a batch through NumPy dtype views, widened to float64; None if NumPy is unavailable."""
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    if preset is BFLOAT16:
+        return (np.asarray(patterns, dtype=np.uint32) << 16).view(np.float32).astype(np.float64)
+    uint, real = {FLOAT16: (np.uint16, np.float16), FLOAT32: (np.uint32, np.float32),
+                  FLOAT64: (np.uint64, np.float64)}[preset]
+    return np.asarray(patterns, dtype=uint).view(real).astype(np.float64)
+
+def check_patterns(patterns: Iterable[int], preset: IEEEPresets, oracles: Sequence[str] = ("struct",),
+                   z3_every: int = 1) -> ChunkResult:
+    """
+    Checks the engine on every pattern against the struct reference, every `z3_every`-th
+    pattern against Z3 and (in one vectorised pass) all of them against NumPy.
+    Stops at the first counterexample.
+    """
+    start = time.perf_counter()
+    patterns = list(patterns)
+    result = ChunkResult(0, 0, 0, 0.0)
+
+    for i, bits in enumerate(patterns):
+        reference = struct_reference(bits, preset)
+        counterexample = check_pattern(bits, preset, reference)
+        result.checked += 1
+        if counterexample is None and "z3" in oracles and i % z3_every == 0:
+            z3_value, z3_class = z3_reference(bits, preset)
+            result.z3_checked += 1
+            value = bits_to_float(bits, preset)
+            if not _same(z3_value, value):
+                counterexample = {"preset": _preset_name(preset), "bits": bits_to_hex(bits, preset),
+                                  "check": "z3 value", "expected": repr(z3_value), "got": repr(value)}
+            elif z3_class != engine_class(bits, preset):
+                counterexample = {"preset": _preset_name(preset), "bits": bits_to_hex(bits, preset),
+                                  "check": "z3 class", "expected": z3_class, "got": engine_class(bits, preset)}
+        if counterexample:
+            result.counterexample = counterexample
+            break
+
+    if result.counterexample is None and "numpy" in oracles:
+        reference = numpy_reference(patterns, preset)
+        if reference is not None:
+            for bits, expected in zip(patterns, reference.tolist()):
+                result.numpy_checked += 1
+                value = bits_to_float(bits, preset)
+                if not _same(expected, value):
+                    result.counterexample = {"preset": _preset_name(preset), "bits": bits_to_hex(bits, preset),
+                                             "check": "numpy value", "expected": repr(expected), "got": repr(value)}
+                    break
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+def run_chunk(preset_name: str, count: int, seed: int, oracles: Sequence[str], z3_every: int,
+              with_boundaries: bool) -> ChunkResult:
+    """Generates and checks one chunk of stratified samples; also the worker-process entry point."""
+    preset = PRESETS[preset_name]
+    patterns = list(stratified_patterns(preset, count, seed))
+    if with_boundaries:
+        patterns = boundary_patterns(preset) + patterns
+    return check_patterns(patterns, preset, oracles, z3_every)
+
+def run_conformance(preset_name: str, samples: int, workers: int = 1, seed: int = 754,
+                    z3_samples: int = 2000, oracles: Sequence[str] = ORACLES,
+                    chunk_size: int = 50000) -> ConformanceReport:
+    """
+    Checks `samples` stratified patterns of one preset across `workers` processes.
+    Z3 is consulted for roughly `z3_samples` of them; the first counterexample (in sample order) is kept.
+    """
+    if preset_name not in PRESETS:
+        raise ValueError(f"Unknown preset '{preset_name}', expected one of {sorted(PRESETS)}")
+    counts = [min(chunk_size, samples - i) for i in range(0, samples, chunk_size)]
+    z3_every = max(1, samples // z3_samples) if z3_samples else 0
+    chunk_oracles = [o for o in oracles if o != "z3" or z3_every]
+    args = [(preset_name, n, seed + i, chunk_oracles, z3_every or 1, i == 0) for i, n in enumerate(counts)]
+
+    start = time.perf_counter()
+    if workers > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_chunk, *zip(*args)))
+    else:
+        results = [run_chunk(*a) for a in args]
+
+    return ConformanceReport(
+        preset=preset_name,
+        samples=sum(r.checked for r in results),
+        workers=workers,
+        seconds=time.perf_counter() - start,
+        z3_checked=sum(r.z3_checked for r in results),
+        numpy_checked=sum(r.numpy_checked for r in results),
+        oracles=list(chunk_oracles),
+        counterexample=next((r.counterexample for r in results if r.counterexample), None),
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-checks the engine codecs against struct, Z3 FPA and NumPy.")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS), help="Preset to check; repeatable (default: all)")
+    parser.add_argument("--samples", type=int, default=1000000, help="Stratified samples per preset")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--z3-samples", type=int, default=2000, help="Samples per preset also evaluated by Z3 (0 to skip)")
+    parser.add_argument("--no-numpy", action="store_true", help="Skip the NumPy oracle even if it is installed")
+    parser.add_argument("--seed", type=int, default=754, help="Sampling seed")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    oracles = [o for o in ORACLES if not (o == "numpy" and args.no_numpy)]
+    reports = [run_conformance(name, args.samples, args.workers, args.seed, args.z3_samples, oracles)
+               for name in (args.preset or sorted(PRESETS))]
+
+    if args.format == 'json':
+        print(json.dumps([dict(asdict(r), values_per_second=r.values_per_second) for r in reports], indent=2))
+    else:
+        print(f"{'Preset':<9} | {'Samples':>10} | {'Z3':>6} | {'NumPy':>10} | {'Seconds':>8} | {'Values/s':>10} | Result")
+        print("-" * 80)
+        for r in reports:
+            numpy_col = f"{r.numpy_checked:>10}" if "numpy" in r.oracles and r.numpy_checked else f"{'n/a':>10}"
+            verdict = "OK" if r.counterexample is None else "MISMATCH"
+            print(f"{r.preset:<9} | {r.samples:>10} | {r.z3_checked:>6} | {numpy_col} | {r.seconds:>8.2f} | "
+                  f"{r.values_per_second:>10,.0f} | {verdict}")
+        for r in reports:
+            if r.counterexample:
+                c = r.counterexample
+                print(f"\nFirst counterexample ({c['preset']} {c['bits']}, {c['check']}): "
+                      f"expected {c['expected']}, got {c['got']}")
+
+    sys.exit(0 if all(r.counterexample is None for r in reports) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import ast
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Below this many changed files the pool start-up costs more than it saves
+PARALLEL_THRESHOLD = 512
+INDEX_VERSION = 1
+
+class DefinitionVisitor(ast.NodeVisitor):
+    """Collects every class, method and (nested) function definition of one module as (type, name)."""
+    def __init__(self):
+        self.current_class = None
+        self.definitions: List[Tuple[str, str]] = []
+
+    def visit_ClassDef(self, node):
+        self.definitions.append(("class", node.name))
+        old_class = self.current_class
+        self.current_class = node.name
+        self.generic_visit(node)
+        self.current_class = old_class
+
+    def visit_FunctionDef(self, node):
+        # We capture methods, nested functions, and top level functions
+        if self.current_class:
+            self.definitions.append(("method", f"{self.current_class}.{node.name}"))
+        else:
+            self.definitions.append(("function", node.name))
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        self.visit_FunctionDef(node)
+
+def parse_definitions(path: str) -> Tuple[Optional[List[Tuple[str, str]]], str]:
+    """Parses one file, returning (definitions, "") or (None, error message); also the worker entry point."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    visitor = DefinitionVisitor()
+    visitor.visit(tree)
+    return visitor.definitions, ""
+
+def _parse_chunk(paths: List[str]) -> List[Tuple[Optional[List[Tuple[str, str]]], str]]:
+    return [parse_definitions(p) for p in paths]
+
+class DefinitionIndex:
+    """
+    Definitions of a source tree, cached per file by (mtime, size) so that only
+    changed files are re-parsed. Optionally persisted to a JSON file between runs.
+    """
+    def __init__(self, cache_path: Optional[str] = None, workers: Optional[int] = None,
+                 parallel_threshold: int = PARALLEL_THRESHOLD):
+        self.cache_path = cache_path
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.parsed = 0
+        self.reused = 0
+        self.errors: Dict[str, str] = {}
+        self.files: Dict[str, dict] = {}
+        self._dirty = False
+        if cache_path:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("version") == INDEX_VERSION:
+                    self.files = data["files"]
+            except (OSError, ValueError, KeyError):
+                self.files = {}
+
+    def _refresh(self, paths: List[str]) -> None:
+        """Re-parses the files whose (mtime, size) changed since they were last indexed."""
+        stale = []
+        for path in paths:
+            st = os.stat(path)
+            entry = self.files.get(path)
+            if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                self.reused += 1
+            else:
+                stale.append((path, st))
+
+        if len(stale) >= self.parallel_threshold and self.workers > 1:
+            # Large batches per task keep the pickling overhead per file small
+            size = max(1, len(stale) // (self.workers * 4))
+            chunks = [[p for p, _ in stale[i:i + size]] for i in range(0, len(stale), size)]
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = [r for chunk in pool.map(_parse_chunk, chunks) for r in chunk]
+        else:
+            results = [parse_definitions(p) for p, _ in stale]
+
+        for (path, st), (definitions, error) in zip(stale, results):
+            self.parsed += 1
+            self._dirty = True
+            self.files[path] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size,
+                                "definitions": definitions, "error": error}
+
+    def scan(self, folder: str, pattern: str = os.path.join("**", "*.py"),
+             exclude_init: bool = True) -> List[Tuple[str, str, str]]:
+        """
+        Returns (module_name, definition_type, definition_name) for every file under `folder`
+        matching `pattern`, with module names dotted relative to `folder`.
+        """
+        folder = os.path.abspath(folder)
+        paths = sorted(glob.glob(os.path.join(folder, pattern), recursive=True))
+        if exclude_init:
+            paths = [p for p in paths if os.path.basename(p) != "__init__.py"]
+        self._refresh(paths)
+
+        definitions = []
+        for path in paths:
+            entry = self.files[path]
+            if entry["definitions"] is None:
+                self.errors[path] = entry["error"]
+                continue
+            module_name = os.path.relpath(path, folder)[:-3].replace(os.sep, ".")
+            definitions.extend((module_name, dtype, name) for dtype, name in entry["definitions"])
+        return definitions
+
+    def save(self) -> None:
+        """Persists the index (dropping files that no longer exist) if a cache path was given and it changed."""
+        if not self.cache_path:
+            return
+        files = {p: e for p, e in self.files.items() if os.path.exists(p)}
+        if not self._dirty and len(files) == len(self.files):
+            return
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"version": INDEX_VERSION, "files": files}, f)
+        os.replace(tmp, self.cache_path)
+        self.files = files
+        self._dirty = False
+
+def definitions_to_json(definitions: List[Tuple[str, str, str]]) -> str:
+    """Serializes definitions as a JSON list of {module, type, name} objects."""
+    return json.dumps([{"module": m, "type": t, "name": n} for m, t, n in sorted(definitions)], indent=2)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.problem_generator import (
+    ProblemSpec, DENORMALS_SPECS, MODEL_CACHE_PATH, ModelCache, ensure_models, enumerate_models
+)
+
+def parse_spec(text: str) -> ProblemSpec:
+    """Parses 'kind[:key=value,...]', e.g. 'subnormal:fraction_ones=3' or 'rounding:guard=1,round=0,sticky=0'."""
+    kind, _, rest = text.partition(":")
+    fields = {}
+    for item in filter(None, rest.split(",")):
+        key, _, value = item.partition("=")
+        if key not in ("preset", "fraction_ones", "guard", "round", "sticky"):
+            raise ValueError(f"Unknown constraint '{key}' in '{text}'")
+        fields[key] = value if key == "preset" else int(value)
+    return ProblemSpec(kind, **fields)
+
+def main():
+    parser = argparse.ArgumentParser(description="Solves constrained drill problems with Z3 and caches the models.")
+    parser.add_argument("specs", nargs="*", help="kind[:key=value,...] (default: the DenormalsMode drills)")
+    parser.add_argument("--count", type=int, default=64, help="Distinct models per constraint")
+    parser.add_argument("--seed", type=int, default=0, help="Solver and sampling seed")
+    parser.add_argument("--cache", default=MODEL_CACHE_PATH, help="Model cache file")
+    parser.add_argument("--refresh", action="store_true", help="Re-solve even if enough models are cached")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    try:
+        specs = [parse_spec(s) for s in args.specs] or list(DENORMALS_SPECS)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    cache = ModelCache(args.cache)
+    rows = []
+    for spec in specs:
+        start = time.perf_counter()
+        if args.refresh:
+            models = enumerate_models(spec, args.count, args.seed)
+            cache.put(spec, models, args.count)
+        else:
+            models = ensure_models(spec, cache, args.count, args.seed)
+        rows.append((spec, models, time.perf_counter() - start))
+    cache.save()
+
+    if args.format == 'json':
+        print(json.dumps([{"spec": spec.__dict__, "key": spec.key(), "models": models} for spec, models, _ in rows], indent=2))
+        return
+
+    print(f"{'Constraint':<55} | {'Models':>6} | {'Seconds':>8}")
+    print("-" * 76)
+    for spec, models, seconds in rows:
+        label = ", ".join(f"{k}={v}" for k, v in spec.__dict__.items() if v is not None)
+        print(f"{label:<55} | {len(models):>6} | {seconds:>8.3f}")
+
+if __name__ == "__main__":
+    main()
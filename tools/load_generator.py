@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api_server import make_server
+from src.engine import PRESETS, bits_to_hex
+
+ENDPOINTS = ("encode", "decode", "fields", "classify")
+
+@dataclass
+class LoadReport:
+    """Totals of a load run; `latencies` are per-request seconds."""
+    endpoint: str
+    batch: int
+    connections: int
+    seconds: float
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.seconds if self.seconds else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile of the request latencies, in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered), max(1, math.ceil(p / 100 * len(ordered)))) - 1]
+
+def build_body(endpoint: str, preset_name: str, batch: int, seed: int = 0) -> bytes:
+    """A request body with `batch` random patterns (or values for encode)."""
+    preset = PRESETS[preset_name]
+    rng = random.Random(seed)
+    if endpoint == "encode":
+        payload = {"preset": preset_name, "values": [rng.uniform(-1e6, 1e6) for _ in range(batch)]}
+    else:
+        payload = {"preset": preset_name,
+                   "bits": [bits_to_hex(rng.getrandbits(preset.total_bits), preset) for _ in range(batch)]}
+    return json.dumps(payload).encode("utf-8")
+
+def _client(host: str, port: int, path: str, body: bytes, count: int, deadline: float, report: LoadReport,
+            lock: threading.Lock) -> None:
+    """Sends requests over one keep-alive connection until `count` are done or `deadline` passes."""
+    conn = http.client.HTTPConnection(host, port, timeout=60)
+    headers = {"Content-Type": "application/json"}
+    latencies, errors, sent = [], 0, 0
+    try:
+        while sent < count and time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request("POST", path, body, headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=60)
+            latencies.append(time.perf_counter() - start)
+            sent += 1
+    finally:
+        conn.close()
+    with lock:
+        report.latencies.extend(latencies)
+        report.errors += errors
+
+def run_load(host: str, port: int, endpoint: str = "decode", preset: str = "FLOAT32", batch: int = 1,
+             connections: int = 4, requests: int = 1000, duration: Optional[float] = None) -> LoadReport:
+    """Drives `connections` keep-alive clients against the API; stops after `requests` in total or `duration` seconds."""
+    if endpoint not in ENDPOINTS:
+        raise ValueError(f"Unknown endpoint '{endpoint}', expected one of {ENDPOINTS}")
+    body = build_body(endpoint, preset, batch)
+    report = LoadReport(endpoint, batch, connections, 0.0)
+    lock = threading.Lock()
+    per_client = [requests // connections + (i < requests % connections) for i in range(connections)]
+    if duration is not None:
+        per_client = [sys.maxsize] * connections
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else float("inf")
+    threads = [threading.Thread(target=_client, args=(host, port, f"/v1/{endpoint}", body, n, deadline, report, lock))
+               for n in per_client]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    report.seconds = time.perf_counter() - start
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-tests the engine HTTP API over keep-alive connections.")
+    parser.add_argument("--url", help="Running server, e.g. http://127.0.0.1:8754 (default: start one in-process)")
+    parser.add_argument("--endpoint", choices=ENDPOINTS, default="decode", help="Endpoint to exercise")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="FLOAT32", help="Preset of the generated data")
+    parser.add_argument("--batch", type=int, default=1, help="Values per request")
+    parser.add_argument("--connections", type=int, default=4, help="Concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=2000, help="Total requests")
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a request count")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname, parsed.port or 80
+    else:
+        server = make_server(port=0)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        report = run_load(host, port, args.endpoint, args.preset, args.batch, args.connections,
+                          args.requests, args.duration)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    summary = {
+        "endpoint": report.endpoint, "batch": report.batch, "connections": report.connections,
+        "requests": report.requests, "errors": report.errors, "seconds": report.seconds,
+        "requests_per_second": report.requests_per_second,
+        "values_per_second": report.requests_per_second * report.batch,
+        "p50_ms": report.percentile(50) * 1000, "p99_ms": report.percentile(99) * 1000,
+    }
+    if args.format == 'json':
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{report.requests} x /v1/{report.endpoint} (batch {report.batch}) over {report.connections} "
+              f"connection(s) in {report.seconds:.2f}s, {report.errors} error(s)")
+        print(f"{summary['requests_per_second']:,.0f} requests/s, {summary['values_per_second']:,.0f} values/s, "
+              f"p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+    sys.exit(1 if report.errors else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+import ast
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import argparse
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engine import (
+    FLOAT64, IEEEPresets, PRESETS, FLAG_INEXACT, FLAG_OVERFLOW, FLAG_UNDERFLOW,
+    extract_bit_fields, decode_exact, bits_to_float
+)
+from src.narrowing import narrow_bit_patterns
+
+NPY_MAGIC = b"\x93NUMPY"
+NPY_DTYPES = {"<f8": "<d", ">f8": ">d", "<f4": "<f", ">f4": ">f"}
+
+@dataclass
+class ColumnAudit:
+    """Running precision-loss statistics for one column."""
+    name: str
+    values: int = 0
+    skipped: int = 0
+    inexact: int = 0
+    overflow: int = 0
+    underflow: int = 0
+    max_rel_error: float = 0.0
+    min_exp: Optional[int] = None
+    max_exp: Optional[int] = None
+
+    def add(self, doubles: array, preset: IEEEPresets) -> None:
+        """Narrows one chunk of float64 values into `preset` and folds in the results."""
+        patterns = memoryview(doubles).cast('B').cast('Q')
+        result = narrow_bit_patterns(patterns, preset)
+        self.values += len(doubles)
+
+        for x, src_bits, bits, flags in zip(doubles, patterns, result.bits, result.flags):
+            _, e, f = extract_bit_fields(src_bits, FLOAT64)
+            if e != (1 << FLOAT64.e_bits) - 1 and (e or f):
+                # Unbiased binary exponent of the source value's leading bit (covers subnormals)
+                _, significand, exponent = decode_exact(src_bits, FLOAT64)
+                exp = significand.bit_length() - 1 + exponent
+                if self.min_exp is None or exp < self.min_exp:
+                    self.min_exp = exp
+                if self.max_exp is None or exp > self.max_exp:
+                    self.max_exp = exp
+
+            if not flags & FLAG_INEXACT:
+                continue
+            self.inexact += 1
+            if flags & FLAG_OVERFLOW:
+                self.overflow += 1
+                self.max_rel_error = float('inf')
+                continue
+            if flags & FLAG_UNDERFLOW:
+                self.underflow += 1
+            rel = abs(bits_to_float(bits, preset) - x) / abs(x)
+            if rel > self.max_rel_error:
+                self.max_rel_error = rel
+
+@dataclass
+class AuditReport:
+    """Per-column results plus throughput and peak memory of one audit run."""
+    path: str
+    preset: str
+    rows: int
+    seconds: float
+    peak_rss_kb: Optional[int]
+    columns: List[ColumnAudit]
+
+    @property
+    def values_per_second(self) -> float:
+        total = sum(c.values for c in self.columns)
+        return total / self.seconds if self.seconds else 0.0
+
+def read_npy_header(fh) -> Tuple[str, bool, Tuple[int, ...], int]:
+    """Parses a .npy header, returning (descr, fortran_order, shape, data_offset)."""
+    if fh.read(6) != NPY_MAGIC:
+        raise ValueError("Not a .npy file (bad magic string).")
+    major = fh.read(2)[0]
+    size_fmt = "<H" if major == 1 else "<I"
+    [header_len] = struct.unpack(size_fmt, fh.read(struct.calcsize(size_fmt)))
+    header = ast.literal_eval(fh.read(header_len).decode("latin1"))
+    return header["descr"], header["fortran_order"], tuple(header["shape"]), fh.tell()
+
+def iter_npy_chunks(path: str, columns: Sequence[int],
+                    chunk_rows: int) -> Iterator[Tuple[int, Dict[int, array]]]:
+    """
+    Memory-maps a 1-D or 2-D float .npy file and yields (row_count, {column: array('d')})
+    chunks; only the touched pages are ever resident.
+    """
+    with open(path, "rb") as fh:
+        descr, fortran_order, shape, offset = read_npy_header(fh)
+        if descr not in NPY_DTYPES or fortran_order or len(shape) not in (1, 2):
+            raise ValueError(f"Unsupported .npy layout: dtype={descr} fortran={fortran_order} shape={shape}")
+        n_rows = shape[0]
+        n_cols = shape[1] if len(shape) == 2 else 1
+        order, code = NPY_DTYPES[descr]
+        row = struct.Struct(order + code * n_cols)
+        if n_rows == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                for start in range(0, n_rows, chunk_rows):
+                    stop = min(start + chunk_rows, n_rows)
+                    chunk = {c: array('d') for c in columns}
+                    for values in row.iter_unpack(view[offset + start * row.size: offset + stop * row.size]):
+                        for c in columns:
+                            chunk[c].append(values[c])
+                    yield stop - start, chunk
+            finally:
+                view.release()
+
+def iter_csv_chunks(path: str, columns: Sequence[int],
+                    chunk_rows: int) -> Iterator[Tuple[int, Dict[int, array], Dict[int, int]]]:
+    """
+    Streams a CSV file and yields (row_count, {column: array('d')}, {column: skipped})
+    chunks. Cells that do not parse as numbers are counted as skipped.
+    """
+    with open(path, newline="") as fh:
+        reader = csv.reader(fh)
+        if csv_header(path) is not None:
+            next(reader, None)
+        rows = 0
+        chunk = {c: array('d') for c in columns}
+        skipped = {c: 0 for c in columns}
+        for record in reader:
+            rows += 1
+            for c in columns:
+                try:
+                    chunk[c].append(float(record[c]))
+                except (ValueError, IndexError):
+                    skipped[c] += 1
+            if rows == chunk_rows:
+                yield rows, chunk, skipped
+                rows = 0
+                chunk = {c: array('d') for c in columns}
+                skipped = {c: 0 for c in columns}
+        if rows:
+            yield rows, chunk, skipped
+
+def csv_header(path: str) -> Optional[List[str]]:
+    """Returns the header row if the first row contains any non-numeric cell."""
+    with open(path, newline="") as fh:
+        first = next(csv.reader(fh), None)
+    if first is None:
+        return None
+    for cell in first:
+        try:
+            float(cell)
+        except ValueError:
+            return first
+    return None
+
+def column_names(path: str) -> List[str]:
+    """Lists the column names of a CSV (header or positional) or .npy file."""
+    if path.endswith(".npy"):
+        with open(path, "rb") as fh:
+            _, _, shape, _ = read_npy_header(fh)
+        return [f"col{i}" for i in range(shape[1] if len(shape) == 2 else 1)]
+    header = csv_header(path)
+    if header is not None:
+        return header
+    with open(path, newline="") as fh:
+        first = next(csv.reader(fh), [])
+    return [f"col{i}" for i in range(len(first))]
+
+def audit_columns(path: str, preset_name: str, columns: Sequence[int],
+                  chunk_rows: int) -> Tuple[int, List[ColumnAudit]]:
+    """Audits a group of columns in one streaming pass; also the worker-process entry point."""
+    preset = PRESETS[preset_name]
+    names = column_names(path)
+    audits = {c: ColumnAudit(names[c]) for c in columns}
+    total_rows = 0
+    if path.endswith(".npy"):
+        chunks = ((rows, chunk, {}) for rows, chunk in iter_npy_chunks(path, columns, chunk_rows))
+    else:
+        chunks = iter_csv_chunks(path, columns, chunk_rows)
+    for rows, chunk, skipped in chunks:
+        total_rows += rows
+        for c in columns:
+            audits[c].add(chunk[c], preset)
+            audits[c].skipped += skipped.get(c, 0)
+    return total_rows, [audits[c] for c in columns]
+
+def _peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process and its finished workers, in KiB."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 if sys.platform == "darwin" else 1
+    return max(own, children) // scale
+
+def audit_file(path: str, preset_name: str = "FLOAT32", chunk_rows: int = 65536,
+               workers: int = 1) -> AuditReport:
+    """
+    Audits every column of a CSV or .npy file against `preset_name`.
+    With workers > 1 the columns are split into groups, one streaming pass per worker process.
+    """
+    if preset_name not in PRESETS:
+        raise ValueError(f"Unknown preset '{preset_name}', expected one of {sorted(PRESETS)}")
+    columns = list(range(len(column_names(path))))
+    start = time.perf_counter()
+
+    if workers > 1 and len(columns) > 1:
+        groups = [columns[i::workers] for i in range(min(workers, len(columns)))]
+        with ProcessPoolExecutor(max_workers=len(groups)) as pool:
+            futures = [pool.submit(audit_columns, path, preset_name, g, chunk_rows) for g in groups]
+            results = [f.result() for f in futures]
+        rows = results[0][0]
+        audits = [None] * len(columns)
+        for group, (_, group_audits) in zip(groups, results):
+            for c, audit in zip(group, group_audits):
+                audits[c] = audit
+    else:
+        rows, audits = audit_columns(path, preset_name, columns, chunk_rows)
+
+    return AuditReport(path, preset_name, rows, time.perf_counter() - start, _peak_rss_kb(), audits)
+
+def main():
+    parser = argparse.ArgumentParser(description="Reports per-column precision loss when down-casting a dataset.")
+    parser.add_argument("path", help="CSV file or .npy array (1-D or 2-D, float32/float64)")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="FLOAT32", help="Target format")
+    parser.add_argument("--chunk-rows", type=int, default=65536, help="Rows read per chunk")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes to fan columns out across")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.path):
+        print(f"Error: File '{args.path}' not found.", file=sys.stderr)
+        sys.exit(1)
+
+    report = audit_file(args.path, args.preset, args.chunk_rows, args.workers)
+
+    if args.format == 'json':
+        out = asdict(report)
+        out["values_per_second"] = report.values_per_second
+        print(json.dumps(out, indent=2))
+        return
+
+    print(f"{'Column':<20} | {'Values':>10} | {'Inexact':>10} | {'Max Rel Error':>13} | {'Exponent Range'}")
+    print("-" * 80)
+    for c in report.columns:
+        exp_range = "--" if c.min_exp is None else f"2^{c.min_exp} .. 2^{c.max_exp}"
+        print(f"{c.name:<20} | {c.values:>10} | {c.inexact:>10} | {c.max_rel_error:>13.3e} | {exp_range}")
+    print("")
+    print(f"Rows: {report.rows}  Preset: {report.preset}  Time: {report.seconds:.3f}s  "
+          f"Throughput: {report.values_per_second:,.0f} values/s  "
+          f"Peak RSS: {report.peak_rss_kb if report.peak_rss_kb is not None else 'n/a'} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+import ast
+import glob
+import hashlib
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import sys
+import time
+import unittest
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Set
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(PROJECT_ROOT, "tests")
+CACHE_PATH = os.path.join(PROJECT_ROOT, ".proof_cache.json")
+
+DEFAULT_TIMEOUT_MS = 10000
+# Only solver verdicts are reusable; errors and timeouts depend on the machine and are always re-run.
+CACHEABLE = ("passed", "failed")
+
+@dataclass
+class ProofSpec:
+    """One BMC proof, addressed as module.Class.method inside a tests directory."""
+    tests_dir: str
+    module: str
+    cls: str
+    method: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.module}.{self.cls}.{self.method}"
+
+@dataclass
+class ProofResult:
+    """Outcome of one proof: passed, failed, error or timeout, plus its wall time."""
+    name: str
+    status: str
+    seconds: float
+    detail: str = ""
+    cached: bool = False
+
+class ProofTimeout(Exception):
+    """Raised inside a proof once its budget is spent or a solver answers unknown."""
+
+class ProofBudget:
+    """
+    One deadline shared by every solver check of a proof. Each check gets only the time
+    left, and a check that answers `unknown` (out of budget) ends the proof as a timeout.
+    """
+    def __init__(self, timeout_ms: int, unknown: object, clock: Callable[[], float] = time.monotonic):
+        self.unknown = unknown
+        self.clock = clock
+        self.deadline = clock() + timeout_ms / 1000
+        # Why the proof ran out, empty while it is within budget
+        self.exhausted = ""
+
+    def check(self, solver, check: Callable, *assumptions):
+        """Runs `check(solver, *assumptions)` with the remaining budget as the solver's timeout."""
+        remaining_ms = int((self.deadline - self.clock()) * 1000)
+        if remaining_ms <= 0:
+            self.exhausted = "Proof budget spent before its next solver check."
+            raise ProofTimeout(self.exhausted)
+        solver.set("timeout", remaining_ms)
+        verdict = check(solver, *assumptions)
+        if verdict == self.unknown:
+            self.exhausted = f"Solver answered unknown: {solver.reason_unknown()}"
+            raise ProofTimeout(self.exhausted)
+        return verdict
+
+def discover_proofs(tests_dir: str = TESTS_DIR, pattern: str = "test_*_bmc.py") -> List[ProofSpec]:
+    """Lists every test method of the BMC suites by parsing them, without importing z3."""
+    specs = []
+    for path in sorted(glob.glob(os.path.join(tests_dir, pattern))):
+        module = os.path.basename(path)[:-3]
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for item in node.body:
+                if isinstance(item, ast.FunctionDef) and item.name.startswith("test_"):
+                    specs.append(ProofSpec(tests_dir, module, node.name, item.name))
+    return specs
+
+def _src_imports(tree: ast.AST) -> Set[str]:
+    """Names of the src modules a parsed file imports, at any nesting level."""
+    found = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(a.name.split(".")[1] for a in node.names if a.name.startswith("src."))
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            if node.module == "src":
+                found.update(a.name for a in node.names)
+            elif node.module.startswith("src."):
+                found.add(node.module.split(".")[1])
+    return found
+
+class ProofCache:
+    """
+    Persistent verdicts keyed by a content hash of everything a proof depends on:
+    its own method source, the shared (non-test) code of its module, the src modules
+    that module imports (transitively), the z3 version and the solver timeout.
+    """
+    def __init__(self, path: str = CACHE_PATH, project_root: str = PROJECT_ROOT):
+        self.path = path
+        self.src_dir = os.path.join(project_root, "src")
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._keys: Dict[str, str] = {}
+        self._modules: Dict[str, tuple] = {}
+        self._files: Dict[str, str] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _file_hash(self, path: str) -> str:
+        if path not in self._files:
+            with open(path, "rb") as f:
+                self._files[path] = hashlib.sha256(f.read()).hexdigest()
+        return self._files[path]
+
+    def _src_closure(self, roots: Set[str]) -> List[str]:
+        """Paths of the given src modules plus every src module they import in turn."""
+        seen, todo = set(), list(roots)
+        while todo:
+            name = todo.pop()
+            path = os.path.join(self.src_dir, name + ".py")
+            if name in seen or not os.path.isfile(path):
+                continue
+            seen.add(name)
+            with open(path, "r", encoding="utf-8") as f:
+                todo.extend(_src_imports(ast.parse(f.read())))
+        return [os.path.join(self.src_dir, n + ".py") for n in sorted(seen)]
+
+    def _module_parts(self, spec: ProofSpec) -> tuple:
+        """(shared-code hash, {class.method: source}) for a test module, computed once per run."""
+        path = os.path.join(spec.tests_dir, spec.module + ".py")
+        if path not in self._modules:
+            with open(path, "r", encoding="utf-8") as f:
+                source = f.read()
+            tree = ast.parse(source)
+            lines = source.splitlines(keepends=True)
+            methods = {}
+            shared = list(lines)
+            for node in tree.body:
+                if not isinstance(node, ast.ClassDef):
+                    continue
+                for item in node.body:
+                    if isinstance(item, ast.FunctionDef) and item.name.startswith("test_"):
+                        start = (item.decorator_list[0] if item.decorator_list else item).lineno - 1
+                        methods[f"{node.name}.{item.name}"] = "".join(lines[start:item.end_lineno])
+                        # Blank the proof out of the shared code so editing one proof leaves the others cached
+                        shared[start:item.end_lineno] = [""] * (item.end_lineno - start)
+            digest = hashlib.sha256("".join(shared).encode("utf-8"))
+            for dep in self._src_closure(_src_imports(tree)):
+                digest.update(os.path.basename(dep).encode("utf-8"))
+                digest.update(self._file_hash(dep).encode("utf-8"))
+            self._modules[path] = (digest.hexdigest(), methods)
+        return self._modules[path]
+
+    def key(self, spec: ProofSpec, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> str:
+        """Content hash identifying one proof; any change to its inputs yields a new key."""
+        if (spec.name, timeout_ms) not in self._keys:
+            shared, methods = self._module_parts(spec)
+            digest = hashlib.sha256()
+            for part in (_z3_version(), str(timeout_ms), shared, methods.get(f"{spec.cls}.{spec.method}", "")):
+                digest.update(part.encode("utf-8"))
+                digest.update(b"\0")
+            self._keys[(spec.name, timeout_ms)] = digest.hexdigest()
+        return self._keys[(spec.name, timeout_ms)]
+
+    def get(self, spec: ProofSpec, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> Optional[ProofResult]:
+        """Returns the cached verdict if the proof's inputs are unchanged, counting the hit or miss."""
+        entry = self.entries.get(spec.name)
+        if entry and entry["key"] == self.key(spec, timeout_ms):
+            self.hits += 1
+            self.saved_seconds += entry["seconds"]
+            return ProofResult(spec.name, entry["status"], entry["seconds"], entry["detail"], cached=True)
+        self.misses += 1
+        return None
+
+    def put(self, spec: ProofSpec, result: ProofResult, timeout_ms: int = DEFAULT_TIMEOUT_MS) -> None:
+        """Stores a fresh solver verdict; other outcomes drop any stale entry."""
+        if _is_verdict(result):
+            self.entries[spec.name] = {"key": self.key(spec, timeout_ms), "status": result.status,
+                                       "seconds": result.seconds, "detail": result.detail}
+        else:
+            self.entries.pop(spec.name, None)
+
+    def save(self) -> None:
+        """Writes the cache atomically so an interrupted run never leaves a truncated file."""
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+def _is_verdict(result: ProofResult) -> bool:
+    """True for a definite solver verdict: a pass or a counterexample (a solver answering unknown is a timeout)."""
+    return result.status in CACHEABLE
+
+def _z3_version() -> str:
+    try:
+        import z3
+        return z3.get_version_string()
+    except ImportError:
+        return "none"
+
+def _proof_worker(spec: ProofSpec, timeout_ms: int, conn) -> None:
+    """Runs a single proof in the current (worker) process and sends back a ProofResult."""
+    sys.path.insert(0, PROJECT_ROOT)
+    sys.path.insert(0, spec.tests_dir)
+    try:
+        import z3
+    except ImportError:
+        z3 = None
+    budget = None
+    if z3 is not None:
+        # Every Solver the proof creates draws on the same budget; restored afterwards for in-process callers
+        budget = ProofBudget(timeout_ms, z3.unknown)
+        check = z3.Solver.check
+        z3.Solver.check = lambda solver, *assumptions: budget.check(solver, check, *assumptions)
+
+    start = time.perf_counter()
+    try:
+        suite = unittest.defaultTestLoader.loadTestsFromName(spec.name)
+        result = unittest.TestResult()
+        suite.run(result)
+        if budget is not None and budget.exhausted:
+            status, detail = "timeout", budget.exhausted
+        elif result.errors:
+            status, detail = "error", result.errors[0][1]
+        elif result.failures:
+            status, detail = "failed", result.failures[0][1]
+        elif result.skipped:
+            status, detail = "skipped", result.skipped[0][1]
+        else:
+            status, detail = "passed", ""
+    except Exception as e:
+        status, detail = "error", f"{type(e).__name__}: {e}"
+    finally:
+        if z3 is not None:
+            z3.Solver.check = check
+    conn.send(ProofResult(spec.name, status, time.perf_counter() - start, detail))
+    conn.close()
+
+def run_proofs(specs: List[ProofSpec], jobs: Optional[int] = None, timeout_ms: int = DEFAULT_TIMEOUT_MS,
+               wall_timeout: Optional[float] = None, cache: Optional[ProofCache] = None) -> List[ProofResult]:
+    """
+    Runs each proof in its own process, at most `jobs` at a time (default: all cores).
+    Each proof gets `timeout_ms` across all of its solver calls; a process still alive after
+    `wall_timeout` seconds (default: twice the solver budget plus start-up slack) is killed.
+    With a `cache`, proofs whose inputs are unchanged reuse their stored verdict.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    wall_timeout = wall_timeout if wall_timeout is not None else 2 * timeout_ms / 1000 + 5
+    ctx = multiprocessing.get_context()
+    if ctx.get_start_method() == "fork":
+        # Forked workers inherit an already-imported z3 instead of each paying its import cost.
+        try:
+            import z3  # noqa: F401
+        except ImportError:
+            pass
+    results = []
+    pending = []
+    for spec in specs:
+        hit = cache.get(spec, timeout_ms) if cache is not None else None
+        if hit is not None:
+            results.append(hit)
+        else:
+            pending.append(spec)
+    by_name = {spec.name: spec for spec in pending}
+    running = []
+
+    while pending or running:
+        while pending and len(running) < jobs:
+            spec = pending.pop(0)
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_proof_worker, args=(spec, timeout_ms, child_conn), daemon=True)
+            proc.start()
+            child_conn.close()
+            running.append((spec, proc, parent_conn, time.perf_counter()))
+
+        multiprocessing.connection.wait([conn for _, _, conn, _ in running], timeout=0.05)
+        still_running = []
+        for spec, proc, conn, started in running:
+            elapsed = time.perf_counter() - started
+            if conn.poll():
+                try:
+                    results.append(conn.recv())
+                except EOFError:
+                    results.append(ProofResult(spec.name, "error", elapsed, "Worker exited without a result."))
+                proc.join()
+            elif not proc.is_alive():
+                results.append(ProofResult(spec.name, "error", elapsed, f"Worker exited with code {proc.exitcode}."))
+            elif elapsed > wall_timeout:
+                proc.kill()
+                proc.join()
+                results.append(ProofResult(spec.name, "timeout", elapsed, f"Killed after {wall_timeout:.1f}s."))
+            else:
+                still_running.append((spec, proc, conn, started))
+                continue
+            conn.close()
+        running = still_running
+
+    if cache is not None:
+        for r in results:
+            if not r.cached:
+                cache.put(by_name[r.name], r, timeout_ms)
+        cache.save()
+
+    order = {spec.name: i for i, spec in enumerate(specs)}
+    return sorted(results, key=lambda r: order[r.name])
+
+def summarize(results: List[ProofResult], wall_seconds: float) -> dict:
+    """Builds the machine-readable summary written by --json."""
+    counts = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    cached = [r for r in results if r.cached]
+    return {
+        "total": len(results),
+        "counts": counts,
+        "wall_seconds": wall_seconds,
+        "proof_seconds": sum(r.seconds for r in results if not r.cached),
+        "cache_hits": len(cached),
+        "cache_misses": len(results) - len(cached),
+        "skipped_seconds": sum(r.seconds for r in cached),
+        "proofs": [asdict(r) for r in results],
+    }
+
+def format_cache_report(summary: dict) -> str:
+    """One-line hit/miss report showing how much solver time the cache skipped."""
+    return (f"Proof cache: {summary['cache_hits']} hit, {summary['cache_misses']} miss, "
+            f"{summary['skipped_seconds']:.2f}s of solver time skipped")
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs every Z3 BMC proof in its own worker process.")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Concurrent proofs (default: all cores)")
+    parser.add_argument("--timeout-ms", type=int, default=DEFAULT_TIMEOUT_MS, help="Z3 solver timeout per proof in milliseconds")
+    parser.add_argument("-k", "--filter", default="", help="Only run proofs whose name contains this substring")
+    parser.add_argument("--json", metavar="PATH", help="Write a machine-readable summary to PATH ('-' for stdout)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-solve every proof and leave the cache untouched")
+
+    args = parser.parse_args()
+
+    specs = [s for s in discover_proofs() if args.filter in s.name]
+    start = time.perf_counter()
+    cache = None if args.no_cache else ProofCache()
+    results = run_proofs(specs, args.jobs, args.timeout_ms, cache=cache)
+    wall = time.perf_counter() - start
+    summary = summarize(results, wall)
+
+    if args.json == "-":
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{'Status':<8} | {'Seconds':>8} | {'Cache':<5} | Proof")
+        print("-" * 80)
+        for r in sorted(results, key=lambda r: r.seconds, reverse=True):
+            print(f"{r.status:<8} | {r.seconds:>8.3f} | {'hit' if r.cached else 'miss':<5} | {r.name}")
+        print("")
+        print(f"{len(results)} proofs in {wall:.2f}s wall ({summary['proof_seconds']:.2f}s of proof time): "
+              + ", ".join(f"{n} {s}" for s, n in sorted(summary["counts"].items())))
+        if cache is not None:
+            print(format_cache_report(summary))
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(summary, f, indent=2)
+
+    sys.exit(0 if all(r.status in ("passed", "skipped") for r in results) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as tutor
+from src.difficulty import DifficultyModel
+from src.progress import ProgressStore
+from src.scheduler import Scheduler
+from src.transcript import ReplayResult, Transcript, replay
+
+def session_runner(target: str) -> Callable[[Scheduler], None]:
+    """Builds the `run(scheduler)` callable for a transcript target: 'main' or 'mode:<id>'."""
+    if target == "main":
+        return lambda scheduler: tutor.main(store=ProgressStore(), scheduler=scheduler)
+    kind, _, mode_id = target.partition(":")
+    if kind != "mode" or not mode_id.isdigit() or int(mode_id) not in tutor.AVAILABLE_MODES:
+        raise ValueError(f"Unknown transcript target '{target}', expected 'main' or 'mode:<1-{len(tutor.AVAILABLE_MODES)}>'.")
+
+    def run(scheduler: Scheduler) -> None:
+        # Built once the replay has seeded the RNG, which modes draw on when constructed (e.g. permutation keys)
+        mode = tutor.create_mode(int(mode_id))
+        mode.bind_progress(ProgressStore(), int(mode_id))
+        mode.bind_scheduler(scheduler, int(mode_id))
+        # As main() does, so modes 1-4 replay the adaptive generator they were recorded with
+        mode.bind_difficulty(DifficultyModel(), int(mode_id))
+        while mode.run_round():
+            pass
+        mode.finish_question()
+    return run
+
+def replay_file(path: str) -> dict:
+    """Replays one transcript file; returns a JSON-friendly summary."""
+    transcript = Transcript.load(path)
+    result: ReplayResult = replay(transcript, session_runner(transcript.target))
+    return {"path": path, "ok": result.ok, "answers": result.answers, "recorded": result.recorded,
+            "exhausted": result.exhausted, "mismatches": result.mismatches,
+            "verdict_mismatches": result.verdict_mismatches, "seconds": result.seconds}
+
+def replay_files(paths: List[str], workers: int = 1) -> List[dict]:
+    """Replays transcripts in order, across `workers` processes when more than one."""
+    if workers <= 1:
+        return [replay_file(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(replay_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays recorded tutor transcripts headlessly as a regression corpus and throughput benchmark.")
+    parser.add_argument("paths", nargs="+", help="Transcript files or directories (*.jsonl, *.jsonl.gz)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--format", choices=['text', 'json'], default='text', help="Output format")
+
+    args = parser.parse_args()
+
+    paths = []
+    for p in args.paths:
+        if os.path.isdir(p):
+            paths += sorted(glob.glob(os.path.join(p, "*.jsonl")) + glob.glob(os.path.join(p, "*.jsonl.gz")))
+        else:
+            paths.append(p)
+    if not paths:
+        print("Error: no transcripts found.", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        results = replay_files(paths, args.workers)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    wall = time.perf_counter() - start
+    answers = sum(r["answers"] for r in results)
+    failed = [r for r in results if not r["ok"]]
+
+    if args.format == 'json':
+        print(json.dumps({"sessions": len(results), "answers": answers, "wall_seconds": wall,
+                          "failed": len(failed), "results": results}, indent=2))
+    else:
+        for r in failed:
+            if r["exhausted"]:
+                reason = "ran out of answers"
+            elif r["mismatches"]:
+                reason = f"{len(r['mismatches'])} prompt mismatch(es)"
+            elif r["verdict_mismatches"]:
+                reason = "graded differently"
+            else:
+                reason = f"consumed {r['answers']}/{r['recorded']} answers"
+            print(f"FAIL {r['path']}: {reason}")
+            for position, expected, actual in (r["mismatches"] + r["verdict_mismatches"])[:3]:
+                print(f"     answer {position}: recorded {expected!r}, now {actual!r}")
+        print(f"Replayed {len(results)} session(s), {answers} answers in {wall:.2f}s "
+              f"({len(results) / wall:.1f} sessions/s, {answers / wall:.0f} answers/s); {len(failed)} failed.")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
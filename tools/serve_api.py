@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api_server import make_server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the engine's conversions as an HTTP JSON API.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8754, help="Port to bind (0 picks a free one)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    parser.add_argument("--cache", type=int, default=0, metavar="N", help="Cache up to N exact expansions (0 disables)")
+
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.verbose, args.cache)
+    host, port = server.server_address[:2]
+    print(f"Serving the IEEE 754 engine API on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()